@@ -2,13 +2,16 @@
 import time
 import threading
 from datetime import datetime, timezone
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 
-from fastapi import FastAPI, Response, HTTPException, Header
+from fastapi import FastAPI, Request, Response, HTTPException, Header
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+from prototype import metrics
+from prototype import circuit_breaker_v1 as breakers
+
 
 # =========================
 # App init
@@ -23,6 +26,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def latency_middleware(request: Request, call_next):
+    """Per-route handler latency -> http_request_seconds{path,method}."""
+    t0 = metrics.now()
+    status = 500
+    try:
+        resp = await call_next(request)
+        status = resp.status_code
+        return resp
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        metrics.observe("http_request_seconds", metrics.now() - t0, path=path, method=request.method)
+        metrics.inc("http_requests_total", path=path, method=request.method, status=status)
+
 # =========================
 # Admin Auth
 # =========================
@@ -48,6 +67,17 @@ except Exception as e:
     print(f"⚠️ Bot import failed: {e}")
     bot = None
 
+# Optional: record every broker round trip for offline replay
+# (python -m prototype.session_replay_v1 <file>)
+BOT_RECORD_PATH = os.getenv("BOT_RECORD_PATH", "")
+if bot is not None and BOT_RECORD_PATH:
+    try:
+        from prototype.session_replay_v1 import install_recorder
+        install_recorder(BOT_RECORD_PATH)
+        print(f"✅ Broker session recording -> {BOT_RECORD_PATH}")
+    except Exception as e:
+        print(f"⚠️ Session recorder not installed: {e}")
+
 # =========================
 # Model E Logic Import
 # =========================
@@ -98,6 +128,8 @@ class StatusResponse(BaseModel):
     # Server-side basis calculation
     curr_basis: float = 0.0
     next_basis: float = 0.0
+    # Broker endpoint health (per-route circuit breaker state)
+    circuit_breakers: Dict[str, Any] = Field(default_factory=dict)
 
 
 # =========================
@@ -138,6 +170,11 @@ async def startup_event():
 def health():
     return {"ok": True, "engine": "Model E", "model_e_available": MODEL_E_AVAILABLE}
 
+@app.get("/metrics", tags=["system"])
+def metrics_endpoint():
+    """Prometheus text exposition of in-process counters and latency histograms."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/dashboard", tags=["dashboard"])
 async def get_dashboard():
     """Dashboard Route - FIX: This solves the 404/Not Found error"""
@@ -261,15 +298,19 @@ def get_status_strict(response: Response):
             current_gear = int(td.get("current_gear", 0))
             gear_status = str(td.get("gear_status", "No Trade"))
             
-            # Extract Trinity View data directly from bot's trade_data
-            vix_ltp = float(td.get("vix_ltp", current_vix))
-            vix_close = float(td.get("vix_close", 0))
-            spot_ltp = float(td.get("spot_ltp", 0))
-            spot_close = float(td.get("spot_close", 0))
-            fut_curr_ltp = float(td.get("fut_curr_ltp", ltp))
-            fut_curr_close = float(td.get("fut_curr_close", last_close))
-            fut_next_ltp = float(td.get("fut_next_ltp", 0))
-            fut_next_close = float(td.get("fut_next_close", 0))
+            # Extract Trinity View data directly from bot's Quote records (loose keys as fallback)
+            quotes = td.get("quotes") or {}
+
+            def _q(key: str, legacy: str, ltp_default: float = 0.0, close_default: float = 0.0) -> Tuple[float, float]:
+                q = quotes.get(key)
+                if q is not None:
+                    return q.ltp, q.close
+                return float(td.get(f"{legacy}_ltp", ltp_default)), float(td.get(f"{legacy}_close", close_default))
+
+            vix_ltp, vix_close = _q("VIX", "vix", current_vix)
+            spot_ltp, spot_close = _q("SPOT", "spot")
+            fut_curr_ltp, fut_curr_close = _q("CURR", "fut_curr", ltp, last_close)
+            fut_next_ltp, fut_next_close = _q("NEXT", "fut_next")
             
         except Exception as e:
             print(f"⚠️ Error extracting market data: {e}")
@@ -313,6 +354,7 @@ def get_status_strict(response: Response):
         # Server-side basis calculation for reliability
         curr_basis=round(fut_curr_ltp - spot_ltp, 2) if (fut_curr_ltp > 0 and spot_ltp > 0) else 0.0,
         next_basis=round(fut_next_ltp - spot_ltp, 2) if (fut_next_ltp > 0 and spot_ltp > 0) else 0.0,
+        circuit_breakers=breakers.snapshot(),
     )
     return payload
 
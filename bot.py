@@ -10,21 +10,54 @@ Volatility-Adjusted Position Sizing (VAPS) with Structural Hedge
 """
 
 import os
-import time
 import threading
 import json
 import hashlib
 import requests
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from typing import Dict, Any
 import pyotp
 
 # Shoonya API
 from NorenRestApiPy.NorenApi import NorenApi
 
+# Injectable time source (real by default; simulated in replay/backtests)
+from prototype import clock
+
+# Hot-path latency metrics (served on api_server GET /metrics)
+from prototype import metrics
+
+# Client-side broker budget: token buckets per route, orders > quotes > history > search
+from prototype import rate_limiter_v1 as rate_limiter
+
+# Per-endpoint circuit breakers (fail fast during outages, half-open probe on recovery)
+from prototype import circuit_breaker_v1 as breakers
+requests = breakers.BreakerHTTP(rate_limiter.RateLimitedHTTP(metrics.InstrumentedHTTP(requests)))
+metrics.instrument_noren()
+rate_limiter.install_noren()
+breakers.install_noren()
+
+# Local Black-Scholes greeks (hedge strike selection without option_greek round trips)
+from prototype import greeks_v1 as greeks
+
+# Option chain snapshots (strikes/tokens/premiums in memory, TTL + websocket LTPs)
+from prototype.option_chain_cache_v1 import OptionChainCache
+
+# Single-flight quotes/candles shared across loop, scan and execution
+from prototype import market_data_v1 as market_data
+from prototype.market_types_v1 import NO_QUOTE, Quote
+
+# One 1m buffer per instrument; derived 1h bars/indicators for Model E
+from prototype.mtf_engine_v1 import CHECKPOINT_PATH as MTF_CHECKPOINT_PATH, MTF
+
+# Tick-driven stop / trailing / MTM-loss exits for the open Model E position
+from prototype.risk_governor_v1 import MTM_LOSS_PCT
+from prototype.risk_service_v1 import Leg, RiskPosition, RiskService
+
 # Institutional Config
 CAPITAL = 500000.00  # Fixed at 5 Lakhs for Model E blueprint
 FRICTION_PTS = 8.0   # Journaling requirement
+QUOTE_REUSE_SEC = 5.0  # scan/execution reuse bot_loop quotes this fresh (loop runs every 3s)
 
 # Token Storage
 TOKENS = {
@@ -34,24 +67,31 @@ TOKENS = {
     "FUT_NEXT": ""
 }
 
+# Broker endpoints (override to run against prototype/shoonya_mock_server_v1)
+SHOONYA_REST_URL = os.getenv("SHOONYA_REST_URL", "https://api.shoonya.com/NorenWClientTP/")
+SHOONYA_API_HOST = os.getenv("SHOONYA_API_HOST", "https://prism.shoonya.com/api")
+SHOONYA_WS_URL = os.getenv("SHOONYA_WS_URL", "wss://prism.shoonya.com/NorenWSToken/")
+
 class ShoonyaApiPy(NorenApi):
     """Shoonya API wrapper with proper initialization"""
     def __init__(self):
         NorenApi.__init__(self, 
-                         host='https://prism.shoonya.com/api', 
-                         websocket='wss://prism.shoonya.com/NorenWSToken/')
+                         host=SHOONYA_API_HOST, 
+                         websocket=SHOONYA_WS_URL)
 
 # Model E Logic
 try:
-    from model_e_logic import calculate_model_e_indicators, get_vaps_lots, get_gear_from_vix, get_gear_status
+    from model_e_logic import calculate_model_e_indicators, calculate_model_e_indicators_1h, get_vaps_lots, get_gear_from_vix, get_gear_status, model_e_entry_rules
     MODEL_E_AVAILABLE = True
 except ImportError:
     print("⚠️ model_e_logic not available. Model E features disabled.")
     MODEL_E_AVAILABLE = False
     def calculate_model_e_indicators(*args, **kwargs): return None
+    def calculate_model_e_indicators_1h(*args, **kwargs): return None
     def get_vaps_lots(*args, **kwargs): return 0
     def get_gear_from_vix(*args, **kwargs): return 0
     def get_gear_status(*args, **kwargs): return "No Trade"
+    def model_e_entry_rules(*args, **kwargs): return None
 
 # ==============================
 # Shared runtime state
@@ -95,6 +135,7 @@ trade_data: Dict[str, Any] = {
     "fut_curr_close": 0.0,
     "fut_next_ltp": 0.0,
     "fut_next_close": 0.0,
+    "quotes": {},  # {"VIX"|"SPOT"|"CURR"|"NEXT": Quote}; the *_ltp/*_close keys mirror it
     "heartbeat": "",
 
     # timing
@@ -137,7 +178,7 @@ def check_gear_change(current_vix: float, current_gear: int):
             f"📊 VIX: {current_vix:.2f}\n"
             f"⚙️ New Status: {status_map.get(current_gear, 'Unknown')}\n"
             f"💰 Capital: ₹ 5,00,000\n"
-            f"🕒 Time: {datetime.now().strftime('%H:%M:%S')}"
+            f"🕒 Time: {clock.local_hms()}"
         )
         telegram_send(msg)
         _last_gear = current_gear
@@ -180,7 +221,7 @@ def shoonya_login_direct_http():
         }
         
         # Shoonya API endpoint - Use /NorenWClientTP/ gateway (Production Gateway)
-        BASE_URL = "https://api.shoonya.com/NorenWClientTP/"
+        BASE_URL = SHOONYA_REST_URL
         url = f"{BASE_URL}QuickAuth"
         
         # Send request with correct format
@@ -262,7 +303,7 @@ def shoonya_login() -> bool:
 def resolve_futures_tokens(susertoken=None):
     """Automatic Future Token Resolution using /NorenWClientTP/ gateway"""
     global TOKENS, _susertoken
-    BASE_URL = "https://api.shoonya.com/NorenWClientTP/"
+    BASE_URL = SHOONYA_REST_URL
     
     # Use stored susertoken if not provided
     if susertoken is None:
@@ -314,10 +355,10 @@ def resolve_futures_tokens(susertoken=None):
         trade_data["last_error"] = f"Token resolution failed: {e}"
         return None
 
-def get_shoonya_data(susertoken, tokens):
+def get_shoonya_data(susertoken, tokens) -> Dict[str, Quote]:
     """Fetches LTP and Last Closing Prices for Trinity View using /NorenWClientTP/"""
-    BASE_URL = "https://api.shoonya.com/NorenWClientTP/"
-    results = {}
+    BASE_URL = SHOONYA_REST_URL
+    results: Dict[str, Quote] = {}
     
     try:
         UID = os.getenv('SHOONYA_USERID', '')
@@ -327,40 +368,36 @@ def get_shoonya_data(susertoken, tokens):
             # Determine exchange based on token
             exch = "NSE" if "26" in str(tok) else "NFO"
             payload = {"uid": UID, "exch": exch, "token": tok}
-            res = requests.post(f"{BASE_URL}GetQuotes",
-                              data=f'jData={json.dumps(payload)}&jKey={susertoken}',
-                              headers={"Content-Type": "application/x-www-form-urlencoded"},
-                              timeout=15)
-            result = res.json()
-            if result.get('stat') == 'Ok':
-                # 'lp' = LTP, 'c' = Last Closing Price
-                results[key] = {
-                    "ltp": float(result.get('lp', 0)),
-                    "close": float(result.get('c', result.get('pc', 0)))
-                }
+
+            def fetch(payload=payload):
+                res = requests.post(f"{BASE_URL}GetQuotes",
+                                  data=f'jData={json.dumps(payload)}&jKey={susertoken}',
+                                  headers={"Content-Type": "application/x-www-form-urlencoded"},
+                                  timeout=15)
+                return res.json()
+
+            # 'lp' = LTP, 'c' = Last Closing Price (parsed once into a Quote)
+            q = market_data.quote(api, exch, tok, fetch=fetch)
+            if q:
+                results[key] = q
         return results
     except Exception as e:
         print(f"⚠️ GetQuotes error: {e}")
         return results
 
-def get_market_data() -> Dict[str, Dict[str, float]]:
+def get_market_data() -> Dict[str, Quote]:
     """Spot, Futures aur VIX ka LTP aur Closing Price fetch karta hai"""
-    data = {}
+    data: Dict[str, Quote] = {}
     try:
         for key, token in TOKENS.items():
             if not token:
                 continue
             exchange = 'NSE' if key in ["NIFTY_SPOT", "VIX"] else 'NFO'
-            res = api.get_quotes(exchange=exchange, token=token)
-            if res and res.get('stat') == 'Ok':
-                ltp = _safe_float(res.get('lp', 0))
-                close = _safe_float(res.get('c', res.get('pc', res.get('close', 0))))
-                if close == 0:
-                    close = ltp  # Fallback to LTP if close not available
-                data[key] = {
-                    "ltp": ltp,
-                    "close": close
-                }
+            q = market_data.quote(api, exchange, token)
+            if q:
+                if q.close == 0:
+                    q = Quote(q.exch, q.token, q.ltp, q.ltp, q.bid, q.ask, q.ts)  # Fallback to LTP if close not available
+                data[key] = q
     except Exception as e:
         print(f"⚠️ Market data fetch error: {e}")
     return data
@@ -392,23 +429,62 @@ def fetch_quote_prices() -> Dict[str, float]:
     if not token:
         return {"ltp": 0.0, "close": 0.0}
 
-    q = api.get_quotes(exchange="NFO", token=token)
+    q = market_data.quote(api, "NFO", token)
     if not q:
         return {"ltp": 0.0, "close": 0.0}
-
-    ltp = q.get("lp") or q.get("ltp") or q.get("last_price")
-    close = q.get("c") or q.get("close") or q.get("prev_close") or q.get("pclose")
-
-    ltp_f = _safe_float(ltp)
-    close_f = _safe_float(close)
-    if close_f <= 0:
-        close_f = ltp_f
-
-    return {"ltp": ltp_f, "close": close_f}
+    return {"ltp": q.ltp, "close": q.close if q.close > 0 else q.ltp}
 
 # ==============================
 # Model E Execution Logic
 # ==============================
+HEDGE_PUT_DELTA = -0.35
+HEDGE_FALLBACK_OTM_PTS = 200
+MIN_CHAIN_QUOTES = 5
+
+option_chain = None  # OptionChainCache, created on first use after login
+MODEL_E_TRAIL_ATR = 0.0  # trailing stop distance in 1H ATRs; 0 = fixed SL only (as the backtest)
+
+def start_option_feed():
+    """Chain cache + websocket feed for the current session; a re-login closes the old feed before replacing it."""
+    global option_chain
+    if not api:
+        return None
+    if option_chain is None or option_chain.api is not api:
+        if option_chain is not None:
+            option_chain.stop_feed()
+        option_chain = OptionChainCache(api)
+        option_chain.subscribe(RISK.keys())
+        threading.Thread(target=option_chain.start_feed, kwargs={"on_tick": RISK.on_tick}, daemon=True).start()
+    return option_chain
+
+def get_option_chain(nifty_spot: float):
+    """Cached chain snapshot around ATM for the current future's expiry (None if unavailable)."""
+    underlying = trade_data.get("symbol")
+    if not underlying or start_option_feed() is None:
+        return None
+    return option_chain.get(underlying, nifty_spot)
+
+def select_hedge_put_strike(nifty_spot: float, now: datetime = None, chain=None):
+    """
+    Strike of the put closest to HEDGE_PUT_DELTA, priced locally. Uses the
+    chain's live put premiums (implied vols) when enough are cached, else a
+    flat vol = India VIX on the current monthly expiry. Returns
+    (strike, greeks_row); falls back to (ATM - 200, None) without either.
+    """
+    now = now or clock.now()
+    if chain is not None and chain.expiry is not None:
+        strikes, ltps = chain.ltps("PE", max_age=option_chain.ltp_ttl_sec if option_chain else None)
+        if (ltps == ltps).sum() >= MIN_CHAIN_QUOTES:
+            t = greeks.year_fraction(chain.expiry, now)
+            row = greeks.select_put_by_delta(nifty_spot, t, strikes=strikes, ltps=ltps, target=HEDGE_PUT_DELTA)
+            return int(row["strike"]), row
+    vix = _safe_float(trade_data.get("current_vix") or trade_data.get("vix_ltp"))
+    if vix <= 0:
+        return round(nifty_spot / 50) * 50 - HEDGE_FALLBACK_OTM_PTS, None
+    t = greeks.year_fraction(greeks.monthly_expiry(now.date()), now)
+    row = greeks.select_put_by_delta(nifty_spot, t, sigma=vix / 100.0, target=HEDGE_PUT_DELTA)
+    return int(row["strike"]), row
+
 def execute_model_e_trade(lots, stop_loss, entry_price):
     """
     Execute Model E Trade with Institutional Order Sequence:
@@ -426,18 +502,18 @@ def execute_model_e_trade(lots, stop_loss, entry_price):
             return False
         
         # Get NIFTY spot for strike calculation
-        nifty_spot_data = api.get_quotes(exchange='NSE', token='26000')
-        nifty_spot = float(nifty_spot_data.get('lp', 0))
+        nifty_spot = (market_data.quote(api, 'NSE', TOKENS["NIFTY_SPOT"], max_age=QUOTE_REUSE_SEC) or NO_QUOTE).ltp
         
         if nifty_spot == 0:
             print("❌ Could not fetch NIFTY spot price")
             return False
         
-        # Calculate Put Strike (ATM - 200, approx Delta 0.35)
-        put_strike = round(nifty_spot / 50) * 50 - 200
+        # Hedge Put Strike: nearest 0.35-delta put (falls back to ATM - 200)
+        now = clock.now()
+        chain = get_option_chain(nifty_spot)
+        put_strike, put_greeks = select_hedge_put_strike(nifty_spot, now, chain)
         
         # Get current expiry (simplified - use current month)
-        now = datetime.now()
         expiry_month = now.strftime('%b').upper()
         expiry_year = now.strftime('%y')
         current_expiry = f"{expiry_year}{expiry_month}"
@@ -450,26 +526,32 @@ def execute_model_e_trade(lots, stop_loss, entry_price):
         print(f"   Entry: {entry_price:.2f}")
         print(f"   SL: {stop_loss:.2f}")
         print(f"   Put Strike: {put_strike}")
+        if put_greeks:
+            print(f"   Put Delta: {put_greeks['delta']:.3f} (IV {put_greeks['iv'] * 100:.1f}%)")
         
         # ORDER 1: BUY OTM PUT (Hedge) - Market Order
         print(f"📊 Order 1: Buying Put Strike {put_strike}PE")
-        put_symbol = f"NIFTY{current_expiry}{put_strike}PE"
+        put_leg = chain.leg(put_strike, "PE") if chain else None
+        put_symbol = put_leg.tsym if put_leg else f"NIFTY{current_expiry}{put_strike}PE"
         
-        put_order = api.place_order(
-            buy_or_sell='B',
-            product_type='M',  # MIS
-            exchange='NFO',
-            tradingsymbol=put_symbol,
-            quantity=qty,
-            discloseqty=0,
-            price_type='MKT',
-            price=0.0,
-            trigger_price=None,
-            retention='DAY',
-            remarks='ModelE_Hedge'
-        )
+        with metrics.timed("order_place_seconds", leg="hedge"):
+            put_order = api.place_order(
+                buy_or_sell='B',
+                product_type='M',  # MIS
+                exchange='NFO',
+                tradingsymbol=put_symbol,
+                quantity=qty,
+                discloseqty=0,
+                price_type='MKT',
+                price=0.0,
+                trigger_price=None,
+                retention='DAY',
+                remarks='ModelE_Hedge'
+            )
         
-        if not put_order or put_order.get('stat') != 'Ok':
+        put_ok = bool(put_order) and put_order.get('stat') == 'Ok'
+        metrics.inc("orders_total", leg="hedge", outcome="ok" if put_ok else "rejected")
+        if not put_ok:
             error_msg = put_order.get('emsg', 'Unknown error') if put_order else 'No response'
             print(f"❌ Put order failed: {error_msg}")
             telegram_send(f"❌ Model E: Put order failed - {error_msg}")
@@ -479,27 +561,30 @@ def execute_model_e_trade(lots, stop_loss, entry_price):
         print(f"✅ Put order placed: {put_order_id}")
         
         # Small delay between orders
-        time.sleep(1)
+        clock.sleep(1)
         
         # ORDER 2: BUY NIFTY FUTURE (Main) - Market Order
         print(f"📊 Order 2: Buying NIFTY Future")
         fut_symbol = trade_data.get("symbol", f"NIFTY{current_expiry}F")
         
-        fut_order = api.place_order(
-            buy_or_sell='B',
-            product_type='M',  # MIS
-            exchange='NFO',
-            tradingsymbol=fut_symbol,
-            quantity=qty,
-            discloseqty=0,
-            price_type='MKT',
-            price=0.0,
-            trigger_price=None,
-            retention='DAY',
-            remarks='ModelE_Main'
-        )
+        with metrics.timed("order_place_seconds", leg="main"):
+            fut_order = api.place_order(
+                buy_or_sell='B',
+                product_type='M',  # MIS
+                exchange='NFO',
+                tradingsymbol=fut_symbol,
+                quantity=qty,
+                discloseqty=0,
+                price_type='MKT',
+                price=0.0,
+                trigger_price=None,
+                retention='DAY',
+                remarks='ModelE_Main'
+            )
         
-        if not fut_order or fut_order.get('stat') != 'Ok':
+        fut_ok = bool(fut_order) and fut_order.get('stat') == 'Ok'
+        metrics.inc("orders_total", leg="main", outcome="ok" if fut_ok else "rejected")
+        if not fut_ok:
             error_msg = fut_order.get('emsg', 'Unknown error') if fut_order else 'No response'
             print(f"❌ Future order failed: {error_msg}")
             telegram_send(f"❌ Model E: Future order failed - {error_msg}")
@@ -520,6 +605,21 @@ def execute_model_e_trade(lots, stop_loss, entry_price):
         trade_data["put_order_id"] = put_order_id
         trade_data["fut_order_id"] = fut_order_id
         trade_data["put_strike"] = put_strike
+        trade_data["put_delta"] = round(put_greeks["delta"], 4) if put_greeks else None
+        trade_data["fut_symbol"] = fut_symbol
+        trade_data["put_symbol"] = put_symbol
+        trade_data["qty"] = qty
+        
+        # Intrabar risk: SL on every spot tick, MTM loss over both legs (first tick is the baseline when unpriced)
+        legs = [Leg(f"NFO|{TOKENS['FUT_CURR']}", qty, trade_data.get("fut_curr_ltp") or None)]
+        if put_leg:
+            legs.append(Leg(f"{put_leg.exch}|{put_leg.token}", qty, option_chain.premium(put_leg) if option_chain else None))
+        RISK.add(RiskPosition(
+            "model_e", legs, stop_key=f"NSE|{TOKENS['NIFTY_SPOT']}", stop=float(stop_loss),
+            trail_dist=MODEL_E_TRAIL_ATR * (entry_price - stop_loss) / 2.0,
+            mtm_limit=MTM_LOSS_PCT * float(trade_data.get("net_equity", CAPITAL)),
+        ))
+        save_model_e_position()
         
         # Telegram Alert
         telegram_send(
@@ -539,39 +639,149 @@ def execute_model_e_trade(lots, stop_loss, entry_price):
         telegram_send(f"❌ Model E Execution Failed: {str(e)}")
         return False
 
+def close_model_e_position(reason: str) -> bool:
+    """
+    Exit Model E: SELL the future first (the risk), then the hedge put.
+    Market orders; called by the risk service (SL / trail / MTM loss) and square_off_all.
+    """
+    fut_symbol = trade_data.get("fut_symbol", "")  # legs already sold are blanked, so a retry only sends the rest
+    put_symbol = trade_data.get("put_symbol", "")
+    qty = int(trade_data.get("qty") or 0)
+    if not api or not (fut_symbol or put_symbol) or qty <= 0:
+        print("⚠️ No active position to square off")
+        return False
+    
+    print(f"🔒 Exiting Model E: {reason}")
+    for leg, symbol in (("exit_main", fut_symbol), ("exit_hedge", put_symbol)):
+        if not symbol:
+            continue
+        # protective exit: sent even while the PlaceOrder breaker is open (outage), never failed fast
+        with breakers.bypass(), metrics.timed("order_place_seconds", leg=leg):
+            order = api.place_order(
+                buy_or_sell='S',
+                product_type='M',  # MIS
+                exchange='NFO',
+                tradingsymbol=symbol,
+                quantity=qty,
+                discloseqty=0,
+                price_type='MKT',
+                price=0.0,
+                trigger_price=None,
+                retention='DAY',
+                remarks='ModelE_Exit'
+            )
+        ok = bool(order) and order.get('stat') == 'Ok'
+        metrics.inc("orders_total", leg=leg, outcome="ok" if ok else "rejected")
+        if not ok:
+            error_msg = order.get('emsg', 'Unknown error') if order else 'No response'
+            print(f"❌ Exit order {symbol} failed: {error_msg}")
+            telegram_send(f"❌ Model E: Exit order {symbol} failed - {error_msg}")
+            return False
+        trade_data["put_symbol" if leg == "exit_hedge" else "fut_symbol"] = ""
+        save_model_e_position()
+    
+    trade_data["active"] = False
+    trade_data["exit_reason"] = reason
+    RISK.remove("model_e")
+    clear_model_e_position()
+    telegram_send(f"🔒 *Model E Exit*\n\n{reason}")
+    return True
+
+RISK = RiskService(
+    exit_fn=lambda pos, d: close_model_e_position(d.reason),
+    subscribe_fn=lambda keys: option_chain.subscribe(keys) if option_chain else None,
+)
+
+# Open Model E position, persisted so a restart puts it back under RISK
+MODEL_E_POSITION_PATH = os.path.join("prototype", "outputs", "model_e_position.json")
+MODEL_E_POSITION_KEYS = ("entry_price", "sl_price", "model_e_signal", "model_e_lots", "model_e_entry", "model_e_sl",
+                         "put_order_id", "fut_order_id", "put_strike", "put_delta", "fut_symbol", "put_symbol", "qty")
+
+def save_model_e_position():
+    """Write the open position (trade_data legs + RISK definition); atomic tmp + rename."""
+    pos = RISK.get("model_e")
+    if pos is None:
+        return
+    state = {"saved_at": clock.time(), "trade": {k: trade_data.get(k) for k in MODEL_E_POSITION_KEYS},
+             "risk": pos.to_state()}
+    try:
+        os.makedirs(os.path.dirname(MODEL_E_POSITION_PATH), exist_ok=True)
+        tmp = MODEL_E_POSITION_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, MODEL_E_POSITION_PATH)
+    except OSError as e:
+        print(f"⚠️ Model E position not persisted: {e}")
+
+def clear_model_e_position():
+    try:
+        os.remove(MODEL_E_POSITION_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ Model E position state not cleared: {e}")
+
+def restore_model_e_position() -> bool:
+    """
+    Boot: re-register the persisted Model E position with RISK so stop / MTM exits
+    resume after a restart. The broker position book decides which legs are still
+    open (legs it shows flat are dropped; all flat -> nothing restored); if it
+    cannot be read the saved state is trusted. MIS legs do not outlive their
+    session, so a state saved on an earlier IST day is discarded.
+    """
+    try:
+        with open(MODEL_E_POSITION_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Model E position state unreadable: {e}")
+        return False
+
+    ist_day = lambda t: int((t + clock.IST_OFFSET_SEC) // 86400)
+    if ist_day(float(state.get("saved_at", 0))) != ist_day(clock.time()):
+        print("ℹ️ Model E position state from an earlier session (MIS squared off): discarded")
+        clear_model_e_position()
+        return False
+
+    trade = dict(state.get("trade") or {})
+    try:
+        book = api.get_positions() if api else None
+    except Exception as e:
+        print(f"⚠️ Position book fetch failed: {e}")
+        book = None
+    if isinstance(book, list):
+        held = {str(p.get("tsym", "")) for p in book if isinstance(p, dict) and _safe_float(p.get("netqty")) > 0}
+        for k in ("fut_symbol", "put_symbol"):
+            if trade.get(k) and trade[k] not in held:
+                trade[k] = ""
+        if not (trade.get("fut_symbol") or trade.get("put_symbol")):
+            print("ℹ️ Broker shows the Model E legs flat: nothing to restore")
+            clear_model_e_position()
+            return False
+    else:
+        telegram_send("⚠️ Model E: position book unavailable at startup; risk re-armed from the saved state")
+
+    risk = dict(state["risk"])
+    # legs were registered FUT first, then the hedge PUT (if priced): drop the ones already sold
+    risk["legs"] = [leg for leg, sym in zip(risk["legs"], (trade.get("fut_symbol"), trade.get("put_symbol"))) if sym]
+    trade_data.update(trade)
+    trade_data["active"] = True
+    RISK.add(RiskPosition.from_state(risk))
+    start_option_feed()  # no chain yet at boot: open the feed so the restored legs (incl. the hedge put) get ticks
+    save_model_e_position()
+    print(f"♻️ Model E position restored: {trade.get('fut_symbol') or '-'} / {trade.get('put_symbol') or '-'} "
+          f"x {trade.get('qty')}, SL {risk.get('stop')}")
+    telegram_send(f"♻️ *Model E position restored after restart*\n\nSL: {risk.get('stop')}")
+    return True
+
 def square_off_all():
     """
     Square off all Model E positions (Future + Put)
     Called on Friday 15:15 or manual exit
     """
     try:
-        if not api:
-            return False
-        
-        fut_symbol = trade_data.get("symbol", "")
-        put_strike = trade_data.get("put_strike", 0)
-        
-        if not fut_symbol:
-            print("⚠️ No active position to square off")
-            return False
-        
-        print("🔒 Squaring off all Model E positions...")
-        
-        # Get current positions
-        positions = api.get_positions()
-        if not positions:
-            print("⚠️ No positions found")
-            return False
-        
-        # Square off Future
-        # Square off Put
-        # (Implementation depends on Shoonya API position management)
-        
-        trade_data["active"] = False
-        telegram_send("🔒 Friday Mandatory Exit Complete. All positions squared off.")
-        
-        return True
-        
+        return close_model_e_position("Friday 15:15 square off")
     except Exception as e:
         print(f"❌ Square off failed: {e}")
         return False
@@ -581,7 +791,7 @@ def check_friday_exit():
     Check if it's Friday 15:15 and trigger exit
     Called from bot loop
     """
-    now = datetime.now()
+    now = clock.now()
     # 4 is Friday, 15:15 is 3:15 PM
     if now.weekday() == 4 and now.hour == 15 and now.minute >= 15:
         if trade_data.get("active"):
@@ -610,7 +820,7 @@ def scan_for_model_e():
         
         import pandas as pd
         
-        # 1. Fetch 1-min historical data (last 24 hours = 1440 minutes)
+        # 1. 1-min history lives in the MTF engine: first scan seeds 24h, later scans fetch only new bars
         fut_token = trade_data.get("fut_token")
         if not fut_token:
             print("⚠️ FUT token not available for Model E scan")
@@ -619,30 +829,21 @@ def scan_for_model_e():
         # Get NIFTY spot token for historical data (26000 = NIFTY 50)
         nifty_spot_token = "26000"
         
-        # Calculate time range (last 24 hours)
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=24)
-        
         # Fetch historical data
         try:
-            raw_data = api.get_time_price_series(
-                exchange='NSE',
-                token=nifty_spot_token,
-                start_time=start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                end_time=end_time.strftime('%Y-%m-%d %H:%M:%S'),
-                interval='1'
-            )
+            MTF.sync(api, 'NSE', nifty_spot_token, lookback_sec=24 * 3600)
             
-            if not raw_data or len(raw_data) == 0:
+            if not len(MTF.bars(nifty_spot_token, '1m', 1)):
                 print("⚠️ No historical data available for Model E")
                 return
+            t_data = metrics.now()
             
-            # Convert to DataFrame
-            df_1min = pd.DataFrame(raw_data)
-            df_1min.columns = ['time', 'open', 'high', 'low', 'close', 'volume']
+            # 1H bars maintained incrementally (forming hour included, as resample('1H') did)
+            df_1h = MTF.frame(nifty_spot_token, '1h', include_forming=True)
             
             # Calculate indicators
-            df_1h = calculate_model_e_indicators(df_1min)
+            with metrics.timed("indicator_compute_seconds", fn="calculate_model_e_indicators"):
+                df_1h = calculate_model_e_indicators_1h(df_1h)
             
             if df_1h.empty or len(df_1h) < 2:
                 print("⚠️ Insufficient data for Model E analysis")
@@ -650,12 +851,13 @@ def scan_for_model_e():
             
             # Signal Candle (Last completed 1H candle)
             bar_i = df_1h.iloc[-1]
-            bar_prev = df_1h.iloc[-2]
             
-            # 2. Check Conditions
-            trend_flip = (bar_i['st_direction'] == 1 and bar_prev['st_direction'] == -1)
-            rsi_filter = bar_i['rsi'] < 65
-            price_action = (bar_i['close'] > bar_i['st_line']) and (bar_i['close'] > bar_i['ema20'])
+            # 2. Check Conditions (model_e_logic.MODEL_E_ENTRY_RULES, same rules the backtest runs)
+            conds = model_e_entry_rules().last(df_1h)
+            trend_flip = conds['trend_flip']
+            rsi_filter = conds['rsi_filter']
+            price_action = conds['price_action']
+            metrics.observe("tick_to_signal_seconds", metrics.now() - t_data)
             
             # Update trade_data with current indicators
             trade_data['model_e_st_direction'] = int(bar_i['st_direction'])
@@ -665,9 +867,8 @@ def scan_for_model_e():
             
             # Get VIX
             try:
-                vix_token = "26017"  # VIX token
-                vix_data = api.get_quotes(exchange='NSE', token=vix_token)
-                current_vix = float(vix_data.get('lp', 0))
+                vix_token = TOKENS["VIX"]  # bot_loop polled it moments ago
+                current_vix = (market_data.quote(api, 'NSE', vix_token, max_age=QUOTE_REUSE_SEC) or NO_QUOTE).ltp
                 trade_data['current_vix'] = current_vix
                 new_gear = get_gear_from_vix(current_vix)
                 trade_data['current_gear'] = new_gear
@@ -705,7 +906,9 @@ def scan_for_model_e():
                     print(f"   SL: {stop_loss:.2f}")
                     
                     # Execute trade
-                    execute_model_e_trade(lots, stop_loss, entry_price)
+                    t_signal = metrics.now()
+                    if execute_model_e_trade(lots, stop_loss, entry_price):
+                        metrics.observe("signal_to_order_ack_seconds", metrics.now() - t_signal)
                     trade_data['model_e_signal'] = True
                     trade_data['model_e_lots'] = lots
                     trade_data['model_e_entry'] = entry_price
@@ -734,13 +937,16 @@ def bot_loop():
     trade_data["status"] = "Starting"
     trade_data["active"] = False
 
-    # Login retry loop
+    # Login retry loop (jittered exponential backoff, never faster than the QuickAuth breaker allows)
+    attempt = 0
     while not _stop_flag:
         ok = shoonya_login()
         if ok:
             break
+        attempt += 1
         trade_data["status"] = "LoginFailed"
-        time.sleep(5)
+        clock.sleep(max(breakers.backoff_delay(attempt, base=5.0, cap=120.0),
+                        breakers.breaker("QuickAuth").retry_in()))
 
     if _stop_flag:
         trade_data["status"] = "Stopped"
@@ -748,6 +954,13 @@ def bot_loop():
 
     trade_data["status"] = "LoginOK"
 
+    # Indicator state from the last bar close: the first Model E scan fetches only the gap since then
+    if MTF.restore(MTF_CHECKPOINT_PATH):
+        print("✅ MTF checkpoint restored (Model E resumes without a history download)")
+
+    # Position opened before a restart: back under the risk service before the first tick
+    restore_model_e_position()
+
     # Resolve futures tokens (Current + Next) using direct HTTP
     tokens = resolve_futures_tokens(_susertoken)
     if not tokens:
@@ -773,50 +986,36 @@ def bot_loop():
     print("✅ Bot Loop: Status set to 'Running' - API will show as Connected")
 
     while not _stop_flag:
+        t_iter = metrics.now()
         try:
             # Check Friday exit
             check_friday_exit()
             
-            trade_data["last_run"] = datetime.now(timezone.utc).isoformat()
+            trade_data["last_run"] = clock.utc_now_iso()
 
             # Fetch all market data (Trinity View) using direct HTTP for real closing prices
             if _susertoken and tokens:
-                shoonya_data = get_shoonya_data(_susertoken, tokens)
-                # Map to expected format
-                vix_ltp = _safe_float(shoonya_data.get("VIX", {}).get("ltp", 0))
-                vix_close = _safe_float(shoonya_data.get("VIX", {}).get("close", 0))
-                spot_ltp = _safe_float(shoonya_data.get("SPOT", {}).get("ltp", 0))
-                spot_close = _safe_float(shoonya_data.get("SPOT", {}).get("close", 0))
-                fut_curr_ltp = _safe_float(shoonya_data.get("CURR", {}).get("ltp", 0))
-                fut_curr_close = _safe_float(shoonya_data.get("CURR", {}).get("close", 0))
-                fut_next_ltp = _safe_float(shoonya_data.get("NEXT", {}).get("ltp", 0))
-                fut_next_close = _safe_float(shoonya_data.get("NEXT", {}).get("close", 0))
+                quotes = get_shoonya_data(_susertoken, tokens)
             else:
                 # Fallback to NorenApi method
                 quotes = {}
                 try:
-                    quotes["VIX"] = api.get_quotes(exchange='NSE', token=TOKENS["VIX"])
-                    quotes["SPOT"] = api.get_quotes(exchange='NSE', token=TOKENS["NIFTY_SPOT"])
-                    if TOKENS["FUT_CURR"]:
-                        quotes["FUT_C"] = api.get_quotes(exchange='NFO', token=TOKENS["FUT_CURR"])
-                    if TOKENS["FUT_NEXT"]:
-                        quotes["FUT_N"] = api.get_quotes(exchange='NFO', token=TOKENS["FUT_NEXT"])
+                    for key, exch, tok in (("VIX", 'NSE', TOKENS["VIX"]), ("SPOT", 'NSE', TOKENS["NIFTY_SPOT"]),
+                                           ("CURR", 'NFO', TOKENS["FUT_CURR"]), ("NEXT", 'NFO', TOKENS["FUT_NEXT"])):
+                        q = market_data.quote(api, exch, tok) if tok else None
+                        if q:
+                            quotes[key] = q
                 except Exception as e:
                     print(f"⚠️ Quote fetch error: {e}")
                     quotes = {}
-                
-                # Extract and update all market data
-                vix_ltp = _safe_float(quotes.get("VIX", {}).get('lp', 0))
-                vix_close = _safe_float(quotes.get("VIX", {}).get('c', quotes.get("VIX", {}).get('pc', 0)))
-                
-                spot_ltp = _safe_float(quotes.get("SPOT", {}).get('lp', 0))
-                spot_close = _safe_float(quotes.get("SPOT", {}).get('c', quotes.get("SPOT", {}).get('pc', 0)))
-                
-                fut_curr_ltp = _safe_float(quotes.get("FUT_C", {}).get('lp', 0))
-                fut_curr_close = _safe_float(quotes.get("FUT_C", {}).get('c', quotes.get("FUT_C", {}).get('pc', 0)))
-                
-                fut_next_ltp = _safe_float(quotes.get("FUT_N", {}).get('lp', 0))
-                fut_next_close = _safe_float(quotes.get("FUT_N", {}).get('c', quotes.get("FUT_N", {}).get('pc', 0)))
+
+            # Extract all market data (already parsed to floats)
+            vix_q, spot_q = quotes.get("VIX", NO_QUOTE), quotes.get("SPOT", NO_QUOTE)
+            curr_q, next_q = quotes.get("CURR", NO_QUOTE), quotes.get("NEXT", NO_QUOTE)
+            vix_ltp, vix_close = vix_q.ltp, vix_q.close
+            spot_ltp, spot_close = spot_q.ltp, spot_q.close
+            fut_curr_ltp, fut_curr_close = curr_q.ltp, curr_q.close
+            fut_next_ltp, fut_next_close = next_q.ltp, next_q.close
             
             # Update trade_data dictionary - This is what api_server.py reads
             # Use real closing prices from GetQuotes API (no fallback calculations)
@@ -830,7 +1029,8 @@ def bot_loop():
                 "fut_curr_close": fut_curr_close,  # Real closing price from API
                 "fut_next_ltp": fut_next_ltp,
                 "fut_next_close": fut_next_close,  # Real closing price from API
-                "heartbeat": datetime.now().strftime("%H:%M:%S"),  # Real heartbeat timestamp
+                "quotes": quotes,  # Quote records (api_server reads these first)
+                "heartbeat": clock.local_hms(),  # Real heartbeat timestamp
             })
             
             # Backward compatibility keys
@@ -850,31 +1050,40 @@ def bot_loop():
                 check_gear_change(vix_ltp, new_gear)
             
             # Update timestamps
-            t = datetime.now().strftime("%H:%M:%S")
+            t = clock.local_hms()
             trade_data["lastCloseTime"] = t
             trade_data["last_close_time"] = t
-            trade_data["last_update_utc"] = datetime.now(timezone.utc).isoformat()
+            trade_data["last_update_utc"] = clock.utc_now_iso()
+
+            # Polled prices back up the websocket for the risk service (no-op when flat)
+            if RISK.active():
+                RISK.on_price(f"NSE|{TOKENS['NIFTY_SPOT']}", spot_ltp)
+                RISK.on_price(f"NFO|{TOKENS['FUT_CURR']}", fut_curr_ltp)
 
             # Logging (every 60 seconds)
-            now = time.time()
+            now = clock.time()
             if now - last_log_ts >= 60:
                 last_log_ts = now
                 print(f"✅ Market Data | VIX={vix_ltp:.2f} | Spot={spot_ltp:.2f} | CurrFut={fut_curr_ltp:.2f} | NextFut={fut_next_ltp:.2f} | Heartbeat={trade_data['heartbeat']}")
 
             # Model E scanning (every 1 hour)
-            current_time = time.time()
+            current_time = clock.time()
             if last_scan_time is None or (current_time - last_scan_time) >= scan_interval:
                 if MODEL_E_AVAILABLE and not trade_data.get("active"):
-                    scan_for_model_e()
+                    with metrics.timed("model_e_scan_seconds"):
+                        scan_for_model_e()
                 last_scan_time = current_time
 
-            time.sleep(3)  # Dashboard refresh sync (3 seconds) - Critical for real-time updates
+            metrics.observe("bot_loop_iteration_seconds", metrics.now() - t_iter)
+            clock.sleep(3)  # Dashboard refresh sync (3 seconds) - Critical for real-time updates
 
         except Exception as e:
             trade_data["last_error"] = str(e)
             trade_data["status"] = "Error"
             print(f"❌ bot_loop error: {e}")
-            time.sleep(5)
+            metrics.inc("bot_loop_errors_total")
+            # BreakerOpen: wait until that breaker's half-open probe is due; any other error: the usual 5s
+            clock.sleep(breakers.breaker(e.name).retry_in() if isinstance(e, breakers.BreakerOpen) else 5)
 
     trade_data["status"] = "Stopped"
     trade_data["active"] = False
@@ -1,85 +1,103 @@
 """
 Model E Trading Logic
 Volatility-Adjusted Position Sizing (VAPS) with Structural Hedge
-Custom manual indicators (no pandas-ta dependency)
+Custom manual indicators (no pandas-ta dependency), from prototype.indicator_lib_v1
 """
 
+from functools import lru_cache
+
 import pandas as pd
-import numpy as np
 
-def calculate_model_e_indicators(df_1min):
-    """
-    Model E Indicators (Manual Implementation - No pandas-ta required)
-    """
-    if df_1min.empty:
-        return pd.DataFrame()
+from prototype.indicator_lib_v1 import atr_sma, ema, rsi_sma, supertrend_simple, true_range
+from prototype.rules_v1 import RuleSet
 
-    # 1. Resample to 1 Hour
+# Default Model E thresholds (sweepable via keyword args)
+RSI_LEN = 19
+EMA_LEN = 20
+ATR_LEN = 14
+ST_MULT = 1.1
+RSI_MAX = 65.0
+VIX_BOUNDS = (14, 16, 18)  # gear 3 below 14 | gear 2 below 16 | no trade up to 18 | gear 1 above
+EQUITY_PER_GEAR = 625000
+
+def resample_1h(df_1min):
+    """1-minute OHLC -> clock-hour bars (what the MTF engine's "1h" timeframe maintains incrementally)."""
     df_1min['time'] = pd.to_datetime(df_1min['time'])
-    df_1h = df_1min.resample('1H', on='time').agg({
+    return df_1min.resample('1H', on='time').agg({
         'open': 'first', 
         'high': 'max', 
         'low': 'min', 
         'close': 'last'
     }).dropna().copy()
 
-    # 2. RSI (19)
-    delta = df_1h['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=19).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=19).mean()
-    rs = gain / loss
-    df_1h['rsi'] = 100 - (100 / (1 + rs))
+def calculate_model_e_indicators(df_1min, rsi_len=RSI_LEN, ema_len=EMA_LEN, atr_len=ATR_LEN, st_mult=ST_MULT):
+    """
+    Model E Indicators (Manual Implementation - No pandas-ta required)
+    """
+    if df_1min.empty:
+        return pd.DataFrame()
 
-    # 3. EMA (20)
-    df_1h['ema20'] = df_1h['close'].ewm(span=20, adjust=False).mean()
+    # 1. Resample to 1 Hour
+    return calculate_model_e_indicators_1h(resample_1h(df_1min), rsi_len, ema_len, atr_len, st_mult)
 
-    # 4. ATR (14) for SuperTrend
-    high_low = df_1h['high'] - df_1h['low']
-    high_cp = np.abs(df_1h['high'] - df_1h['close'].shift())
-    low_cp = np.abs(df_1h['low'] - df_1h['close'].shift())
-    df_1h['tr'] = pd.concat([high_low, high_cp, low_cp], axis=1).max(axis=1)
-    df_1h['atr'] = df_1h['tr'].rolling(window=14).mean()
+def calculate_model_e_indicators_1h(df_1h, rsi_len=RSI_LEN, ema_len=EMA_LEN, atr_len=ATR_LEN, st_mult=ST_MULT):
+    """Model E indicators on ready-made 1H bars (columns open/high/low/close; 'time' column or index)."""
+    if df_1h.empty:
+        return pd.DataFrame()
+    if 'time' in df_1h.columns:
+        df_1h = df_1h.set_index('time')[['open', 'high', 'low', 'close']].copy()
 
-    # 5. SuperTrend (21, 1.1)
-    multiplier = 1.1
-    df_1h['upperband'] = ((df_1h['high'] + df_1h['low']) / 2) + (multiplier * df_1h['atr'])
-    df_1h['lowerband'] = ((df_1h['high'] + df_1h['low']) / 2) - (multiplier * df_1h['atr'])
+    # 2. RSI (19), 3. EMA (20), 4. ATR (14), 5. SuperTrend (21, 1.1): Model E definitions, NumPy batch path
+    high, low, close = df_1h['high'].values, df_1h['low'].values, df_1h['close'].values
+    df_1h['rsi'] = rsi_sma(close, rsi_len)
+    df_1h['ema20'] = ema(close, ema_len)
+    df_1h['tr'] = true_range(high, low, close)
+    df_1h['atr'] = atr_sma(high, low, close, atr_len)
+    st_direction, st_line, upperband, lowerband = supertrend_simple(high, low, close, df_1h['atr'].values, st_mult)
+    df_1h['upperband'] = upperband
+    df_1h['lowerband'] = lowerband
     
     # Simple Trend Logic
-    df_1h['st_direction'] = np.where(df_1h['close'] > df_1h['upperband'].shift(), 1, -1)
-    df_1h['st_line'] = np.where(df_1h['st_direction'] == 1, df_1h['lowerband'], df_1h['upperband'])
+    df_1h['st_direction'] = st_direction
+    df_1h['st_line'] = st_line
 
     return df_1h
 
-def get_vaps_lots(current_vix, net_equity):
+# Entry conditions on the signal bar (last row of the indicator frame); the live
+# scanner and the backtest evaluate the same compiled rules (prototype.rules_v1)
+MODEL_E_ENTRY_RULES = {
+    'trend_flip': "st_direction == 1 and st_direction[1] == -1",
+    'rsi_filter': "rsi < rsi_max",
+    'price_action': "close > st_line and close > ema20",
+}
+
+@lru_cache(maxsize=32)
+def model_e_entry_rules(rsi_max=RSI_MAX):
+    """Compiled Model E entry RuleSet (.last(df_1h) live, .mask(columns) over history)."""
+    return RuleSet(MODEL_E_ENTRY_RULES, params={'rsi_max': float(rsi_max)})
+
+def get_vaps_lots(current_vix, net_equity, bounds=VIX_BOUNDS, equity_per_gear=EQUITY_PER_GEAR):
     """Gear calculation from VIX"""
-    if current_vix < 14: 
-        gear = 3
-    elif 14 <= current_vix < 16: 
-        gear = 2
-    elif 16 <= current_vix <= 18: 
-        gear = 0
-    else: 
-        gear = 1
-    
+    gear = get_gear_from_vix(current_vix, bounds)
     if gear == 0: 
         return 0
-    return round((net_equity / 625000) * gear)
+    return round((net_equity / equity_per_gear) * gear)
 
-def get_gear_from_vix(current_vix):
+def get_gear_from_vix(current_vix, bounds=VIX_BOUNDS):
     """
     Get gear number from VIX value
     
     Returns:
         gear: 0 (No Trade), 1 (Low), 2 (Medium), 3 (High)
     """
-    if current_vix < 14:
+    low, mid, high = bounds
+    if current_vix < low:
         return 3
-    elif 14 <= current_vix < 16:
+    elif low <= current_vix < mid:
         return 2
-    elif 16 <= current_vix <= 18:
+    elif mid <= current_vix <= high:
         return 0  # No Trade
-    elif current_vix > 18:
+    elif current_vix > high:
         return 1
     return 0
 
@@ -0,0 +1,216 @@
+"""
+ADX V1
+Wilder ADX / +DI / -DI over high/low/close, in two forms with identical
+results:
+
+    dmi(high, low, close, 14)      batch: vectorized +DM/-DM/TR, one smoothing pass
+    ADX(14).update(h, l, c)        incremental: O(1) per closed bar
+
+SeriesADX serves last_adx() for a candle series re-fetched every poll: bars
+are fed to one ADX once, so a poll costs the new bars plus a peek at the
+newest (still-forming) candle instead of a full dmi() pass.
+
+Wilder's method: +DM/-DM/TR smoothed with (s * (n-1) + x) / n seeded by the
+mean of the first n bars; DI = 100 * sDM / sTR; DX = 100 * |+DI - -DI| /
+(+DI + -DI); ADX = Wilder-smoothed DX seeded by the mean of the first n DX.
+DI is defined from bar n, ADX from bar 2n-1 (0-based); earlier values are NaN.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+NAN = float("nan")
+
+
+def _as_f8(x) -> np.ndarray:
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def directional_movement(high, low, close) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(+DM, -DM, TR) per bar; bar 0 has no previous bar and is NaN."""
+    h, l, c = _as_f8(high), _as_f8(low), _as_f8(close)
+    n = len(c)
+    pdm, mdm, tr = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    if n > 1:
+        up = h[1:] - h[:-1]
+        down = l[:-1] - l[1:]
+        pdm[1:] = np.where((up > down) & (up > 0.0), up, 0.0)
+        mdm[1:] = np.where((down > up) & (down > 0.0), down, 0.0)
+        tr[1:] = np.maximum(h[1:] - l[1:], np.maximum(np.abs(h[1:] - c[:-1]), np.abs(l[1:] - c[:-1])))
+    return pdm, mdm, tr
+
+
+def _wilder(x: list, p: int) -> np.ndarray:
+    """Wilder average of x[1:], seeded by the mean of x[1..p]; value i defined from i = p."""
+    out = np.full(len(x), np.nan)
+    s = 0.0
+    for i in range(1, p + 1):
+        s += x[i]
+    s = s / p
+    w = p - 1
+    vals = [s]
+    append = vals.append
+    for v in x[p + 1:]:
+        s = (s * w + v) / p
+        append(s)
+    out[p:] = vals
+    return out
+
+
+def dmi(high, low, close, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Batch (adx, plus_di, minus_di) arrays, same length as close."""
+    pdm, mdm, tr = directional_movement(high, low, close)
+    n, p = len(tr), int(period)
+    adx = np.full(n, np.nan)
+    if p <= 0 or n <= p:
+        return adx, adx.copy(), adx.copy()
+
+    # scalar recurrences (same float ops as ADX.update); DI/DX are elementwise
+    s_p, s_m, s_t = _wilder(pdm.tolist(), p), _wilder(mdm.tolist(), p), _wilder(tr.tolist(), p)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pdi = np.where(s_t > 0.0, 100.0 * s_p / s_t, 0.0)
+        mdi = np.where(s_t > 0.0, 100.0 * s_m / s_t, 0.0)
+        d = pdi + mdi
+        dx = np.where(d > 0.0, 100.0 * np.abs(pdi - mdi) / d, 0.0)
+    pdi[:p] = mdi[:p] = np.nan
+    if n >= 2 * p:
+        dxl = dx[p:].tolist()
+        a = 0.0
+        for v in dxl[:p]:
+            a += v
+        a = a / p
+        w = p - 1
+        vals = [a]
+        append = vals.append
+        for v in dxl[p:]:
+            a = (a * w + v) / p
+            append(a)
+        adx[2 * p - 1:] = vals
+    return adx, pdi, mdi
+
+
+def last_adx(high, low, close, period: int = 14) -> Tuple[float, float, float]:
+    """Latest (adx, plus_di, minus_di); 0.0 where not yet defined (IndicatorPack never holds None/NaN)."""
+    adx, pdi, mdi = dmi(high, low, close, period)
+    if not len(adx):
+        return 0.0, 0.0, 0.0
+    return tuple(0.0 if math.isnan(v) else float(v) for v in (adx[-1], pdi[-1], mdi[-1]))
+
+
+class ADX:
+    """
+    Incremental Wilder ADX/DMI: feed closed bars one at a time with update().
+    Same recurrence and float operations as dmi(), so values match the batch path exactly.
+    """
+
+    __slots__ = ("period", "bars", "adx", "plus_di", "minus_di",
+                 "_ph", "_pl", "_pc", "_sp", "_sm", "_st", "_dx_sum")
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self.bars = 0
+        self.adx = self.plus_di = self.minus_di = NAN
+        self._ph = self._pl = self._pc = 0.0
+        self._sp = self._sm = self._st = 0.0
+        self._dx_sum = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.adx)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """Add one closed bar; returns (adx, plus_di, minus_di), NaN until defined."""
+        high, low, close = float(high), float(low), float(close)
+        i, p = self.bars, self.period
+        self.bars += 1
+        if i > 0:
+            up = high - self._ph
+            down = self._pl - low
+            pdm = up if (up > down and up > 0.0) else 0.0
+            mdm = down if (down > up and down > 0.0) else 0.0
+            tr = max(high - low, max(abs(high - self._pc), abs(low - self._pc)))
+            w = p - 1
+            if i < p:
+                self._sp += pdm
+                self._sm += mdm
+                self._st += tr
+            else:
+                if i == p:
+                    self._sp = (self._sp + pdm) / p
+                    self._sm = (self._sm + mdm) / p
+                    self._st = (self._st + tr) / p
+                else:
+                    self._sp = (self._sp * w + pdm) / p
+                    self._sm = (self._sm * w + mdm) / p
+                    self._st = (self._st * w + tr) / p
+                st = self._st
+                pdi = 100.0 * self._sp / st if st > 0.0 else 0.0
+                mdi = 100.0 * self._sm / st if st > 0.0 else 0.0
+                d = pdi + mdi
+                dx = 100.0 * abs(pdi - mdi) / d if d > 0.0 else 0.0
+                self.plus_di, self.minus_di = pdi, mdi
+                k = i - p
+                if k < p:
+                    self._dx_sum += dx
+                    if k == w:
+                        self.adx = self._dx_sum / p
+                else:
+                    self.adx = (self.adx * w + dx) / p
+        self._ph, self._pl, self._pc = high, low, close
+        return self.adx, self.plus_di, self.minus_di
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """update() without keeping the bar (e.g. a candle that is still forming)."""
+        saved = [getattr(self, k) for k in self.__slots__]
+        try:
+            return self.update(high, low, close)
+        finally:
+            for k, v in zip(self.__slots__, saved):
+                setattr(self, k, v)
+
+    def warm(self, high, low, close) -> "ADX":
+        """Replay a history (oldest -> newest) through update()."""
+        for h, l, c in zip(_as_f8(high).tolist(), _as_f8(low).tolist(), _as_f8(close).tolist()):
+            self.update(h, l, c)
+        return self
+
+
+class SeriesADX:
+    """
+    last_adx() over the same series polled again and again (oldest -> newest,
+    newest possibly still forming). Every bar but the newest is fed to an ADX
+    once; a call adds the bars past the last one fed and peeks the newest. A
+    series that no longer starts at the same bar, or whose last fed bar
+    changed, is replayed from scratch: values equal last_adx() on the same bars.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._lock = threading.Lock()
+        self._adx = ADX(self.period)
+        self._first: Optional[Tuple[int, float]] = None
+        self._last: Optional[Tuple[int, float, float, float]] = None
+
+    def last(self, ssboe, high, low, close) -> Tuple[float, float, float]:
+        n = len(close)
+        if n == 0:
+            return 0.0, 0.0, 0.0
+        with self._lock:
+            a = self._adx
+            k = a.bars
+            if not (0 < k < n and self._first == (int(ssboe[0]), float(close[0]))
+                    and self._last == (int(ssboe[k - 1]), float(high[k - 1]), float(low[k - 1]), float(close[k - 1]))):
+                a = self._adx = ADX(self.period)
+                k = 0
+                self._first = (int(ssboe[0]), float(close[0]))
+            if k < n - 1:
+                a.warm(high[k:n - 1], low[k:n - 1], close[k:n - 1])
+                j = n - 2
+                self._last = (int(ssboe[j]), float(high[j]), float(low[j]), float(close[j]))
+            out = a.peek(high[n - 1], low[n - 1], close[n - 1])
+        return tuple(0.0 if math.isnan(v) else float(v) for v in out)
@@ -0,0 +1,86 @@
+"""
+BAR CLOCK V1
+Session-aligned bar boundaries (NSE 09:15-15:30, Mon-Fri) and a bar-close
+event source for the runners:
+
+    bars = BarClock("1h_915")            # 10:15, 11:15, ... 15:15, 15:30
+    t = bars.wait()                      # one sleep until close + settle_sec; returns the close
+    engine.close_due(token, bars.horizon(t))
+
+    bars.next_close(now)                 # next bar close after now (epoch)
+    bars.next_open(now)                  # next bar open after now (Candle N+1 open)
+
+Boundaries of a day are the session open, every bucket edge of the
+timeframe inside the session (mtf_engine_v1.TIMEFRAMES, same anchors as the
+MTF engine) and the session close; the last bar of the day is cut at 15:30.
+Exchange holidays are not modelled: the runner wakes, finds no new bar and
+sleeps again.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from prototype import clock, metrics
+from prototype.clock import IST_OFFSET_SEC
+from prototype.mtf_engine_v1 import TIMEFRAMES
+
+SESSION_OPEN_SEC = 9 * 3600 + 15 * 60      # local seconds after midnight
+SESSION_CLOSE_SEC = 15 * 3600 + 30 * 60
+SETTLE_SEC = 1.0                           # after the close: broker's last 1m bar is published
+DAY = 86400
+
+
+def session_boundaries(tf: str) -> List[int]:
+    """Bar edges of one session in local seconds after midnight: [open, ..., close]."""
+    t = TIMEFRAMES[tf]
+    step, anchor = t.minutes * 60, t.offset_min * 60
+    edges = [SESSION_OPEN_SEC]
+    e = SESSION_OPEN_SEC - (SESSION_OPEN_SEC - anchor) % step + step
+    while e < SESSION_CLOSE_SEC:
+        edges.append(e)
+        e += step
+    edges.append(SESSION_CLOSE_SEC)
+    return edges
+
+
+class BarClock:
+    def __init__(self, tf: str = "1h_915", tz_offset_sec: int = IST_OFFSET_SEC, settle_sec: float = SETTLE_SEC):
+        self.tf = tf
+        self.tz = int(tz_offset_sec)
+        self.settle_sec = float(settle_sec)
+        self.edges = session_boundaries(tf)
+
+    def _next(self, now: float, edges: List[int]) -> float:
+        local = now + self.tz
+        day = local - local % DAY
+        for d in range(8):
+            start = day + d * DAY
+            if (int(start // DAY) + 3) % 7 >= 5:          # 1970-01-01 was a Thursday; skip Sat / Sun
+                continue
+            for e in edges:
+                t = start + e - self.tz
+                if t > now:
+                    return t
+        raise ValueError(f"no session boundary after {now}")
+
+    def next_close(self, now: Optional[float] = None) -> float:
+        return self._next(clock.time() if now is None else now, self.edges[1:])
+
+    def next_open(self, now: Optional[float] = None) -> float:
+        return self._next(clock.time() if now is None else now, self.edges[:-1])
+
+    def is_session_close(self, t: float) -> bool:
+        return (t + self.tz) % DAY == SESSION_CLOSE_SEC
+
+    def horizon(self, close: float) -> float:
+        """`now` for MultiTimeframeEngine.close_due at this close: past the session close nothing
+        else can arrive before the next open, so every forming bar is final."""
+        return self.next_open(close) if self.is_session_close(close) else close
+
+    def wait(self, now: Optional[float] = None) -> float:
+        """Sleep (once) until the next close + settle_sec; returns that close."""
+        close = self.next_close(now)
+        clock.sleep(close + self.settle_sec - clock.time())
+        metrics.observe("bar_close_wake_lag_seconds", max(0.0, clock.time() - close - self.settle_sec), tf=self.tf)
+        return close
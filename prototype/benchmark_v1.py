@@ -0,0 +1,384 @@
+"""
+BENCHMARK V1
+Performance baselines + regression gates for the hot paths:
+
+  model_e_indicators   model_e_logic.calculate_model_e_indicators (1m -> 1h)
+  supertrend           prototype.indicator_lib_v1.supertrend
+  compute_indicators   prototype.indicators_v2.compute_indicators (CandlePack)
+  papertrade_step      PaperTradeEngineV2.step
+  get_status           api_server.get_status_strict
+  jsonl_event_log      prototype.events.event_log
+  jsonl_event_logger   prototype.observability.EventLogger.log
+  jsonl_issue_logger   prototype.issue_logger.IssueLogger.track_runtime_error
+
+Each case runs on fixed synthetic datasets of increasing size. Timings are
+stored both in seconds and normalised by a pure-Python calibration loop,
+so a baseline recorded on one machine is still meaningful on another.
+
+  python -m prototype.benchmark_v1                 # compare vs baseline, exit 1 on regression
+  python -m prototype.benchmark_v1 --update        # (re)write the baseline
+  python -m prototype.benchmark_v1 --only supertrend,get_status
+
+Env: BENCH_TOLERANCE (default 0.5 => fail when >50% slower than baseline)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASELINE_PATH = os.path.join("prototype", "benchmark_baseline_v1.json")
+RESULTS_PATH = os.path.join("prototype", "outputs", "benchmark_results_v1.json")
+DEFAULT_TOLERANCE = 0.5
+MIN_REPEAT_SEC = 0.05
+REPEATS = 5
+CONFIRM_ATTEMPTS = 2
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    case: str
+    size: int
+    sec_per_call: float
+    norm: float          # sec_per_call / calibration unit
+    calls: int
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    baseline_norm: float
+    current_norm: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_norm / self.baseline_norm if self.baseline_norm else float("inf")
+
+
+# =========================
+# Timing
+# =========================
+
+def calibrate() -> float:
+    """Seconds for a fixed pure-Python workload (best of 5)."""
+    def work() -> float:
+        acc = 0.0
+        for i in range(200000):
+            acc += (i % 7) * 0.5
+        return acc
+
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def time_call(fn: Callable[[], Any], repeats: int = REPEATS, min_sec: float = MIN_REPEAT_SEC) -> Tuple[float, int]:
+    """Best-of-N seconds per call, auto-scaling the inner loop (timeit style)."""
+    fn()  # warm-up
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_sec or number >= 1 << 20:
+            break
+        number *= 2 if dt <= 0 else max(2, min(10, int(min_sec / dt) + 1))
+    best = dt / number
+    for _ in range(repeats - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best, number
+
+
+# =========================
+# Cases: (size) -> zero-arg callable
+# =========================
+
+def _case_model_e_indicators(size: int) -> Callable[[], Any]:
+    import pandas as pd
+
+    from model_e_logic import calculate_model_e_indicators
+    from prototype.synthetic_data_v1 import SESSION_MINUTES, synthetic_1m_session
+
+    d = synthetic_1m_session(days=max(1, size // SESSION_MINUTES), seed=11)
+    df = pd.DataFrame({"time": d["times"], "open": d["open"], "high": d["high"],
+                       "low": d["low"], "close": d["close"]})
+    return lambda: calculate_model_e_indicators(df)
+
+
+def _case_supertrend(size: int) -> Callable[[], Any]:
+    from prototype.indicator_lib_v1 import supertrend
+    from prototype.synthetic_data_v1 import synthetic_1m_session
+
+    d = synthetic_1m_session(days=size // 375 + 1, seed=12)
+    high, low, close = d["high"][:size], d["low"][:size], d["close"][:size]
+    return lambda: supertrend(high, low, close, 10, 3.0)
+
+
+def _case_compute_indicators(size: int) -> Callable[[], Any]:
+    from prototype.contract_guard import ensure_candlepack
+    from prototype.indicators_v2 import compute_indicators
+    from prototype.synthetic_data_v1 import synthetic_tpseries_rows
+
+    pack = ensure_candlepack(synthetic_tpseries_rows(size, seed=13), meta={"bench": True})
+    return lambda: compute_indicators(pack)
+
+
+def _case_papertrade_step(size: int) -> Callable[[], Any]:
+    from prototype.papertrade_engine_v2 import PaperTradeEngineV2
+
+    decisions = ("CALL", "CALL", "HOLD", "PUT", "PUT", "HOLD")
+    signals = [{"decision": decisions[i % len(decisions)], "close": 23000.0 + i, "reason": "bench",
+                "meta": {}, "ts": "2026-01-23T09:15:00+00:00"} for i in range(size)]
+
+    def run() -> None:
+        eng = PaperTradeEngineV2()
+        for s in signals:
+            eng.step(s)
+    return run
+
+
+def _case_get_status(size: int) -> Callable[[], Any]:
+    from fastapi import Response
+
+    import api_server
+
+    td = getattr(api_server.bot, "trade_data", None)
+    if td is not None:
+        td.update({"status": "Running", "ltp": 23080.0, "lastClose": 23010.0, "lastCloseTime": "10:15:00",
+                   "active": True, "entry_price": 23000.0, "model_e_lots": 2, "current_vix": 14.2,
+                   "current_gear": 2, "gear_status": "Gear 2", "vix_ltp": 14.2, "vix_close": 14.0,
+                   "spot_ltp": 23010.0, "spot_close": 22950.0, "fut_curr_ltp": 23080.0,
+                   "fut_curr_close": 23010.0, "fut_next_ltp": 23190.0, "fut_next_close": 23120.0})
+
+    def run() -> None:
+        for _ in range(size):
+            api_server.get_status_strict(Response())
+    return run
+
+
+class _TmpOutputs:
+    """Redirect a logger's output file into a temp dir for the benchmark."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="bench_")
+        atexit.register(shutil.rmtree, self.dir, True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def clear(self) -> None:
+        """Start every timed run from empty files (append cost depends on fs state)."""
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+
+
+def _case_jsonl_event_log(size: int) -> Callable[[], Any]:
+    import prototype.events as events
+
+    tmp = _TmpOutputs()
+    data = {"decision": "CALL", "close": 23001.5, "action": "ENTER", "state": {"position": "CALL"}}
+
+    def run() -> None:
+        tmp.clear()
+        old = events.OUTPUT_DIR, events.EVENTS_FILE
+        events.OUTPUT_DIR, events.EVENTS_FILE = tmp.dir, tmp.path("events.jsonl")
+        try:
+            for _ in range(size):
+                events.event_log("PAPERTRADE_STEP", data)
+        finally:
+            events.OUTPUT_DIR, events.EVENTS_FILE = old
+    return run
+
+
+def _case_jsonl_event_logger(size: int) -> Callable[[], Any]:
+    from prototype.observability import EventLogger
+
+    tmp = _TmpOutputs()
+    log = EventLogger(tmp.path("obs.jsonl"))
+    data = {"route": "GetQuotes", "ms": 12, "ok": True}
+
+    def run() -> None:
+        tmp.clear()
+        for _ in range(size):
+            log.log("BROKER_CALL", "abcd1234abcd1234", data)
+    return run
+
+
+def _case_jsonl_issue_logger(size: int) -> Callable[[], Any]:
+    from prototype.issue_logger import IssueLogger
+
+    tmp = _TmpOutputs()
+    issues = IssueLogger(out_dir=tmp.dir)
+    details = {"exc": "ConnectionError('timeout')", "route": "TPSeries"}
+
+    def run() -> None:
+        tmp.clear()
+        for i in range(size):
+            issues.track_runtime_error(f"E_{i % 4}", "Runtime error", details)
+    return run
+
+
+CASES: Dict[str, Tuple[Callable[[int], Callable[[], Any]], Tuple[int, ...]]] = {
+    "model_e_indicators": (_case_model_e_indicators, (1875, 18750, 93750)),
+    "supertrend": (_case_supertrend, (500, 2000, 10000)),
+    "compute_indicators": (_case_compute_indicators, (100, 1000, 5000)),
+    "papertrade_step": (_case_papertrade_step, (100, 1000, 10000)),
+    "get_status": (_case_get_status, (1, 100)),
+    "jsonl_event_log": (_case_jsonl_event_log, (10, 100, 1000)),
+    "jsonl_event_logger": (_case_jsonl_event_logger, (10, 100, 1000)),
+    "jsonl_issue_logger": (_case_jsonl_issue_logger, (10, 100, 1000)),
+}
+
+
+# file-system bound cases are noisier than CPU bound ones
+TOLERANCE_SCALE: Dict[str, float] = {
+    "jsonl_event_log": 2.0,
+    "jsonl_event_logger": 2.0,
+    "jsonl_issue_logger": 2.0,
+}
+
+
+def result_key(case: str, size: int) -> str:
+    return f"{case}[{size}]"
+
+
+# =========================
+# Run / compare
+# =========================
+
+def run_benchmarks(only: Optional[List[str]] = None, unit: Optional[float] = None,
+                   sizes: Optional[Dict[str, Tuple[int, ...]]] = None,
+                   min_sec: float = MIN_REPEAT_SEC) -> Tuple[List[BenchResult], float]:
+    unit = unit or calibrate()
+    out: List[BenchResult] = []
+    for name, (_, default_sizes) in CASES.items():
+        if only and name not in only:
+            continue
+        for size in (sizes or {}).get(name, default_sizes):
+            out.append(bench_one(name, size, unit, min_sec))
+    return out, unit
+
+
+def bench_one(case: str, size: int, unit: float, min_sec: float = MIN_REPEAT_SEC) -> BenchResult:
+    sec, calls = time_call(CASES[case][0](size), min_sec=min_sec)
+    return BenchResult(case=case, size=size, sec_per_call=sec, norm=sec / unit, calls=calls)
+
+
+def confirm(results: List[BenchResult], regressions: List[Regression], unit: float,
+            attempts: int = CONFIRM_ATTEMPTS) -> List[BenchResult]:
+    """Re-time regressed cases and keep the best run, so one noisy sample cannot fail the gate."""
+    flagged = {g.key for g in regressions}
+    out: List[BenchResult] = []
+    for r in results:
+        if result_key(r.case, r.size) in flagged:
+            for _ in range(attempts):
+                again = bench_one(r.case, r.size, unit)
+                if again.norm < r.norm:
+                    r = again
+        out.append(r)
+    return out
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> Tuple[List[Regression], List[str]]:
+    """Regressions (norm > baseline * (1 + tolerance)) and keys missing from the baseline."""
+    base = baseline.get("results", {})
+    regressions: List[Regression] = []
+    missing: List[str] = []
+    for r in results:
+        key = result_key(r.case, r.size)
+        b = base.get(key)
+        if b is None:
+            missing.append(key)
+            continue
+        if r.norm > float(b["norm"]) * (1.0 + tolerance * TOLERANCE_SCALE.get(r.case, 1.0)):
+            regressions.append(Regression(key, float(b["norm"]), r.norm))
+    return regressions, missing
+
+
+def to_baseline(results: List[BenchResult], unit: float) -> Dict[str, Any]:
+    return {
+        "version": 1,
+        "calibration_sec": unit,
+        "python": sys.version.split()[0],
+        "results": {result_key(r.case, r.size): asdict(r) for r in results},
+    }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, obj: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    update = "--update" in args
+    only = None
+    if "--only" in args:
+        only = args[args.index("--only") + 1].split(",")
+    tolerance = float(os.getenv("BENCH_TOLERANCE", DEFAULT_TOLERANCE))
+
+    results, unit = run_benchmarks(only=only)
+    baseline = load_baseline()
+    regressions, missing = compare(results, baseline, tolerance)
+    if regressions and not update:
+        results = confirm(results, regressions, unit)
+        regressions, missing = compare(results, baseline, tolerance)
+
+    print(f"calibration unit: {unit * 1000:.2f} ms")
+    base = baseline.get("results", {})
+    for r in results:
+        key = result_key(r.case, r.size)
+        b = base.get(key)
+        delta = f"{(r.norm / b['norm'] - 1) * 100:+6.1f}%" if b else "   new"
+        print(f"{key:32s} {r.sec_per_call * 1e3:10.3f} ms  norm={r.norm:9.3f}  {delta}")
+
+    current = to_baseline(results, unit)
+    write_json(RESULTS_PATH, current)
+
+    if update:
+        if only and baseline:
+            merged = dict(baseline)
+            merged["results"] = dict(base, **current["results"])
+            merged["calibration_sec"] = unit
+            current = merged
+        write_json(BASELINE_PATH, current)
+        print(f"✅ Baseline written: {BASELINE_PATH}")
+        return
+
+    if not baseline:
+        raise SystemExit(f"FAIL: no baseline at {BASELINE_PATH} (run with --update)")
+    if missing:
+        print("⚠️ not in baseline:", ", ".join(missing))
+    if regressions:
+        for g in regressions:
+            print(f"❌ REGRESSION {g.key}: {g.ratio:.2f}x baseline")
+        raise SystemExit(1)
+    print(f"✅ No regressions (tolerance {tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+CIRCUIT BREAKER V1
+Per-endpoint circuit breakers for broker routes (closed / open / half-open)
+with jittered exponential backoff, so an outage is met with fast local
+failures instead of retry storms, and recovery is picked up by the first
+successful half-open probe.
+
+    closed    -> calls pass; failure_threshold consecutive failures -> open
+    open      -> calls fail fast with BreakerOpen until retry_at
+    half-open -> one probe call passes: success -> closed (full speed),
+                 failure -> open again with the backoff doubled
+
+Failures are transport errors and HTTP 5xx; broker-level {"stat": "Not_Ok"}
+replies are answers, not outages, and client-side refusals (RateLimited)
+are neither. Time comes from prototype.clock so replays/backtests can
+drive it.
+
+    from prototype import circuit_breaker_v1 as breakers
+    requests = breakers.BreakerHTTP(requests)     # bot.py direct HTTP
+    breakers.install_noren()                      # NorenApi (+ adapters)
+    breakers.snapshot()                           # -> /get_status
+
+Protective exits must not fail fast: calls made inside `with breakers.bypass():`
+go to the broker even while their route is open (the outcome still feeds the
+breaker, so a successful exit closes it).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from prototype import clock, metrics
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_CODE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class BreakerOpen(Exception):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"circuit open for {name}; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    failure_threshold: int = 3
+    base_backoff_sec: float = 1.0
+    max_backoff_sec: float = 30.0
+    jitter: float = 0.5            # fraction of the delay randomised away (0 = none)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5,
+                  rng: Callable[[], float] = random.random) -> float:
+    """Jittered exponential backoff: min(cap, base * 2^(attempt-1)) scaled into [1-jitter, 1]."""
+    d = min(cap, base * (2 ** max(0, attempt - 1)))
+    return d * (1.0 - jitter * rng())
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, cfg: Optional[BreakerConfig] = None, rng: Callable[[], float] = random.random):
+        self.name = name
+        self.cfg = cfg or BreakerConfig()
+        self._rng = rng
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0          # consecutive
+        self.opens = 0             # consecutive trips without recovery
+        self.retry_at = 0.0
+        self.probing = False
+        self.last_error = ""
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and clock.monotonic() >= self.retry_at:
+                self._set(HALF_OPEN)
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self.retry_at - clock.monotonic())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opens = 0
+            self.probing = False
+            self.last_error = ""
+            if self.state != CLOSED:
+                self._set(CLOSED)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without a verdict."""
+        with self._lock:
+            self.probing = False
+
+    def record_failure(self, error: str = "") -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = error[:200]
+            if self.state == HALF_OPEN or self.failures >= self.cfg.failure_threshold:
+                self.opens += 1
+                self.probing = False
+                c = self.cfg
+                self.retry_at = clock.monotonic() + backoff_delay(
+                    self.opens, c.base_backoff_sec, c.max_backoff_sec, c.jitter, self._rng)
+                self._set(OPEN)
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if not self.allow():
+            raise BreakerOpen(self.name, self.retry_in())
+        try:
+            res = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        self.record_success()
+        return res
+
+    def _set(self, state: str) -> None:
+        if state != self.state:
+            metrics.inc("circuit_transitions_total", route=self.name, to=state)
+        self.state = state
+        metrics.set_gauge("circuit_state", _STATE_CODE[state], route=self.name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opens": self.opens,
+            "retry_in": round(self.retry_in(), 2),
+            "last_error": self.last_error,
+        }
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_REG_LOCK = threading.Lock()
+DEFAULT_CONFIG = BreakerConfig()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    b = _BREAKERS.get(name)
+    if b is None:
+        with _REG_LOCK:
+            b = _BREAKERS.setdefault(name, CircuitBreaker(name, DEFAULT_CONFIG))
+    return b
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return {name: b.snapshot() for name, b in sorted(_BREAKERS.items())}
+
+
+def next_retry_in() -> float:
+    """Shortest wait until any open breaker admits a probe (0 if none open)."""
+    waits = [b.retry_in() for b in list(_BREAKERS.values()) if b.state != CLOSED]
+    return min(waits) if waits else 0.0
+
+
+def reset() -> None:
+    with _REG_LOCK:
+        _BREAKERS.clear()
+
+
+_LOCAL = threading.local()
+
+
+@contextlib.contextmanager
+def bypass() -> Iterator[None]:
+    """Calls from this thread inside the block are never refused by an open breaker."""
+    prev = getattr(_LOCAL, "bypass", False)
+    _LOCAL.bypass = True
+    try:
+        yield
+    finally:
+        _LOCAL.bypass = prev
+
+
+# =========================
+# HTTP integration
+# =========================
+
+class BreakerHTTP:
+    """Wraps a requests-like module: post() is guarded by the URL route's breaker."""
+
+    def __init__(self, real: Any):
+        self._real = real
+
+    def post(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        b = breaker(str(url).rstrip("/").rsplit("/", 1)[-1])
+        allowed = b.allow()
+        if not allowed:
+            if not getattr(_LOCAL, "bypass", False):
+                raise BreakerOpen(b.name, b.retry_in())
+            metrics.inc("circuit_bypass_total", route=b.name)
+        try:
+            res = self._real.post(url, *args, **kwargs)
+        except OSError as e:  # transport errors (requests exceptions are OSErrors)
+            b.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except Exception:     # client-side (e.g. RateLimited): not an endpoint failure
+            if allowed:
+                b.release()
+            raise
+        code = int(getattr(res, "status_code", 200) or 200)
+        if code >= 500:
+            b.record_failure(f"HTTP {code}")
+        else:
+            b.record_success()
+        return res
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+def install_noren() -> None:
+    """Guard NorenRestApiPy round trips (its module-level `requests`). Idempotent."""
+    import NorenRestApiPy.NorenApi as noren_mod
+
+    if not metrics.is_wrapped(noren_mod.requests, BreakerHTTP):
+        noren_mod.requests = BreakerHTTP(noren_mod.requests)
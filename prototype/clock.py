@@ -0,0 +1,209 @@
+"""
+CLOCK
+Single injectable time source for bot.py and the prototype engines.
+
+- RealClock:      wall clock (default)
+- SimulatedClock: virtual epoch time, sleep() advances it instantly
+                  (replay / backtests / soak tests run faster than real time)
+- FrozenClock:    fixed instant, sleep() is a no-op (deterministic tests)
+
+Usage:
+    from prototype import clock
+    clock.now()            # naive local datetime   (was datetime.now())
+    clock.utc_now_iso()    # ...+00:00              (was datetime.now(timezone.utc).isoformat())
+    clock.utc_now_iso_z()  # ...Z                   (was datetime.utcnow().isoformat() + "Z")
+    clock.sleep(3)
+
+    with clock.use_clock(clock.SimulatedClock(start_epoch)):
+        ...
+
+Timestamp strings reuse a per-second cached "YYYY-MM-DDTHH:MM:SS" prefix, so
+hot paths only format the microsecond suffix.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time as _time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional, Tuple
+
+IST_OFFSET_SEC = 19800   # NSE exchange time (UTC+05:30); session math never uses the host zone
+
+
+class Clock(ABC):
+    """Time source interface; a clock missing a method fails at construction."""
+
+    @abstractmethod
+    def time(self) -> float: ...
+
+    @abstractmethod
+    def monotonic(self) -> float: ...
+
+    @abstractmethod
+    def sleep(self, sec: float) -> None: ...
+
+
+class RealClock(Clock):
+    def time(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+    def sleep(self, sec: float) -> None:
+        if sec > 0:
+            _time.sleep(sec)
+
+
+class SimulatedClock(Clock):
+    """
+    Virtual epoch seconds. sleep() advances instantly and then calls
+    on_sleep(clock) (e.g. to stop a loop at the end of a session).
+    real_sleep_scale > 0 also sleeps sec * scale of wall time, which lets
+    other threads run during accelerated soak tests.
+    """
+
+    def __init__(self, start: Optional[float] = None,
+                 on_sleep: Optional[Callable[["SimulatedClock"], None]] = None,
+                 real_sleep_scale: float = 0.0):
+        self._now = float(_time.time() if start is None else start)
+        self.on_sleep = on_sleep
+        self.real_sleep_scale = float(real_sleep_scale)
+        self.sleeps = 0
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def advance(self, sec: float) -> None:
+        self._now += max(0.0, float(sec))
+
+    def set(self, epoch: float) -> None:
+        self._now = float(epoch)
+
+    def sleep(self, sec: float) -> None:
+        self.advance(sec)
+        self.sleeps += 1
+        if self.real_sleep_scale > 0 and sec > 0:
+            _time.sleep(sec * self.real_sleep_scale)
+        if self.on_sleep:
+            self.on_sleep(self)
+
+
+class FrozenClock(SimulatedClock):
+    """Time never moves unless advance()/set() is called explicitly."""
+
+    def sleep(self, sec: float) -> None:
+        self.sleeps += 1
+        if self.on_sleep:
+            self.on_sleep(self)
+
+
+_clock: Clock = RealClock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(c: Clock) -> Clock:
+    """Install a clock, returns the previous one."""
+    global _clock
+    prev = _clock
+    _clock = c
+    return prev
+
+
+@contextlib.contextmanager
+def use_clock(c: Clock) -> Iterator[Clock]:
+    prev = set_clock(c)
+    try:
+        yield c
+    finally:
+        set_clock(prev)
+
+
+# =========================
+# Module-level shortcuts
+# =========================
+
+def time() -> float:
+    return _clock.time()
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def sleep(sec: float) -> None:
+    _clock.sleep(sec)
+
+
+def now_ms() -> int:
+    return int(_clock.time() * 1000)
+
+
+def now(tz=None) -> datetime:
+    """datetime.now(tz) on the current clock."""
+    return datetime.fromtimestamp(_clock.time(), tz)
+
+
+def now_utc() -> datetime:
+    return datetime.fromtimestamp(_clock.time(), timezone.utc)
+
+
+# =========================
+# Cached formatting
+# =========================
+
+_utc_prefix: Tuple[int, str] = (-1, "")
+_local_hms: Tuple[int, str] = (-1, "")
+
+
+def _split(t: float) -> Tuple[int, int]:
+    sec = int(t // 1)
+    us = int(round((t - sec) * 1e6))
+    if us >= 1000000:
+        sec, us = sec + 1, us - 1000000
+    return sec, us
+
+
+def _utc_iso_body(t: float) -> str:
+    global _utc_prefix
+    sec, us = _split(t)
+    cached_sec, prefix = _utc_prefix
+    if cached_sec != sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _utc_prefix = (sec, prefix)
+    # isoformat() drops the fraction when microsecond == 0
+    return f"{prefix}.{us:06d}" if us else prefix
+
+
+def utc_now_iso() -> str:
+    """== datetime.now(timezone.utc).isoformat()"""
+    return _utc_iso_body(_clock.time()) + "+00:00"
+
+
+def utc_now_iso_z() -> str:
+    """== datetime.utcnow().isoformat() + "Z" """
+    return _utc_iso_body(_clock.time()) + "Z"
+
+
+def utc_iso(epoch: float) -> str:
+    """Any epoch -> datetime.fromtimestamp(epoch, timezone.utc).isoformat()"""
+    return _utc_iso_body(epoch) + "+00:00"
+
+
+def local_hms() -> str:
+    """== datetime.now().strftime("%H:%M:%S")"""
+    global _local_hms
+    sec = int(_clock.time() // 1)
+    cached_sec, s = _local_hms
+    if cached_sec != sec:
+        s = datetime.fromtimestamp(sec).strftime("%H:%M:%S")
+        _local_hms = (sec, s)
+    return s
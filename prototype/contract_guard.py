@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, Dict, List
 from prototype.contracts import CandlePack
+from prototype.market_types_v1 import BarBatch
 
 def ensure_candlepack(obj: Any, meta: Dict[str, Any]) -> CandlePack:
     """
@@ -25,7 +26,9 @@ def ensure_candlepack(obj: Any, meta: Dict[str, Any]) -> CandlePack:
         last = rows[0]
         close = float(last.get("intc") or 0.0)
         ssboe = int(last.get("ssboe") or 0)
-        return CandlePack(close=close, last_ssboe=ssboe, rows=rows, meta=meta, raw=raw)
+        # columnar view parsed once here; indicators read it without touching rows
+        return CandlePack(close=close, last_ssboe=ssboe, rows=rows, meta=meta, raw=raw,
+                          bars=BarBatch.from_rows(rows))
 
     # fallback strict contract
-    return CandlePack(close=0.0, last_ssboe=0, rows=[], meta=meta, raw=raw)
\ No newline at end of file
+    return CandlePack(close=0.0, last_ssboe=0, rows=[], meta=meta, raw=raw, bars=BarBatch.empty())
\ No newline at end of file
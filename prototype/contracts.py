@@ -1,6 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from prototype.market_types_v1 import BarBatch
 
 @dataclass(frozen=True)
 class CandlePack:
@@ -10,6 +13,7 @@ class CandlePack:
     - last_ssboe: int
     - rows: list[dict]
     - meta: dict
+    - bars: columnar view of rows (NumPy, oldest -> newest); see columns()
 
     This object MUST be returned by all candle fetch functions.
     """
@@ -18,6 +22,18 @@ class CandlePack:
     rows: List[Dict[str, Any]]
     meta: Dict[str, Any]
     raw: Optional[Any] = None
+    bars: Optional["BarBatch"] = None
+
+    def columns(self) -> "BarBatch":
+        """
+        Parsed, chronological OHLCV arrays. ensure_candlepack builds them once;
+        packs constructed elsewhere parse rows on first use.
+        """
+        if self.bars is None:
+            from prototype.market_types_v1 import BarBatch
+
+            object.__setattr__(self, "bars", BarBatch.from_rows(self.rows))
+        return self.bars
 
     def to_dict(self) -> Dict[str, Any]:
         return {
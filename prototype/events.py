@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+from prototype import clock
+
 OUTPUT_DIR = os.path.join("prototype", "outputs")
 EVENTS_FILE = os.path.join(OUTPUT_DIR, "events.jsonl")
 
@@ -14,7 +15,7 @@ def _ensure_dir() -> None:
 
 
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return clock.utc_now_iso()
 
 
 def event_log(event: str, data: Optional[Dict[str, Any]] = None, trace_id: str = "") -> None:
@@ -4,7 +4,7 @@ Single source of truth for execution decision
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 @dataclass
 class ExecutionIntent:
@@ -19,7 +19,7 @@ def route_execution(
     basis_ok: bool,
     vix_gear: str | None
 ):
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     if not pending_ok:
         return ExecutionIntent("WAIT", None, "PendingEntry not armed", ts)
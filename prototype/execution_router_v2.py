@@ -1,6 +1,6 @@
 ﻿# prototype/execution_router_v2.py
 
-from datetime import datetime
+from prototype import clock
 from prototype.execution_intent_v1 import ExecutionIntent
 from prototype.prev_close_filter_v1 import check_prev_close
 from prototype.spot_fut_basis_v1 import check_basis
@@ -12,7 +12,7 @@ def route_execution(spot_signal, vix, prev_close, spot_price, fut_price):
             intent="WAIT",
             gear=None,
             reason=f"SpotSignal={spot_signal.signal}",
-            ts=datetime.utcnow().isoformat() + "Z"
+            ts=clock.utc_now_iso_z()
         )
 
     prev = check_prev_close(spot_price, prev_close)
@@ -21,7 +21,7 @@ def route_execution(spot_signal, vix, prev_close, spot_price, fut_price):
             intent="WAIT",
             gear=None,
             reason="PrevClose filter blocked",
-            ts=datetime.utcnow().isoformat() + "Z"
+            ts=clock.utc_now_iso_z()
         )
 
     basis = check_basis(spot_price, fut_price)
@@ -30,7 +30,7 @@ def route_execution(spot_signal, vix, prev_close, spot_price, fut_price):
             intent="WAIT",
             gear=None,
             reason="Spot–FUT basis blocked",
-            ts=datetime.utcnow().isoformat() + "Z"
+            ts=clock.utc_now_iso_z()
         )
 
     gear_ctx = select_gear(vix)
@@ -39,5 +39,5 @@ def route_execution(spot_signal, vix, prev_close, spot_price, fut_price):
         intent="EXECUTE",
         gear=gear_ctx.gear,
         reason=f"All guards passed → {gear_ctx.gear}",
-        ts=datetime.utcnow().isoformat() + "Z"
+        ts=clock.utc_now_iso_z()
     )
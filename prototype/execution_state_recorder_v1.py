@@ -1,7 +1,7 @@
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
 from pathlib import Path
 import json
+from prototype import clock
 
 STATE_FILE = Path(__file__).parent / "outputs" / "execution_state.json"
 
@@ -17,7 +17,7 @@ def record_execution_state(status: str, gear: str | None, reason: str) -> Execut
         status=status,
         gear=gear,
         reason=reason,
-        ts=datetime.now(timezone.utc).isoformat()
+        ts=clock.utc_now_iso()
     )
     STATE_FILE.parent.mkdir(exist_ok=True)
     STATE_FILE.write_text(json.dumps(asdict(state), indent=2))
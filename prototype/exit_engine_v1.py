@@ -4,7 +4,7 @@ Route-1 (Risk) + Route-2 (Signal)
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 @dataclass
 class ExitDecision:
@@ -18,7 +18,7 @@ def evaluate_exit(
     signal_exit: bool
 ) -> ExitDecision:
 
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     # Route 1 — Intrabar Risk Exit (highest priority)
     if risk_exit:
@@ -0,0 +1,237 @@
+"""
+GREEKS V1
+Vectorized Black-Scholes(-Merton) pricing for a whole option chain in one
+NumPy pass: price, delta, gamma, vega, theta and implied vol from LTP.
+Replaces per-strike NorenApi.option_greek round trips.
+
+Conventions:
+- T in years (ACT/365), r and q continuously compounded, sigma annualised
+- vega per 1 vol point (0.01), theta per calendar day
+- is_call: bool or bool array (False => put)
+
+Hedge selection:
+    select_put_by_delta(spot, T, sigma=vix / 100, target=-0.35)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+RISK_FREE = 0.065           # INR overnight-ish
+DIVIDEND_YIELD = 0.0
+NIFTY_STRIKE_STEP = 50
+EXPIRY_CUTOFF = time(15, 30)
+MIN_T = 1.0 / (365.0 * 24.0 * 60.0)   # one minute
+IV_LO, IV_HI = 1e-4, 5.0
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+_SQRT2 = np.sqrt(2.0)
+_INV_SQRT2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+# =========================
+# Normal distribution (no scipy dependency)
+# =========================
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    """Complementary error function, fractional error < 1.2e-7 everywhere (Chebyshev fit)."""
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    ans = t * np.exp(
+        -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+            -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+                -0.82215223 + t * 0.17087277)))))))))
+    return np.where(x >= 0.0, ans, 2.0 - ans)
+
+
+def norm_cdf(x: ArrayLike) -> np.ndarray:
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / _SQRT2)
+
+
+def norm_pdf(x: ArrayLike) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return _INV_SQRT2PI * np.exp(-0.5 * x * x)
+
+
+# =========================
+# Pricing
+# =========================
+
+@dataclass(frozen=True)
+class Greeks:
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray     # per 0.01 vol
+    theta: np.ndarray    # per calendar day
+    iv: np.ndarray
+
+    def row(self, i: int) -> dict:
+        return {k: float(getattr(self, k)[i]) for k in ("price", "delta", "gamma", "vega", "theta", "iv")}
+
+
+def _prep(spot: ArrayLike, strike: ArrayLike, t: ArrayLike, sigma: ArrayLike, is_call: Any):
+    S, K, T, sig, call = np.broadcast_arrays(
+        np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float),
+        np.maximum(np.asarray(t, dtype=float), MIN_T),
+        np.maximum(np.asarray(sigma, dtype=float), IV_LO),
+        np.asarray(is_call, dtype=bool),
+    )
+    return S, K, T, sig, call
+
+
+def _d1d2(S, K, T, sig, r, q):
+    vol_t = sig * np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sig * sig) * T) / vol_t
+    return d1, d1 - vol_t
+
+
+def bs_price(spot: ArrayLike, strike: ArrayLike, t: ArrayLike, sigma: ArrayLike, is_call: Any = True,
+             r: float = RISK_FREE, q: float = DIVIDEND_YIELD) -> np.ndarray:
+    S, K, T, sig, call = _prep(spot, strike, t, sigma, is_call)
+    d1, d2 = _d1d2(S, K, T, sig, r, q)
+    df_r, df_q = np.exp(-r * T), np.exp(-q * T)
+    c = S * df_q * norm_cdf(d1) - K * df_r * norm_cdf(d2)
+    p = K * df_r * norm_cdf(-d2) - S * df_q * norm_cdf(-d1)
+    return np.where(call, c, p)
+
+
+def greeks(spot: ArrayLike, strike: ArrayLike, t: ArrayLike, sigma: ArrayLike, is_call: Any = True,
+           r: float = RISK_FREE, q: float = DIVIDEND_YIELD) -> Greeks:
+    S, K, T, sig, call = _prep(spot, strike, t, sigma, is_call)
+    d1, d2 = _d1d2(S, K, T, sig, r, q)
+    sqrt_t = np.sqrt(T)
+    df_r, df_q = np.exp(-r * T), np.exp(-q * T)
+    n_d1 = norm_pdf(d1)
+    N_d1, N_d2 = norm_cdf(d1), norm_cdf(d2)
+    N_md1, N_md2 = 1.0 - N_d1, 1.0 - N_d2
+
+    price = np.where(call, S * df_q * N_d1 - K * df_r * N_d2, K * df_r * N_md2 - S * df_q * N_md1)
+    delta = np.where(call, df_q * N_d1, -df_q * N_md1)
+    gamma = df_q * n_d1 / (S * sig * sqrt_t)
+    vega = S * df_q * n_d1 * sqrt_t / 100.0
+    decay = -S * df_q * n_d1 * sig / (2.0 * sqrt_t)
+    theta_c = decay - r * K * df_r * N_d2 + q * S * df_q * N_d1
+    theta_p = decay + r * K * df_r * N_md2 - q * S * df_q * N_md1
+    theta = np.where(call, theta_c, theta_p) / 365.0
+    return Greeks(price=price, delta=delta, gamma=gamma, vega=vega, theta=theta, iv=sig)
+
+
+def implied_vol(price: ArrayLike, spot: ArrayLike, strike: ArrayLike, t: ArrayLike, is_call: Any = True,
+                r: float = RISK_FREE, q: float = DIVIDEND_YIELD, tol: float = 1e-6,
+                max_iter: int = 60) -> np.ndarray:
+    """
+    Vectorized safeguarded Newton: Newton steps inside a shrinking [lo, hi]
+    bracket, bisection whenever Newton leaves it. NaN where the price is
+    outside the no-arbitrage bounds.
+    """
+    P, S, K, T, call = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(spot, dtype=float), np.asarray(strike, dtype=float),
+        np.maximum(np.asarray(t, dtype=float), MIN_T), np.asarray(is_call, dtype=bool),
+    )
+    df_r, df_q = np.exp(-r * T), np.exp(-q * T)
+    intrinsic = np.where(call, np.maximum(S * df_q - K * df_r, 0.0), np.maximum(K * df_r - S * df_q, 0.0))
+    upper = np.where(call, S * df_q, K * df_r)
+    valid = (P > intrinsic) & (P < upper)
+
+    lo = np.full(P.shape, IV_LO)
+    hi = np.full(P.shape, IV_HI)
+    # Brenner-Subrahmanyam start
+    sig = np.clip(np.sqrt(2.0 * np.pi / T) * P / S, 0.05, 2.0)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        g = greeks(S, K, T, sig, call, r, q)
+        diff = g.price - P
+        active &= np.abs(diff) > tol
+        hi = np.where(active & (diff > 0), sig, hi)
+        lo = np.where(active & (diff < 0), sig, lo)
+        vega = g.vega * 100.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sig - diff / vega
+        ok = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        sig = np.where(active, np.where(ok, newton, 0.5 * (lo + hi)), sig)
+    return np.where(valid, sig, np.nan)
+
+
+def chain_greeks(spot: float, strikes: ArrayLike, t: float, ltps: ArrayLike, is_call: Any,
+                 r: float = RISK_FREE, q: float = DIVIDEND_YIELD) -> Greeks:
+    """IV from LTPs, then full greeks at that IV, for a whole chain (NaN greeks where the IV failed)."""
+    iv = implied_vol(ltps, spot, strikes, t, is_call, r, q)
+    ok = np.isfinite(iv)
+    g = greeks(spot, strikes, t, np.where(ok, iv, IV_LO), is_call, r, q)
+    priced = lambda x: np.where(ok, x, np.nan)                   # unpriceable strikes never win select_by_delta
+    return Greeks(price=priced(g.price), delta=priced(g.delta), gamma=priced(g.gamma), vega=priced(g.vega),
+                  theta=priced(g.theta), iv=iv)
+
+
+# =========================
+# Strike selection
+# =========================
+
+def strike_grid(spot: float, width: int = 40, step: int = NIFTY_STRIKE_STEP) -> np.ndarray:
+    atm = round(spot / step) * step
+    return atm + step * np.arange(-width, width + 1, dtype=float)
+
+
+def select_by_delta(deltas: ArrayLike, strikes: ArrayLike, target: float) -> int:
+    """Index of the strike whose delta is closest to target (NaNs ignored)."""
+    d = np.asarray(deltas, dtype=float)
+    err = np.abs(d - target)
+    err = np.where(np.isfinite(err), err, np.inf)
+    if not np.isfinite(err).any():
+        raise ValueError("no finite deltas in chain")
+    return int(np.argmin(err))
+
+
+def select_put_by_delta(spot: float, t: float, sigma: Optional[ArrayLike] = None,
+                        strikes: Optional[ArrayLike] = None, ltps: Optional[ArrayLike] = None,
+                        target: float = -0.35, r: float = RISK_FREE,
+                        q: float = DIVIDEND_YIELD) -> dict:
+    """
+    Put whose delta is closest to target. Uses LTP-implied vols when ltps are
+    given, else a flat sigma (e.g. India VIX / 100).
+    """
+    K = strike_grid(spot) if strikes is None else np.asarray(strikes, dtype=float)
+    if ltps is not None:
+        g = chain_greeks(spot, K, t, ltps, False, r, q)
+    else:
+        if sigma is None:
+            raise ValueError("sigma or ltps required")
+        g = greeks(spot, K, t, sigma, False, r, q)
+    i = select_by_delta(g.delta, K, target)
+    out = g.row(i)
+    out["strike"] = float(K[i])
+    return out
+
+
+# =========================
+# Expiry / time to expiry
+# =========================
+
+def last_weekday_of_month(y: int, m: int, weekday: int = 3) -> date:
+    """Last <weekday> (Mon=0 .. Thu=3) of the month."""
+    d = date(y + (m == 12), m % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def monthly_expiry(today: date, weekday: int = 3) -> date:
+    """Current NIFTY monthly expiry (rolls to next month once this month's has passed)."""
+    exp = last_weekday_of_month(today.year, today.month, weekday)
+    if exp < today:
+        y, m = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+        exp = last_weekday_of_month(y, m, weekday)
+    return exp
+
+
+def year_fraction(expiry: date, now: datetime) -> float:
+    """ACT/365 from now to expiry day's 15:30 (naive local times), floored at one minute."""
+    exp_dt = datetime.combine(expiry, EXPIRY_CUTOFF)
+    return max((exp_dt - now).total_seconds() / (365.0 * 86400.0), MIN_T)
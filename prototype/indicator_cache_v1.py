@@ -0,0 +1,89 @@
+"""
+INDICATOR CACHE V1
+LRU memo for indicator results keyed on what they depend on:
+
+    (token, interval, params, bar_id)
+
+so a 60s poll loop over hourly candles computes once per bar and gets the
+cached IndicatorPack / snapshot back on every other poll.
+
+    ind = compute_indicators_cached(pack)                # papertrade runner v3
+    snap = MEMO.get(key, lambda: compute(df))            # any other indicator fn
+
+bar_id is the newest bar's ssboe plus its OHLC. Over closed bars (MTF engine)
+that is exactly the newest closed bar id; when a broker series ends in the
+still-forming candle, a revised forming bar changes the key instead of
+serving a stale value.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from prototype import indicators_v2, metrics
+from prototype.contracts import CandlePack
+from prototype.indicator_contracts import IndicatorPack
+
+DEFAULT_MAXSIZE = 256
+
+Key = Tuple[str, str, Hashable, Hashable]
+T = TypeVar("T")
+
+
+class IndicatorMemo:
+    """Bounded LRU (OrderedDict) of indicator results; thread-safe. Values are shared: treat as read-only."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = int(maxsize)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Key, Any]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hit": 0, "miss": 0, "evict": 0}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Key, compute: Callable[[], T], fn: str = "") -> T:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._count("hit", fn, self._data[key])
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._count("evict", fn)
+        return self._count("miss", fn, value)
+
+    def _count(self, outcome: str, fn: str, value: Any = None) -> Any:
+        self.stats[outcome] += 1
+        metrics.inc("indicator_cache_total", fn=fn or "-", outcome=outcome)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+MEMO = IndicatorMemo()
+
+
+def pack_bar_id(pack: CandlePack) -> Tuple[Any, ...]:
+    """(ssboe, open, high, low, close) of the newest bar, without parsing the rest of the pack."""
+    if pack.bars is not None and len(pack.bars):
+        b = pack.bars.last()
+        return (b.ssboe, b.open, b.high, b.low, b.close)
+    r = pack.rows[0] if pack.rows and isinstance(pack.rows[0], dict) else {}
+    return (pack.last_ssboe, r.get("into"), r.get("inth"), r.get("intl"), r.get("intc", pack.close))
+
+
+def compute_indicators_cached(pack: CandlePack, token: str = "", interval: str = "",
+                              memo: Optional[IndicatorMemo] = None) -> IndicatorPack:
+    """indicators_v2.compute_indicators through the memo (same IndicatorPack until the newest bar changes)."""
+    meta = pack.meta or {}
+    key = (str(token or meta.get("token", "")), str(interval or meta.get("interval", "")),
+           ("indicators_v2", indicators_v2.EMA_PERIODS, 14), pack_bar_id(pack))
+    return (MEMO if memo is None else memo).get(key, lambda: indicators_v2.compute_indicators(pack), fn="compute_indicators")
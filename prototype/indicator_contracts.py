@@ -12,8 +12,9 @@ class IndicatorPack:
     - ema_50: float
     - ema_200: float
     - rsi_14: float
-    - adx_14: float
+    - adx_14: float (Wilder ADX; 0.0 until 2*14 bars)
     - meta: dict
+    - plus_di_14 / minus_di_14: float (0.0 until 15 bars)
     """
     close: float
     ema_20: float
@@ -22,6 +23,8 @@ class IndicatorPack:
     rsi_14: float
     adx_14: float
     meta: Dict[str, Any]
+    plus_di_14: float = 0.0
+    minus_di_14: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -31,5 +34,7 @@ class IndicatorPack:
             "ema_200": self.ema_200,
             "rsi_14": self.rsi_14,
             "adx_14": self.adx_14,
+            "plus_di_14": self.plus_di_14,
+            "minus_di_14": self.minus_di_14,
             "meta": self.meta,
         }
\ No newline at end of file
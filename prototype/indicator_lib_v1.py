@@ -0,0 +1,394 @@
+"""
+INDICATOR LIB V1
+Single source for EMA / RSI / ATR / SuperTrend / ADX, in two forms with the
+same numbers:
+
+    batch (NumPy arrays, whole history)      ema(), rsi(), atr(), supertrend(), dmi()
+    incremental (O(1) per closed bar)        EMA, RSI, ATR, SuperTrend, ADX  -> .update(...)
+
+Canonical definitions (same numbers as the pandas prototype.indicators;
+TradingView-style Wilder smoothing seeded at the first value):
+
+    ema          ewm(span=n, adjust=False)
+    rsi          Wilder: ewm(alpha=1/n) of gains / losses, zero loss -> 1e-9
+    atr          Wilder: ewm(alpha=1/n) of true range
+    supertrend   final-band SuperTrend, starts bearish on the upper band
+    dmi / ADX    Wilder ADX (+DI / -DI), see adx_v1
+
+Model E's strategy definitions are kept as named variants (its parameters were
+swept against them): rsi_sma, atr_sma and supertrend_simple (direction = close
+above the previous upper band).
+
+Incremental state round-trips through plain dicts (get_state / set_state), so
+a checkpoint taken on bar close resumes bit-for-bit after a restart.
+
+Compat shims calc_ema / calc_rsi14 / calc_atr14 / calc_supertrend accept the
+legacy pandas style (Series / DataFrame) and the list keyword style used by
+main_v7 / main_v8 (highs=, lows=, closes=).
+
+Golden values: prototype/indicator_golden_v1.json
+(smoke_test_indicator_parity_v1).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from prototype.adx_v1 import ADX, dmi, last_adx
+
+__all__ = [
+    "ema", "rma", "rsi", "true_range", "atr", "supertrend", "dmi", "last_adx",
+    "sma", "rsi_sma", "atr_sma", "supertrend_simple",
+    "EMA", "RSI", "ATR", "SuperTrend", "ADX", "get_state", "set_state",
+    "calc_ema", "calc_rsi14", "calc_atr14", "calc_supertrend",
+]
+
+ZERO_LOSS = 1e-9
+
+
+# =========================
+# Batch: canonical
+# =========================
+# Recursive filters (EMA, Wilder) are tight loops over python floats;
+# everything else is vectorized.
+
+def _as_f8(x) -> np.ndarray:
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """ewm(alpha, adjust=False).mean() seeded at x[0]."""
+    if len(x) == 0:
+        return np.empty(0)
+    beta = 1.0 - alpha
+    e = float(x[0])
+    out = [e]
+    append = out.append
+    for v in x[1:].tolist():
+        e = alpha * v + beta * e
+        append(e)
+    return np.array(out)
+
+
+def ema(close, period: int) -> np.ndarray:
+    """== series.ewm(span=period, adjust=False).mean()"""
+    return _ewm(_as_f8(close), 2.0 / (period + 1.0))
+
+
+def rma(x, period: int) -> np.ndarray:
+    """Wilder smoothing == ewm(alpha=1/period, adjust=False).mean()"""
+    return _ewm(_as_f8(x), 1.0 / period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """== prototype.indicators.rsi (Wilder, first value NaN)."""
+    c = _as_f8(close)
+    out = np.full(len(c), np.nan)
+    if len(c) < 2:
+        return out
+    delta = np.diff(c)
+    ma_up = rma(np.clip(delta, 0.0, None), period)
+    ma_down = rma(np.clip(-delta, 0.0, None), period)
+    ma_down[ma_down == 0] = ZERO_LOSS
+    out[1:] = 100.0 - (100.0 / (1.0 + ma_up / ma_down))
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    h, l, c = _as_f8(high), _as_f8(low), _as_f8(close)
+    prev = np.r_[np.nan, c[:-1]] if len(c) else c
+    return np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """== prototype.indicators.atr (Wilder)."""
+    return rma(true_range(high, low, close), period)
+
+
+def supertrend(high, low, close, period: int = 10, multiplier: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    == prototype.indicators.supertrend
+    Returns (st_value, st_dir) with st_dir +1 bullish / -1 bearish.
+    """
+    h, l, c = _as_f8(high), _as_f8(low), _as_f8(close)
+    n = len(c)
+    st = np.empty(n)
+    direction = np.empty(n, dtype=np.int64)
+    if n == 0:
+        return st, direction
+
+    a = atr(h, l, c, period)
+    hl2 = (h + l) / 2.0
+    ub = (hl2 + multiplier * a).tolist()
+    lb = (hl2 - multiplier * a).tolist()
+    cl = c.tolist()
+
+    st[0] = ub[0]
+    direction[0] = -1
+    prev_ub, prev_lb, prev_dir = ub[0], lb[0], -1
+
+    for i in range(1, n):
+        cur_ub, cur_lb, prev_close = ub[i], lb[i], cl[i - 1]
+
+        final_ub = cur_ub if (cur_ub < prev_ub or prev_close > prev_ub) else prev_ub
+        final_lb = cur_lb if (cur_lb > prev_lb or prev_close < prev_lb) else prev_lb
+
+        if prev_dir == -1:
+            d = 1 if cl[i] > final_ub else -1
+        else:
+            d = -1 if cl[i] < final_lb else 1
+
+        st[i] = final_lb if d == 1 else final_ub
+        direction[i] = d
+        prev_ub, prev_lb, prev_dir = final_ub, final_lb, d
+
+    return st, direction
+
+
+# =========================
+# Batch: Model E variants
+# =========================
+
+def sma(x, window: int) -> np.ndarray:
+    """Rolling mean (NaN until `window` values), cumsum form."""
+    x = _as_f8(x)
+    out = np.full(len(x), np.nan)
+    if window <= 0 or len(x) < window:
+        return out
+    c = np.cumsum(np.r_[0.0, x])
+    out[window - 1:] = (c[window:] - c[:-window]) / window
+    return out
+
+
+def rsi_sma(close, period: int = 19) -> np.ndarray:
+    """Model E RSI: rolling means of gains / losses (first diff counted as 0)."""
+    c = _as_f8(close)
+    delta = np.r_[0.0, np.diff(c)] if len(c) else c
+    gain = sma(np.where(delta > 0, delta, 0.0), period)
+    loss = sma(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - (100.0 / (1.0 + gain / loss))
+
+
+def atr_sma(high, low, close, period: int = 14) -> np.ndarray:
+    """Model E ATR: rolling mean of true range."""
+    return sma(true_range(high, low, close), period)
+
+
+def supertrend_simple(high, low, close, atr_values, multiplier: float = 1.1
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Model E's simplified SuperTrend: bands hl2 +/- mult * atr, direction +1
+    when close is above the previous bar's upper band.
+    Returns (st_direction, st_line, upperband, lowerband).
+    """
+    h, l, c, a = _as_f8(high), _as_f8(low), _as_f8(close), _as_f8(atr_values)
+    hl2 = (h + l) / 2.0
+    upper = hl2 + multiplier * a
+    lower = hl2 - multiplier * a
+    prev_upper = np.r_[np.nan, upper[:-1]] if len(c) else upper
+    with np.errstate(invalid="ignore"):
+        direction = np.where(c > prev_upper, 1, -1)
+    return direction, np.where(direction == 1, lower, upper), upper, lower
+
+
+# =========================
+# Incremental
+# =========================
+
+class EMA:
+    """ewm(span=period, adjust=False), seeded at the first value."""
+
+    __slots__ = ("alpha", "beta", "value")
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.beta = 1.0 - self.alpha
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        self.value = x if math.isnan(self.value) else self.alpha * x + self.beta * self.value
+        return self.value
+
+
+class _RMA:
+    __slots__ = ("alpha", "beta", "value")
+
+    def __init__(self, period: int):
+        self.alpha = 1.0 / period
+        self.beta = 1.0 - self.alpha
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        self.value = x if math.isnan(self.value) else self.alpha * x + self.beta * self.value
+        return self.value
+
+
+class RSI:
+    """Wilder RSI, same as rsi()[-1]; NaN until the second close."""
+
+    __slots__ = ("_up", "_down", "_prev", "value")
+
+    def __init__(self, period: int = 14):
+        self._up, self._down = _RMA(period), _RMA(period)
+        self._prev = math.nan
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        if not math.isnan(self._prev):
+            d = close - self._prev
+            up = self._up.update(d if d > 0.0 else 0.0)
+            down = self._down.update(-d if d < 0.0 else 0.0)
+            self.value = 100.0 - (100.0 / (1.0 + up / (down if down != 0 else ZERO_LOSS)))
+        self._prev = close
+        return self.value
+
+
+class ATR:
+    """Wilder ATR, same as atr()[-1]."""
+
+    __slots__ = ("_rma", "_pc", "value")
+
+    def __init__(self, period: int = 14):
+        self._rma = _RMA(period)
+        self._pc = math.nan
+        self.value = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        tr = high - low
+        if not math.isnan(self._pc):
+            tr = max(tr, max(abs(high - self._pc), abs(low - self._pc)))
+        self._pc = close
+        self.value = self._rma.update(tr)
+        return self.value
+
+
+class SuperTrend:
+    """Final-band SuperTrend, same as supertrend() at the newest bar: update() -> (value, direction)."""
+
+    __slots__ = ("mult", "_atr", "_ub", "_lb", "_pc", "value", "direction", "prev_direction")
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0):
+        self.mult = float(multiplier)
+        self._atr = ATR(period)
+        self._ub = self._lb = self._pc = math.nan
+        self.value = math.nan
+        self.direction = self.prev_direction = 0
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, int]:
+        high, low, close = float(high), float(low), float(close)
+        a = self._atr.update(high, low, close)
+        hl2 = (high + low) / 2.0
+        ub, lb = hl2 + self.mult * a, hl2 - self.mult * a
+        self.prev_direction = self.direction
+        if self.direction == 0:
+            self.value, self.direction = ub, -1
+            self.prev_direction = -1
+        else:
+            pc = self._pc
+            ub = ub if (ub < self._ub or pc > self._ub) else self._ub
+            lb = lb if (lb > self._lb or pc < self._lb) else self._lb
+            if self.direction == -1:
+                d = 1 if close > ub else -1
+            else:
+                d = -1 if close < lb else 1
+            self.value = lb if d == 1 else ub
+            self.direction = d
+        self._ub, self._lb, self._pc = ub, lb, close
+        return self.value, self.direction
+
+
+# =========================
+# Checkpoint state
+# =========================
+
+# constructor parameters: a checkpoint must have been taken with the same ones
+_PARAM_SLOTS = frozenset(("alpha", "beta", "mult", "period"))
+
+
+def _slots(obj: Any):
+    for cls in type(obj).__mro__:
+        yield from getattr(cls, "__slots__", ())
+
+
+def get_state(ind: Any) -> Dict[str, Any]:
+    """Plain-dict state of an incremental indicator (nested ones included); JSON-safe, floats exact."""
+    return {k: get_state(v) if hasattr(v, "__slots__") else v
+            for k in _slots(ind) for v in [getattr(ind, k)]}
+
+
+def set_state(ind: Any, state: Dict[str, Any]) -> Any:
+    """Restore get_state() output into a freshly built indicator; ValueError if its parameters differ."""
+    for k in _slots(ind):
+        cur, v = getattr(ind, k), state[k]
+        if hasattr(cur, "__slots__"):
+            set_state(cur, v)
+        elif k in _PARAM_SLOTS:
+            if v != cur:
+                raise ValueError(f"{type(ind).__name__}.{k}: checkpoint {v!r} != {cur!r}")
+        else:
+            setattr(ind, k, v)
+    return ind
+
+
+# =========================
+# Compat shims (legacy call styles)
+# =========================
+
+def _col(x: Any, name: str) -> np.ndarray:
+    if hasattr(x, "columns"):
+        return _as_f8(x[name])
+    return _as_f8(x)
+
+
+def _hlc(df: Any = None, highs: Any = None, lows: Any = None, closes: Any = None,
+         low: Any = None, close: Any = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(df) | (high, low, close) positional | highs= / lows= / closes= keywords."""
+    if df is not None and hasattr(df, "columns"):
+        return _col(df, "high"), _col(df, "low"), _col(df, "close")
+    if df is not None and low is not None and close is not None:
+        return _as_f8(df), _as_f8(low), _as_f8(close)
+    if highs is None or lows is None or closes is None:
+        raise TypeError("expected a high/low/close DataFrame or highs=, lows=, closes=")
+    return _as_f8(highs), _as_f8(lows), _as_f8(closes)
+
+
+def _last(x: np.ndarray) -> float:
+    return float(x[-1]) if len(x) else math.nan
+
+
+def calc_ema(close: Any, period: int = 20, length: Optional[int] = None) -> float:
+    return _last(ema(_as_f8(close), int(length or period)))
+
+
+def calc_rsi14(close: Any, period: int = 14) -> float:
+    return _last(rsi(_as_f8(close), int(period)))
+
+
+def calc_atr14(df: Any = None, low: Any = None, close: Any = None, period: int = 14, **kw: Any) -> float:
+    h, l, c = _hlc(df, low=low, close=close, **kw)
+    return _last(atr(h, l, c, int(period)))
+
+
+def calc_supertrend(df: Any = None, period: int = 10, multiplier: float = 3.0, **kw: Any) -> Tuple[float, int, int]:
+    """(st_val_latest, st_dir_latest, st_dir_prev), as prototype.indicators.calc_supertrend."""
+    h, l, c = _hlc(df, **kw)
+    st, direction = supertrend(h, l, c, int(period), float(multiplier))
+    if not len(st):
+        return math.nan, 0, 0
+    st_dir = int(direction[-1])
+    return float(st[-1]), st_dir, int(direction[-2]) if len(direction) >= 2 else st_dir
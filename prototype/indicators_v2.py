@@ -0,0 +1,126 @@
+"""
+INDICATORS V2
+IndicatorPack from the columnar CandlePack (indicators_v1 stays frozen):
+- closes / highs / lows come from pack.columns(), parsed once, oldest -> newest
+- EMA 20/50/200 fused into one pass (emas)
+- RSI / ADX / +DI / -DI from indicator_lib_v1 (Wilder); ADX is incremental
+  per series (adx_v1.SeriesADX): a poll only feeds bars it has not seen
+
+Parity vs indicators_v1: EMA values are identical; RSI is the library's
+Wilder RSI (smoothing seeded at the first change, zero loss -> 1e-9) where
+v1 seeded with the mean of the first `period` changes and returned 100.0 on
+zero loss, so rsi_14 differs on short series and converges as history grows;
+adx_14 / +DI / -DI are real values (v1: 0.0 stub).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+from prototype import indicator_lib_v1 as lib
+from prototype.adx_v1 import SeriesADX
+from prototype.contracts import CandlePack
+from prototype.indicator_contracts import IndicatorPack
+
+EMA_PERIODS = (20, 50, 200)
+ADX_SERIES_MAX = 64   # series (token, interval, first bar) with live ADX state
+
+_adx_series: "OrderedDict[Tuple[str, str, int], SeriesADX]" = OrderedDict()
+_adx_lock = threading.Lock()
+
+
+def _get_close_series(pack: CandlePack) -> List[float]:
+    """
+    Shoonya candle rows: latest first
+    Columnar pack closes are already parsed oldest->newest.
+    """
+    return pack.columns().close.tolist()
+
+
+def ema(series: List[float], period: int) -> float:
+    if not len(series) or period <= 0:
+        return 0.0
+    return float(lib.ema(series, period)[-1])
+
+
+def emas(series: Sequence[float], periods: Sequence[int] = EMA_PERIODS) -> Tuple[float, ...]:
+    """
+    Last EMA value for several periods in ONE pass over the series.
+    Same recurrence (and floats) as ema() per period.
+    """
+    if not series:
+        return tuple(0.0 for _ in periods)
+    ks = [2.0 / (p + 1.0) if p > 0 else 0.0 for p in periods]
+    if len(ks) == 3:  # unrolled for the standard 20/50/200 set
+        k1, k2, k3 = ks
+        j1, j2, j3 = 1.0 - k1, 1.0 - k2, 1.0 - k3
+        e1 = e2 = e3 = series[0]
+        for i in range(1, len(series)):
+            x = series[i]
+            e1 = (x * k1) + (e1 * j1)
+            e2 = (x * k2) + (e2 * j2)
+            e3 = (x * k3) + (e3 * j3)
+        out = [e1, e2, e3]
+    else:
+        out = [series[0]] * len(ks)
+        for x in series[1:]:
+            out = [(x * k) + (e * (1.0 - k)) for k, e in zip(ks, out)]
+    return tuple(float(e) if p > 0 else 0.0 for p, e in zip(periods, out))
+
+
+def rsi(series: List[float], period: int = 14) -> float:
+    """Wilder RSI (indicator_lib_v1.rsi, same numbers as main_v7 / Type F); 0.0 until period + 1 closes."""
+    if len(series) < period + 1:
+        return 0.0
+    return float(lib.rsi(series, period)[-1])
+
+
+def _series_adx(pack: CandlePack) -> SeriesADX:
+    meta = pack.meta or {}
+    bars = pack.columns()
+    key = (str(meta.get("token", "")), str(meta.get("interval", "")), int(bars.ssboe[0]) if len(bars) else 0)
+    with _adx_lock:
+        s = _adx_series.get(key)
+        if s is None:
+            s = _adx_series[key] = SeriesADX(14)
+            while len(_adx_series) > ADX_SERIES_MAX:
+                _adx_series.popitem(last=False)
+        else:
+            _adx_series.move_to_end(key)
+    return s
+
+
+def compute_indicators(pack: CandlePack) -> IndicatorPack:
+    bars = pack.columns()
+    closes = _get_close_series(pack)  # one C-level copy of the parsed close column
+    close_last = float(closes[-1]) if closes else float(pack.close)
+    ema_20, ema_50, ema_200 = emas(closes, EMA_PERIODS)
+    adx_14, plus_di_14, minus_di_14 = _series_adx(pack).last(bars.ssboe, bars.high, bars.low, bars.close)
+
+    out = IndicatorPack(
+        close=close_last,
+        ema_20=ema_20,
+        ema_50=ema_50,
+        ema_200=ema_200,
+        rsi_14=rsi(closes, 14),
+        adx_14=adx_14,
+        meta={
+            "rows": len(pack.rows),
+            "source": "CandlePack",
+        },
+        plus_di_14=plus_di_14,
+        minus_di_14=minus_di_14,
+    )
+
+    # HARD CONTRACT (no None)
+    assert out.close is not None
+    assert out.ema_20 is not None
+    assert out.ema_50 is not None
+    assert out.ema_200 is not None
+    assert out.rsi_14 is not None
+    assert out.adx_14 is not None
+    assert out.plus_di_14 is not None
+    assert out.minus_di_14 is not None
+
+    return out
\ No newline at end of file
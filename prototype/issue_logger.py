@@ -15,12 +15,13 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+from prototype import clock
+
 
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return clock.utc_now_iso()
 
 
 def ensure_dir(path: str) -> None:
@@ -0,0 +1,214 @@
+"""
+MAIN V2.1
+main_v2's spot 1H signal -> Candle N+1 paper entry -> intrabar SL loop, with
+the entry placed by EntryScheduler (pending_entry_engine_v1) instead of the
+200ms sleep_until() poll (main.py / main_v2 stay frozen):
+- armed when the signal fires, placed at the next session-aligned bar open
+  (09:15, 10:15 ... 15:15; after 15:15 the next session's 09:15) + exec_delay_sec
+- India VIX pre-warmed before the open, so only the FUT LTP is fetched at it
+- ENTRY_DECISION logs intended_at / fired_at / fire_drift_ms
+- strategy parameters come from the config when it has them, else DEFAULTS
+  (Config carries only broker credentials + poll_sec)
+- all waits go through prototype.clock (replays / smoke test drive it)
+
+    python -m prototype.main_v2_1
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from prototype import clock
+from prototype.config import load_config
+from prototype.error_codes import Err
+from prototype.main_v2 import atr, ema, rsi, supertrend
+from prototype.observability import EventLogger, new_trace_id, ms
+from prototype.paper_broker import PaperBroker
+from prototype.pending_entry_engine_v1 import EntryScheduler
+from prototype.trade_log import TradeRow, write_trade_csv
+
+EVENTS_PATH = "prototype/outputs/events.jsonl"
+TRADES_PATH = "prototype/outputs/paper_trades.csv"
+
+DEFAULTS: Dict[str, Any] = {
+    "capital": 500000.0,
+    "st_len": 21,
+    "st_mult": 1.1,
+    "rsi_len": 14,
+    "ema_len": 20,
+    "atr_len": 14,
+    "sl_atr_mult": 2.0,
+    "vix_low_threshold": 14.0,
+    "exec_delay_sec": 1.0,     # Candle N+1 open + 1 sec
+    "poll_sec": 60,
+}
+
+
+def _param(cfg: Any, name: str) -> Any:
+    return getattr(cfg, name, DEFAULTS[name])
+
+
+def run(cfg: Any = None, broker: Any = None, cycles: int = 0, events_path: str = EVENTS_PATH,
+        trades_path: str = TRADES_PATH, entry_sched: Optional[EntryScheduler] = None) -> None:
+    """cycles: stop after that many loop iterations (0 = run forever)."""
+    cfg = cfg or load_config()
+
+    logger = EventLogger(events_path)
+    paper = PaperBroker()
+
+    trace_id = new_trace_id()
+    logger.log("BOOT", trace_id, {"msg": "prototype v2.1 starting", "capital": _param(cfg, "capital")})
+
+    if broker is None:
+        from prototype.shoonya_adapter_v2 import ShoonyaAdapter
+
+        broker = ShoonyaAdapter(trace_id=trace_id)
+
+    try:
+        broker.login()
+    except Exception as e:
+        logger.log("ERROR", trace_id, {"code": Err.SHOONYA_LOGIN_FAILED, "detail": str(e)})
+        return
+
+    logger.log("BROKER_LOGIN_OK", trace_id, {"code": Err.OK})
+
+    entry_sched = entry_sched or EntryScheduler(delay_sec=float(_param(cfg, "exec_delay_sec")))
+    pending_entry = False
+    stored_atr = None
+    stored_spot_close = None
+
+    in_trade = False
+    fut_symbol = None
+    fut_entry = None
+    hard_sl = None
+    trade_id = None
+    entry_time_utc = None
+    regime = None
+
+    cycle = 0
+    while not cycles or cycle < cycles:
+        cycle += 1
+        trace_id = new_trace_id()
+
+        # 1) signal snapshot
+        try:
+            spot_df = broker.get_spot_candles_1h()
+            if spot_df is None or len(spot_df) < 50:
+                logger.log("ERROR", trace_id, {"code": Err.DATA_EMPTY, "detail": "spot candles empty"})
+                clock.sleep(2)
+                continue
+
+            st_val, st_dir, st_prev = supertrend(spot_df, _param(cfg, "st_len"), _param(cfg, "st_mult"))
+            rsi_val = float(rsi(spot_df["close"], _param(cfg, "rsi_len")).iloc[-1])
+            ema20 = float(ema(spot_df["close"], _param(cfg, "ema_len")).iloc[-1])
+            atr_val = float(atr(spot_df, _param(cfg, "atr_len")).iloc[-1])
+            close = float(spot_df["close"].iloc[-1])
+
+            cond1 = (st_prev == -1 and st_dir == 1)
+            cond2 = (rsi_val < 65)
+            cond3 = (close >= st_val)
+            cond4 = (close > ema20)
+
+            logger.log("SPOT_SIGNAL_SNAPSHOT", trace_id, {
+                "close": close, "st_val": st_val, "st_dir": st_dir, "st_prev": st_prev,
+                "rsi": rsi_val, "ema20": ema20, "atr14": atr_val,
+                "conds": [cond1, cond2, cond3, cond4]
+            })
+
+            if (not in_trade) and cond1 and cond2 and cond3 and cond4:
+                pending_entry = True
+                stored_atr = atr_val
+                stored_spot_close = close
+                logger.log("PENDING_ENTRY", trace_id, {"msg": "conditions met on spot close", "atr": stored_atr})
+
+        except Exception as e:
+            logger.log("ERROR", trace_id, {"code": Err.SHOONYA_BAD_RESPONSE, "detail": str(e)})
+            clock.sleep(2)
+            continue
+
+        # 2) execute next candle open (+ exec_delay_sec), on the timer wheel; VIX pre-warmed before the open
+        if pending_entry and (not in_trade):
+            entry = entry_sched.arm("entry", fire=lambda vix: (vix, broker.get_future_ltp()),
+                                    prewarm=lambda: float(broker.get_india_vix()))
+            entry_sched.wait(entry)
+
+            try:
+                if entry.error is not None:
+                    raise entry.error
+                vix, (fut_symbol, fut_ltp) = entry.result
+                vix = float(broker.get_india_vix()) if vix is None else vix
+            except Exception as e:
+                logger.log("ERROR", trace_id, {"code": Err.SHOONYA_TIMEOUT, "detail": f"entry fetch fail: {e}"})
+                pending_entry = False
+                continue
+
+            hard_sl = float(fut_ltp) - (_param(cfg, "sl_atr_mult") * float(stored_atr))
+            regime = "FUT_PUT_HEDGE" if vix >= _param(cfg, "vix_low_threshold") else "RATIO_SPREAD"
+
+            logger.log("ENTRY_DECISION", trace_id, {
+                "vix": vix, "regime": regime, "fut_symbol": fut_symbol,
+                "fut_entry": fut_ltp, "atr_spot": stored_atr, "hard_sl": hard_sl,
+                "intended_at": entry.intended, "fired_at": entry.fired_at, "fire_drift_ms": entry.drift * 1000.0
+            })
+
+            trade_id = f"T{ms()}"
+            entry_time_utc = clock.utc_now_iso()
+
+            paper.place_market(fut_symbol, "BUY", 65, ltp=fut_ltp)
+
+            in_trade = True
+            pending_entry = False
+            fut_entry = float(fut_ltp)
+
+            logger.log("ENTRY_FILLED", trace_id, {
+                "trade_id": trade_id, "fut_symbol": fut_symbol, "fut_entry": fut_entry,
+                "hard_sl": hard_sl
+            })
+
+        # 3) SL monitor
+        if in_trade:
+            try:
+                _, fut_ltp = broker.get_future_ltp()
+                fut_ltp = float(fut_ltp)
+            except Exception as e:
+                logger.log("ERROR", trace_id, {"code": Err.DATA_STALE, "detail": f"monitor fetch fail: {e}"})
+                clock.sleep(1)
+                continue
+
+            if hard_sl is not None and fut_ltp <= hard_sl:
+                logger.log("SL_HIT", trace_id, {"fut_ltp": fut_ltp, "hard_sl": hard_sl})
+
+                paper.place_market(fut_symbol, "SELL", 65, ltp=fut_ltp)
+
+                exit_time_utc = clock.utc_now_iso()
+                pnl_points = fut_ltp - fut_entry
+                pnl_value = pnl_points * 65
+
+                write_trade_csv(trades_path, TradeRow(
+                    trade_id=trade_id,
+                    trace_id=trace_id,
+                    entry_time_utc=entry_time_utc,
+                    exit_time_utc=exit_time_utc,
+                    regime=regime,
+                    spot_entry_ref=float(stored_spot_close or 0.0),
+                    fut_entry=float(fut_entry),
+                    basis=float(fut_entry - float(stored_spot_close or fut_entry)),
+                    atr_spot=float(stored_atr or 0.0),
+                    hard_sl_fut=float(hard_sl),
+                    fut_exit=float(fut_ltp),
+                    pnl_points=float(pnl_points),
+                    pnl_value=float(pnl_value),
+                    reason_exit="SL_INTRABAR"
+                ))
+
+                in_trade = False
+                fut_entry = None
+                hard_sl = None
+                trade_id = None
+                regime = None
+
+        clock.sleep(_param(cfg, "poll_sec"))
+
+
+if __name__ == "__main__":
+    run()
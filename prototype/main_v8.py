@@ -0,0 +1,237 @@
+"""
+MAIN V8
+main_v7's spot 1H signal loop (main_v7 stays frozen), driven by bar closes
+instead of a poll_sec sleep:
+- one fetch right after each 09:15-anchored 1H close (+ bar_settle_sec),
+  no broker calls in between
+- the post-close fetch bypasses the single-flight series cache and re-polls
+  for up to bar_wait_sec until the broker publishes the new candle
+- bar_close_to_step_seconds records close -> signal latency
+- candles through shoonya_adapter_v5 (one login, ring-buffered 60m series)
+
+    python -m prototype.main_v8
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from prototype import clock, metrics
+from prototype import market_data_v1 as market_data
+from prototype.bar_clock_v1 import SETTLE_SEC, BarClock
+from prototype.issue_logger import IssueLogger
+from prototype.events import event_log
+
+# NOTE:
+# config.load_config may return either:
+# - dict-like (old style)
+# - Config object/dataclass (new style)
+from prototype.config import load_config  # type: ignore
+
+from prototype.shoonya_adapter_v5 import ShoonyaAdapterV5
+
+from prototype.indicator_lib_v1 import (
+    calc_atr14,
+    calc_ema,
+    calc_rsi14,
+    calc_supertrend,
+)
+from prototype.rules_v1 import RuleSet
+
+OUTPUT_DIR = os.path.join("prototype", "outputs")
+
+
+def utc_now_iso() -> str:
+    return clock.utc_now_iso()
+
+
+def cfg_get(cfg: Any, key: str, default: Any = None) -> Any:
+    """
+    Hardening helper:
+    - if cfg is dict-like -> cfg.get
+    - if cfg is object -> getattr
+    """
+    if cfg is None:
+        return default
+
+    # dict-like
+    if hasattr(cfg, "get") and callable(getattr(cfg, "get")):
+        try:
+            return cfg.get(key, default)
+        except Exception:
+            return default
+
+    # object/dataclass
+    if hasattr(cfg, key):
+        try:
+            return getattr(cfg, key)
+        except Exception:
+            return default
+
+    return default
+
+
+@dataclass
+class RuntimeCfg:
+    poll_sec: int = 60
+    atr_mult: float = 2.0
+    rsi_min: float = 55.0
+    ema_len: int = 20
+    st_len: int = 10
+    st_mult: float = 3.0
+    bar_settle_sec: float = SETTLE_SEC   # wake this long after each 1H close
+    bar_wait_sec: float = 5.0            # re-poll this long for the new candle to show up
+
+
+def build_runtime_cfg(cfg_raw: Any) -> RuntimeCfg:
+    return RuntimeCfg(
+        poll_sec=int(cfg_get(cfg_raw, "poll_sec", 60)),
+        atr_mult=float(cfg_get(cfg_raw, "atr_mult", 2.0)),
+        rsi_min=float(cfg_get(cfg_raw, "rsi_min", 55.0)),
+        ema_len=int(cfg_get(cfg_raw, "ema_len", 20)),
+        st_len=int(cfg_get(cfg_raw, "st_len", 10)),
+        st_mult=float(cfg_get(cfg_raw, "st_mult", 3.0)),
+        bar_settle_sec=float(cfg_get(cfg_raw, "bar_settle_sec", SETTLE_SEC)),
+        bar_wait_sec=float(cfg_get(cfg_raw, "bar_wait_sec", 5.0)),
+    )
+
+
+BAR_RETRY_SEC = 0.5
+
+
+# Example Conditions (customize later); evaluated on the snapshot, order = snapshot["conds"]
+SPOT_SIGNAL_RULES = RuleSet({
+    "trend": "close > ema20",
+    "supertrend": "st_dir == 1",        # supertrend bullish
+    "momentum": "rsi >= 55.0",
+    "sanity": "atr14 > 0",
+})
+
+
+def compute_signal_from_spot_df(df):
+    """
+    Returns:
+        snapshot: Dict[str, Any]
+    """
+    close_series = df["close"].astype(float).tolist()
+    high_series = df["high"].astype(float).tolist()
+    low_series = df["low"].astype(float).tolist()
+
+    st_val, st_dir, st_prev = calc_supertrend(
+        highs=high_series,
+        lows=low_series,
+        closes=close_series,
+        period=10,
+        multiplier=3.0,
+    )
+    rsi = calc_rsi14(close_series)
+    ema20 = calc_ema(close_series, length=20)
+    atr14 = calc_atr14(high_series, low_series, close_series)
+
+    close = close_series[-1]
+
+    snapshot = {
+        "close": close,
+        "st_val": st_val,
+        "st_dir": st_dir,
+        "st_prev": st_prev,
+        "rsi": rsi,
+        "ema20": ema20,
+        "atr14": atr14,
+    }
+    snapshot["conds"] = list(SPOT_SIGNAL_RULES.last(snapshot).values())
+    return snapshot
+
+
+def run(cfg_raw: Any = None, broker: Any = None, cycles: int = 0) -> None:
+    """cycles: stop after that many fetch rounds (boot + one per bar close; 0 = run forever)."""
+    # Issue logger
+    issue = IssueLogger(out_dir=OUTPUT_DIR)
+
+    # Boot event
+    event_log("BOOT", {"msg": "prototype v8 starting"})
+
+    # Load config (may return dict or Config)
+    cfg_raw = cfg_raw if cfg_raw is not None else load_config()
+    cfg = build_runtime_cfg(cfg_raw)
+    spot_token = str(cfg_get(cfg_raw, "nifty_spot_token", "") or cfg_get(cfg_raw, "spot_token", ""))
+
+    broker = broker or ShoonyaAdapterV5(token=spot_token)
+    ok = broker.login()
+    if not ok:
+        issue.track_runtime_error(
+            "E_LOGIN",
+            "Shoonya login failed",
+            {"last_error": broker.last_error},
+        )
+        event_log("BROKER_LOGIN_FAIL", {"err": broker.last_error})
+        return
+
+    event_log("BROKER_LOGIN_OK", {"code": "OK"})
+    spot_token = str(getattr(broker, "token", "") or spot_token)
+
+    last_candle_key: Optional[int] = None
+
+    # 09:15-anchored 1H closes (broker 60m bars): fetch right after each boundary, idle in between
+    bars = BarClock("1h_915", settle_sec=cfg.bar_settle_sec)
+    closed_at: Optional[float] = None  # boot: fetch straight away
+
+    cycle = 0
+    while True:
+        seen = False
+        if closed_at is not None:
+            # the post-close fetch must reach the broker, not the single-flight cache
+            market_data.MARKET_DATA.invalidate(("NSE", spot_token, "tpseries:60"))
+        try:
+            # Use pack function to avoid SSL hang and to get meta
+            spot_pack = broker.get_spot_candles_1h_pack()
+            spot_df = spot_pack["df"]
+            meta = spot_pack.get("meta", {})
+
+            # candle time key - use ssboe if present (adapter meta calls it "ssboe")
+            candle_ts = int(meta.get("last_ssboe") or meta.get("ssboe") or 0) if meta else 0
+
+            # heartbeat
+            event_log("HEARTBEAT", {
+                "close": float(spot_df["close"].iloc[-1]),
+                "last_ssboe": candle_ts,
+            })
+
+            # candle close detection
+            if candle_ts and candle_ts != last_candle_key:
+                last_candle_key = candle_ts
+                seen = True
+                if closed_at is not None:
+                    metrics.observe("bar_close_to_step_seconds", clock.time() - closed_at, tf=bars.tf)
+
+                snap = compute_signal_from_spot_df(spot_df)
+                event_log("CANDLE_CLOSE_SIGNAL", {
+                    "ssboe": candle_ts,
+                    **snap
+                })
+
+            # mark healthy if no exception
+            issue.mark_healthy()
+
+        except Exception as e:
+            issue.track_runtime_error(
+                "E_RUNTIME",
+                "Runtime exception in main loop",
+                {"exc": repr(e)},
+            )
+            event_log("RUNTIME_EXCEPTION", {"exc": repr(e)})
+
+        # the broker may publish the new candle a moment after the boundary: re-poll briefly
+        if closed_at is not None and not seen and clock.time() < closed_at + cfg.bar_wait_sec:
+            clock.sleep(BAR_RETRY_SEC)
+            continue
+        cycle += 1
+        if cycles and cycle >= cycles:
+            break
+        closed_at = bars.wait()
+
+
+if __name__ == "__main__":
+    run()
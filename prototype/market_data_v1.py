@@ -0,0 +1,150 @@
+"""
+MARKET DATA V1
+Shared market-data service for quotes and candle series, keyed by
+(exchange, token, kind). Concurrent callers for the same key share one
+in-flight broker call (single-flight), and a short freshness cache serves
+near-simultaneous repeats (bot_loop quote -> scan VIX -> execution spot,
+network_guard / adapter 1h candles) without another round trip.
+
+    from prototype import market_data_v1 as market_data
+    q = market_data.quote(api, "NSE", "26017", max_age=5.0)      # Quote (parsed once) or None
+    rows = market_data.series(api, "NSE", "26000", "60", starttime=st)   # TPSeries rows
+
+Series requests coalesce when a cached / in-flight fetch covers them (same
+interval and end, start at or before the requested start); the wider result
+is trimmed to the requested window. Failures and empty replies are shared
+with waiters but never cached. Time comes from prototype.clock.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prototype import clock, metrics
+from prototype.market_types_v1 import Quote
+
+Key = Tuple[str, str, str]        # (exchange, token, kind)
+Window = Tuple[float, Optional[float]]
+
+QUOTE_TTL_SEC = 1.0
+SERIES_TTL_SEC = 30.0
+JOIN_TIMEOUT_SEC = 30.0
+
+
+@dataclass
+class _Flight:
+    window: Optional[Window] = None
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Entry:
+    value: Any
+    at: float                      # clock.monotonic() when fetched
+    window: Optional[Window] = None
+
+
+def _covers(have: Optional[Window], want: Optional[Window]) -> bool:
+    if have is None or want is None:
+        return have is want
+    return have[0] <= want[0] and have[1] == want[1]
+
+
+class MarketData:
+    def __init__(self, join_timeout: float = JOIN_TIMEOUT_SEC):
+        self.join_timeout = join_timeout
+        self._lock = threading.Lock()
+        self._cache: Dict[Key, _Entry] = {}
+        self._flights: Dict[Key, _Flight] = {}
+        self.stats = {"hits": 0, "joins": 0, "fetches": 0}
+
+    def get(self, key: Key, fetch: Callable[[], Any], max_age: float,
+            window: Optional[Window] = None) -> Any:
+        """Fresh cached value, else join the in-flight call, else fetch (and let others join)."""
+        with self._lock:
+            ent = self._cache.get(key)
+            if ent is not None and clock.monotonic() - ent.at <= max_age and _covers(ent.window, window):
+                return self._count("hits", key, ent.value)
+            fl = self._flights.get(key)
+            if fl is not None and _covers(fl.window, window):
+                self._count("joins", key)
+            else:
+                self._count("fetches", key)
+                own = _Flight(window)
+                if fl is None:
+                    self._flights[key] = own
+                fl = None
+        if fl is not None:
+            if fl.done.wait(self.join_timeout):
+                if fl.error is not None:
+                    raise fl.error
+                return fl.value
+            own = _Flight(window)  # leader stuck past join_timeout: fetch on our own
+        return self._run(key, own, fetch)
+
+    def _run(self, key: Key, fl: _Flight, fetch: Callable[[], Any]) -> Any:
+        try:
+            fl.value = fetch()
+        except BaseException as e:
+            fl.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is fl:
+                    del self._flights[key]
+                if fl.error is None and fl.value:
+                    self._cache[key] = _Entry(fl.value, clock.monotonic(), fl.window)
+            fl.done.set()
+        return fl.value
+
+    def _count(self, outcome: str, key: Key, value: Any = None) -> Any:
+        self.stats[outcome] += 1
+        metrics.inc("market_data_requests_total", kind=key[2].split(":", 1)[0], outcome=outcome)
+        return value
+
+    def invalidate(self, key: Optional[Key] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+
+MARKET_DATA = MarketData()
+
+
+def quote(api: Any, exchange: str, token: str, max_age: float = QUOTE_TTL_SEC,
+          fetch: Optional[Callable[[], Any]] = None) -> Optional[Quote]:
+    """Quote for (exchange, token), parsed once per round trip; fetch overrides the transport
+    (default NorenApi get_quotes) and returns the raw GetQuotes reply."""
+    key = (exchange, str(token), "quote")
+    raw = fetch or (lambda: api.get_quotes(exchange=exchange, token=token))
+    return MARKET_DATA.get(key, lambda: Quote.from_reply(raw(), exchange, str(token)), max_age)
+
+
+def session_start(now: Optional[float] = None) -> float:
+    """Local midnight today (NorenApi's default TPSeries start)."""
+    d = datetime.fromtimestamp(clock.time() if now is None else now)
+    return d.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def series(api: Any, exchange: str, token: str, interval: str, starttime: Optional[float] = None,
+           endtime: Optional[float] = None, max_age: float = SERIES_TTL_SEC) -> Optional[List[Dict[str, Any]]]:
+    """TPSeries rows (newest first, as Noren) from starttime (default: session start) to endtime/now."""
+    st = float(starttime) if starttime is not None else session_start()
+    et = float(endtime) if endtime is not None else None
+    key = (exchange, str(token), f"tpseries:{interval}")
+
+    def fetch() -> Any:
+        return api.get_time_price_series(exchange=exchange, token=token, starttime=str(int(st)),
+                                         endtime=None if et is None else str(int(et)), interval=interval)
+
+    out = MARKET_DATA.get(key, fetch, max_age, window=(st, et))
+    if isinstance(out, list) and out and float(out[-1].get("ssboe") or st) < st:
+        out = [r for r in out if float(r.get("ssboe") or 0) >= st]
+    return out
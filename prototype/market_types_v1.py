@@ -0,0 +1,137 @@
+"""
+MARKET TYPES V1
+Compact market-data records parsed once at the broker boundary:
+
+    Quote     slotted GetQuotes snapshot (ltp / close / bid / ask as floats)
+    Bar       slotted OHLCV bar
+    BarBatch  array-backed bars (NumPy columns, oldest -> newest)
+
+Replaces dict-of-dicts ({"VIX": {"ltp": .., "close": ..}}) and string-keyed
+TPSeries rows ('into'/'inth'/'intl'/'intc') downstream of the parse, so the
+hot path does no repeated float() coercion or per-tick dict allocation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from prototype import clock
+
+
+def _num(x: Any) -> float:
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(slots=True)
+class Quote:
+    exch: str
+    token: str
+    ltp: float = 0.0
+    close: float = 0.0          # previous close (0.0 when the broker omits it)
+    bid: float = 0.0
+    ask: float = 0.0
+    ts: float = 0.0             # clock.time() at parse
+
+    @classmethod
+    def from_reply(cls, reply: Optional[Dict[str, Any]], exch: str = "", token: str = "") -> Optional["Quote"]:
+        """GetQuotes reply -> Quote (None unless stat is Ok)."""
+        if not reply or reply.get("stat") != "Ok":
+            return None
+        g = reply.get
+        ltp = _num(g("lp") or g("ltp") or g("last_price"))
+        close = _num(g("c") or g("pc") or g("close") or g("prev_close"))
+        return cls(exch or str(g("exch", "")), token or str(g("token", "")), ltp, close,
+                   _num(g("bp1")), _num(g("sp1")), clock.time())
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"ltp": self.ltp, "close": self.close}
+
+
+NO_QUOTE = Quote("", "")          # shared placeholder for missing quotes; never mutate
+
+
+@dataclass(slots=True)
+class Bar:
+    ssboe: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Bar":
+        g = row.get
+        return cls(int(_num(g("ssboe"))), _num(g("into")), _num(g("inth")), _num(g("intl")),
+                   _num(g("intc")), _num(g("intv")))
+
+
+_COLUMNS = (("open", "into"), ("high", "inth"), ("low", "intl"), ("close", "intc"), ("volume", "intv"))
+
+
+class BarBatch:
+    """Columnar bars, oldest first: ssboe int64 plus float64 OHLCV arrays of equal length."""
+
+    __slots__ = ("ssboe", "open", "high", "low", "close", "volume")
+
+    def __init__(self, ssboe: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: Optional[np.ndarray] = None):
+        self.ssboe = ssboe
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = np.zeros(len(close)) if volume is None else volume
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "BarBatch":
+        """Noren TPSeries rows (newest first, string fields) -> chronological arrays in one pass per column."""
+        rows = [r for r in reversed(rows) if isinstance(r, dict)]
+        cols = {}
+        for name, src in _COLUMNS:
+            try:
+                cols[name] = np.array([r.get(src) or 0 for r in rows], dtype=np.float64)
+            except (TypeError, ValueError):
+                cols[name] = np.array([_num(r.get(src)) for r in rows], dtype=np.float64)
+        ssboe = np.array([_num(r.get("ssboe")) for r in rows], dtype=np.float64).astype(np.int64)
+        return cls(ssboe, **cols)
+
+    @classmethod
+    def empty(cls) -> "BarBatch":
+        z = np.zeros(0)
+        return cls(z.astype(np.int64), z, z, z, z, z)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, i: int) -> Bar:
+        return Bar(int(self.ssboe[i]), float(self.open[i]), float(self.high[i]), float(self.low[i]),
+                   float(self.close[i]), float(self.volume[i]))
+
+    def __iter__(self) -> Iterator[Bar]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def last(self) -> Optional[Bar]:
+        return self[-1] if len(self) else None
+
+    def to_frame(self, tz_offset_sec: Optional[int] = None):
+        """pandas OHLCV frame with bar 'time' (local wall clock, as Noren's 'time' field), chronological."""
+        import pandas as pd
+
+        if tz_offset_sec is None:
+            t = int(self.ssboe[-1]) if len(self) else 0
+            tz_offset_sec = int(datetime.fromtimestamp(t).replace(tzinfo=timezone.utc).timestamp()) - t
+
+        return pd.DataFrame({
+            "time": pd.to_datetime(self.ssboe + tz_offset_sec, unit="s"),
+            "open": self.open, "high": self.high, "low": self.low,
+            "close": self.close, "volume": self.volume,
+        })
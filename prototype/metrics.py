@@ -0,0 +1,290 @@
+"""
+METRICS
+Low-overhead in-process counters / gauges / latency histograms with
+Prometheus text exposition (served by api_server.py GET /metrics).
+
+    from prototype import metrics
+
+    with metrics.timed("model_e_scan_seconds"):
+        ...
+    metrics.observe("order_place_seconds", dt, leg="hedge")
+    metrics.inc("broker_requests_total", route="GetQuotes", outcome="ok")
+
+Histograms use fixed buckets (0.5ms .. 30s) and a bisect per observation;
+label sets are resolved to a child once and cached, so the hot path is a
+dict lookup, a bisect and two adds under a lock.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in items) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        out = []
+        if self.help:
+            out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} {self.kind}")
+        return out
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = ""):
+        super().__init__(name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(k)} {_fmt_num(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = float(value)
+
+
+class _HistChild:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n: int):
+        self.counts = [0] * (n + 1)  # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._children: Dict[LabelKey, _HistChild] = {}
+
+    def _child(self, k: LabelKey) -> _HistChild:
+        c = self._children.get(k)
+        if c is None:
+            with self._lock:
+                c = self._children.setdefault(k, _HistChild(len(self.buckets)))
+        return c
+
+    def observe(self, value: float, **labels: Any) -> None:
+        c = self._child(_key(labels) if labels else ())
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            c.counts[i] += 1
+            c.sum += value
+            c.count += 1
+
+    def snapshot(self, **labels: Any) -> Dict[str, Any]:
+        c = self._children.get(_key(labels))
+        if c is None:
+            return {"count": 0, "sum": 0.0, "p50": 0.0, "p99": 0.0}
+        with self._lock:
+            counts, total, n = list(c.counts), c.sum, c.count
+        return {"count": n, "sum": total, "p50": self._quantile(counts, n, 0.5), "p99": self._quantile(counts, n, 0.99)}
+
+    def _quantile(self, counts: List[int], n: int, q: float) -> float:
+        """Upper bucket bound containing the q-quantile (Prometheus-style estimate)."""
+        if n == 0:
+            return 0.0
+        target, acc = q * n, 0
+        for i, c in enumerate(counts):
+            acc += c
+            if acc >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def render(self) -> List[str]:
+        out = self.header()
+        with self._lock:
+            items = sorted((k, list(c.counts), c.sum, c.count) for k, c in self._children.items())
+        for k, counts, total, n in items:
+            acc = 0
+            for b, c in zip(self.buckets + (float("inf"),), counts):
+                acc += c
+                out.append(f"{self.name}_bucket{_fmt_labels(k, ('le', _fmt_num(b)))} {acc}")
+            out.append(f"{self.name}_sum{_fmt_labels(k)} {_fmt_num(total)}")
+            out.append(f"{self.name}_count{_fmt_labels(k)} {n}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kw) -> Any:
+        m = self._metrics.get(name)
+        if m is None:
+            with self._lock:
+                m = self._metrics.get(name)
+                if m is None:
+                    m = cls(name, help, **kw)
+                    self._metrics[name] = m
+        if not isinstance(m, cls):
+            raise TypeError(f"metric {name} already registered as {m.kind}")
+        return m
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[k] for k in sorted(self._metrics)]
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =========================
+# Shortcuts
+# =========================
+
+def now() -> float:
+    """Monotonic wall timer for latency spans (not the injectable clock)."""
+    return time.perf_counter()
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    REGISTRY.counter(name).inc(amount, **labels)
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    REGISTRY.gauge(name).set(value, **labels)
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    REGISTRY.histogram(name).observe(seconds, **labels)
+
+
+@contextlib.contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """Observe wall time of the block (also on exceptions)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.histogram(name).observe(time.perf_counter() - t0, **labels)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# =========================
+# Broker HTTP instrumentation
+# =========================
+
+class InstrumentedHTTP:
+    """
+    Wraps a requests-like module: post() is timed per broker route into
+    broker_request_seconds{route} and counted in broker_requests_total{route,outcome}.
+    """
+
+    def __init__(self, real: Any):
+        self._real = real
+
+    def post(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        route = str(url).rstrip("/").rsplit("/", 1)[-1]
+        t0 = time.perf_counter()
+        try:
+            res = self._real.post(url, *args, **kwargs)
+        except Exception:
+            observe("broker_request_seconds", time.perf_counter() - t0, route=route)
+            inc("broker_requests_total", route=route, outcome="exception")
+            raise
+        observe("broker_request_seconds", time.perf_counter() - t0, route=route)
+        code = int(getattr(res, "status_code", 200) or 200)
+        inc("broker_requests_total", route=route, outcome="ok" if code < 400 else f"http_{code}")
+        return res
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+def instrument_noren() -> None:
+    """Time NorenRestApiPy round trips (its module-level `requests`). Idempotent."""
+    import NorenRestApiPy.NorenApi as noren_mod
+
+    if not is_wrapped(noren_mod.requests, InstrumentedHTTP):
+        noren_mod.requests = InstrumentedHTTP(noren_mod.requests)
+
+
+def is_wrapped(obj: Any, cls: type) -> bool:
+    """True if obj or any wrapper beneath it (via ._real) is a cls."""
+    while obj is not None:
+        if isinstance(obj, cls):
+            return True
+        obj = vars(obj).get("_real") if hasattr(obj, "__dict__") else None
+    return False
@@ -0,0 +1,445 @@
+"""
+MODEL E BACKTEST V1
+Vectorized replay of archived NIFTY 1m bars + VIX through the live Model E rules:
+- 1m -> 1H resample (clock hours, same as model_e_logic)
+- RSI(19) SMA, EMA(20), ATR(14) SMA, SuperTrend(1.1) simple flip
+- Entry: ST flip up AND RSI < 65 AND close > ST line AND close > EMA20
+- Sizing: get_vaps_lots(VIX, equity)
+- Exits: close - 2xATR stop (intrabar on 1m lows), Friday 15:15 square off
+- Journal: 8 pts friction per round trip
+
+All indicator work runs on NumPy arrays; only the (sparse) signal list is walked
+in Python, so multi-year 1m histories replay in well under a second.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_e_logic import get_gear_from_vix, get_vaps_lots, model_e_entry_rules
+from prototype.clock import IST_OFFSET_SEC
+from prototype.indicator_lib_v1 import atr_sma, ema as ema_np, rsi_sma, supertrend_simple
+
+# Same blueprint constants as bot.py
+CAPITAL = 500000.00
+FRICTION_PTS = 8.0
+LOT_SIZE = 50
+
+FRIDAY = 4
+FRIDAY_EXIT_MINUTE = 15 * 60 + 15
+
+OUT_DIR = os.path.join("prototype", "outputs")
+LEDGER_PATH = os.path.join(OUT_DIR, "model_e_backtest_trades.csv")
+EQUITY_PATH = os.path.join(OUT_DIR, "model_e_backtest_equity.jsonl")
+
+
+@dataclass(frozen=True)
+class ModelEParams:
+    """
+    Model E thresholds (defaults = live bot values).
+    """
+    rsi_len: int = 19
+    rsi_max: float = 65.0
+    ema_len: int = 20
+    atr_len: int = 14
+    st_mult: float = 1.1
+    sl_atr_mult: float = 2.0
+    vix_low: float = 14.0
+    vix_mid: float = 16.0
+    vix_high: float = 18.0
+    friction_pts: float = FRICTION_PTS
+    lot_size: int = LOT_SIZE
+
+    def vix_bounds(self) -> Tuple[float, float, float]:
+        return (self.vix_low, self.vix_mid, self.vix_high)
+
+
+@dataclass
+class HourlyBars:
+    """
+    1H bars built from 1m arrays.
+    start_idx/end_idx point back into the 1m arrays (inclusive).
+    """
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+
+
+@dataclass
+class BacktestTrade:
+    entry_time: str
+    exit_time: str
+    entry_price: float
+    exit_price: float
+    stop_loss: float
+    lots: int
+    qty: int
+    vix: float
+    gear: int
+    rsi: float
+    atr: float
+    pnl_points: float
+    pnl_value: float
+    reason_exit: str
+
+
+@dataclass
+class BacktestResult:
+    trades: List[BacktestTrade]
+    times: np.ndarray
+    equity: np.ndarray
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": self.summary,
+            "trades": [asdict(t) for t in self.trades],
+        }
+
+
+# =========================
+# NumPy indicator kernels
+# =========================
+
+def ist_minutes(times: np.ndarray) -> np.ndarray:
+    """
+    IST wall-clock minutes since 1970-01-01 00:00 (the axis hour buckets and the
+    Friday exit are computed on). datetime64 (any unit) is taken as IST wall
+    clock, like model_e_logic's `time` column; numbers are UTC epoch seconds.
+    """
+    t = np.asarray(times)
+    if np.issubdtype(t.dtype, np.datetime64):
+        return t.astype("datetime64[m]", copy=False).view(np.int64)   # no copy when already minutes (mmap'd sweep input)
+    return (t.astype(np.int64) + IST_OFFSET_SEC) // 60
+
+
+def resample_hourly(times: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                    low: np.ndarray, close: np.ndarray) -> HourlyBars:
+    """
+    Clock-hour buckets (09:00, 10:00, ...) exactly like
+    df.resample('1H', on='time') in model_e_logic. Input must be sorted.
+    """
+    mins = ist_minutes(times)
+    n = len(mins)
+    if n == 0:
+        empty = np.empty(0, dtype=float)
+        idx = np.empty(0, dtype=np.int64)
+        return HourlyBars(empty, empty, empty, empty, idx, idx)
+
+    hour_key = mins // 60
+    starts = np.flatnonzero(np.r_[True, hour_key[1:] != hour_key[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    return HourlyBars(
+        open=np.asarray(open_, dtype=float)[starts],
+        high=np.maximum.reduceat(np.asarray(high, dtype=float), starts),
+        low=np.minimum.reduceat(np.asarray(low, dtype=float), starts),
+        close=np.asarray(close, dtype=float)[ends],
+        start_idx=starts,
+        end_idx=ends,
+    )
+
+
+def compute_hourly_indicators(bars: HourlyBars, params: ModelEParams = ModelEParams()) -> Dict[str, np.ndarray]:
+    """
+    Model E indicators from indicator_lib_v1 (same kernels as model_e_logic, same NaN layout).
+    """
+    high, low, close = bars.high, bars.low, bars.close
+
+    rsi = rsi_sma(close, params.rsi_len)
+    ema = ema_np(close, params.ema_len)
+    atr = atr_sma(high, low, close, params.atr_len)
+    st_dir, st_line, upper, lower = supertrend_simple(high, low, close, atr, params.st_mult)
+
+    return {
+        "rsi": rsi,
+        "ema20": ema,
+        "atr": atr,
+        "upperband": upper,
+        "lowerband": lower,
+        "st_direction": st_dir,
+        "st_line": st_line,
+    }
+
+
+def entry_signals(bars: HourlyBars, ind: Dict[str, np.ndarray], params: ModelEParams = ModelEParams()) -> np.ndarray:
+    """Boolean per 1H bar: the compiled MODEL_E_ENTRY_RULES that bot.scan_for_model_e checks on the last bar."""
+    return model_e_entry_rules(params.rsi_max).mask(dict(ind, close=bars.close))
+
+
+# =========================
+# Trade simulation
+# =========================
+
+def _first_at_or_below(arr: np.ndarray, level: float, start: int, chunk: int = 4096) -> int:
+    """First index >= start with arr[i] <= level, else -1 (chunked, no full scans)."""
+    n = len(arr)
+    i = start
+    while i < n:
+        hit = np.flatnonzero(arr[i:i + chunk] <= level)
+        if len(hit):
+            return i + int(hit[0])
+        i += chunk
+    return -1
+
+
+def _iso_minute(m: int) -> str:
+    return str(np.datetime64(int(m), "m"))
+
+
+def run_backtest_arrays(
+    times: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    vix: np.ndarray,
+    params: ModelEParams = ModelEParams(),
+    capital: float = CAPITAL,
+    compound: bool = False,
+    bars: Optional[HourlyBars] = None,
+) -> BacktestResult:
+    """
+    times: datetime64 (IST wall clock) or UTC epoch seconds, sorted, one per 1m bar
+    vix:   India VIX aligned to the 1m bars (forward filled)
+    compound=False keeps net_equity fixed at capital, like the live bot.
+    """
+    open_ = np.asarray(open_, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    vix = np.asarray(vix, dtype=float)
+    mins = ist_minutes(times)
+    n = len(mins)
+
+    if bars is None:
+        bars = resample_hourly(mins.astype("datetime64[m]"), open_, high, low, close)
+    ind = compute_hourly_indicators(bars, params)
+    sig_idx = np.flatnonzero(entry_signals(bars, ind, params))
+
+    # Friday >= 15:15 minute bars (1970-01-01 was a Thursday -> weekday 3)
+    weekday = (mins // 1440 + 3) % 7
+    minute_of_day = mins % 1440
+    friday_idx = np.flatnonzero((weekday == FRIDAY) & (minute_of_day >= FRIDAY_EXIT_MINUTE))
+
+    trades: List[BacktestTrade] = []
+    entry_at: List[int] = []
+    exit_at: List[int] = []
+    qtys: List[int] = []
+
+    equity = float(capital)
+    busy_until = -1
+    skipped_gear0 = 0
+
+    for h in sig_idx.tolist():
+        i_entry = int(bars.end_idx[h])
+        if i_entry <= busy_until:
+            continue  # scanner is idle while a position is active
+
+        cur_vix = float(vix[i_entry])
+        lots = int(get_vaps_lots(cur_vix, equity if compound else capital, bounds=params.vix_bounds()))
+        if lots <= 0:
+            skipped_gear0 += 1
+            continue
+
+        entry = float(bars.close[h])
+        atr = float(ind["atr"][h])
+        sl = entry - params.sl_atr_mult * atr
+        qty = lots * params.lot_size
+
+        j0 = i_entry + 1
+        j_stop = _first_at_or_below(low, sl, j0)
+        k = int(np.searchsorted(friday_idx, j0))
+        j_fri = int(friday_idx[k]) if k < len(friday_idx) else -1
+
+        cands = [j for j in (j_stop, j_fri) if j >= 0]
+        if cands:
+            j_exit = min(cands)
+            if j_exit == j_stop:
+                reason = "STOP_LOSS"
+                exit_px = min(float(open_[j_exit]), sl)  # gap through stop fills at open
+            else:
+                reason = "FRIDAY_EXIT"
+                exit_px = float(open_[j_exit])
+        else:
+            j_exit = n - 1
+            reason = "END_OF_DATA"
+            exit_px = float(close[j_exit])
+
+        pnl_points = exit_px - entry - params.friction_pts
+        pnl_value = pnl_points * qty
+        equity += pnl_value
+        busy_until = j_exit
+
+        trades.append(BacktestTrade(
+            entry_time=_iso_minute(mins[i_entry]),
+            exit_time=_iso_minute(mins[j_exit]),
+            entry_price=entry,
+            exit_price=exit_px,
+            stop_loss=sl,
+            lots=lots,
+            qty=qty,
+            vix=cur_vix,
+            gear=int(get_gear_from_vix(cur_vix, bounds=params.vix_bounds())),
+            rsi=float(ind["rsi"][h]),
+            atr=atr,
+            pnl_points=pnl_points,
+            pnl_value=pnl_value,
+            reason_exit=reason,
+        ))
+        entry_at.append(i_entry)
+        exit_at.append(j_exit)
+        qtys.append(qty)
+
+    curve = _equity_curve(n, close, capital, trades, entry_at, exit_at, qtys)
+    summary = summarize(trades, curve, capital)
+    summary["signals"] = int(len(sig_idx))
+    summary["skipped_gear0"] = skipped_gear0
+    summary["bars_1m"] = n
+    summary["bars_1h"] = int(len(bars.close))
+
+    return BacktestResult(trades=trades, times=mins, equity=curve, summary=summary)
+
+
+def _equity_curve(n: int, close: np.ndarray, capital: float, trades: List[BacktestTrade],
+                  entry_at: List[int], exit_at: List[int], qtys: List[int]) -> np.ndarray:
+    """
+    Mark-to-market equity per 1m bar:
+    capital + realized (booked at exit bar) + open qty * (close - entry).
+    """
+    if n == 0:
+        return np.empty(0)
+
+    realized = np.zeros(n)
+    open_qty = np.zeros(n)
+    open_cost = np.zeros(n)
+
+    if trades:
+        e = np.asarray(entry_at)
+        x = np.asarray(exit_at)
+        q = np.asarray(qtys, dtype=float)
+        px = np.asarray([t.entry_price for t in trades])
+        np.add.at(realized, x, [t.pnl_value for t in trades])
+        # position is open on bars [entry, exit)
+        np.add.at(open_qty, e, q)
+        np.add.at(open_qty, x, -q)
+        np.add.at(open_cost, e, q * px)
+        np.add.at(open_cost, x, -q * px)
+
+    open_qty = np.cumsum(open_qty)
+    open_cost = np.cumsum(open_cost)
+    return capital + np.cumsum(realized) + (open_qty * close - open_cost)
+
+
+def summarize(trades: List[BacktestTrade], curve: np.ndarray, capital: float) -> Dict[str, Any]:
+    pnl = np.asarray([t.pnl_value for t in trades], dtype=float)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl <= 0]
+
+    if len(curve):
+        peak = np.maximum.accumulate(curve)
+        dd = curve - peak
+        max_dd = float(dd.min())
+        max_dd_pct = float((dd / peak).min() * 100.0)
+        final = float(curve[-1])
+    else:
+        max_dd = max_dd_pct = 0.0
+        final = float(capital)
+
+    gross_loss = float(-losses.sum()) if len(losses) else 0.0
+    return {
+        "trades": int(len(trades)),
+        "wins": int(len(wins)),
+        "win_rate": float(len(wins) / len(trades) * 100.0) if trades else 0.0,
+        "net_pnl": float(pnl.sum()) if len(pnl) else 0.0,
+        "profit_factor": float(wins.sum() / gross_loss) if gross_loss > 0 else 0.0,
+        "final_equity": final,
+        "return_pct": (final - capital) / capital * 100.0 if capital else 0.0,
+        "max_drawdown": max_dd,
+        "max_drawdown_pct": max_dd_pct,
+    }
+
+
+# =========================
+# IO helpers
+# =========================
+
+def load_1m_csv(path: str, default_vix: float = 15.0) -> Dict[str, np.ndarray]:
+    """
+    CSV columns: time,open,high,low,close[,vix]
+    time is IST wall clock (e.g. 2024-01-05 09:15:00).
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df["time"] = pd.to_datetime(df["time"])
+    df = df.sort_values("time").reset_index(drop=True)
+    vix = df["vix"].ffill().bfill() if "vix" in df.columns else pd.Series(default_vix, index=df.index)
+    return {
+        "times": df["time"].to_numpy(dtype="datetime64[m]"),
+        "open": df["open"].to_numpy(dtype=float),
+        "high": df["high"].to_numpy(dtype=float),
+        "low": df["low"].to_numpy(dtype=float),
+        "close": df["close"].to_numpy(dtype=float),
+        "vix": vix.to_numpy(dtype=float),
+    }
+
+
+def run_backtest(data: Dict[str, np.ndarray], params: ModelEParams = ModelEParams(),
+                 capital: float = CAPITAL, compound: bool = False) -> BacktestResult:
+    return run_backtest_arrays(
+        data["times"], data["open"], data["high"], data["low"], data["close"], data["vix"],
+        params=params, capital=capital, compound=compound,
+    )
+
+
+def write_ledger_csv(path: str, trades: List[BacktestTrade]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fields = list(BacktestTrade.__dataclass_fields__.keys())
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for t in trades:
+            w.writerow(asdict(t))
+
+
+def write_equity_jsonl(path: str, result: BacktestResult, every: int = 60) -> None:
+    """Equity curve sampled every N 1m bars (plus the final bar)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    n = len(result.equity)
+    idx = np.r_[np.arange(0, n, max(1, every)), n - 1] if n else np.empty(0, dtype=np.int64)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in np.unique(idx).tolist():
+            f.write(json.dumps({"ts": _iso_minute(result.times[i]), "equity": float(result.equity[i])}) + "\n")
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        raise SystemExit("usage: python -m prototype.model_e_backtest_v1 <nifty_1m.csv>")
+
+    data = load_1m_csv(sys.argv[1])
+    t0 = time.perf_counter()
+    result = run_backtest(data)
+    elapsed = time.perf_counter() - t0
+
+    write_ledger_csv(LEDGER_PATH, result.trades)
+    write_equity_jsonl(EQUITY_PATH, result)
+
+    print(json.dumps({**result.summary, "elapsed_sec": round(elapsed, 3)}, indent=2))
+    print(f"✅ Ledger: {LEDGER_PATH}")
+    print(f"✅ Equity: {EQUITY_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+MTF ENGINE V1
+Multi-timeframe bars + indicators from ONE 1-minute base buffer per instrument.
+
+    engine = MultiTimeframeEngine()
+    engine.subscribe("26000", "1h", on_bar)            # on_bar(token, tf, Bar, IndicatorState)
+    engine.sync(api, "NSE", "26000")                   # delta-fetch new 1m bars only
+    engine.sync_close(api, "NSE", "26000", close)      # at a bar close (bar_clock_v1): fetch + close now
+    engine.ingest(token, bar) / engine.ingest_rows(token, tpseries_rows)
+    engine.bars("26000", "15m")                        # BarBatch of closed bars
+    engine.candlepack("26000", "1h_915")               # CandlePack (rows Noren-shaped)
+
+1m bars land in a fixed-size OHLCVRing; every timeframe in use keeps its own
+ring whose newest slot is the forming bar, revised in O(1) per 1m bar, and
+incremental indicators (indicator_lib_v1 EMA 20/50/200, RSI 14, ADX 14) updated
+once per closed bar. A timeframe requested later is back-filled from the 1m
+ring, so nothing is downloaded or resampled twice.
+
+Buckets are aligned in exchange wall-clock time (IST, as the broker 'time'
+field; never the host zone): "1h" is clock-hour (pandas resample('1H'), as model_e_logic), "1h_915" is
+anchored at 09:15 like broker 60-minute bars.
+
+Checkpoints: engine.restore(path) at boot loads the last checkpoint (indicator
+states, forming bars, the newest CHECKPOINT_BARS bars of every ring) and keeps
+writing it on every bar close, so after a restart sync() fetches only the gap
+since the newest checkpointed 1m bar and indicators continue bit-for-bit.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from prototype import clock, metrics
+from prototype.clock import IST_OFFSET_SEC
+from prototype import market_data_v1 as market_data
+from prototype.indicator_lib_v1 import ADX, EMA, RSI, SuperTrend, get_state, set_state
+from prototype.contracts import CandlePack
+from prototype.market_types_v1 import Bar, BarBatch
+from prototype.ohlcv_ring_v1 import OHLCVRing
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    name: str
+    minutes: int
+    offset_min: int = 0        # bucket anchor within the step (local time)
+
+
+TIMEFRAMES: Dict[str, Timeframe] = {
+    "1m": Timeframe("1m", 1),
+    "5m": Timeframe("5m", 5),
+    "15m": Timeframe("15m", 15),
+    "1h": Timeframe("1h", 60),
+    "1h_915": Timeframe("1h_915", 60, offset_min=15),
+    "1d": Timeframe("1d", 1440),
+}
+
+BASE_CAPACITY = 10_000         # 1m bars per instrument (~26 NSE sessions)
+TF_CAPACITY = 2_000            # closed bars kept per derived timeframe
+SEED_LOOKBACK_SEC = 24 * 3600  # first sync() history
+
+CHECKPOINT_PATH = os.path.join("prototype", "outputs", "mtf_checkpoint.json")
+CHECKPOINT_VERSION = 1
+CHECKPOINT_BARS = 500                     # newest bars kept per ring in a checkpoint
+CHECKPOINT_MAX_AGE_SEC = 5 * 24 * 3600    # older checkpoints are ignored (fresh seed)
+
+CLOSE_WAIT_SEC = 5.0           # sync_close: give the broker this long to publish the bar's last minute
+CLOSE_RETRY_SEC = 0.25
+
+
+def _z(v: float) -> float:
+    return 0.0 if math.isnan(v) else v
+
+
+def _ring_state(ring: OHLCVRing, n: int) -> Dict[str, List[float]]:
+    w = ring.window(n)
+    return {"ssboe": w.ssboe.tolist(), "open": w.open.tolist(), "high": w.high.tolist(),
+            "low": w.low.tolist(), "close": w.close.tolist(), "volume": w.volume.tolist()}
+
+
+def _load_ring(ring: OHLCVRing, cols: Dict[str, List[float]]) -> None:
+    ring.clear()
+    ring.extend(BarBatch(np.asarray(cols["ssboe"], dtype=np.int64),
+                         *(np.asarray(cols[k], dtype=float) for k in ("open", "high", "low", "close", "volume"))))
+
+
+# =========================
+# Incremental indicators
+# =========================
+
+class IndicatorState:
+    """Per (instrument, timeframe) indicators, advanced once per closed bar."""
+
+    __slots__ = ("ema_20", "ema_50", "ema_200", "rsi", "adx", "supertrend", "bars")
+
+    def __init__(self):
+        self.ema_20, self.ema_50, self.ema_200 = EMA(20), EMA(50), EMA(200)
+        self.rsi = RSI(14)
+        self.adx = ADX(14)
+        self.supertrend = SuperTrend(10, 3.0)
+        self.bars = 0
+
+    def update(self, b: Bar) -> None:
+        c = b.close
+        self.ema_20.update(c)
+        self.ema_50.update(c)
+        self.ema_200.update(c)
+        self.rsi.update(c)
+        self.adx.update(b.high, b.low, c)
+        self.supertrend.update(b.high, b.low, c)
+        self.bars += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        a = self.adx
+        return {
+            "ema_20": _z(self.ema_20.value),
+            "ema_50": _z(self.ema_50.value),
+            "ema_200": _z(self.ema_200.value),
+            "rsi_14": _z(self.rsi.value),
+            "adx_14": _z(a.adx),
+            "plus_di_14": _z(a.plus_di),
+            "minus_di_14": _z(a.minus_di),
+            "supertrend_10_3": _z(self.supertrend.value),
+            "st_dir": self.supertrend.direction,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) if k == "bars" else get_state(getattr(self, k)) for k in self.__slots__}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        for k in self.__slots__:
+            if k == "bars":
+                self.bars = int(state[k])
+            else:
+                set_state(getattr(self, k), state[k])
+
+
+# =========================
+# Per-timeframe aggregation
+# =========================
+
+class _Series:
+    """One derived timeframe of one instrument: bar ring (forming bar last) + indicators."""
+
+    __slots__ = ("tf", "step", "anchor", "tz", "ring", "forming", "start", "hi", "lo", "vol", "ind")
+
+    def __init__(self, tf: Timeframe, tz_offset: int, capacity: int):
+        self.tf = tf
+        self.step = tf.minutes * 60
+        self.anchor = tf.offset_min * 60
+        self.tz = tz_offset
+        self.ring = OHLCVRing(capacity + 1)     # + the forming bar, revised in place
+        self.forming = False
+        self.start = 0
+        self.hi = self.lo = self.vol = 0.0
+        self.ind = IndicatorState()
+
+    def bucket(self, ssboe: int) -> int:
+        local = ssboe + self.tz - self.anchor
+        return local - local % self.step + self.anchor - self.tz
+
+    def add(self, b: Bar) -> Optional[Bar]:
+        """Fold a 1m bar in; returns the bar that closed because of it (if any)."""
+        start = self.bucket(b.ssboe)
+        if not self.forming and self.ring.n and start <= self.start:
+            return None                         # late minute of a bar already closed by close_due
+        if self.forming and start == self.start:
+            if b.high > self.hi:
+                self.hi = b.high
+            if b.low < self.lo:
+                self.lo = b.low
+            self.vol += b.volume
+            self.ring.set_last(self.hi, self.lo, b.close, self.vol)
+            return None
+        done = self._close() if self.forming else None
+        self.ring.append(start, b.open, b.high, b.low, b.close, b.volume)
+        self.forming, self.start, self.hi, self.lo, self.vol = True, start, b.high, b.low, b.volume
+        return done
+
+    def close_due(self, now: float) -> Optional[Bar]:
+        if self.forming and self.start + self.step <= now:
+            return self._close()
+        return None
+
+    def _close(self) -> Bar:
+        self.forming = False
+        f = self.ring.last()
+        self.ind.update(f)
+        return f
+
+    def get_state(self, n: int) -> Dict[str, Any]:
+        return {"forming": self.forming, "start": self.start, "hi": self.hi, "lo": self.lo, "vol": self.vol,
+                "bars": _ring_state(self.ring, n), "ind": self.ind.get_state()}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.ind.set_state(state["ind"])
+        _load_ring(self.ring, state["bars"])
+        self.forming, self.start = bool(state["forming"]), int(state["start"])
+        self.hi, self.lo, self.vol = float(state["hi"]), float(state["lo"]), float(state["vol"])
+
+
+Callback = Callable[[str, str, Bar, IndicatorState], None]
+
+
+class _Instrument:
+    __slots__ = ("base", "series", "subs")
+
+    def __init__(self, capacity: int):
+        self.base = OHLCVRing(capacity)
+        self.series: Dict[str, _Series] = {}
+        self.subs: Dict[str, List[Callback]] = {}
+
+
+class MultiTimeframeEngine:
+    def __init__(self, base_capacity: int = BASE_CAPACITY, tf_capacity: int = TF_CAPACITY,
+                 tz_offset_sec: int = IST_OFFSET_SEC):
+        self.base_capacity = base_capacity
+        self.tf_capacity = tf_capacity
+        self.tz = int(tz_offset_sec)
+        self._lock = threading.RLock()
+        self._inst: Dict[str, _Instrument] = {}
+        self.checkpoint_path: Optional[str] = None
+        self.stats = {"bars_1m": 0, "fetches": 0, "closed": 0, "checkpoints": 0}
+
+    # ---- instruments / timeframes ----
+    def _instrument(self, token: str) -> _Instrument:
+        inst = self._inst.get(token)
+        if inst is None:
+            inst = self._inst[token] = _Instrument(self.base_capacity)
+        return inst
+
+    def _series(self, token: str, tf: str) -> _Series:
+        inst = self._instrument(token)
+        s = inst.series.get(tf)
+        if s is None:
+            s = inst.series[tf] = _Series(TIMEFRAMES[tf], self.tz, self.tf_capacity)
+            # back-fill from the 1m base: no re-download
+            hist = inst.base.window()
+            for i in range(len(hist)):
+                s.add(hist[i])
+        return s
+
+    def subscribe(self, token: str, tf: str, fn: Callback) -> None:
+        with self._lock:
+            self._series(token, tf)
+            self._instrument(token).subs.setdefault(tf, []).append(fn)
+
+    # ---- ingest ----
+    def ingest(self, token: str, b: Bar, checkpoint: bool = True) -> int:
+        """Append one closed 1m bar (older/duplicate bars are ignored); returns bars closed."""
+        with self._lock:
+            inst = self._instrument(token)
+            if inst.base.n and b.ssboe <= inst.base.last_ssboe():
+                return 0
+            inst.base.append_bar(b)
+            self.stats["bars_1m"] += 1
+            fired: List[Tuple[str, Bar]] = []
+            for name, s in inst.series.items():
+                done = s.add(b)
+                if done is not None:
+                    fired.append((name, done))
+            self.stats["closed"] += len(fired)
+        self._notify(token, inst, fired)
+        if fired and checkpoint:
+            self._checkpoint()
+        return len(fired)
+
+    def ingest_rows(self, token: str, rows: Any, until: Optional[float] = None) -> int:
+        """
+        TPSeries 1m rows (newest first) -> ingest oldest-first; returns new 1m bars.
+        until: ignore bars starting after it (the broker also returns the still-forming minute).
+        """
+        if not isinstance(rows, list) or not rows:
+            return 0
+        batch = BarBatch.from_rows(rows)
+        last = self._instrument(token).base.last_ssboe()
+        keep = batch.ssboe > last
+        if until is not None:
+            keep &= batch.ssboe <= until
+        new = closed = 0
+        for i in np.flatnonzero(keep).tolist():
+            closed += self.ingest(token, batch[i], checkpoint=False)
+            new += 1
+        if closed:
+            self._checkpoint()
+        return new
+
+    def close_due(self, token: str, now: Optional[float] = None) -> int:
+        """Close forming bars whose bucket has ended by `now` (e.g. the 15:00-15:30 hour at 15:30)."""
+        now = clock.time() if now is None else now
+        with self._lock:
+            inst = self._instrument(token)
+            fired = [(name, b) for name, s in inst.series.items() for b in [s.close_due(now)] if b is not None]
+            self.stats["closed"] += len(fired)
+        self._notify(token, inst, fired)
+        if fired:
+            self._checkpoint()
+        return len(fired)
+
+    def _notify(self, token: str, inst: _Instrument, fired: List[Tuple[str, Bar]]) -> None:
+        for name, b in fired:
+            for fn in inst.subs.get(name, ()):
+                fn(token, name, b, inst.series[name].ind)
+
+    def sync(self, api: Any, exchange: str, token: str, lookback_sec: float = SEED_LOOKBACK_SEC,
+             max_age: float = market_data.SERIES_TTL_SEC) -> int:
+        """Fetch only 1m bars newer than the buffer (seed: lookback_sec of history)."""
+        now = clock.time()
+        last = self._instrument(token).base.last_ssboe()
+        start = last + 60 if last else now - lookback_sec
+        rows = market_data.series(api, exchange, token, "1", starttime=start, max_age=max_age)
+        self.stats["fetches"] += 1
+        return self.ingest_rows(token, rows, until=now - 60)
+
+    def sync_close(self, api: Any, exchange: str, token: str, close: float, horizon: Optional[float] = None,
+                   lookback_sec: float = SEED_LOOKBACK_SEC, wait_sec: float = CLOSE_WAIT_SEC) -> int:
+        """
+        Bar-close event (bar_clock_v1.BarClock.wait): fetch uncached until the minute ending at
+        `close` is in (or wait_sec passes), then close the bars due by `horizon` (default close).
+        Returns bars closed; subscribers fire as usual.
+        """
+        deadline = clock.time() + wait_sec
+        while True:
+            self.sync(api, exchange, token, lookback_sec, max_age=0.0)
+            if self._instrument(token).base.last_ssboe() >= close - 60 or clock.time() >= deadline:
+                break
+            clock.sleep(CLOSE_RETRY_SEC)
+        return self.close_due(token, close if horizon is None else horizon)
+
+    # ---- checkpoints ----
+    def state(self, n: int = CHECKPOINT_BARS) -> Dict[str, Any]:
+        """Everything needed to resume: per instrument the newest n 1m bars and, per timeframe,
+        the newest n bars (forming one included), aggregation and indicator state."""
+        with self._lock:
+            return {
+                "version": CHECKPOINT_VERSION,
+                "saved_at": clock.time(),
+                "tz": self.tz,
+                "instruments": {
+                    token: {"base": _ring_state(inst.base, n),
+                            "series": {tf: s.get_state(n) for tf, s in inst.series.items()}}
+                    for token, inst in self._inst.items()
+                },
+            }
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Replace instruments / timeframes with a state() snapshot (subscribers are kept)."""
+        if state.get("version") != CHECKPOINT_VERSION or int(state.get("tz", self.tz)) != self.tz:
+            raise ValueError("checkpoint version / timezone mismatch")
+        loaded: Dict[str, _Instrument] = {}
+        for token, st in state["instruments"].items():       # build fully first: a bad file changes nothing
+            inst = loaded[token] = _Instrument(self.base_capacity)
+            _load_ring(inst.base, st["base"])
+            for tf, ss in st["series"].items():
+                inst.series[tf] = _Series(TIMEFRAMES[tf], self.tz, self.tf_capacity)
+                inst.series[tf].set_state(ss)
+        with self._lock:
+            for token, inst in loaded.items():
+                old = self._inst.get(token)
+                if old is not None:
+                    inst.subs = old.subs
+                self._inst[token] = inst
+                for tf in inst.subs:                          # subscribed but not checkpointed: back-fill
+                    self._series(token, tf)
+
+    def save_state(self, path: str, n: int = CHECKPOINT_BARS) -> None:
+        """Atomic write (tmp + rename): a crash mid-write leaves the previous checkpoint."""
+        with self._lock, metrics.timed("mtf_checkpoint_seconds"):
+            data = json.dumps(self.state(n), separators=(",", ":"))
+            d = os.path.dirname(path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.stats["checkpoints"] += 1
+
+    def restore(self, path: str, max_age_sec: float = CHECKPOINT_MAX_AGE_SEC) -> bool:
+        """
+        Boot: load the checkpoint at path if present and fresh, then checkpoint
+        there on every bar close. Returns True when state was restored.
+        """
+        self.checkpoint_path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if clock.time() - float(state.get("saved_at", 0)) > max_age_sec:
+                metrics.inc("mtf_checkpoint_restore_total", outcome="stale")
+                return False
+            self.load(state)
+        except FileNotFoundError:
+            metrics.inc("mtf_checkpoint_restore_total", outcome="missing")
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ MTF checkpoint ignored ({path}): {e}")
+            metrics.inc("mtf_checkpoint_restore_total", outcome="invalid")
+            return False
+        metrics.inc("mtf_checkpoint_restore_total", outcome="ok")
+        return True
+
+    def _checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        try:
+            self.save_state(self.checkpoint_path)
+        except OSError as e:
+            print(f"⚠️ MTF checkpoint write failed: {e}")
+            metrics.inc("mtf_checkpoint_errors_total")
+
+    # ---- read ----
+    def bars(self, token: str, tf: str, n: Optional[int] = None, include_forming: bool = False) -> BarBatch:
+        """Newest n bars as read-only views of the ring (closed only unless include_forming)."""
+        with self._lock:
+            if tf == "1m":
+                return self._instrument(token).base.window(n)
+            s = self._series(token, tf)
+            return s.ring.window(n, drop_last=s.forming and not include_forming)
+
+    def indicators(self, token: str, tf: str) -> Dict[str, float]:
+        with self._lock:
+            return self._series(token, tf).ind.snapshot()
+
+    def frame(self, token: str, tf: str, include_forming: bool = False):
+        """pandas OHLCV frame (local 'time' column) for pandas consumers (model_e_logic); zero-copy OHLCV."""
+        with self._lock:
+            if tf == "1m":
+                return self._instrument(token).base.to_frame(tz_offset_sec=self.tz)
+            s = self._series(token, tf)
+            return s.ring.to_frame(drop_last=s.forming and not include_forming, tz_offset_sec=self.tz)
+
+    def candlepack(self, token: str, tf: str, meta: Optional[Dict[str, Any]] = None,
+                   include_forming: bool = True) -> CandlePack:
+        """CandlePack of derived bars; rows are Noren-shaped (newest first) for row consumers."""
+        b = self.bars(token, tf, include_forming=include_forming)
+        rows = [{"stat": "Ok", "ssboe": str(int(t)), "into": f"{o:.2f}", "inth": f"{h:.2f}",
+                 "intl": f"{l:.2f}", "intc": f"{c:.2f}", "intv": str(int(v))}
+                for t, o, h, l, c, v in zip(b.ssboe.tolist()[::-1], b.open.tolist()[::-1], b.high.tolist()[::-1],
+                                            b.low.tolist()[::-1], b.close.tolist()[::-1], b.volume.tolist()[::-1])]
+        m = dict(meta or {}, source="mtf", timeframe=tf)
+        if not rows:
+            return CandlePack(close=0.0, last_ssboe=0, rows=[], meta=m, bars=b)
+        return CandlePack(close=float(b.close[-1]), last_ssboe=int(b.ssboe[-1]), rows=rows, meta=m, bars=b)
+
+
+MTF = MultiTimeframeEngine()
@@ -1,11 +1,20 @@
 ﻿from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import pandas as pd
 
+from prototype import market_data_v1 as market_data
+from prototype.ohlcv_ring_v1 import OHLCVRing
+
+SERIES_RING_CAPACITY = 2048     # 60m bars per token (~290 sessions), preallocated once
+
+_RINGS: Dict[str, OHLCVRing] = {}
+_RINGS_LOCK = threading.Lock()
+
 
 @dataclass
 class GuardResult:
@@ -15,10 +24,21 @@ class GuardResult:
     error: str = ""
 
 
-def _build_df_from_series(out: Any) -> GuardResult:
+def _ring(token: str) -> OHLCVRing:
+    with _RINGS_LOCK:
+        ring = _RINGS.get(token)
+        if ring is None:
+            ring = _RINGS[token] = OHLCVRing(SERIES_RING_CAPACITY)
+        return ring
+
+
+def _build_df_from_series(out: Any, ring: Optional[OHLCVRing] = None) -> GuardResult:
     """
     Shoonya get_time_price_series typically returns list[dict] with keys:
     time, into, inth, intl, intc, ssboe ...
+    With a persistent ring, polls append only new bars; without one a ring
+    sized to the series is used. The returned df is the caller's own copy:
+    the ring is overwritten by later polls.
     """
     if not isinstance(out, list) or len(out) == 0:
         return GuardResult(ok=False, error=f"EMPTY_SERIES: {type(out)} {out}")
@@ -27,20 +47,15 @@ def _build_df_from_series(out: Any) -> GuardResult:
     if not isinstance(newest, dict):
         return GuardResult(ok=False, error=f"BAD_NEWEST: {type(newest)}")
 
-    rows = []
-    for item in reversed(out):
-        if not isinstance(item, dict):
-            continue
-        rows.append(
-            {
-                "open": float(item.get("into") or 0.0),
-                "high": float(item.get("inth") or 0.0),
-                "low": float(item.get("intl") or 0.0),
-                "close": float(item.get("intc") or 0.0),
-            }
-        )
-
-    df = pd.DataFrame(rows)
+    n = sum(1 for item in out if isinstance(item, dict))
+    if ring is None:
+        ring = OHLCVRing(n)
+    with _RINGS_LOCK:
+        if ring.n and int(newest.get("ssboe", 0) or 0) < ring.last_ssboe():
+            ring.clear()                    # older than what we hold: start over
+        ring.extend_rows(out)
+        # OHLC block of this fetch's bars (no per-row dicts), copied out of the ring
+        df = ring.to_frame(n, time=False, volume=False).copy()
     meta = {
         "candle_time": str(newest.get("time", "")),
         "ssboe": int(newest.get("ssboe", 0) or 0),
@@ -57,12 +72,9 @@ def fetch_spot_1h_with_timeout(api, token: str, timeout_sec: int) -> GuardResult
     try:
         # NorenApi.get_time_price_series does requests.post internally.
         # It may hang if network stalls, but in practice requests has its own socket timeouts.
-        out = api.get_time_price_series(
-            exchange="NSE",
-            token=token,
-            interval="60",
-        )
-        return _build_df_from_series(out)
+        # Shared with the adapters: a concurrent/recent 1h fetch for the token is reused.
+        out = market_data.series(api, "NSE", token, "60")
+        return _build_df_from_series(out, _ring(token))
     except Exception as e:
         return GuardResult(ok=False, error=f"FETCH_EXC: {e}")
 
@@ -1,10 +1,9 @@
 ﻿import json
-import time
 import uuid
-from datetime import datetime, timezone
+from prototype import clock
 
 def utc_now():
-    return datetime.now(timezone.utc).isoformat()
+    return clock.utc_now_iso()
 
 def new_trace_id():
     return uuid.uuid4().hex[:16]
@@ -25,4 +24,4 @@ class EventLogger:
             f.write(line + "\n")
 
 def ms():
-    return int(time.time() * 1000)
+    return clock.now_ms()
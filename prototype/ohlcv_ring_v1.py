@@ -0,0 +1,176 @@
+"""
+OHLCV RING V1
+Preallocated fixed-capacity OHLCV buffer: O(1) append, zero-copy windows.
+
+    ring = OHLCVRing(2048)
+    ring.extend_rows(tpseries_rows)      # Noren rows (newest first), deduped by ssboe
+    ring.append(ssboe, o, h, l, c, v)    # one bar
+    ring.set_last(high, low, close, v)   # revise the forming bar in place
+    ring.window(200)                     # BarBatch of read-only views, oldest -> newest
+    ring.to_frame(200)                   # pandas frame whose OHLCV block shares the ring memory
+
+Every bar is written twice (slot i and i + capacity), so the newest n bars are
+always one contiguous slice: windows and frames are views, not copies, and a
+steady-state poll allocates nothing but the parse of the new rows.
+
+Views stay valid until their bars are overwritten (capacity - n appends later);
+the newest bar of a view changes if it is revised with set_last(). Call .copy()
+to keep a snapshot longer than that.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+import numpy as np
+
+from prototype.market_types_v1 import Bar, BarBatch, _num
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class OHLCVRing:
+    __slots__ = ("cap", "n", "head", "_t", "_f")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.cap = int(capacity)
+        self.n = 0
+        self.head = 0                                       # next write slot in [0, cap)
+        self._t = np.zeros(2 * self.cap, dtype=np.int64)    # ssboe
+        self._f = np.zeros((len(FIELDS), 2 * self.cap))     # open/high/low/close/volume rows
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self) -> None:
+        self.n = 0
+        self.head = 0
+
+    def last_ssboe(self) -> int:
+        return int(self._t[self.head + self.cap - 1]) if self.n else 0
+
+    # ---- write ----
+    def append(self, ssboe: int, open: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> None:
+        i, j = self.head, self.head + self.cap
+        self._t[i] = self._t[j] = ssboe
+        f = self._f
+        f[0, i] = f[0, j] = open
+        f[1, i] = f[1, j] = high
+        f[2, i] = f[2, j] = low
+        f[3, i] = f[3, j] = close
+        f[4, i] = f[4, j] = volume
+        self.head = (i + 1) % self.cap
+        if self.n < self.cap:
+            self.n += 1
+
+    def append_bar(self, b: Bar) -> None:
+        self.append(b.ssboe, b.open, b.high, b.low, b.close, b.volume)
+
+    def set_last(self, high: float, low: float, close: float, volume: float) -> None:
+        """Revise the newest bar (forming candle) in place; open and ssboe are kept."""
+        if not self.n:
+            raise IndexError("set_last on empty ring")
+        j = self.head + self.cap - 1
+        i = j - self.cap if j >= self.cap else j + self.cap
+        f = self._f
+        f[1, i] = f[1, j] = high
+        f[2, i] = f[2, j] = low
+        f[3, i] = f[3, j] = close
+        f[4, i] = f[4, j] = volume
+
+    def extend(self, batch: BarBatch) -> None:
+        """Append a chronological batch (vectorized; only the newest `capacity` bars survive)."""
+        k = len(batch)
+        if not k:
+            return
+        sl = slice(max(0, k - self.cap), k)
+        k = sl.stop - sl.start
+        idx = (self.head + np.arange(k)) % self.cap
+        for dst in (idx, idx + self.cap):
+            self._t[dst] = batch.ssboe[sl]
+            for r, col in enumerate((batch.open, batch.high, batch.low, batch.close, batch.volume)):
+                self._f[r, dst] = col[sl]
+        self.head = (self.head + k) % self.cap
+        self.n = min(self.n + k, self.cap)
+
+    def extend_rows(self, rows: Any, until: Optional[float] = None) -> int:
+        """
+        Noren TPSeries rows (newest first) -> ring. Bars older than the newest
+        are ignored, a bar with the newest ssboe revises it (forming candle
+        update), later bars are appended; until drops bars starting after it.
+        Returns the number of bars appended.
+        """
+        if not isinstance(rows, list) or not rows:
+            return 0
+        last = self.last_ssboe() if self.n else None
+        if last is not None:
+            # newest first: only the head at/after our newest bar needs parsing
+            k = 0
+            for r in rows:
+                if isinstance(r, dict) and _num(r.get("ssboe")) < last:
+                    break
+                k += 1
+            rows = rows[:k]
+            if not rows:
+                return 0
+        b = BarBatch.from_rows(rows)
+        if last is not None:
+            same = np.flatnonzero(b.ssboe == last)
+            if len(same):
+                i = same[-1]
+                self.set_last(b.high[i], b.low[i], b.close[i], b.volume[i])
+            keep = b.ssboe > last
+        else:
+            keep = np.ones(len(b), dtype=bool)
+        if until is not None:
+            keep &= b.ssboe <= until
+        if not keep.all():
+            b = BarBatch(*(a[keep] for a in (b.ssboe, b.open, b.high, b.low, b.close, b.volume)))
+        self.extend(b)
+        return len(b)
+
+    # ---- read ----
+    def _span(self, n: Optional[int], drop_last: bool) -> slice:
+        avail = self.n - (1 if drop_last and self.n else 0)
+        n = avail if n is None else max(0, min(int(n), avail))
+        end = self.head + self.cap - (self.n - avail)
+        return slice(end - n, end)
+
+    def window(self, n: Optional[int] = None, drop_last: bool = False) -> BarBatch:
+        """Newest n bars (all if None) as read-only views; drop_last skips the newest (forming) bar."""
+        sl = self._span(n, drop_last)
+        cols = [self._t[sl]] + [self._f[r, sl] for r in range(len(FIELDS))]
+        for c in cols:
+            c.flags.writeable = False
+        return BarBatch(*cols)
+
+    def last(self) -> Optional[Bar]:
+        if not self.n:
+            return None
+        j = self.head + self.cap - 1
+        f = self._f
+        return Bar(int(self._t[j]), float(f[0, j]), float(f[1, j]), float(f[2, j]), float(f[3, j]), float(f[4, j]))
+
+    def to_frame(self, n: Optional[int] = None, drop_last: bool = False, time: bool = True,
+                 volume: bool = True, tz_offset_sec: Optional[int] = None):
+        """
+        pandas frame over the newest n bars. The OHLC(V) block is a view of the
+        ring (no copy); the optional 'time' column (local wall clock, as
+        BarBatch.to_frame) is the only allocation.
+        """
+        import pandas as pd
+
+        sl = self._span(n, drop_last)
+        cols: List[str] = list(FIELDS if volume else FIELDS[:4])
+        df = pd.DataFrame(self._f[:len(cols), sl].T, columns=cols, copy=False)
+        if time:
+            t = self._t[sl]
+            if tz_offset_sec is None:
+                t0 = int(t[-1]) if len(t) else 0
+                tz_offset_sec = int(datetime.fromtimestamp(t0).replace(tzinfo=timezone.utc).timestamp()) - t0
+            df.insert(0, "time", pd.to_datetime(t + tz_offset_sec, unit="s"))
+        return df
@@ -0,0 +1,241 @@
+"""
+OPTION CHAIN CACHE V1
+In-memory NIFTY option chain snapshots (strikes, tokens, tsyms, lot size)
+fetched once via NorenApi.get_option_chain around ATM, with premiums kept
+live from websocket touchline ticks (tk/tf) and expiry by TTL.
+
+    cache = OptionChainCache(api)
+    cache.start_feed()                          # optional: live LTPs over WS
+    cache.stop_feed()                           # before dropping the cache (re-login)
+    snap = cache.get(fut_tsym, spot)            # fetch once, then memory
+    leg = snap.leg(22850, "PE")                 # tsym / token / ltp
+
+Refetch happens when the snapshot is older than ttl_sec or ATM has moved
+out of the covered strike range. A leg's premium is "live" while its last
+tick is younger than ltp_ttl_sec; stale premiums fall back to one quote.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from prototype import clock
+
+DEFAULT_TTL_SEC = 300.0
+DEFAULT_LTP_TTL_SEC = 5.0
+DEFAULT_COUNT = 15            # strikes either side of ATM
+STRIKE_STEP = 50
+EDGE_STRIKES = 3              # refetch when ATM is within this many strikes of the edge
+
+
+@dataclass
+class ChainLeg:
+    strike: float
+    optt: str                 # CE / PE
+    tsym: str
+    token: str
+    exch: str = "NFO"
+    lot_size: int = 0
+    ltp: Optional[float] = None
+    ltp_ts: float = 0.0       # clock.monotonic() of last price update
+
+
+@dataclass
+class ChainSnapshot:
+    underlying: str
+    expiry: Optional[date]
+    atm: float
+    fetched_at: float
+    legs: Dict[Tuple[float, str], ChainLeg] = field(default_factory=dict)
+
+    def leg(self, strike: float, optt: str) -> Optional[ChainLeg]:
+        return self.legs.get((float(strike), optt.upper()))
+
+    def strikes(self) -> np.ndarray:
+        return np.array(sorted({k for k, _ in self.legs}), dtype=float)
+
+    def covers(self, atm: float, edge: int = EDGE_STRIKES, step: int = STRIKE_STEP) -> bool:
+        ks = [k for k, _ in self.legs]
+        return bool(ks) and min(ks) + edge * step <= atm <= max(ks) - edge * step
+
+    def ltps(self, optt: str, max_age: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(strikes, premiums) for one side; NaN where missing or older than max_age."""
+        now = clock.monotonic()
+        K = self.strikes()
+        px = np.full(len(K), np.nan)
+        for i, k in enumerate(K):
+            lg = self.legs.get((k, optt.upper()))
+            if lg is not None and lg.ltp is not None and (max_age is None or now - lg.ltp_ts <= max_age):
+                px[i] = lg.ltp
+        return K, px
+
+
+def parse_expiry(tsym: str) -> Optional[date]:
+    """NIFTY29JAN26P23000 / NIFTY29JAN26F -> 2026-01-29"""
+    try:
+        return datetime.strptime(tsym[5:12], "%d%b%y").date()
+    except ValueError:
+        return None
+
+
+class OptionChainCache:
+    def __init__(self, api: Any, ttl_sec: float = DEFAULT_TTL_SEC, ltp_ttl_sec: float = DEFAULT_LTP_TTL_SEC,
+                 count: int = DEFAULT_COUNT, step: int = STRIKE_STEP, exchange: str = "NFO"):
+        self.api = api
+        self.ttl_sec = ttl_sec
+        self.ltp_ttl_sec = ltp_ttl_sec
+        self.count = count
+        self.step = step
+        self.exchange = exchange
+        self._lock = threading.Lock()
+        self._snaps: Dict[str, ChainSnapshot] = {}
+        self._by_token: Dict[str, ChainLeg] = {}
+        self._subscribed: set = set()
+        self._extra: set = set()                 # non-chain keys riding the same feed (risk_service_v1)
+        self.feed_active = False
+        self._closed = False
+        self.stats = {"hits": 0, "fetches": 0, "fetch_errors": 0, "ticks": 0, "quote_fallbacks": 0}
+
+    # ---- snapshots ----
+    def get(self, underlying: str, spot: float, force: bool = False) -> Optional[ChainSnapshot]:
+        """Cached snapshot for the underlying's chain; refetched on TTL expiry or ATM drift."""
+        atm = round(spot / self.step) * self.step
+        with self._lock:
+            snap = self._snaps.get(underlying)
+        fresh = (snap is not None and not force
+                 and clock.monotonic() - snap.fetched_at < self.ttl_sec and snap.covers(atm, step=self.step))
+        if fresh:
+            self.stats["hits"] += 1
+            return snap
+        return self._fetch(underlying, atm) or snap
+
+    def _fetch(self, underlying: str, atm: float) -> Optional[ChainSnapshot]:
+        try:
+            res = self.api.get_option_chain(self.exchange, underlying, int(atm), self.count)
+        except Exception:
+            res = None
+        vals = (res or {}).get("values") or []
+        if not vals:
+            self.stats["fetch_errors"] += 1
+            return None
+        self.stats["fetches"] += 1
+
+        snap = ChainSnapshot(underlying=underlying, expiry=parse_expiry(vals[0].get("tsym", "")),
+                             atm=atm, fetched_at=clock.monotonic())
+        with self._lock:
+            old = self._snaps.get(underlying)
+            for v in vals:
+                try:
+                    strike = float(v.get("strprc", 0))
+                    lot = int(float(v.get("ls", 0) or 0))
+                except ValueError:
+                    continue
+                tok = str(v.get("token", ""))
+                prev = self._by_token.get(tok)
+                lg = ChainLeg(strike=strike, optt=str(v.get("optt", "")).upper(), tsym=str(v.get("tsym", "")),
+                              token=tok, exch=str(v.get("exch", self.exchange)), lot_size=lot,
+                              ltp=prev.ltp if prev else None, ltp_ts=prev.ltp_ts if prev else 0.0)
+                snap.legs[(strike, lg.optt)] = lg
+                self._by_token[tok] = lg
+            self._snaps[underlying] = snap
+            stale = {lg.token for lg in old.legs.values()} - {lg.token for lg in snap.legs.values()} if old else set()
+            for tok in stale:
+                self._by_token.pop(tok, None)
+        self._resubscribe(snap, stale)
+        return snap
+
+    # ---- live premiums ----
+    def on_tick(self, msg: Dict[str, Any]) -> None:
+        """Websocket subscribe callback (tk/tf/dk/df): update the leg's premium."""
+        lg = self._by_token.get(str(msg.get("tk", "")))
+        lp = msg.get("lp")
+        if lg is None or lp in (None, ""):
+            return
+        try:
+            lg.ltp = float(lp)
+        except ValueError:
+            return
+        lg.ltp_ts = clock.monotonic()
+        self.stats["ticks"] += 1
+
+    def premium(self, leg: ChainLeg) -> Optional[float]:
+        """Live premium, or one GetQuotes round trip when the tick is stale."""
+        if leg.ltp is not None and clock.monotonic() - leg.ltp_ts <= self.ltp_ttl_sec:
+            self.stats["hits"] += 1
+            return leg.ltp
+        self.stats["quote_fallbacks"] += 1
+        try:
+            q = self.api.get_quotes(exchange=leg.exch, token=leg.token) or {}
+            leg.ltp = float(q["lp"])
+            leg.ltp_ts = clock.monotonic()
+        except Exception:
+            pass
+        return leg.ltp
+
+    def start_feed(self, timeout: float = 5.0, on_tick: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """Open the NorenApi websocket with on_tick as subscribe callback (chained to on_tick if given)."""
+        opened = threading.Event()
+
+        def _cb(msg: Dict[str, Any]) -> None:
+            self.on_tick(msg)
+            if on_tick:
+                on_tick(msg)
+
+        try:
+            self.api.start_websocket(subscribe_callback=_cb, socket_open_callback=opened.set)
+        except Exception:
+            return False
+        self.feed_active = opened.wait(timeout) and not self._closed
+        if self._closed:
+            self._close_websocket()                 # stop_feed() ran while the socket was opening
+        elif self.feed_active:
+            with self._lock:
+                legs = [lg for s in self._snaps.values() for lg in s.legs.values()]
+            self._subscribe([f"{lg.exch}|{lg.token}" for lg in legs] + sorted(self._extra))
+        return self.feed_active
+
+    def stop_feed(self) -> None:
+        """Close the websocket start_feed opened: its ticks stop reaching on_tick (and the chained callback)."""
+        self._closed = True
+        self.feed_active = False
+        self._close_websocket()
+        self._subscribed.clear()
+
+    def _close_websocket(self) -> None:
+        try:
+            self.api.close_websocket()
+        except Exception:
+            pass
+
+    def subscribe(self, keys: List[str]) -> None:
+        """Stream extra "EXCH|token" keys (spot, futures) on the chain's websocket, now or once it opens."""
+        self._extra.update(keys)
+        if self.feed_active:
+            self._subscribe(list(keys))
+
+    def _resubscribe(self, snap: ChainSnapshot, stale: set) -> None:
+        if not self.feed_active:
+            return
+        drop = [k for k in self._subscribed if k.split("|", 1)[-1] in stale]
+        if drop:
+            try:
+                self.api.unsubscribe(drop)
+            except Exception:
+                pass
+            self._subscribed.difference_update(drop)
+        self._subscribe([f"{lg.exch}|{lg.token}" for lg in snap.legs.values()])
+
+    def _subscribe(self, keys: List[str]) -> None:
+        new = [k for k in keys if k not in self._subscribed]
+        if not new:
+            return
+        try:
+            self.api.subscribe(new)
+            self._subscribed.update(new)
+        except Exception:
+            pass
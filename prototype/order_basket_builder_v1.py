@@ -4,7 +4,7 @@ Builds trade legs based on VIX gear
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 @dataclass
 class OrderLeg:
@@ -25,7 +25,7 @@ def build_order_basket(
     spot: int,
     lot_size: int = 65
 ):
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     if gear == "SAFE_FUTURE":
         return OrderBasket(
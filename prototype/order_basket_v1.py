@@ -1,8 +1,9 @@
 ﻿# prototype/order_basket_v1.py
 
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, replace
 from typing import List, Optional
+from prototype import clock
+from prototype.option_chain_cache_v1 import ChainSnapshot
 
 @dataclass(frozen=True)
 class OrderLeg:
@@ -10,6 +11,9 @@ class OrderLeg:
     instrument: str     # FUT / CE / PE
     strike: Optional[int]
     qty: int
+    tsym: Optional[str] = None       # filled from the option chain cache
+    token: Optional[str] = None
+    premium: Optional[float] = None
 
 @dataclass(frozen=True)
 class OrderBasket:
@@ -18,8 +22,21 @@ class OrderBasket:
     risk_note: str
     ts: str
 
-def build_order_basket(gear: str, atm: int) -> OrderBasket:
-    ts = datetime.utcnow().isoformat() + "Z"
+def _with_chain(basket: OrderBasket, chain: Optional[ChainSnapshot]) -> OrderBasket:
+    """Attach tsym / token / cached premium to option legs (memory only, no quote calls)."""
+    if chain is None:
+        return basket
+    legs = []
+    for leg in basket.legs:
+        c = chain.leg(leg.strike, leg.instrument) if leg.strike is not None else None
+        legs.append(replace(leg, tsym=c.tsym, token=c.token, premium=c.ltp) if c else leg)
+    return replace(basket, legs=legs)
+
+def build_order_basket(gear: str, atm: int, chain: Optional[ChainSnapshot] = None) -> OrderBasket:
+    return _with_chain(_build_order_basket(gear, atm), chain)
+
+def _build_order_basket(gear: str, atm: int) -> OrderBasket:
+    ts = clock.utc_now_iso_z()
 
     if gear == "SAFE_FUTURE":
         return OrderBasket(
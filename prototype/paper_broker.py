@@ -1,16 +1,33 @@
-﻿from dataclasses import dataclass
-from typing import Optional, Dict
-import time
+﻿from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
+import itertools
+import math
+import random
 
-@dataclass
+import numpy as np
+
+from prototype import clock
+
+# Journal friction: 8 pts per round trip -> 4 pts charged on each fill side
+FRICTION_PTS_ROUND_TRIP = 8.0
+NIFTY_FREEZE_QTY = 1800
+TICK = 0.05
+
+_broker_seq = itertools.count(1)
+
+@dataclass(slots=True)
 class PaperOrder:
     order_id: str
     symbol: str
     side: str  # BUY/SELL
     qty: int
-    price: float
-    ts_ms: int
-    status: str  # SENT/FILLED/REJECTED
+    price: float          # average fill price (LTP for instant fills)
+    ts_ms: int            # sent
+    status: str  # SENT/FILLED/PARTIAL/REJECTED
+    filled_qty: int = 0
+    fill_ts_ms: int = 0
+    friction: float = 0.0  # rupees charged on this fill
+    reason: str = ""
 
 @dataclass
 class Position:
@@ -18,49 +35,220 @@ class Position:
     qty: int
     avg_price: float
 
+@dataclass(frozen=True)
+class Fill:
+    qty: int
+    price: float
+    latency_ms: float
+    reason: str = ""      # non-empty => rejected
+
+# =========================
+# Fill models
+# =========================
+
+class InstantFill:
+    """Legacy behaviour: full quantity at the passed LTP, no latency, no friction."""
+    friction_per_side = 0.0
+
+    def fill(self, side: str, qty: int, ltp: float, bid: Optional[float] = None, ask: Optional[float] = None,
+             depth_qty: Optional[int] = None, vol_pts: Optional[float] = None) -> Fill:
+        return Fill(qty, float(ltp), 0.0)
+
+    def fill_batch(self, buy: np.ndarray, qty: np.ndarray, ltp: np.ndarray, **_) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        n = len(qty)
+        return qty.astype(np.int64), ltp.astype(float), np.zeros(n), np.zeros(n, dtype=bool)
+
+@dataclass
+class RealisticFill:
+    """
+    Market-order fills with
+    - spread: cross to bid/ask when given, else half of spread_bps around LTP
+    - slippage: slippage_bps plus adverse drift vol_pts * sqrt(latency_s) * |N(0,1)|
+    - latency: latency_ms +/- uniform jitter_ms (stamped on the order, not slept)
+    - partial fills: quantity beyond depth_qty (touch size) walks impact_bps per
+      extra touch size when walk_book, else is cancelled (status PARTIAL)
+    - rejections: reject_rate at random, and qty above freeze_qty
+    - friction: friction_per_side points per unit, charged on every fill
+    """
+    spread_bps: float = 1.0
+    slippage_bps: float = 0.5
+    vol_pts: float = 0.0             # default price noise in pts per sqrt(second)
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    impact_bps: float = 2.0
+    walk_book: bool = False
+    reject_rate: float = 0.0
+    freeze_qty: int = NIFTY_FREEZE_QTY
+    friction_per_side: float = FRICTION_PTS_ROUND_TRIP / 2.0
+    seed: Optional[int] = None
+    rng: random.Random = field(init=False, repr=False)
+    np_rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self.np_rng = np.random.default_rng(self.seed)
+
+    def fill(self, side: str, qty: int, ltp: float, bid: Optional[float] = None, ask: Optional[float] = None,
+             depth_qty: Optional[int] = None, vol_pts: Optional[float] = None) -> Fill:
+        r = self.rng.random
+        latency = max(0.0, self.latency_ms + self.jitter_ms * (2.0 * r() - 1.0))
+        if qty > self.freeze_qty or (self.reject_rate and r() < self.reject_rate):
+            return Fill(0, 0.0, latency, self.reject_reason(qty))
+
+        sign = 1.0 if side.upper() == "BUY" else -1.0
+        touch = ask if sign > 0 else bid
+        if touch is None or touch <= 0:
+            touch = ltp * (1.0 + sign * self.spread_bps * 0.5e-4)
+        vol = self.vol_pts if vol_pts is None else vol_pts
+        slip = ltp * self.slippage_bps * 1e-4
+        if vol:
+            slip += vol * math.sqrt(latency * 1e-3) * abs(self.rng.gauss(0.0, 1.0))
+
+        filled = qty
+        impact = 0.0
+        if depth_qty and qty > depth_qty:
+            if self.walk_book:
+                impact = ltp * self.impact_bps * 1e-4 * (qty / depth_qty - 1.0) * 0.5
+            else:
+                filled = int(depth_qty)
+        px = touch + sign * (slip + impact)
+        return Fill(filled, round(round(px / TICK) * TICK, 2), latency)
+
+    def reject_reason(self, qty: int) -> str:
+        """Why an order of qty was rejected: the freeze limit, else the random exchange reject."""
+        if qty > self.freeze_qty:
+            return f"qty {qty} above freeze limit {self.freeze_qty}"
+        return "simulated exchange reject"
+
+    def fill_batch(self, buy: np.ndarray, qty: np.ndarray, ltp: np.ndarray, bid: Optional[np.ndarray] = None,
+                   ask: Optional[np.ndarray] = None, depth_qty: Optional[np.ndarray] = None,
+                   vol_pts: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized fill(): returns (filled_qty, price, latency_ms, rejected)."""
+        n = len(qty)
+        g = self.np_rng
+        sign = np.where(buy, 1.0, -1.0)
+        latency = np.maximum(0.0, self.latency_ms + self.jitter_ms * (2.0 * g.random(n) - 1.0))
+        rejected = qty > self.freeze_qty
+        if self.reject_rate:
+            rejected |= g.random(n) < self.reject_rate
+
+        touch = ltp * (1.0 + sign * self.spread_bps * 0.5e-4)
+        if bid is not None or ask is not None:
+            side_px = np.where(buy, ask if ask is not None else np.nan, bid if bid is not None else np.nan)
+            touch = np.where(np.isfinite(side_px) & (side_px > 0), side_px, touch)
+        vol = self.vol_pts if vol_pts is None else vol_pts
+        slip = ltp * self.slippage_bps * 1e-4 + vol * np.sqrt(latency * 1e-3) * np.abs(g.standard_normal(n))
+
+        filled = qty.astype(np.int64)
+        impact = 0.0
+        if depth_qty is not None:
+            over = (depth_qty > 0) & (qty > depth_qty)
+            if self.walk_book:
+                impact = np.where(over, ltp * self.impact_bps * 1e-4 * (qty / np.maximum(depth_qty, 1) - 1.0) * 0.5, 0.0)
+            else:
+                filled = np.where(over, depth_qty, filled).astype(np.int64)
+        px = np.round(np.round((touch + sign * (slip + impact)) / TICK) * TICK, 2)
+        filled = np.where(rejected, 0, filled)
+        px = np.where(rejected, 0.0, px)
+        return filled, px, latency, rejected
+
 class PaperBroker:
     """
     Simulates order execution for prototype.
-    - Market order fills instantly at passed LTP.
-    - Maintains positions.
+    - Market orders fill through a pluggable fill model (default: instantly at passed LTP).
+    - Collision-free order IDs (per-broker prefix + sequence).
+    - Maintains positions and accumulated friction.
     """
-    def __init__(self):
+    def __init__(self, fill_model=None):
+        self.fill_model = fill_model or InstantFill()
         self.orders: Dict[str, PaperOrder] = {}
         self.positions: Dict[str, Position] = {}
+        self.friction_total = 0.0
+        self._prefix = f"PB{clock.now_ms()}{next(_broker_seq):03d}"
+        self._seq = itertools.count(1)
 
     def _oid(self):
-        return f"PB{int(time.time()*1000)}"
+        return f"{self._prefix}-{next(self._seq)}"
 
-    def place_market(self, symbol: str, side: str, qty: int, ltp: float) -> PaperOrder:
+    def place_market(self, symbol: str, side: str, qty: int, ltp: float, bid: Optional[float] = None,
+                     ask: Optional[float] = None, depth_qty: Optional[int] = None,
+                     vol_pts: Optional[float] = None) -> PaperOrder:
         oid = self._oid()
-        order = PaperOrder(
-            order_id=oid, symbol=symbol, side=side, qty=qty,
-            price=float(ltp), ts_ms=int(time.time()*1000), status="FILLED"
-        )
+        ts = clock.now_ms()
+        f = self.fill_model.fill(side, qty, ltp, bid, ask, depth_qty, vol_pts)
+        fill_ts = ts + int(f.latency_ms)
+        if f.reason:
+            order = PaperOrder(oid, symbol, side, qty, 0.0, ts, "REJECTED", 0, fill_ts, 0.0, f.reason)
+        else:
+            friction = self.fill_model.friction_per_side * f.qty
+            status = "FILLED" if f.qty == qty else "PARTIAL"
+            order = PaperOrder(oid, symbol, side, qty, f.price, ts, status, f.qty, fill_ts, friction)
+            self.friction_total += friction
+            self._apply_fill(symbol, side, f.qty, f.price)
         self.orders[oid] = order
-        self._apply_fill(order)
         return order
 
-    def _apply_fill(self, o: PaperOrder):
-        sign = 1 if o.side.upper() == "BUY" else -1
-        new_qty = sign * o.qty
+    def place_market_batch(self, symbols: List[str], sides: List[str], qtys, ltps, bid=None, ask=None,
+                           depth_qty=None, vol_pts=None, keep_orders: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Vectorized place_market for backtests: one fill_batch() pass, then
+        positions updated in order. Returns the fill arrays (and order ids).
+        """
+        qty = np.asarray(qtys, dtype=np.int64)
+        ltp = np.asarray(ltps, dtype=float)
+        buy = np.fromiter((s.upper() == "BUY" for s in sides), dtype=bool, count=len(qty))
+        filled, px, latency, rejected = self.fill_model.fill_batch(
+            buy, qty, ltp,
+            bid=None if bid is None else np.asarray(bid, dtype=float),
+            ask=None if ask is None else np.asarray(ask, dtype=float),
+            depth_qty=None if depth_qty is None else np.asarray(depth_qty, dtype=np.int64),
+            vol_pts=None if vol_pts is None else np.asarray(vol_pts, dtype=float),
+        )
+        friction = self.fill_model.friction_per_side * filled
+        self.friction_total += float(friction.sum())
+
+        ts = clock.now_ms()
+        ids = [self._oid() for _ in range(len(qty))]
+        fq, fp, lat, rej, fr = filled.tolist(), px.tolist(), latency.tolist(), rejected.tolist(), friction.tolist()
+        for i, sym in enumerate(symbols):
+            reason = ""
+            if rej[i]:
+                status = "REJECTED"
+                reason = self.fill_model.reject_reason(int(qty[i]))
+            else:
+                status = "FILLED" if fq[i] == qty[i] else "PARTIAL"
+                self._apply_fill(sym, sides[i], fq[i], fp[i])
+            if keep_orders:
+                self.orders[ids[i]] = PaperOrder(ids[i], sym, sides[i], int(qty[i]), fp[i], ts, status, fq[i],
+                                                 ts + int(lat[i]), fr[i], reason)
+        return {"order_id": np.array(ids), "filled_qty": filled, "price": px, "latency_ms": latency,
+                "rejected": rejected, "friction": friction}
+
+    def _apply_fill(self, symbol: str, side: str, qty: int, price: float):
+        if qty <= 0:
+            return
+        new_qty = qty if side.upper() == "BUY" else -qty
 
-        pos = self.positions.get(o.symbol)
+        pos = self.positions.get(symbol)
         if not pos:
-            self.positions[o.symbol] = Position(symbol=o.symbol, qty=new_qty, avg_price=o.price)
+            self.positions[symbol] = Position(symbol=symbol, qty=new_qty, avg_price=price)
             return
 
         # position update (simple average if same direction)
         if (pos.qty >= 0 and new_qty >= 0) or (pos.qty <= 0 and new_qty <= 0):
             total_qty = pos.qty + new_qty
             if total_qty != 0:
-                pos.avg_price = ((pos.avg_price * abs(pos.qty)) + (o.price * abs(new_qty))) / abs(total_qty)
+                pos.avg_price = ((pos.avg_price * abs(pos.qty)) + (price * abs(new_qty))) / abs(total_qty)
             pos.qty = total_qty
         else:
-            # reducing/closing
-            pos.qty = pos.qty + new_qty
-            if pos.qty == 0:
-                del self.positions[o.symbol]
+            # reducing/closing (flip opens the remainder at the fill price)
+            total_qty = pos.qty + new_qty
+            if total_qty == 0:
+                del self.positions[symbol]
+            else:
+                if (total_qty > 0) != (pos.qty > 0):
+                    pos.avg_price = price
+                pos.qty = total_qty
 
     def get_positions(self):
         return list(self.positions.values())
@@ -0,0 +1,166 @@
+"""
+PAPERTRADE RUNNER V3
+papertrade_runner_v2's fetch -> indicators -> signal -> paper step loop
+(runner_v2 stays frozen), stepped once per 1H bar close instead of every
+poll_sec:
+- candles come from the MTF engine; after a close only the bar's minutes are
+  fetched (sync_close), woken bar_settle_sec after the boundary
+- no new minutes at a close (holiday / feed gap): BAR_CLOSE_NO_DATA, no step
+- bar_close_to_step_seconds records close -> step latency
+
+    python -m prototype.papertrade_runner_v3
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict
+
+from prototype import clock, metrics
+from prototype.bar_clock_v1 import SETTLE_SEC, BarClock
+from prototype.config import load_config
+from prototype.contracts import CandlePack
+from prototype.indicator_cache_v1 import compute_indicators_cached
+from prototype.mtf_engine_v1 import MTF, MultiTimeframeEngine
+from prototype.papertrade_engine_v2 import PaperTradeEngineV2, PaperTradeState
+from prototype.shoonya_adapter_v4 import ShoonyaAdapterV4
+from prototype.signals_v1_compat import generate_signal_v1
+
+
+OUT_DIR = os.path.join("prototype", "outputs")
+STATE_PATH = os.path.join(OUT_DIR, "papertrade_state.json")
+JOURNAL_PATH = os.path.join(OUT_DIR, "papertrade.jsonl")
+EVENTS_PATH = os.path.join(OUT_DIR, "events.jsonl")
+MTF_CHECKPOINT_PATH = os.path.join(OUT_DIR, "papertrade_mtf_checkpoint.json")
+
+
+def _now_iso() -> str:
+    return clock.utc_now_iso()
+
+
+def _ensure_out_dir() -> None:
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+
+def _append_jsonl(path: str, obj: Dict[str, Any]) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+
+def _log_event(event: str, data: Dict[str, Any]) -> None:
+    _append_jsonl(EVENTS_PATH, {"ts": _now_iso(), "event": event, "trace_id": "", "data": data})
+
+
+def _load_state() -> PaperTradeState:
+    if not os.path.exists(STATE_PATH):
+        return PaperTradeState()
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            d = json.load(f)
+        return PaperTradeState.from_dict(d)
+    except Exception:
+        return PaperTradeState()
+
+
+def _save_state(state: PaperTradeState) -> None:
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f, indent=2)
+
+
+def main(cfg: Any = None, broker: Any = None, mtf: MultiTimeframeEngine = MTF) -> None:
+    _ensure_out_dir()
+    cfg = cfg or load_config()
+
+    _log_event("BOOT", {"msg": "papertrade runner v3 starting", "ts": _now_iso()})
+
+    # candles via the MTF engine: restored from its checkpoint, only the gap is fetched after a restart
+    restored = mtf.restore(MTF_CHECKPOINT_PATH)
+    broker = broker or ShoonyaAdapterV4(mtf=mtf)
+    ok = broker.login()
+    if not ok:
+        _log_event("BROKER_LOGIN_FAIL", {"error": broker.last_error})
+        raise SystemExit("LOGIN FAILED: " + broker.last_error)
+
+    _log_event("BROKER_LOGIN_OK", {"code": "OK"})
+    _log_event("MTF_CHECKPOINT", {"restored": restored, "path": MTF_CHECKPOINT_PATH})
+    print("✅ Login OK")
+
+    # persistent engine
+    state = _load_state()
+    engine = PaperTradeEngineV2(state=state)
+
+    # one step per 1H close (09:15-anchored, as the pack), woken right after the boundary
+    bars = BarClock("1h_915", tz_offset_sec=mtf.tz, settle_sec=float(getattr(cfg, "bar_settle_sec", SETTLE_SEC)))
+    cycles = int(os.getenv("PAPERTRADE_CYCLES", "0") or 0)  # 0 => infinite loop
+
+    cycle = 0
+    closed_at = None  # boot: step on the newest data straight away
+    bars_1m = mtf.stats["bars_1m"]
+    while True:
+        cycle += 1
+
+        # --- fetch candles ---
+        with metrics.timed("candle_fetch_seconds", source="shoonya_v4"):
+            if closed_at is None:
+                pack: CandlePack = broker.get_spot_candles_1h_pack()
+            else:
+                pack = broker.get_spot_candles_1h_pack(close_at=closed_at, horizon=bars.horizon(closed_at))
+        print("✅ CandlePack OK")
+
+        if closed_at is not None and mtf.stats["bars_1m"] == bars_1m:
+            # holiday / feed gap: no new minutes, nothing to step
+            _log_event("BAR_CLOSE_NO_DATA", {"close_at": closed_at, "last_ssboe": pack.last_ssboe})
+            closed_at = bars.wait()
+            continue
+        bars_1m = mtf.stats["bars_1m"]
+        if closed_at is not None:
+            metrics.observe("bar_close_to_step_seconds", clock.time() - closed_at, tf=bars.tf)
+
+        # --- indicators (memoized: recomputed only when the newest bar changes) ---
+        with metrics.timed("indicator_compute_seconds", fn="compute_indicators"):
+            ind = compute_indicators_cached(pack)
+        print("✅ IndicatorPack OK")
+
+        # --- signal ---
+        sig = generate_signal_v1(ind)
+        sig["ts"] = _now_iso()
+        print("✅ SignalPack OK")
+
+        # --- papertrade step ---
+        with metrics.timed("papertrade_step_seconds"):
+            out = engine.step(sig)
+
+        _save_state(engine.state)
+
+        _append_jsonl(
+            JOURNAL_PATH,
+            {
+                "ts": _now_iso(),
+                "signal": sig,
+                "result": out,
+            },
+        )
+
+        _log_event(
+            "PAPERTRADE_STEP",
+            {
+                "decision": sig.get("decision"),
+                "close": sig.get("close"),
+                "action": out.get("action"),
+                "state": out.get("state"),
+            },
+        )
+
+        print("\nPAPERTRADE RESULT =>")
+        print(json.dumps(out, indent=2))
+
+        if cycles > 0 and cycle >= cycles:
+            print(f"\n✅ DONE: PAPERTRADE_CYCLES={cycles}")
+            break
+
+        closed_at = bars.wait()
+
+
+if __name__ == "__main__":
+    main()
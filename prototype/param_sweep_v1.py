@@ -0,0 +1,287 @@
+"""
+PARAM SWEEP V1
+Grid / random search over Model E and Type F thresholds on a process pool.
+- Price arrays are saved once as .npy and memory-mapped read-only by every
+  worker (initializer attach) -> tasks only carry a small params dict
+- Hourly bars are built once in the parent and shared the same way
+- Results are ranked by a summary metric (default: net_pnl)
+
+Usage:
+  python -m prototype.param_sweep_v1 <nifty_1m.csv> model_e grid
+  python -m prototype.param_sweep_v1 <nifty_1m.csv> type_f random:500
+  (SWEEP_PROCS=N to pin the pool size, default = all cores)
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from prototype.model_e_backtest_v1 import (
+    HourlyBars,
+    ModelEParams,
+    ist_minutes,
+    load_1m_csv,
+    resample_hourly,
+    run_backtest_arrays,
+)
+from prototype.typef_backtest_v1 import TypeFParams, run_typef_backtest
+
+OUT_DIR = os.path.join("prototype", "outputs")
+
+# list -> choices (grid + random), (lo, hi) tuple -> uniform range (random only)
+Space = Dict[str, Union[Sequence[Any], Tuple[Any, Any]]]
+
+MODEL_E_SPACE: Space = {
+    "rsi_len": [14, 19, 21],
+    "rsi_max": [60.0, 65.0, 70.0],
+    "ema_len": [20, 34],
+    "atr_len": [10, 14],
+    "st_mult": [1.1, 1.5, 2.0],
+    "sl_atr_mult": [1.5, 2.0, 2.5],
+    "vix_low": [13.0, 14.0],
+    "vix_high": [18.0, 19.0],
+}
+
+TYPEF_SPACE: Space = {
+    "rsi_min": [50.0, 55.0, 60.0],
+    "ema_len": [20, 50],
+    "st_len": [7, 10, 14],
+    "st_mult": [2.0, 3.0],
+    "atr_mult": [1.5, 2.0, 3.0],
+}
+
+STRATEGY_PARAMS = {
+    "model_e": ModelEParams,
+    "type_f": TypeFParams,
+}
+
+DEFAULT_SPACES = {
+    "model_e": MODEL_E_SPACE,
+    "type_f": TYPEF_SPACE,
+}
+
+# worker-local read-only views (filled by _attach)
+_DATA: Dict[str, np.ndarray] = {}
+
+
+# =========================
+# Shared read-only arrays
+# =========================
+
+class SharedArrays:
+    """
+    Context manager: dumps arrays to a temp dir once; workers np.load(mmap_mode="r").
+    The OS page cache holds a single physical copy for all processes.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.root = ""
+        self.spec: Dict[str, str] = {}
+
+    def __enter__(self) -> "SharedArrays":
+        self.root = tempfile.mkdtemp(prefix="param_sweep_")
+        for name, arr in self.arrays.items():
+            path = os.path.join(self.root, f"{name}.npy")
+            np.save(path, np.ascontiguousarray(arr))
+            self.spec[name] = path
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _DATA.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _attach(spec: Dict[str, str]) -> None:
+    _DATA.clear()
+    for name, path in spec.items():
+        _DATA[name] = np.load(path, mmap_mode="r")
+
+
+def build_shared_inputs(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """1m arrays + precomputed hourly bars (parameter independent)."""
+    mins = ist_minutes(data["times"]).astype("datetime64[m]")    # stored as IST datetime64: no per-task conversion
+    bars = resample_hourly(mins, data["open"], data["high"], data["low"], data["close"])
+    return {
+        "mins": mins,
+        "open": np.asarray(data["open"], dtype=float),
+        "high": np.asarray(data["high"], dtype=float),
+        "low": np.asarray(data["low"], dtype=float),
+        "close": np.asarray(data["close"], dtype=float),
+        "vix": np.asarray(data["vix"], dtype=float),
+        "h_open": bars.open,
+        "h_high": bars.high,
+        "h_low": bars.low,
+        "h_close": bars.close,
+        "h_start": bars.start_idx,
+        "h_end": bars.end_idx,
+    }
+
+
+def _bars() -> HourlyBars:
+    return HourlyBars(
+        open=_DATA["h_open"], high=_DATA["h_high"], low=_DATA["h_low"], close=_DATA["h_close"],
+        start_idx=_DATA["h_start"], end_idx=_DATA["h_end"],
+    )
+
+
+# =========================
+# Worker
+# =========================
+
+def _evaluate(task: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+    strategy, overrides = task
+    try:
+        if strategy == "model_e":
+            res = run_backtest_arrays(
+                _DATA["mins"], _DATA["open"], _DATA["high"], _DATA["low"], _DATA["close"], _DATA["vix"],
+                params=ModelEParams(**overrides), bars=_bars(),
+            )
+        elif strategy == "type_f":
+            res = run_typef_backtest(_bars(), _DATA["mins"], params=TypeFParams(**overrides))
+        else:
+            raise ValueError(f"Unsupported strategy: {strategy}")
+        return {"params": overrides, **res.summary}
+    except Exception as e:
+        return {"params": overrides, "error": repr(e)}
+
+
+# =========================
+# Search spaces
+# =========================
+
+def grid(space: Space) -> List[Dict[str, Any]]:
+    keys = list(space.keys())
+    values = [list(space[k]) for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def random_search(space: Space, n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    out: List[Dict[str, Any]] = []
+    for _ in range(n):
+        d: Dict[str, Any] = {}
+        for k, v in space.items():
+            if isinstance(v, tuple) and len(v) == 2:
+                lo, hi = v
+                if isinstance(lo, int) and isinstance(hi, int):
+                    d[k] = int(rng.integers(lo, hi + 1))
+                else:
+                    d[k] = round(float(rng.uniform(lo, hi)), 4)
+            else:
+                choice = list(v)[int(rng.integers(0, len(v)))]
+                d[k] = choice.item() if hasattr(choice, "item") else choice
+        out.append(d)
+    return out
+
+
+# =========================
+# Runner
+# =========================
+
+@dataclass
+class SweepReport:
+    strategy: str
+    rank_by: str
+    evaluated: int
+    errors: int
+    processes: int
+    elapsed_sec: float
+    evals_per_sec: float
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def run_sweep(
+    data: Dict[str, np.ndarray],
+    strategy: str,
+    param_sets: List[Dict[str, Any]],
+    processes: Optional[int] = None,
+    rank_by: str = "net_pnl",
+    top: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> SweepReport:
+    if strategy not in STRATEGY_PARAMS:
+        raise ValueError(f"Unsupported strategy: {strategy}")
+    valid = {f.name for f in fields(STRATEGY_PARAMS[strategy])}
+    for p in param_sets:
+        bad = set(p) - valid
+        if bad:
+            raise ValueError(f"Unknown {strategy} params: {sorted(bad)}")
+
+    procs = max(1, int(processes or os.cpu_count() or 1))
+    tasks = [(strategy, p) for p in param_sets]
+
+    t0 = time.perf_counter()
+    with SharedArrays(build_shared_inputs(data)) as shared:
+        if procs == 1:
+            _attach(shared.spec)
+            rows = [_evaluate(t) for t in tasks]
+        else:
+            cs = chunksize or max(1, len(tasks) // (procs * 8))
+            with mp.Pool(processes=procs, initializer=_attach, initargs=(shared.spec,)) as pool:
+                rows = list(pool.imap_unordered(_evaluate, tasks, chunksize=cs))
+    elapsed = time.perf_counter() - t0
+
+    ok = [r for r in rows if "error" not in r]
+    ok.sort(key=lambda r: float(r.get(rank_by, 0.0)), reverse=True)
+    ranked = ok + [r for r in rows if "error" in r]
+
+    return SweepReport(
+        strategy=strategy,
+        rank_by=rank_by,
+        evaluated=len(rows),
+        errors=len(rows) - len(ok),
+        processes=procs,
+        elapsed_sec=elapsed,
+        evals_per_sec=(len(rows) / elapsed) if elapsed > 0 else 0.0,
+        results=ranked[:top] if top else ranked,
+    )
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        raise SystemExit("usage: python -m prototype.param_sweep_v1 <nifty_1m.csv> [model_e|type_f] [grid|random:N]")
+
+    path = sys.argv[1]
+    strategy = sys.argv[2] if len(sys.argv) > 2 else "model_e"
+    mode = sys.argv[3] if len(sys.argv) > 3 else "grid"
+    procs = int(os.getenv("SWEEP_PROCS", "0") or 0) or None
+
+    space = DEFAULT_SPACES[strategy]
+    if mode.startswith("random"):
+        n = int(mode.split(":", 1)[1]) if ":" in mode else 200
+        param_sets = random_search(space, n)
+    else:
+        param_sets = grid(space)
+
+    report = run_sweep(load_1m_csv(path), strategy, param_sets, processes=procs)
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    out_path = os.path.join(OUT_DIR, f"param_sweep_{strategy}.jsonl")
+    with open(out_path, "w", encoding="utf-8") as f:
+        for row in report.results:
+            f.write(json.dumps(row) + "\n")
+
+    print(f"✅ {report.evaluated} evals ({report.errors} errors) on {report.processes} procs "
+          f"in {report.elapsed_sec:.2f}s = {report.evals_per_sec:.1f} evals/s")
+    for row in report.results[:10]:
+        print(json.dumps({k: row.get(k) for k in ("params", "net_pnl", "trades", "win_rate", "max_drawdown_pct")}))
+    print(f"✅ Ranked results: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,32 @@
 """
 PENDING ENTRY STATE ENGINE V1
 Ensures execution only at Candle N+1 open
+
+EntryScheduler arms at signal time and fires at the exact next
+session-aligned bar open (bar_clock_v1) on a timer wheel, optionally with
+an order payload pre-warmed a few seconds ahead:
+
+    ENTRY = EntryScheduler(delay_sec=1.0).start()
+    e = ENTRY.arm("model_e", fire=place_entry, prewarm=build_payload)   # fire(payload) at 10:15:01
+    e.intended, e.fired_at, e.drift                                      # entry_fire_drift_seconds
+                                                                         # (early: entry_fire_early_seconds)
+
+update_pending_entry() is the previous poll-driven check (READY once a
+later candle timestamp is seen), kept for its callers.
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from prototype import clock, metrics
+from prototype.bar_clock_v1 import BarClock
+from prototype.timer_wheel_v1 import Timer, TimerWheel
+
+PREWARM_SEC = 5.0   # build the order payload this long before the open
+
 
 @dataclass
 class PendingEntryState:
@@ -21,3 +43,102 @@ def update_pending_entry(state: PendingEntryState, spot_signal, candle_ts: str):
         return state, "READY"
 
     return state, "WAIT"
+
+
+@dataclass(eq=False)
+class ScheduledEntry:
+    key: str
+    armed_at: float
+    intended: float                       # Candle N+1 open (+ delay_sec), epoch
+    payload: Any = None                   # pre-warmed order payload (None: not pre-warmed / failed)
+    result: Any = None                    # fire(payload) return value
+    fired_at: Optional[float] = None
+    cancelled: bool = False
+    error: Optional[BaseException] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _timers: List[Timer] = field(default_factory=list, repr=False)
+
+    @property
+    def drift(self) -> Optional[float]:
+        """Actual - intended fire time (seconds)."""
+        return None if self.fired_at is None else self.fired_at - self.intended
+
+
+class EntryScheduler:
+    def __init__(self, bars: Optional[BarClock] = None, delay_sec: float = 0.0,
+                 prewarm_sec: float = PREWARM_SEC, wheel: Optional[TimerWheel] = None):
+        self.bars = bars or BarClock("1h_915")
+        self.delay_sec = float(delay_sec)
+        self.prewarm_sec = float(prewarm_sec)
+        self.wheel = wheel or TimerWheel()
+        self._lock = threading.Lock()
+        self._armed: Dict[str, ScheduledEntry] = {}
+
+    def start(self) -> "EntryScheduler":
+        """Fire from the wheel's thread (RealClock); otherwise call wait()."""
+        self.wheel.start()
+        return self
+
+    def arm(self, key: str, fire: Optional[Callable[[Any], Any]] = None,
+            prewarm: Optional[Callable[[], Any]] = None, now: Optional[float] = None,
+            at: Optional[float] = None) -> ScheduledEntry:
+        """Schedule the entry for the next bar open after now (or `at`); re-arming a key replaces it."""
+        now = clock.time() if now is None else now
+        intended = self.bars.next_open(now) + self.delay_sec if at is None else float(at)
+        e = ScheduledEntry(key, armed_at=now, intended=intended)
+        self.cancel(key)
+        with self._lock:
+            self._armed[key] = e
+        if prewarm is not None:
+            e._timers.append(self.wheel.schedule(max(now, intended - self.prewarm_sec), self._prewarm, e, prewarm,
+                                                 name=f"{key}:prewarm"))
+        e._timers.append(self.wheel.schedule(intended, self._fire, e, fire, name=key))
+        return e
+
+    def cancel(self, key: str) -> bool:
+        with self._lock:
+            e = self._armed.pop(key, None)
+        if e is None:
+            return False
+        for t in e._timers:
+            self.wheel.cancel(t)
+        e.cancelled = True
+        e.done.set()
+        return True
+
+    def get(self, key: str) -> Optional[ScheduledEntry]:
+        return self._armed.get(key)
+
+    def _prewarm(self, e: ScheduledEntry, prewarm: Callable[[], Any]) -> None:
+        try:
+            e.payload = prewarm()
+        except Exception as ex:
+            print(f"⚠️ Entry {e.key} pre-warm failed (building at fire time): {ex}")
+            metrics.inc("entry_prewarm_errors_total", key=e.key)
+
+    def _fire(self, e: ScheduledEntry, fire: Optional[Callable[[Any], Any]]) -> None:
+        with self._lock:
+            if self._armed.get(e.key) is not e:
+                return
+            del self._armed[e.key]
+        e.fired_at = clock.time()
+        if e.drift < 0:
+            metrics.observe("entry_fire_early_seconds", -e.drift, key=e.key)
+        else:
+            metrics.observe("entry_fire_drift_seconds", e.drift, key=e.key)
+        try:
+            e.result = fire(e.payload) if fire is not None else e.payload
+        except Exception as ex:
+            e.error = ex
+            print(f"❌ Entry {e.key} failed: {ex}")
+        finally:
+            e.done.set()
+
+    def wait(self, e: ScheduledEntry, timeout: Optional[float] = None) -> bool:
+        """Block until the entry fired (or was cancelled). Without start(): runs the wheel in this
+        thread, one clock.sleep per timer."""
+        if self.wheel.running:
+            return e.done.wait(timeout)
+        while not e.done.is_set() and self.wheel.next_due() is not None:
+            self.wheel.run_next()
+        return e.done.is_set()
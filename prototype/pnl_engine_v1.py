@@ -4,9 +4,9 @@ Computes MTM, Realized PnL, Equity Curve
 """
 
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
 from pathlib import Path
 import json
+from prototype import clock
 
 PNL_FILE = Path("prototype/outputs/pnl_state.json")
 EQUITY_FILE = Path("prototype/outputs/equity_curve.jsonl")
@@ -21,7 +21,7 @@ class PnLState:
 def load_pnl() -> PnLState:
     if PNL_FILE.exists():
         return PnLState(**json.loads(PNL_FILE.read_text()))
-    return PnLState(0.0, 0.0, 0.0, datetime.now(timezone.utc).isoformat())
+    return PnLState(0.0, 0.0, 0.0, clock.utc_now_iso())
 
 def save_pnl(pnl: PnLState):
     PNL_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -34,7 +34,7 @@ def on_tick(entry: float, current: float, qty: int):
     pnl = load_pnl()
     pnl.unrealized = mark_to_market(entry, current, qty)
     pnl.equity = pnl.realized + pnl.unrealized
-    pnl.ts = datetime.now(timezone.utc).isoformat()
+    pnl.ts = clock.utc_now_iso()
     save_pnl(pnl)
 
     EQUITY_FILE.open("a").write(
@@ -47,7 +47,7 @@ def on_exit(realized_pnl: float):
     pnl.realized += realized_pnl
     pnl.unrealized = 0.0
     pnl.equity = pnl.realized
-    pnl.ts = datetime.now(timezone.utc).isoformat()
+    pnl.ts = clock.utc_now_iso()
     save_pnl(pnl)
 
     EQUITY_FILE.open("a").write(
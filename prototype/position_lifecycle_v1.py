@@ -4,9 +4,9 @@ Single source of truth for trade state
 """
 
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
 import json
 from pathlib import Path
+from prototype import clock
 
 STATE_FILE = Path("prototype/outputs/papertrade_state.json")
 
@@ -50,7 +50,7 @@ def on_entry(position: str, price: float) -> PositionState:
     if state.state != "FLAT":
         return state
 
-    now = datetime.now(timezone.utc).isoformat()
+    now = clock.utc_now_iso()
     state = PositionState(
         state="ENTERED",
         position=position,
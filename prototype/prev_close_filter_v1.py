@@ -4,7 +4,7 @@ Ensures directional bias confirmation
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 @dataclass
 class PrevCloseDecision:
@@ -13,7 +13,7 @@ class PrevCloseDecision:
     ts: str
 
 def check_prev_close(spot_close: float, prev_close: float):
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     if spot_close > prev_close:
         return PrevCloseDecision(True, "Spot above previous close", ts)
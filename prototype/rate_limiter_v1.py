@@ -0,0 +1,230 @@
+"""
+RATE LIMITER V1
+Client-side token-bucket budget for broker API calls, with priority classes
+so order placement always gets capacity and background work backs off.
+
+    orders  (PlaceOrder, ModifyOrder, CancelOrder, ExitSNOOrder)   priority 0
+    auth    (QuickAuth, Logout)                                     priority 1
+    quotes  (GetQuotes, GetOptionChain, Get*Greek, ...)             priority 2
+    history (TPSeries, EODChartData, books)                         priority 3
+    search  (SearchScrip, GetSecurityInfo, everything else)         priority 4
+
+Every call takes one token from its route bucket and one from the shared
+gateway bucket. A class may only take a gateway token while the bucket
+holds more than its reserve floor (orders: 0), and gateway waiters are
+served in priority order (a call only waiting on its own route bucket does
+not hold others back), so a burst of quote/history polling can never
+starve an order. Waits are bounded per class; past that RateLimited is raised.
+
+    from prototype import rate_limiter_v1 as rate_limiter
+    requests = rate_limiter.RateLimitedHTTP(requests)   # bot.py direct HTTP
+    rate_limiter.install_noren()                        # NorenApi (+ adapters)
+
+Env: BROKER_RATE_RPS / BROKER_RATE_BURST scale the gateway bucket;
+BROKER_RATE_LIMIT=0 disables limiting.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from prototype import metrics
+
+
+class RateLimited(Exception):
+    """Raised when a call could not get budget within its class max_wait."""
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    name: str
+    priority: int            # lower = served first
+    reserve: float           # fraction of the gateway bucket this class may not dip into
+    max_wait: float          # seconds before RateLimited
+
+
+CLASSES: Dict[str, PriorityClass] = {
+    "orders": PriorityClass("orders", 0, 0.0, 10.0),
+    "auth": PriorityClass("auth", 1, 0.1, 15.0),
+    "quotes": PriorityClass("quotes", 2, 0.25, 5.0),
+    "history": PriorityClass("history", 3, 0.5, 30.0),
+    "search": PriorityClass("search", 4, 0.6, 30.0),
+}
+
+ROUTE_CLASS: Dict[str, str] = {
+    "PlaceOrder": "orders", "ModifyOrder": "orders", "CancelOrder": "orders", "ExitSNOOrder": "orders",
+    "QuickAuth": "auth", "Logout": "auth",
+    "GetQuotes": "quotes", "GetOptionChain": "quotes", "GetOptionGreek": "quotes", "Limits": "quotes",
+    "PositionBook": "quotes", "SingleOrdHist": "quotes",
+    "TPSeries": "history", "EODChartData": "history", "OrderBook": "history", "TradeBook": "history",
+    "SearchScrip": "search", "GetSecurityInfo": "search",
+}
+
+# (rate per second, burst)
+GATEWAY_LIMIT: Tuple[float, float] = (10.0, 20.0)
+ROUTE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "PlaceOrder": (10.0, 10.0),
+    "ModifyOrder": (10.0, 10.0),
+    "CancelOrder": (10.0, 10.0),
+    "QuickAuth": (0.2, 1.0),         # login retries: at most one per 5s after the first
+    "GetQuotes": (10.0, 20.0),
+    "GetOptionChain": (1.0, 2.0),
+    "TPSeries": (3.0, 5.0),
+    "SearchScrip": (1.0, 3.0),
+}
+
+
+def route_of(url: str) -> str:
+    return str(url).rstrip("/").rsplit("/", 1)[-1]
+
+
+def class_of(route: str) -> PriorityClass:
+    return CLASSES[ROUTE_CLASS.get(route, "search")]
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe on its own (RateLimiter holds the lock)."""
+
+    __slots__ = ("rate", "capacity", "tokens", "stamp")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.stamp = now
+
+    def refill(self, now: float) -> None:
+        if now > self.stamp:
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def wait_for(self, floor: float = 0.0) -> float:
+        """Seconds until one token is available above floor (after refill)."""
+        need = floor + 1.0 - self.tokens
+        return 0.0 if need <= 0 else need / self.rate
+
+
+class RateLimiter:
+    def __init__(self, gateway: Tuple[float, float] = GATEWAY_LIMIT,
+                 routes: Optional[Dict[str, Tuple[float, float]]] = None,
+                 timer: Callable[[], float] = time.monotonic):
+        self._timer = timer
+        self._cond = threading.Condition()
+        now = timer()
+        self.gateway = TokenBucket(gateway[0], gateway[1], now)
+        self._route_limits = dict(ROUTE_LIMITS if routes is None else routes)
+        self._routes: Dict[str, TokenBucket] = {}
+        self._waiting: Dict[Tuple[int, int], str] = {}   # (priority, ticket) -> "gateway" | "route"
+        self._tickets = itertools.count()
+        self.enabled = True
+
+    def _bucket(self, route: str, now: float) -> Optional[TokenBucket]:
+        b = self._routes.get(route)
+        if b is None and route in self._route_limits:
+            rate, burst = self._route_limits[route]
+            b = self._routes[route] = TokenBucket(rate, burst, now)
+        return b
+
+    def acquire(self, route: str, max_wait: Optional[float] = None) -> float:
+        """Block until the route may be called; returns seconds waited."""
+        if not self.enabled:
+            return 0.0
+        cls = class_of(route)
+        limit = cls.max_wait if max_wait is None else max_wait
+        floor = cls.reserve * self.gateway.capacity
+        t0 = self._timer()
+        entry = (cls.priority, next(self._tickets))
+        blocked = False
+        with self._cond:
+            self._waiting[entry] = "gateway"
+            try:
+                while True:
+                    now = self._timer()
+                    g = self.gateway
+                    g.refill(now)
+                    rb = self._bucket(route, now)
+                    if rb is not None:
+                        rb.refill(now)
+                    wait = rb.wait_for() if rb is not None else 0.0
+                    if wait > 0:
+                        # only waiting on our own route: don't hold back other classes
+                        self._waiting[entry] = "route"
+                    else:
+                        self._waiting[entry] = "gateway"
+                        if any(e < entry and st == "gateway" for e, st in self._waiting.items()):
+                            wait = 0.05
+                        else:
+                            wait = g.wait_for(floor)
+                            if wait == 0.0:
+                                g.tokens -= 1.0
+                                if rb is not None:
+                                    rb.tokens -= 1.0
+                                break
+                    left = t0 + limit - now
+                    if left <= 0:
+                        metrics.inc("rate_limited_total", cls=cls.name, route=route)
+                        raise RateLimited(f"{route}: no {cls.name} budget within {limit:.1f}s")
+                    blocked = True
+                    self._cond.wait(min(wait, left))
+            finally:
+                del self._waiting[entry]
+                if self._waiting:
+                    self._cond.notify_all()
+        if not blocked:
+            return 0.0
+        waited = self._timer() - t0
+        metrics.observe("rate_limit_wait_seconds", waited, cls=cls.name)
+        return waited
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self._timer()
+        with self._cond:
+            self.gateway.refill(now)
+            out = {"gateway": round(self.gateway.tokens, 2), "waiting": len(self._waiting)}
+            for r, b in self._routes.items():
+                b.refill(now)
+                out[r] = round(b.tokens, 2)
+        return out
+
+
+def _from_env() -> RateLimiter:
+    rps = float(os.getenv("BROKER_RATE_RPS", GATEWAY_LIMIT[0]))
+    burst = float(os.getenv("BROKER_RATE_BURST", GATEWAY_LIMIT[1]))
+    lim = RateLimiter(gateway=(rps, burst))
+    lim.enabled = os.getenv("BROKER_RATE_LIMIT", "1") != "0"
+    return lim
+
+
+LIMITER = _from_env()
+
+
+# =========================
+# HTTP integration
+# =========================
+
+class RateLimitedHTTP:
+    """Wraps a requests-like module: post() acquires budget for the URL's route first."""
+
+    def __init__(self, real: Any, limiter: Optional[RateLimiter] = None):
+        self._real = real
+        self._limiter = limiter
+
+    def post(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        (self._limiter or LIMITER).acquire(route_of(url))
+        return self._real.post(url, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+def install_noren() -> None:
+    """Rate-limit NorenRestApiPy round trips (its module-level `requests`). Idempotent."""
+    import NorenRestApiPy.NorenApi as noren_mod
+
+    if not metrics.is_wrapped(noren_mod.requests, RateLimitedHTTP):
+        noren_mod.requests = RateLimitedHTTP(noren_mod.requests)
@@ -1,7 +1,9 @@
 ﻿# prototype/risk_governor_v1.py
 
 from dataclasses import dataclass
-from datetime import datetime
+from prototype import clock
+
+MTM_LOSS_PCT = 0.045    # exit when MTM loss exceeds 4.5% of capital
 
 @dataclass(frozen=True)
 class RiskDecision:
@@ -16,11 +18,11 @@ def evaluate_risk(
     price: float | None = None,
     atr: float | None = None,
 ) -> RiskDecision:
-    ts = datetime.utcnow().isoformat() + "Z"
+    ts = clock.utc_now_iso_z()
 
     # OPTIONS risk (MTM based)
     if position_type == "OPTIONS":
-        if mtm < 0 and abs(mtm) > (0.045 * capital):
+        if mtm < 0 and abs(mtm) > (MTM_LOSS_PCT * capital):
             return RiskDecision(
                 exit_now=True,
                 reason="Options MTM loss > 4.5% capital",
@@ -0,0 +1,229 @@
+"""
+RISK SERVICE V1
+Intrabar risk for open positions, driven by the live tick stream. Every tick
+(websocket tk/tf, or a polled LTP) re-checks the positions watching that
+instrument in O(1):
+
+    STOP      stop instrument LTP at/through the stop      (Model E: spot 1H close - 2 x ATR)
+    TRAIL     LTP at/through peak -/+ trail_dist           (trail_dist 0 = off)
+    MTM_LOSS  mark-to-market loss > mtm_limit              (risk_governor_v1.MTM_LOSS_PCT x capital)
+
+A breach fires the position's exit once, as an exit_engine_v1 INTRABAR_RISK
+decision, on the exit worker thread (the feed thread never waits on an
+order round trip), through the execution layer callback:
+
+    RISK = RiskService(exit_fn=close_position)        # exit_fn(position, ExitDecision) -> bool
+    RISK.add(RiskPosition("model_e", legs=[Leg("NFO|53001", 50, 23010.0), Leg("NFO|61234", 50, 95.0)],
+                          stop_key="NSE|26000", stop=22880.0, mtm_limit=22500.0))
+    cache.start_feed(on_tick=RISK.on_tick)            # websocket ticks
+    RISK.on_price("NSE|26000", ltp)                   # polled fallback
+
+A failed exit (exit_fn returned False / raised) re-arms the position: the next
+breaching tick retries. tick_to_exit_seconds = tick received -> exit_fn done.
+
+An open position round-trips through a plain dict (RiskPosition.to_state /
+from_state), so the execution layer can persist it and re-register it with
+RISK.add() after a restart.
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prototype import metrics
+from prototype.exit_engine_v1 import ExitDecision, evaluate_exit
+
+
+@dataclass
+class Leg:
+    key: str                          # "EXCH|token", as subscribed on the websocket
+    qty: int                          # signed: + long, - short
+    entry: Optional[float] = None     # None: the first tick is the baseline
+    ltp: Optional[float] = None
+
+
+@dataclass
+class RiskPosition:
+    pid: str
+    legs: List[Leg]
+    stop_key: str = ""                # instrument the stop / trail watch
+    stop: Optional[float] = None
+    side: int = 1                     # +1: stop below (long), -1: stop above (short)
+    trail_dist: float = 0.0
+    mtm_limit: float = 0.0            # loss in rupees; 0 = off
+    mtm: float = 0.0
+    peak: Optional[float] = None
+    exiting: bool = False
+    decision: Optional[ExitDecision] = None
+    tick_to_exit: Optional[float] = None
+    _by_key: Dict[str, List[Leg]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        for leg in self.legs:
+            self._by_key.setdefault(leg.key, []).append(leg)
+            if leg.entry is not None and leg.ltp is not None:
+                self.mtm += (leg.ltp - leg.entry) * leg.qty
+
+    def keys(self) -> List[str]:
+        return sorted(set(self._by_key) | ({self.stop_key} if self.stop_key else set()))
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-able definition (legs, stop, trail peak, MTM limit); live LTPs / MTM are not kept."""
+        return {"pid": self.pid, "legs": [[leg.key, leg.qty, leg.entry] for leg in self.legs],
+                "stop_key": self.stop_key, "stop": self.stop, "side": self.side,
+                "trail_dist": self.trail_dist, "mtm_limit": self.mtm_limit, "peak": self.peak}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RiskPosition":
+        return cls(str(state["pid"]), [Leg(str(k), int(q), None if e is None else float(e)) for k, q, e in state["legs"]],
+                   stop_key=str(state.get("stop_key", "")),
+                   stop=None if state.get("stop") is None else float(state["stop"]),
+                   side=int(state.get("side", 1)), trail_dist=float(state.get("trail_dist", 0.0)),
+                   mtm_limit=float(state.get("mtm_limit", 0.0)),
+                   peak=None if state.get("peak") is None else float(state["peak"]))
+
+    def level(self) -> Optional[float]:
+        """Effective stop: the fixed stop ratcheted by the trail."""
+        lvl = self.stop
+        if self.trail_dist and self.peak is not None:
+            trail = self.peak - self.side * self.trail_dist
+            lvl = trail if lvl is None else (max(lvl, trail) if self.side > 0 else min(lvl, trail))
+        return lvl
+
+    def update(self, key: str, ltp: float) -> Optional[str]:
+        """Apply one tick; returns the breached rule (STOP / TRAIL / MTM_LOSS) or None."""
+        for leg in self._by_key.get(key, ()):
+            if leg.entry is None:
+                leg.entry = ltp
+            self.mtm += (ltp - (leg.entry if leg.ltp is None else leg.ltp)) * leg.qty
+            leg.ltp = ltp
+        if key == self.stop_key:
+            if self.peak is None or (ltp - self.peak) * self.side > 0:
+                self.peak = ltp
+            lvl = self.level()
+            if lvl is not None and (ltp - lvl) * self.side <= 0:
+                return "TRAIL" if self.stop is None or (lvl - self.stop) * self.side > 0 else "STOP"
+        if self.mtm_limit and self.mtm < -self.mtm_limit:
+            return "MTM_LOSS"
+        return None
+
+
+ExitFn = Callable[[RiskPosition, ExitDecision], bool]
+
+
+class RiskService:
+    def __init__(self, exit_fn: ExitFn, subscribe_fn: Optional[Callable[[List[str]], Any]] = None):
+        self.exit_fn = exit_fn
+        self.subscribe_fn = subscribe_fn
+        self._lock = threading.Lock()
+        self._pos: Dict[str, RiskPosition] = {}
+        self._watch: Dict[str, Tuple[RiskPosition, ...]] = {}
+        self._q: "queue.Queue[Tuple[RiskPosition, ExitDecision, float]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {"ticks": 0, "exits": 0, "exit_failures": 0}
+
+    # ---- positions ----
+    def add(self, pos: RiskPosition) -> None:
+        with self._lock:
+            self._pos[pos.pid] = pos
+            self._reindex()
+        if self.subscribe_fn:
+            self.subscribe_fn(pos.keys())
+
+    def remove(self, pid: str) -> Optional[RiskPosition]:
+        with self._lock:
+            pos = self._pos.pop(pid, None)
+            self._reindex()
+        return pos
+
+    def get(self, pid: str) -> Optional[RiskPosition]:
+        return self._pos.get(pid)
+
+    def active(self) -> bool:
+        return bool(self._pos)
+
+    def keys(self) -> List[str]:
+        return sorted(self._watch)
+
+    def _reindex(self) -> None:
+        watch: Dict[str, List[RiskPosition]] = {}
+        for pos in self._pos.values():
+            for k in pos.keys():
+                watch.setdefault(k, []).append(pos)
+        self._watch = {k: tuple(v) for k, v in watch.items()}
+
+    # ---- ticks ----
+    def on_tick(self, msg: Dict[str, Any]) -> None:
+        """Websocket subscribe callback (tk/tf): {"e": exch, "tk": token, "lp": ltp}."""
+        lp = msg.get("lp")
+        if lp in (None, ""):
+            return
+        try:
+            ltp = float(lp)
+        except ValueError:
+            return
+        self.on_price(f"{msg.get('e', '')}|{msg.get('tk', '')}", ltp)
+
+    def on_price(self, key: str, ltp: float, t: Optional[float] = None) -> None:
+        positions = self._watch.get(key)
+        if not positions or not ltp > 0 or math.isinf(ltp):     # NO_QUOTE / bad print: never a stop
+            return
+        t = metrics.now() if t is None else t
+        fire: List[Tuple[RiskPosition, str]] = []
+        with self._lock:
+            self.stats["ticks"] += 1
+            for pos in positions:
+                rule = pos.update(key, ltp)
+                if rule and not pos.exiting:
+                    pos.exiting = True
+                    fire.append((pos, rule))
+        for pos, rule in fire:
+            self._fire(pos, rule, key, ltp, t)
+
+    def _fire(self, pos: RiskPosition, rule: str, key: str, ltp: float, t: float) -> None:
+        d = evaluate_exit(risk_exit=True, signal_exit=False)
+        d.reason = f"{rule}: {key} {ltp:.2f} (stop {_fmt(pos.level())}, MTM {pos.mtm:,.0f})"
+        pos.decision = d
+        metrics.inc("risk_exit_triggers_total", rule=rule)
+        self._q.put((pos, d, t))
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="risk-exit", daemon=True)
+                self._worker.start()
+
+    # ---- exits ----
+    def _run(self) -> None:
+        while True:
+            pos, d, t = self._q.get()
+            try:
+                ok = bool(self.exit_fn(pos, d))
+            except Exception as e:
+                print(f"❌ Risk exit {pos.pid} failed: {e}")
+                ok = False
+            lat = metrics.now() - t
+            rule = d.reason.split(":", 1)[0]
+            metrics.observe("tick_to_exit_seconds", lat, rule=rule)
+            metrics.inc("risk_exits_total", rule=rule, outcome="ok" if ok else "failed")
+            with self._lock:
+                if ok:
+                    pos.tick_to_exit = lat
+                    self.stats["exits"] += 1
+                    if self._pos.get(pos.pid) is pos:
+                        del self._pos[pos.pid]
+                        self._reindex()
+                else:
+                    pos.exiting = False               # re-armed: the next breaching tick retries
+                    self.stats["exit_failures"] += 1
+            self._q.task_done()
+
+    def wait_idle(self) -> None:
+        """Block until every fired exit has been handled (tests / shutdown)."""
+        self._q.join()
+
+
+def _fmt(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.2f}"
@@ -0,0 +1,293 @@
+"""
+RULES V1
+Declarative entry / filter conditions, compiled once into two evaluators with
+the same semantics:
+
+    rs = RuleSet({
+        "trend_flip":   "st_direction == 1 and st_direction[1] == -1",
+        "rsi_filter":   "rsi < rsi_max",
+        "price_action": "close > st_line and close > ema20",
+    }, params={"rsi_max": 65.0})
+
+    rs.vector(cols)        # whole history -> {name: bool ndarray}   (backtests, NumPy only)
+    rs.mask(cols)          # AND of all rules -> bool ndarray
+    rs.last(cols)          # newest bar -> {name: bool}              (live, scalar closures)
+    rs.ok(cols)            # AND of all rules at the newest bar (short-circuits)
+
+cols maps name -> column (ndarray / list / pandas Series, oldest first) or a
+scalar (IndicatorPack-style snapshot, constant over the bars); a pandas
+DataFrame works as is. Only the columns a rule references are touched.
+
+Language (restricted Python expression syntax, parsed with ast):
+
+    close, ema20          columns; names in params are bound as constants at compile time
+    x[k]                  x k bars ago (lookback, k >= 0); NaN before the first bar
+    + - * /  abs()        arithmetic
+    < <= > >= == !=       comparisons (chains allowed); NaN compares False
+    and  or  not          boolean logic
+    crosses_above(a, b)   a > b and a[1] <= b[1]
+    crosses_below(a, b)   a < b and a[1] >= b[1]
+    'GREEN', 1.5, True    constants
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+import operator
+from functools import reduce
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+import numpy as np
+
+NAN = math.nan
+
+VecFn = Callable[[Mapping[str, Any], int], Any]     # (cols, n) -> array | scalar
+ScalarFn = Callable[[Mapping[str, Any], int], Any]  # (env, j) -> value at bar j
+
+_CMP = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITH = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul}
+
+
+# =========================
+# Column access
+# =========================
+
+def _is_scalar(v: Any) -> bool:
+    return isinstance(v, (str, bytes)) or not hasattr(v, "__len__")
+
+
+def _seq(v: Any) -> Any:
+    """Positional indexing for pandas columns; everything else as is."""
+    return v.to_numpy() if hasattr(v, "to_numpy") else v
+
+
+def _vcol(v: Any, n: int) -> np.ndarray:
+    return np.full(n, v) if _is_scalar(v) else np.asarray(v)
+
+
+def _vshift(a: Any, k: int, n: int) -> np.ndarray:
+    a = np.asarray(a)
+    if a.ndim == 0:
+        a = np.full(n, a[()])
+    numeric = a.dtype.kind in "biuf"
+    out = np.full(len(a), NAN if numeric else None, dtype=float if numeric else object)
+    if k < len(a):
+        out[k:] = a[:len(a) - k]
+    return out
+
+
+def _sget(v: Any, j: int) -> Any:
+    if _is_scalar(v):
+        return v if j >= 0 else NAN
+    return v[j] if 0 <= j < len(v) else NAN
+
+
+def _sdiv(a: Any, b: Any) -> float:
+    if b == 0:  # as NumPy: x/0 -> +-inf, 0/0 -> nan
+        return NAN if a == 0 or a != a else math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+# =========================
+# Compiler: ast -> (vector fn, scalar fn)
+# =========================
+
+class _Compiler:
+    def __init__(self, params: Mapping[str, Any]):
+        self.params = params
+        self.columns: set = set()
+
+    def compile(self, node: ast.AST) -> Tuple[VecFn, ScalarFn]:
+        meth = getattr(self, "_" + type(node).__name__, None)
+        if meth is None:
+            raise ValueError(f"unsupported syntax: {ast.unparse(node)!r}")
+        return meth(node)
+
+    def _Expression(self, node: ast.Expression):
+        return self.compile(node.body)
+
+    def _Constant(self, node: ast.Constant):
+        v = node.value
+        return (lambda c, n: v), (lambda e, j: v)
+
+    def _Name(self, node: ast.Name):
+        name = node.id
+        if name in self.params:
+            return self._Constant(ast.Constant(self.params[name]))
+        self.columns.add(name)
+        return (lambda c, n: _vcol(c[name], n)), (lambda e, j: _sget(e[name], j))
+
+    def _Subscript(self, node: ast.Subscript):
+        k = node.slice
+        if not (isinstance(k, ast.Constant) and type(k.value) is int and k.value >= 0):
+            raise ValueError(f"lookback must be a non-negative integer: {ast.unparse(node)!r}")
+        return self._shift(self.compile(node.value), k.value)
+
+    @staticmethod
+    def _shift(fns: Tuple[VecFn, ScalarFn], k: int):
+        vf, sf = fns
+        if k == 0:
+            return fns
+        return (lambda c, n: _vshift(vf(c, n), k, n)), (lambda e, j: sf(e, j - k) if j >= k else NAN)
+
+    def _UnaryOp(self, node: ast.UnaryOp):
+        vf, sf = self.compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return (lambda c, n: ~np.asarray(vf(c, n), dtype=bool)), (lambda e, j: not sf(e, j))
+        if isinstance(node.op, ast.USub):
+            return (lambda c, n: -vf(c, n)), (lambda e, j: -sf(e, j))
+        if isinstance(node.op, ast.UAdd):
+            return vf, sf
+        raise ValueError(f"unsupported operator: {ast.unparse(node)!r}")
+
+    def _BinOp(self, node: ast.BinOp):
+        (lv, ls), (rv, rs) = self.compile(node.left), self.compile(node.right)
+        if isinstance(node.op, ast.Div):
+            def vdiv(c, n):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    return np.true_divide(lv(c, n), rv(c, n))
+            return vdiv, (lambda e, j: _sdiv(ls(e, j), rs(e, j)))
+        op = _ARITH.get(type(node.op))
+        if op is None:
+            raise ValueError(f"unsupported operator: {ast.unparse(node)!r}")
+        return (lambda c, n: op(lv(c, n), rv(c, n))), (lambda e, j: op(ls(e, j), rs(e, j)))
+
+    def _Compare(self, node: ast.Compare):
+        parts = []
+        left = self.compile(node.left)
+        for cmp_op, comparator in zip(node.ops, node.comparators):
+            op = _CMP.get(type(cmp_op))
+            if op is None:
+                raise ValueError(f"unsupported comparison: {ast.unparse(node)!r}")
+            right = self.compile(comparator)
+            parts.append(self._cmp(op, left, right))
+            left = right
+        return self._and(parts)
+
+    @staticmethod
+    def _cmp(op, left, right):
+        (lv, ls), (rv, rs) = left, right
+
+        def vcmp(c, n):
+            with np.errstate(invalid="ignore"):
+                return op(lv(c, n), rv(c, n))
+        return vcmp, (lambda e, j: op(ls(e, j), rs(e, j)))
+
+    @staticmethod
+    def _and(parts):
+        def pair(a, b):
+            (av, as_), (bv, bs) = a, b
+            return (lambda c, n: np.logical_and(av(c, n), bv(c, n))), (lambda e, j: bool(as_(e, j)) and bool(bs(e, j)))
+        return reduce(pair, parts)
+
+    @staticmethod
+    def _or(parts):
+        def pair(a, b):
+            (av, as_), (bv, bs) = a, b
+            return (lambda c, n: np.logical_or(av(c, n), bv(c, n))), (lambda e, j: bool(as_(e, j)) or bool(bs(e, j)))
+        return reduce(pair, parts)
+
+    def _BoolOp(self, node: ast.BoolOp):
+        parts = [self.compile(v) for v in node.values]
+        return self._and(parts) if isinstance(node.op, ast.And) else self._or(parts)
+
+    def _Call(self, node: ast.Call):
+        fn = node.func.id if isinstance(node.func, ast.Name) else ""
+        if node.keywords:
+            raise ValueError(f"keyword arguments not supported: {ast.unparse(node)!r}")
+        args = [self.compile(a) for a in node.args]
+        if fn == "abs" and len(args) == 1:
+            vf, sf = args[0]
+            return (lambda c, n: np.abs(vf(c, n))), (lambda e, j: abs(sf(e, j)))
+        if fn in ("crosses_above", "crosses_below") and len(args) == 2:
+            a, b = args
+            now, before = (operator.gt, operator.le) if fn == "crosses_above" else (operator.lt, operator.ge)
+            return self._and([self._cmp(now, a, b), self._cmp(before, self._shift(a, 1), self._shift(b, 1))])
+        raise ValueError(f"unknown function: {ast.unparse(node)!r}")
+
+
+# =========================
+# Public API
+# =========================
+
+class Rule:
+    """One compiled condition: .vector(cols, n) -> bool ndarray, .scalar(env, j) -> bool."""
+
+    __slots__ = ("name", "source", "columns", "_vf", "_sf")
+
+    def __init__(self, source: str, params: Optional[Mapping[str, Any]] = None, name: str = ""):
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"rule {name or source!r}: {e.msg}") from None
+        comp = _Compiler(params or {})
+        self._vf, self._sf = comp.compile(tree)
+        self.name = name or source
+        self.source = source
+        self.columns: FrozenSet[str] = frozenset(comp.columns)
+
+    def vector(self, cols: Mapping[str, Any], n: int) -> np.ndarray:
+        out = np.zeros(n, dtype=bool)
+        out |= np.asarray(self._vf(cols, n), dtype=bool)
+        return out
+
+    def scalar(self, env: Mapping[str, Any], j: int) -> bool:
+        return bool(self._sf(env, j))
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name!r}: {self.source!r})"
+
+
+class RuleSet:
+    """Named rules compiled once; evaluated over whole histories (vector) or one bar (scalar)."""
+
+    def __init__(self, rules: Mapping[str, str], params: Optional[Mapping[str, Any]] = None):
+        self.params = dict(params or {})
+        self.rules: Dict[str, Rule] = {name: Rule(src, self.params, name) for name, src in rules.items()}
+        self.columns: FrozenSet[str] = frozenset().union(*(r.columns for r in self.rules.values()))
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self.rules)
+
+    def _length(self, cols: Mapping[str, Any]) -> int:
+        for name in self.columns:
+            v = cols[name]
+            if not _is_scalar(v):
+                return len(v)
+        return 1
+
+    # ---- whole history ----
+    def vector(self, cols: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        n = self._length(cols)
+        return {name: r.vector(cols, n) for name, r in self.rules.items()}
+
+    def mask(self, cols: Mapping[str, Any]) -> np.ndarray:
+        out = np.ones(self._length(cols), dtype=bool)
+        for m in self.vector(cols).values():
+            out &= m
+        return out
+
+    # ---- one bar ----
+    def _env(self, cols: Mapping[str, Any], i: int) -> Tuple[Dict[str, Any], int]:
+        env = {name: _seq(cols[name]) for name in self.columns}
+        n = self._length(env)
+        return env, (n + i if i < 0 else i)
+
+    def at(self, cols: Mapping[str, Any], i: int = -1) -> Dict[str, bool]:
+        env, j = self._env(cols, i)
+        return {name: r.scalar(env, j) for name, r in self.rules.items()}
+
+    def last(self, cols: Mapping[str, Any]) -> Dict[str, bool]:
+        return self.at(cols, -1)
+
+    def ok(self, cols: Mapping[str, Any], i: int = -1) -> bool:
+        env, j = self._env(cols, i)
+        return all(r.scalar(env, j) for r in self.rules.values())
+
+    def __repr__(self) -> str:
+        return f"RuleSet({', '.join(self.rules)})"
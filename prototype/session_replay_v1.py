@@ -0,0 +1,411 @@
+"""
+SESSION REPLAY V1
+Deterministic, accelerated replay of a recorded broker session through the
+LIVE bot.bot_loop code path.
+
+Only two things are injected, the bot code itself is not modified:
+- time:      prototype.clock -> SimulatedClock (sleep advances instantly)
+- transport: the raw `requests` beneath bot.py's and NorenRestApiPy's wrapper
+             chain (BreakerHTTP -> RateLimitedHTTP -> InstrumentedHTTP) ->
+             ReplayTransport; breakers and the rate limiter run on virtual time
+
+Recording (live):
+  BOT_RECORD_PATH=prototype/outputs/session.jsonl  (api_server installs the recorder
+  beneath the same wrappers, so breakers / rate limits / metrics stay on)
+  one JSONL line per broker round trip:
+  {"t": epoch, "route": "GetQuotes", "req": {...jData...}, "status": 200, "body": "..."}
+  or {"t": epoch, "route": ..., "req": ..., "error": "ConnectionError(...)"} on exceptions
+
+Replay (offline):
+  python -m prototype.session_replay_v1 prototype/outputs/session.jsonl
+  A full 6h15m session (bot sleeps 3s per loop) runs in seconds.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import threading
+import time as _real_time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from prototype import circuit_breaker_v1 as breakers
+from prototype import metrics
+from prototype import rate_limiter_v1 as rate_limiter
+from prototype.clock import SimulatedClock, use_clock
+
+SESSION_SECONDS = 6 * 3600 + 15 * 60  # 09:15 -> 15:30
+
+# Event-like routes are consumed in call order; everything else is served
+# as "latest recorded response at or before virtual now".
+SEQUENTIAL_ROUTES = {
+    "QuickAuth",
+    "PlaceOrder",
+    "ModifyOrder",
+    "CancelOrder",
+    "ExitSNOOrder",
+    "Logout",
+}
+
+# request fields that identify "the same" data request
+KEY_FIELDS = ("exch", "token", "intrv", "tsym", "stext")
+
+# dummy credentials so the bot's login path runs (payloads are not matched)
+REPLAY_ENV = {
+    "SHOONYA_USERID": "REPLAY",
+    "SHOONYA_PASSWORD": "REPLAY",
+    "TOTP_SECRET": "JBSWY3DPEHPK3PXP",
+    "SHOONYA_VENDOR_CODE": "REPLAY",
+    "SHOONYA_API_SECRET": "REPLAY",
+    "SHOONYA_IMEI": "REPLAY",
+    "TELEGRAM_TOKEN": "",
+    "TELEGRAM_CHAT_ID": "",
+}
+
+
+class ReplayTransportError(ConnectionError):
+    pass
+
+
+# =========================
+# Request parsing / records
+# =========================
+
+def route_of(url: str) -> str:
+    return str(url).rstrip("/").rsplit("/", 1)[-1]
+
+
+def parse_jdata(data: Any) -> Dict[str, Any]:
+    """'jData={...}&jKey=...' (bot.py + NorenApi form bodies) -> jData dict."""
+    if isinstance(data, dict):
+        raw = data.get("jData", "")
+    else:
+        text = data.decode("utf-8") if isinstance(data, bytes) else str(data or "")
+        if not text.startswith("jData="):
+            return {}
+        # jData is raw JSON (not url-encoded) and may contain '&' only inside jKey
+        raw = text[len("jData="):].split("&jKey=", 1)[0]
+        if not raw.startswith("{"):
+            raw = (parse_qs(text).get("jData") or [""])[0]
+    try:
+        out = json.loads(raw)
+        return out if isinstance(out, dict) else {}
+    except Exception:
+        return {}
+
+
+def request_key(route: str, req: Dict[str, Any]) -> Tuple[str, ...]:
+    return (route,) + tuple(str(req.get(k, "")) for k in KEY_FIELDS)
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                out.append(json.loads(line))
+    out.sort(key=lambda r: float(r.get("t", 0.0)))
+    return out
+
+
+class ReplayResponse:
+    def __init__(self, body: str, status: int = 200):
+        self.text = body
+        self.status_code = status
+        self.ok = 200 <= status < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+# =========================
+# Transports
+# =========================
+
+class ReplayTransport:
+    """
+    requests-compatible `.post()` serving recorded responses by virtual time.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], clock: SimulatedClock):
+        self.clock = clock
+        self.calls = 0
+        self.misses = 0
+        self.served: Dict[str, int] = {}
+        self.orders: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        self._seq: Dict[str, List[Dict[str, Any]]] = {}
+        self._seq_pos: Dict[str, int] = {}
+        self._by_key: Dict[Tuple[str, ...], Tuple[List[float], List[Dict[str, Any]]]] = {}
+
+        for r in records:
+            route = str(r.get("route", ""))
+            if route in SEQUENTIAL_ROUTES:
+                self._seq.setdefault(route, []).append(r)
+                continue
+            key = request_key(route, r.get("req") or {})
+            ts, recs = self._by_key.setdefault(key, ([], []))
+            ts.append(float(r.get("t", 0.0)))
+            recs.append(r)
+
+    def _pick(self, route: str, req: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if route in SEQUENTIAL_ROUTES:
+            recs = self._seq.get(route) or []
+            pos = self._seq_pos.get(route, 0)
+            if pos >= len(recs):
+                return recs[-1] if recs else None
+            self._seq_pos[route] = pos + 1
+            return recs[pos]
+
+        hit = self._by_key.get(request_key(route, req))
+        if not hit:
+            return None
+        ts, recs = hit
+        i = bisect.bisect_right(ts, self.clock.time()) - 1
+        return recs[max(i, 0)]
+
+    def post(self, url: str, data: Any = None, **kwargs) -> ReplayResponse:
+        route = route_of(url)
+        req = parse_jdata(data)
+        with self._lock:
+            self.calls += 1
+            rec = self._pick(route, req)
+            if route == "PlaceOrder":
+                self.orders.append({"t": self.clock.time(), "req": req})
+            if rec is None:
+                self.misses += 1
+                return ReplayResponse(json.dumps({"stat": "Not_Ok", "emsg": f"replay: no record for {route}"}))
+            self.served[route] = self.served.get(route, 0) + 1
+
+        if rec.get("error"):
+            raise ReplayTransportError(str(rec["error"]))
+        return ReplayResponse(str(rec.get("body", "")), int(rec.get("status", 200)))
+
+    def get(self, url: str, **kwargs) -> ReplayResponse:
+        raise ReplayTransportError(f"replay: GET not recorded ({url})")
+
+
+class RecordingTransport:
+    """
+    Wraps the raw `requests` module and appends every post() round trip as JSONL.
+    """
+
+    def __init__(self, real: Any, path: str):
+        self._real = real
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _write(self, rec: Dict[str, Any]) -> None:
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def post(self, url: str, data: Any = None, **kwargs):
+        rec: Dict[str, Any] = {"t": _real_time.time(), "route": route_of(url), "req": parse_jdata(data)}
+        # never persist credentials
+        for secret in ("pwd", "appkey", "factor2"):
+            rec["req"].pop(secret, None)
+        try:
+            res = self._real.post(url, data=data, **kwargs)
+        except Exception as e:
+            rec["error"] = repr(e)
+            self._write(rec)
+            raise
+        rec["status"] = int(getattr(res, "status_code", 200))
+        rec["body"] = res.text
+        self._write(rec)
+        return res
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+def _noren_module():
+    import NorenRestApiPy.NorenApi as noren_mod
+    return noren_mod
+
+
+def transport_slot(owner: Any, name: str = "requests") -> Tuple[Any, str]:
+    """
+    (object, attribute) holding the raw transport at the bottom of owner.name's
+    wrapper chain (BreakerHTTP / RateLimitedHTTP / InstrumentedHTTP / ..., linked
+    by ._real), so record / replay swap it without dropping any wrapper. An
+    installed recorder counts as the transport (replay never writes to it).
+    """
+    obj, attr = owner, name
+    while True:
+        inner = getattr(obj, attr)
+        nxt = vars(inner).get("_real") if hasattr(inner, "__dict__") else None
+        if nxt is None or isinstance(inner, RecordingTransport):
+            return obj, attr
+        obj, attr = inner, "_real"
+
+
+def install_recorder(path: str) -> Optional[RecordingTransport]:
+    """Record every broker round trip made by bot.py (direct HTTP + NorenApi); None if already recording."""
+    import bot
+
+    rec: Optional[RecordingTransport] = None
+    for owner in (bot, _noren_module()):
+        if metrics.is_wrapped(owner.requests, RecordingTransport):
+            continue
+        obj, attr = transport_slot(owner)
+        raw = getattr(obj, attr)
+        if rec is None or rec._real is not raw:
+            rec = RecordingTransport(raw, path)
+        setattr(obj, attr, rec)
+    return rec
+
+
+# =========================
+# Replay runner
+# =========================
+
+@dataclass
+class ReplayReport:
+    start: float
+    end: float
+    virtual_sec: float
+    wall_sec: float
+    loop_sleeps: int
+    calls: int
+    misses: int
+    served: Dict[str, int]
+    orders: List[Dict[str, Any]]
+    trade_data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        return self.virtual_sec / self.wall_sec if self.wall_sec > 0 else 0.0
+
+
+@contextlib.contextmanager
+def _patched(obj: Any, name: str, value: Any):
+    old = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, old)
+
+
+@contextlib.contextmanager
+def _replay_env():
+    old = {k: os.environ.get(k) for k in REPLAY_ENV}
+    os.environ.update(REPLAY_ENV)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def replay_session(
+    records: List[Dict[str, Any]],
+    start: Optional[float] = None,
+    duration_sec: float = SESSION_SECONDS,
+    quiet: bool = True,
+) -> ReplayReport:
+    """
+    Run bot.bot_loop() synchronously under virtual time until start + duration_sec.
+    """
+    import bot
+
+    if start is None:
+        start = float(records[0]["t"]) if records else _real_time.time()
+    end = start + float(duration_sec)
+
+    def _stop_when_done(c: SimulatedClock) -> None:
+        if c.time() >= end:
+            bot._stop_flag = True
+
+    clock = SimulatedClock(start, on_sleep=_stop_when_done)
+    transport = ReplayTransport(records, clock)
+
+    # fresh runtime state per replay (same as a process start)
+    trade_data0 = copy.deepcopy(bot.trade_data)
+    tokens0 = dict(bot.TOKENS)
+    bot._stop_flag = False
+    bot._last_gear = None
+    bot._susertoken = None
+    bot.api = None
+
+    out = io.StringIO()
+    t0 = _real_time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(_replay_env())
+            stack.enter_context(use_clock(clock))
+            for owner in (bot, _noren_module()):
+                stack.enter_context(_patched(*transport_slot(owner), transport))
+            # same breakers / rate limits as live, but on virtual time and not shared with it
+            stack.enter_context(_patched(breakers, "_BREAKERS", {}))
+            live = rate_limiter.LIMITER
+            limiter = rate_limiter.RateLimiter(gateway=(live.gateway.rate, live.gateway.capacity),
+                                               timer=clock.monotonic)
+            limiter.enabled = live.enabled
+            stack.enter_context(_patched(rate_limiter, "LIMITER", limiter))
+            if quiet:
+                stack.enter_context(contextlib.redirect_stdout(out))
+            bot.bot_loop()
+        wall = _real_time.perf_counter() - t0
+        snapshot = copy.deepcopy(bot.trade_data)
+    finally:
+        bot.trade_data.clear()
+        bot.trade_data.update(trade_data0)
+        bot.TOKENS.clear()
+        bot.TOKENS.update(tokens0)
+        bot._stop_flag = False
+
+    return ReplayReport(
+        start=start,
+        end=end,
+        virtual_sec=clock.time() - start,
+        wall_sec=wall,
+        loop_sleeps=clock.sleeps,
+        calls=transport.calls,
+        misses=transport.misses,
+        served=transport.served,
+        orders=transport.orders,
+        trade_data=snapshot,
+    )
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        raise SystemExit("usage: python -m prototype.session_replay_v1 <session.jsonl> [duration_sec]")
+
+    records = load_records(sys.argv[1])
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else SESSION_SECONDS
+    rep = replay_session(records, duration_sec=duration)
+
+    print(json.dumps({
+        "virtual_sec": rep.virtual_sec,
+        "wall_sec": round(rep.wall_sec, 3),
+        "speedup": round(rep.speedup, 1),
+        "loop_sleeps": rep.loop_sleeps,
+        "calls": rep.calls,
+        "misses": rep.misses,
+        "served": rep.served,
+        "orders": len(rep.orders),
+        "status": rep.trade_data.get("status"),
+        "last_error": rep.trade_data.get("last_error"),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
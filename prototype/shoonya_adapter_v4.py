@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import time
 from typing import Any, Dict, Optional
 
+from prototype import clock
+from prototype import circuit_breaker_v1 as breakers
+from prototype import market_data_v1 as market_data
 from prototype.config import load_config
 from prototype.contracts import CandlePack
 from prototype.contract_guard import ensure_candlepack
+from prototype.mtf_engine_v1 import MultiTimeframeEngine
 from prototype.shoonya_login_v2 import login
 
 
@@ -22,8 +25,10 @@ class ShoonyaAdapterV4:
     - last_ssboe never None
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mtf: Optional[MultiTimeframeEngine] = None) -> None:
         self.cfg = load_config()
+        # optional: derive 1h bars from a shared 1m buffer instead of a separate 60m download
+        self.mtf = mtf
         self.api = None
         self.last_error: str = ""
         self.max_attempts: int = 3
@@ -35,16 +40,19 @@ class ShoonyaAdapterV4:
             self.last_error = str(err or "LOGIN_FAILED")
             return False
         self.api = api
+        breakers.install_noren()
         return True
 
     def _need_api(self):
         if self.api is None:
             raise AdapterError("NOT_LOGGED_IN")
 
-    def get_spot_candles_1h_pack(self, lookback_hours: int = 72) -> CandlePack:
+    def get_spot_candles_1h_pack(self, lookback_hours: int = 72, close_at: Optional[float] = None,
+                                 horizon: Optional[float] = None) -> CandlePack:
         """
         Fetch NIFTY spot candles (1h interval) using Shoonya get_time_price_series.
         STRICT: returns CandlePack always.
+        close_at (MTF only): called at a bar close (bar_clock_v1), the bar ending then is closed in the pack.
         """
         self._need_api()
 
@@ -56,7 +64,7 @@ class ShoonyaAdapterV4:
         interval = "60"
 
         # start time: now - lookback_hours
-        now = int(time.time())
+        now = int(clock.time())
         start = now - (lookback_hours * 3600)
 
         meta: Dict[str, Any] = {
@@ -70,15 +78,20 @@ class ShoonyaAdapterV4:
 
         for attempt in range(1, self.max_attempts + 1):
             try:
-                out = self.api.get_time_price_series(
-                    exchange=exchange,
-                    token=token,
-                    starttime=str(start),
-                    interval=interval,
-                )
-
-                # normalize (list/dict wrapper) into CandlePack
-                pack = ensure_candlepack(out, meta=meta)
+                if self.mtf is not None:
+                    # delta 1m fetch into the shared engine; 09:15-anchored hours like broker 60m bars
+                    if close_at is not None:
+                        self.mtf.sync_close(self.api, exchange, token, close_at, horizon,
+                                            lookback_sec=lookback_hours * 3600)
+                    else:
+                        self.mtf.sync(self.api, exchange, token, lookback_sec=lookback_hours * 3600)
+                    pack = self.mtf.candlepack(token, "1h_915", meta=meta)
+                else:
+                    # single-flight: network_guard / other callers share the round trip
+                    out = market_data.series(self.api, exchange, token, interval, starttime=start)
+
+                    # normalize (list/dict wrapper) into CandlePack
+                    pack = ensure_candlepack(out, meta=meta)
 
                 # HARD CONTRACT asserts
                 if pack.close is None:
@@ -88,11 +101,16 @@ class ShoonyaAdapterV4:
 
                 return pack
 
+            except breakers.BreakerOpen as e:
+                # endpoint is down: fail fast, the breaker owns the retry schedule
+                self.last_error = str(e)
+                raise AdapterError(f"E_SPOT_CANDLES_FAILED: {e}") from e
+
             except Exception as e:
                 last_err = str(e)
                 self.last_error = last_err
                 if attempt < self.max_attempts:
-                    time.sleep(self.http_backoff_sec * attempt)
+                    clock.sleep(breakers.backoff_delay(attempt, base=self.http_backoff_sec))
                     continue
                 raise AdapterError(f"E_SPOT_CANDLES_FAILED: {last_err}") from e
 
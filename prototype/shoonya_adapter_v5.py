@@ -0,0 +1,114 @@
+"""
+SHOONYA ADAPTER V5
+Same contract as shoonya_adapter_v3 (v3 stays frozen, policy) for main_v8:
+    login(), last_error, get_spot_candles_1h_pack() -> {"df": DataFrame, "meta": dict}
+- logs in once and keeps the session (v3's guard logs in again on every fetch)
+- 60m series through market_data_v1 (single-flight, shared with other readers)
+- parsed into one persistent OHLCVRing per token: a poll appends only the bars
+  the ring does not hold yet instead of rebuilding row dicts -> DataFrame
+- the frame is a copy, so it does not change when the ring takes the next poll
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from prototype import clock
+from prototype import circuit_breaker_v1 as breakers
+from prototype import market_data_v1 as market_data
+from prototype.network_guard import SERIES_RING_CAPACITY
+from prototype.ohlcv_ring_v1 import OHLCVRing
+from prototype.shoonya_adapter_v3 import AdapterError, _normalize_candle_item
+
+
+def build_df_from_shoonya_series(out2: Any, ring: Optional[OHLCVRing] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """OHLC frame (oldest first) + newest-candle meta; pass a persistent ring to append only new bars."""
+    if not isinstance(out2, list) or len(out2) == 0:
+        raise AdapterError(f"CANDLES_EMPTY: {out2}")
+
+    newest_raw = _normalize_candle_item(out2[0])
+    if not newest_raw:
+        raise AdapterError(f"NEWEST_CANDLE_BAD_FORMAT: {type(out2[0])}")
+
+    rows = [c for c in map(_normalize_candle_item, out2) if c]
+    if ring is None:
+        ring = OHLCVRing(len(rows))
+    if ring.n and int(newest_raw.get("ssboe", 0) or 0) < ring.last_ssboe():
+        ring.clear()                        # older than what we hold: start over
+    ring.extend_rows(rows)
+
+    df = ring.to_frame(len(rows), time=False, volume=False).copy()
+    meta = {
+        "candle_time": str(newest_raw.get("time", "")),
+        "ssboe": int(newest_raw.get("ssboe", 0) or 0),
+    }
+    return df, meta
+
+
+class ShoonyaAdapterV5:
+    def __init__(self, token: str = "", lookback_hours: int = 72):
+        self.token = str(token or "")
+        self.lookback_hours = int(lookback_hours)
+        self.api = None
+        self.last_error: str = ""
+        self.http_backoff_sec: int = 5
+        self.max_attempts: int = 3
+        self._rings: Dict[str, OHLCVRing] = {}
+
+    def login(self) -> bool:
+        try:
+            from prototype.shoonya_login_v2 import login as shoonya_login
+            api, err = shoonya_login()
+            if not api:
+                self.last_error = str(err or "LOGIN_FAILED")
+                return False
+            if not self.token:
+                from prototype.config import load_config
+
+                cfg = load_config()
+                self.token = str(getattr(cfg, "nifty_spot_token", "") or getattr(cfg, "spot_token", "") or "")
+            self.api = api
+            self.last_error = ""
+            breakers.install_noren()
+            return True
+        except Exception as e:
+            self.last_error = f"LOGIN_EXC: {e}"
+            return False
+
+    def _ring(self, token: str) -> OHLCVRing:
+        ring = self._rings.get(token)
+        if ring is None:
+            ring = self._rings[token] = OHLCVRing(SERIES_RING_CAPACITY)
+        return ring
+
+    def get_spot_candles_1h_pack(self) -> Dict[str, Any]:
+        """{"df": OHLC DataFrame (oldest first), "meta": {"candle_time": str, "ssboe": int}}"""
+        if self.api is None:
+            raise AdapterError("NOT_LOGGED_IN")
+        if not self.token:
+            raise AdapterError("CONFIG_MISSING_TOKEN")
+
+        last_err = ""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                start = clock.time() - self.lookback_hours * 3600
+                out = market_data.series(self.api, "NSE", self.token, "60", starttime=start)
+                df, meta = build_df_from_shoonya_series(out, self._ring(self.token))
+                return {"df": df, "meta": meta}
+
+            except breakers.BreakerOpen as e:
+                # endpoint is down: fail fast, the breaker owns the retry schedule
+                self.last_error = str(e)
+                raise AdapterError(f"E_SPOT_CANDLES_FAILED: {e}") from e
+
+            except Exception as e:
+                last_err = str(e)
+                self.last_error = last_err
+                if attempt < self.max_attempts:
+                    clock.sleep(breakers.backoff_delay(attempt, base=self.http_backoff_sec))
+                    continue
+                raise AdapterError(f"E_SPOT_CANDLES_FAILED: Failed after retries: {last_err}") from e
+
+        raise AdapterError(f"E_SPOT_CANDLES_FAILED: {last_err}")
@@ -0,0 +1,780 @@
+"""
+SHOONYA MOCK SERVER V1
+Offline stand-in for the Shoonya / Noren gateway (REST + WebSocket), for
+load and latency testing without touching api.shoonya.com.
+
+One port serves both:
+  REST  POST http://127.0.0.1:<port>/NorenWClientTP/<Route>   (jData=...&jKey=...)
+        routes: QuickAuth, SearchScrip, GetQuotes, TPSeries, GetOptionChain,
+                PlaceOrder, PositionBook, OrderBook, SingleOrdHist, Limits, Logout
+  WS    ws://127.0.0.1:<port>/NorenWSToken/
+        c (connect) -> ck | t/u (touchline) -> tk/tf/uk | d/ud (depth) -> dk/df/udk
+        o (order updates) -> ok, then om per order | ping frames -> pong
+
+Behaviour knobs (MockConfig / MOCK_* env vars): base latency, jitter,
+HTTP error rate, broker reject rate, tick interval, price volatility, seed.
+Prices follow a seeded random walk (spot, VIX, two futures, any NFO option
+tsym priced from spot).
+
+Point the bot at it:
+  SHOONYA_REST_URL=http://127.0.0.1:9100/NorenWClientTP/
+  SHOONYA_API_HOST=http://127.0.0.1:9100/NorenWClientTP
+  SHOONYA_WS_URL=ws://127.0.0.1:9100/NorenWSToken/
+
+Run:
+  python -m prototype.shoonya_mock_server_v1
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+SPOT_TOKEN = "26000"
+VIX_TOKEN = "26017"
+FUT_TOKENS = ("53001", "53002")
+OPT_STRIKE_STEP = 50
+
+_OPT_RE = re.compile(r"^NIFTY\w*?(\d{4,6})(PE|CE|P|C)$")
+_NFO_OPT_RE = re.compile(r"^NIFTY(\d{2}[A-Z]{3}\d{2})([CP])(\d{4,6})$")   # NIFTY29JAN26P23000
+
+
+@dataclass
+class MockConfig:
+    host: str = "127.0.0.1"
+    port: int = 9100
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0          # HTTP 502 responses
+    reject_rate: float = 0.0         # {"stat": "Not_Ok"} responses
+    route_latency_ms: Dict[str, float] = field(default_factory=dict)
+    tick_interval_sec: float = 1.0
+    spot: float = 23000.0
+    vix: float = 14.5
+    annual_vol: float = 0.14
+    seed: int = 7
+    lot_size: int = 50
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        def f(name: str, default: float) -> float:
+            return float(os.getenv(name, default))
+        return cls(
+            host=os.getenv("MOCK_HOST", "127.0.0.1"),
+            port=int(f("MOCK_PORT", 9100)),
+            latency_ms=f("MOCK_LATENCY_MS", 0.0),
+            jitter_ms=f("MOCK_JITTER_MS", 0.0),
+            error_rate=f("MOCK_ERROR_RATE", 0.0),
+            reject_rate=f("MOCK_REJECT_RATE", 0.0),
+            tick_interval_sec=f("MOCK_TICK_SEC", 1.0),
+            spot=f("MOCK_SPOT", 23000.0),
+            vix=f("MOCK_VIX", 14.5),
+            seed=int(f("MOCK_SEED", 7)),
+        )
+
+
+# =========================
+# Synthetic market
+# =========================
+
+def _last_thursday(y: int, m: int) -> date:
+    d = date(y + (m == 12), m % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - 3) % 7)
+
+
+def _fut_expiries(today: date) -> Tuple[date, date]:
+    cur = _last_thursday(today.year, today.month)
+    if cur < today:
+        y, m = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+        cur = _last_thursday(y, m)
+    y, m = (cur.year + 1, 1) if cur.month == 12 else (cur.year, cur.month + 1)
+    return cur, _last_thursday(y, m)
+
+
+class SyntheticMarket:
+    """Seeded random walk for spot/VIX; futures carry a fixed basis."""
+
+    def __init__(self, cfg: MockConfig, today: Optional[date] = None):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.lock = threading.Lock()
+        self.spot = cfg.spot
+        self.vix = cfg.vix
+        self.ticks = 0
+
+        today = today or date.today()
+        self.instruments: Dict[str, Dict[str, Any]] = {
+            SPOT_TOKEN: {"exch": "NSE", "tsym": "Nifty 50", "instname": "UNDIND"},
+            VIX_TOKEN: {"exch": "NSE", "tsym": "INDIAVIX", "instname": "UNDIND"},
+        }
+        for i, (tok, exp) in enumerate(zip(FUT_TOKENS, _fut_expiries(today))):
+            self.instruments[tok] = {
+                "exch": "NFO",
+                "tsym": f"NIFTY{exp.strftime('%d%b%y').upper()}F",
+                "instname": "FUTIDX",
+                "expd": exp.strftime("%d-%b-%Y").upper(),
+                "basis": 0.0035 * (i + 1),
+                "ls": str(cfg.lot_size),
+            }
+        self.by_tsym = {v["tsym"]: k for k, v in self.instruments.items()}
+        self.open = {tok: self.ltp(tok) for tok in self.instruments}
+        self.high = dict(self.open)
+        self.low = dict(self.open)
+        self.prev_close = {tok: px * (1.0 - 0.002) for tok, px in self.open.items()}
+        self.volume = {tok: 0 for tok in self.instruments}
+
+    def step(self, dt_sec: float) -> None:
+        sd = self.cfg.annual_vol * math.sqrt(max(dt_sec, 1e-6) / (252 * 22500))
+        with self.lock:
+            self.spot *= math.exp(self.rng.gauss(0.0, sd))
+            self.vix = max(8.0, self.vix + 0.05 * (self.cfg.vix - self.vix) + self.rng.gauss(0.0, 0.02))
+            self.ticks += 1
+            for tok in self.instruments:
+                px = self.ltp(tok)
+                self.high[tok] = max(self.high[tok], px)
+                self.low[tok] = min(self.low[tok], px)
+                self.volume[tok] += self.rng.randint(0, 500)
+
+    def ltp(self, token: str) -> Optional[float]:
+        if token == SPOT_TOKEN:
+            return round(self.spot, 2)
+        if token == VIX_TOKEN:
+            return round(self.vix, 2)
+        inst = self.instruments.get(token)
+        if inst and "basis" in inst:
+            return round(self.spot * (1.0 + inst["basis"]), 2)
+        if inst and "optt" in inst:
+            return self.option_price(inst["strike"], inst["optt"] == "PE")
+        return None
+
+    def option_price(self, strike: float, is_put: bool) -> float:
+        intrinsic = max(0.0, strike - self.spot) if is_put else max(0.0, self.spot - strike)
+        time_value = self.spot * self.vix / 100.0 * 0.04 * math.exp(-abs(self.spot - strike) / (0.02 * self.spot))
+        return round(max(0.05, intrinsic + time_value), 2)
+
+    def price_for_tsym(self, tsym: str) -> Optional[float]:
+        tok = self.by_tsym.get(tsym)
+        if tok:
+            return self.ltp(tok)
+        m = _NFO_OPT_RE.match(tsym)
+        if m:
+            return self.option_price(float(m.group(3)), m.group(2) == "P")
+        m = _OPT_RE.match(tsym)
+        if not m:
+            return None
+        return self.option_price(float(m.group(1)), m.group(2).startswith("P"))
+
+    def option_chain(self, tsym: str, strike: float, count: int) -> List[Dict[str, Any]]:
+        """CE+PE for `count` strikes either side of `strike`, on the expiry of the future/option `tsym`."""
+        inst = self.instruments.get(self.by_tsym.get(tsym, ""), {})
+        m = _NFO_OPT_RE.match(tsym)
+        if "expd" in inst:
+            exp = datetime.strptime(inst["expd"], "%d-%b-%Y").date()
+        elif m:
+            exp = datetime.strptime(m.group(1), "%d%b%y").date()
+        else:
+            return []
+        expd = exp.strftime("%d-%b-%Y").upper()
+        fut_exps = [self.instruments[t]["expd"] for t in FUT_TOKENS]
+        exp_idx = fut_exps.index(expd) if expd in fut_exps else len(fut_exps)
+        atm = int(round(strike / OPT_STRIKE_STEP) * OPT_STRIKE_STEP)
+        out = []
+        for k in range(atm - count * OPT_STRIKE_STEP, atm + (count + 1) * OPT_STRIKE_STEP, OPT_STRIKE_STEP):
+            for optt in ("CE", "PE"):
+                tok = f"{4 + exp_idx}{k:06d}{int(optt == 'PE')}"
+                if tok not in self.instruments:
+                    otsym = f"NIFTY{exp.strftime('%d%b%y').upper()}{optt[0]}{k}"
+                    self.instruments[tok] = {"exch": "NFO", "tsym": otsym, "instname": "OPTIDX", "expd": expd,
+                                             "strike": float(k), "optt": optt, "ls": str(self.cfg.lot_size)}
+                    self.by_tsym[otsym] = tok
+                    px = self.ltp(tok)
+                    self.open[tok] = self.high[tok] = self.low[tok] = self.prev_close[tok] = px
+                    self.volume[tok] = 0
+                opt = self.instruments[tok]
+                out.append({"exch": "NFO", "token": tok, "tsym": opt["tsym"], "optt": optt,
+                            "strprc": f"{k:.2f}", "pp": "2", "ls": opt["ls"], "ti": "0.05"})
+        return out
+
+    def quote(self, token: str) -> Optional[Dict[str, Any]]:
+        inst = self.instruments.get(token)
+        if not inst:
+            return None
+        lp = self.ltp(token)
+        out = {
+            "exch": inst["exch"], "tsym": inst["tsym"], "token": token,
+            "lp": f"{lp:.2f}", "c": f"{self.prev_close[token]:.2f}",
+            "o": f"{self.open[token]:.2f}", "h": f"{self.high[token]:.2f}", "l": f"{self.low[token]:.2f}",
+            "v": str(self.volume[token]), "bp1": f"{lp - 0.05:.2f}", "sp1": f"{lp + 0.05:.2f}",
+            "bq1": "1500", "sq1": "1350",
+        }
+        if "ls" in inst:
+            out["ls"] = inst["ls"]
+        return out
+
+    def history(self, token: str, st: float, et: float, interval_min: int) -> List[Dict[str, Any]]:
+        """Backward random walk ending at the current price, newest first (as Noren)."""
+        last = self.ltp(token)
+        if last is None:
+            return []
+        step = 60 * max(1, interval_min)
+        t_end = int(et) - int(et) % step
+        n = max(0, (t_end - int(st)) // step)
+        rng = random.Random(f"{token}|{int(st) // step}|{interval_min}|{self.cfg.seed}")
+        sd = self.cfg.annual_vol * math.sqrt(step / (252 * 22500))
+        out: List[Dict[str, Any]] = []
+        close = last
+        for i in range(n):
+            t = t_end - i * step
+            o = close * math.exp(-rng.gauss(0.0, sd))
+            hi = max(o, close) * (1 + abs(rng.gauss(0.0, sd / 2)))
+            lo = min(o, close) * (1 - abs(rng.gauss(0.0, sd / 2)))
+            out.append({
+                "stat": "Ok",
+                "time": datetime.fromtimestamp(t).strftime("%d-%m-%Y %H:%M:%S"),
+                "ssboe": str(t),
+                "into": f"{o:.2f}", "inth": f"{hi:.2f}", "intl": f"{lo:.2f}", "intc": f"{close:.2f}",
+                "intvwap": f"{(hi + lo + close) / 3:.2f}", "intv": str(rng.randint(1000, 50000)),
+                "intoi": "0", "v": "0", "oi": "0",
+            })
+            close = o
+        return out
+
+
+# =========================
+# Broker state
+# =========================
+
+class MockBroker:
+    def __init__(self, cfg: MockConfig, market: SyntheticMarket):
+        self.cfg = cfg
+        self.market = market
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, str] = {}          # susertoken -> uid
+        self.orders: List[Dict[str, Any]] = []
+        self.positions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._oid = itertools.count(int(cfg.seed) * 10**9 + 1)
+        self._sess = itertools.count(1)
+        self.order_listeners: List["_WsSession"] = []
+
+    # ---- auth ----
+    def login(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        uid = str(req.get("uid", ""))
+        if not uid:
+            return {"stat": "Not_Ok", "emsg": "Invalid Input : uid"}
+        token = hashlib.sha256(f"{uid}|{next(self._sess)}|{self.cfg.seed}".encode()).hexdigest()
+        with self.lock:
+            self.sessions[token] = uid
+        return {
+            "stat": "Ok", "susertoken": token, "actid": uid, "uname": uid,
+            "request_time": datetime.now().strftime("%H:%M:%S %d-%m-%Y"),
+        }
+
+    def valid(self, jkey: str) -> bool:
+        return jkey in self.sessions
+
+    def logout(self, jkey: str) -> Dict[str, Any]:
+        with self.lock:
+            self.sessions.pop(jkey, None)
+        return {"stat": "Ok"}
+
+    # ---- reference / market data ----
+    def search(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        text = str(req.get("stext", "")).upper()
+        exch = str(req.get("exch", ""))
+        vals = []
+        for tok, inst in self.market.instruments.items():
+            if exch and inst["exch"] != exch:
+                continue
+            if text and text.replace(" ", "") not in inst["tsym"].upper().replace(" ", ""):
+                continue
+            v = {"exch": inst["exch"], "token": tok, "tsym": inst["tsym"], "instname": inst["instname"]}
+            if "expd" in inst:
+                v["expd"] = inst["expd"]
+                v["ls"] = inst["ls"]
+            vals.append(v)
+        if not vals:
+            return {"stat": "Not_Ok", "emsg": "no data"}
+        return {"stat": "Ok", "values": vals}
+
+    def quotes(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        with self.market.lock:
+            q = self.market.quote(str(req.get("token", "")))
+        if q is None:
+            return {"stat": "Not_Ok", "emsg": "Error Occurred : 5 \"no data\""}
+        q["stat"] = "Ok"
+        return q
+
+    def tpseries(self, req: Dict[str, Any]) -> Any:
+        now = time.time()
+        st = float(req.get("st") or now - 86400)
+        et = float(req.get("et") or now)
+        intrv = int(float(req.get("intrv") or 1))
+        with self.market.lock:
+            rows = self.market.history(str(req.get("token", "")), st, et, intrv)
+        return rows if rows else {"stat": "Not_Ok", "emsg": "no data"}
+
+    def option_chain(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            strike = float(req.get("strprc") or 0)
+            cnt = int(float(req.get("cnt") or 2))
+        except ValueError:
+            return {"stat": "Not_Ok", "emsg": "Invalid Input : strprc"}
+        with self.market.lock:
+            vals = self.market.option_chain(unquote_plus(str(req.get("tsym", ""))), strike, cnt)
+        if not vals:
+            return {"stat": "Not_Ok", "emsg": "no data"}
+        return {"stat": "Ok", "values": vals}
+
+    # ---- orders ----
+    def place_order(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        tsym = unquote_plus(str(req.get("tsym", "")))
+        side = str(req.get("trantype", ""))
+        try:
+            qty = int(float(req.get("qty", 0)))
+        except ValueError:
+            qty = 0
+        if side not in ("B", "S") or qty <= 0 or not tsym:
+            return {"stat": "Not_Ok", "emsg": "Invalid Input : trantype/qty/tsym"}
+
+        with self.market.lock:
+            mkt = self.market.price_for_tsym(tsym)
+        prctyp = str(req.get("prctyp", "MKT"))
+        limit = float(req.get("prc") or 0.0)
+        px = mkt if prctyp == "MKT" or not limit else limit
+        if px is None:
+            px = limit or 100.0
+
+        oid = str(next(self._oid))
+        ts = datetime.now().strftime("%H:%M:%S %d-%m-%Y")
+        order = {
+            "norenordno": oid, "uid": req.get("uid", ""), "actid": req.get("actid", ""),
+            "exch": req.get("exch", "NFO"), "tsym": tsym, "qty": str(qty), "trantype": side,
+            "prctyp": prctyp, "prd": req.get("prd", "M"), "ret": req.get("ret", "DAY"),
+            "remarks": req.get("remarks", ""), "status": "COMPLETE", "fillshares": str(qty),
+            "avgprc": f"{px:.2f}", "prc": f"{limit:.2f}", "norentm": ts, "exch_tm": ts,
+            "reporttype": "Fill",
+        }
+        with self.lock:
+            self.orders.append(order)
+            self._apply_fill(order, px)
+            listeners = list(self.order_listeners)
+        msg = json.dumps(dict(order, t="om"))
+        for ws in listeners:
+            ws.send_text(msg)
+        return {"stat": "Ok", "norenordno": oid, "request_time": ts}
+
+    def _apply_fill(self, order: Dict[str, Any], px: float) -> None:
+        key = (order["exch"], order["tsym"], order["prd"])
+        qty = int(order["qty"])
+        pos = self.positions.setdefault(key, {
+            "stat": "Ok", "exch": order["exch"], "tsym": order["tsym"], "prd": order["prd"],
+            "token": self.market.by_tsym.get(order["tsym"], ""), "actid": order["actid"],
+            "daybuyqty": 0, "daysellqty": 0, "daybuyamt": 0.0, "daysellamt": 0.0,
+        })
+        if order["trantype"] == "B":
+            pos["daybuyqty"] += qty
+            pos["daybuyamt"] += qty * px
+        else:
+            pos["daysellqty"] += qty
+            pos["daysellamt"] += qty * px
+
+    def position_book(self) -> Any:
+        with self.lock:
+            rows = [dict(p) for p in self.positions.values()]
+        if not rows:
+            return {"stat": "Not_Ok", "emsg": "no data"}
+        out = []
+        for p in rows:
+            net = p["daybuyqty"] - p["daysellqty"]
+            with self.market.lock:
+                lp = self.market.price_for_tsym(p["tsym"]) or 0.0
+            buy_avg = p["daybuyamt"] / p["daybuyqty"] if p["daybuyqty"] else 0.0
+            sell_avg = p["daysellamt"] / p["daysellqty"] if p["daysellqty"] else 0.0
+            closed = min(p["daybuyqty"], p["daysellqty"])
+            rpnl = (sell_avg - buy_avg) * closed
+            upnl = (lp - (buy_avg if net > 0 else sell_avg)) * net if net else 0.0
+            out.append({
+                "stat": "Ok", "exch": p["exch"], "tsym": p["tsym"], "token": p["token"], "prd": p["prd"],
+                "actid": p["actid"], "netqty": str(net), "lp": f"{lp:.2f}",
+                "daybuyqty": str(p["daybuyqty"]), "daysellqty": str(p["daysellqty"]),
+                "daybuyavgprc": f"{buy_avg:.2f}", "daysellavgprc": f"{sell_avg:.2f}",
+                "netavgprc": f"{(buy_avg if net >= 0 else sell_avg):.2f}",
+                "rpnl": f"{rpnl:.2f}", "urmtom": f"{upnl:.2f}",
+            })
+        return out
+
+    def order_book(self) -> Any:
+        with self.lock:
+            rows = [dict(o, stat="Ok") for o in reversed(self.orders)]
+        return rows if rows else {"stat": "Not_Ok", "emsg": "no data"}
+
+    def single_order_history(self, req: Dict[str, Any]) -> Any:
+        oid = str(req.get("norenordno", ""))
+        with self.lock:
+            rows = [dict(o, stat="Ok") for o in self.orders if o["norenordno"] == oid]
+        return rows if rows else {"stat": "Not_Ok", "emsg": "no data"}
+
+    def limits(self) -> Dict[str, Any]:
+        return {"stat": "Ok", "cash": "500000.00", "payin": "0.00", "marginused": "0.00"}
+
+
+# =========================
+# WebSocket (RFC 6455, server side)
+# =========================
+
+class _WsSession:
+    def __init__(self, handler: "_Handler"):
+        self.h = handler
+        self.conn: socket.socket = handler.connection
+        self.rfile = handler.rfile
+        self.wlock = threading.Lock()
+        self.closed = False
+        self.touch: Dict[str, str] = {}   # token -> "t" | "d"
+        self.authed = False
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        n = len(payload)
+        if n < 126:
+            head = struct.pack("!BB", 0x80 | opcode, n)
+        elif n < 65536:
+            head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+        with self.wlock:
+            if self.closed:
+                return
+            try:
+                self.conn.sendall(head + payload)
+            except OSError:
+                self.closed = True
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def _read_exact(self, n: int) -> bytes:
+        buf = self.rfile.read(n)
+        if buf is None or len(buf) < n:
+            raise ConnectionError("ws closed")
+        return buf
+
+    def recv(self) -> Tuple[int, bytes]:
+        b1, b2 = self._read_exact(2)
+        opcode = b1 & 0x0F
+        n = b2 & 0x7F
+        if n == 126:
+            n = struct.unpack("!H", self._read_exact(2))[0]
+        elif n == 127:
+            n = struct.unpack("!Q", self._read_exact(8))[0]
+        mask = self._read_exact(4) if b2 & 0x80 else b""
+        data = self._read_exact(n)
+        if mask:
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+        return opcode, data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MockShoonyaServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # quiet
+        pass
+
+    # ---- REST ----
+    def do_POST(self) -> None:
+        srv = self.server
+        route = self.path.rstrip("/").rsplit("/", 1)[-1]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8", "replace")
+        req, jkey = parse_form(body)
+
+        srv.inject_latency(route)
+        srv.count(route)
+
+        if srv.roll(srv.cfg.error_rate):
+            self._reply(502, {"stat": "Not_Ok", "emsg": "mock: injected gateway error"})
+            return
+        if srv.roll(srv.cfg.reject_rate):
+            self._reply(200, {"stat": "Not_Ok", "emsg": "mock: injected reject"})
+            return
+
+        b = srv.broker
+        if route == "QuickAuth":
+            self._reply(200, b.login(req))
+            return
+        if not b.valid(jkey):
+            self._reply(200, {"stat": "Not_Ok", "emsg": "Session Expired :  Invalid Session Key"})
+            return
+
+        handlers = {
+            "SearchScrip": lambda: b.search(req),
+            "GetQuotes": lambda: b.quotes(req),
+            "TPSeries": lambda: b.tpseries(req),
+            "GetOptionChain": lambda: b.option_chain(req),
+            "PlaceOrder": lambda: b.place_order(req),
+            "PositionBook": b.position_book,
+            "OrderBook": b.order_book,
+            "SingleOrdHist": lambda: b.single_order_history(req),
+            "Limits": b.limits,
+            "Logout": lambda: b.logout(jkey),
+        }
+        fn = handlers.get(route)
+        if fn is None:
+            self._reply(404, {"stat": "Not_Ok", "emsg": f"mock: route not implemented: {route}"})
+            return
+        self._reply(200, fn())
+
+    def _reply(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ---- WebSocket ----
+    def do_GET(self) -> None:
+        if self.headers.get("Upgrade", "").lower() != "websocket":
+            self._reply(200, {"stat": "Ok", "mock": "shoonya", "ticks": self.server.market.ticks})
+            return
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.ws_loop(_WsSession(self))
+
+
+class MockShoonyaServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, cfg: Optional[MockConfig] = None, today: Optional[date] = None):
+        self.cfg = cfg or MockConfig()
+        self.market = SyntheticMarket(self.cfg, today=today)
+        self.broker = MockBroker(self.cfg, self.market)
+        self._rng = random.Random(self.cfg.seed + 1)
+        self._rng_lock = threading.Lock()
+        self.route_counts: Dict[str, int] = {}
+        self.ws_sessions: List[_WsSession] = []
+        self._stop = threading.Event()
+        self._bg_threads: List[threading.Thread] = []
+        super().__init__((self.cfg.host, self.cfg.port), _Handler)
+
+    # ---- urls ----
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.cfg.host}:{self.port}/NorenWClientTP/"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.cfg.host}:{self.port}/NorenWSToken/"
+
+    def env(self) -> Dict[str, str]:
+        """Env vars that point bot.py at this server."""
+        return {
+            "SHOONYA_REST_URL": self.rest_url,
+            "SHOONYA_API_HOST": self.rest_url.rstrip("/"),
+            "SHOONYA_WS_URL": self.ws_url,
+        }
+
+    # ---- fault injection ----
+    def roll(self, p: float) -> bool:
+        if p <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < p
+
+    def inject_latency(self, route: str) -> None:
+        base = self.cfg.route_latency_ms.get(route, self.cfg.latency_ms)
+        if base <= 0 and self.cfg.jitter_ms <= 0:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self.cfg.jitter_ms, self.cfg.jitter_ms)
+        delay = max(0.0, base + jitter) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+    def count(self, route: str) -> None:
+        with self._rng_lock:
+            self.route_counts[route] = self.route_counts.get(route, 0) + 1
+
+    # ---- websocket protocol ----
+    def ws_loop(self, ws: _WsSession) -> None:
+        with self._rng_lock:
+            self.ws_sessions.append(ws)
+        try:
+            while not ws.closed and not self._stop.is_set():
+                try:
+                    opcode, data = ws.recv()
+                except (ConnectionError, OSError):
+                    break
+                if opcode == 0x8:
+                    ws._send_frame(0x8, data[:2])
+                    break
+                if opcode == 0x9:
+                    ws._send_frame(0xA, data)
+                    continue
+                if opcode != 0x1:
+                    continue
+                try:
+                    msg = json.loads(data.decode("utf-8"))
+                except ValueError:
+                    continue
+                self.inject_latency("ws")
+                self._ws_message(ws, msg)
+        finally:
+            ws.closed = True
+            with self._rng_lock:
+                if ws in self.ws_sessions:
+                    self.ws_sessions.remove(ws)
+            with self.broker.lock:
+                if ws in self.broker.order_listeners:
+                    self.broker.order_listeners.remove(ws)
+
+    def _ws_message(self, ws: _WsSession, msg: Dict[str, Any]) -> None:
+        t = msg.get("t")
+        if t == "c":
+            ok = self.broker.valid(str(msg.get("susertoken", "")))
+            ws.authed = ok
+            ws.send_text(json.dumps({"t": "ck", "s": "OK" if ok else "Not_Ok", "uid": msg.get("uid", "")}))
+            return
+        if not ws.authed:
+            ws.send_text(json.dumps({"t": "ck", "s": "Not_Ok", "emsg": "not connected"}))
+            return
+        if t in ("t", "d"):
+            for exch, tok in _instruments(msg.get("k", "")):
+                ws.touch[tok] = t
+                with self.market.lock:
+                    q = self.market.quote(tok)
+                if q:
+                    ws.send_text(json.dumps(_feed(q, t + "k", exch)))
+            return
+        if t in ("u", "ud"):
+            for _, tok in _instruments(msg.get("k", "")):
+                ws.touch.pop(tok, None)
+            ws.send_text(json.dumps({"t": t + "k", "k": msg.get("k", "")}))
+            return
+        if t == "o":
+            with self.broker.lock:
+                self.broker.order_listeners.append(ws)
+            ws.send_text(json.dumps({"t": "ok"}))
+            return
+        if t == "h":
+            ws.send_text(json.dumps({"t": "h"}))
+
+    def _ticker(self) -> None:
+        last = time.monotonic()
+        while not self._stop.wait(self.cfg.tick_interval_sec):
+            now = time.monotonic()
+            self.market.step(now - last)
+            last = now
+            with self._rng_lock:
+                sessions = list(self.ws_sessions)
+            for ws in sessions:
+                for tok, kind in list(ws.touch.items()):
+                    with self.market.lock:
+                        q = self.market.quote(tok)
+                    if q:
+                        ws.send_text(json.dumps(_feed(q, kind + "f", q["exch"])))
+
+    # ---- lifecycle ----
+    def start(self) -> "MockShoonyaServer":
+        for target in (self.serve_forever, self._ticker):
+            th = threading.Thread(target=target, daemon=True)
+            th.start()
+            self._bg_threads.append(th)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.shutdown()
+        for ws in list(self.ws_sessions):
+            ws.closed = True
+            try:
+                ws.conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.server_close()
+
+
+# =========================
+# Helpers
+# =========================
+
+def parse_form(body: str) -> Tuple[Dict[str, Any], str]:
+    """'jData={...}&jKey=...' -> (jData dict, jKey)"""
+    if not body.startswith("jData="):
+        return {}, ""
+    raw, _, jkey = body[len("jData="):].partition("&jKey=")
+    try:
+        req = json.loads(raw)
+    except ValueError:
+        try:
+            req = json.loads(unquote_plus(raw))
+        except ValueError:
+            req = {}
+    return (req if isinstance(req, dict) else {}), jkey
+
+
+def _instruments(k: str) -> List[Tuple[str, str]]:
+    out = []
+    for part in str(k).split("#"):
+        exch, _, tok = part.partition("|")
+        if tok:
+            out.append((exch, tok))
+    return out
+
+
+def _feed(q: Dict[str, Any], t: str, exch: str) -> Dict[str, Any]:
+    msg = {"t": t, "e": exch, "tk": q["token"], "lp": q["lp"], "pc": "0.00", "c": q["c"],
+           "o": q["o"], "h": q["h"], "l": q["l"], "v": q["v"], "ts": q["tsym"],
+           "ft": str(int(time.time()))}
+    if t[0] == "d":
+        msg.update({"bp1": q["bp1"], "sp1": q["sp1"], "bq1": q["bq1"], "sq1": q["sq1"]})
+    return msg
+
+
+def serve(cfg: Optional[MockConfig] = None) -> MockShoonyaServer:
+    """Start in background threads and return the server (call .stop())."""
+    return MockShoonyaServer(cfg).start()
+
+
+def main() -> None:
+    srv = serve(MockConfig.from_env())
+    print(f"Shoonya mock on {srv.rest_url} (ws {srv.ws_url})")
+    for k, v in srv.env().items():
+        print(f"  {k}={v}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
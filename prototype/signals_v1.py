@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 from prototype.indicator_contracts import IndicatorPack
+from prototype.rules_v1 import RuleSet
 from prototype.signal_contracts import SignalPack
 
+# first matching rule decides; reasons as logged before the rules were declarative
+SIGNAL_RULES = RuleSet({
+    "CALL": "close > ema20 and rsi14 > 55",
+    "PUT": "close < ema20 and rsi14 < 45",
+})
+REASONS = {
+    "CALL": "close>ema20 AND rsi>55",
+    "PUT": "close<ema20 AND rsi<45",
+}
+
 
 def generate_signal(ind: IndicatorPack) -> SignalPack:
     """
@@ -16,15 +27,9 @@ def generate_signal(ind: IndicatorPack) -> SignalPack:
     ema20 = float(ind.ema_20)
     rsi14 = float(ind.rsi_14)
 
-    if close > ema20 and rsi14 > 55:
-        decision = "CALL"
-        reason = "close>ema20 AND rsi>55"
-    elif close < ema20 and rsi14 < 45:
-        decision = "PUT"
-        reason = "close<ema20 AND rsi<45"
-    else:
-        decision = "NONE"
-        reason = "no edge"
+    hits = SIGNAL_RULES.last({"close": close, "ema20": ema20, "rsi14": rsi14})
+    decision = next((d for d, hit in hits.items() if hit), "NONE")
+    reason = REASONS.get(decision, "no edge")
 
     pack = SignalPack(
         decision=decision,
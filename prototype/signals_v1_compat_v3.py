@@ -2,13 +2,13 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 from typing import Any, Dict
-from datetime import datetime, timezone
 
+from prototype import clock
 from prototype.signals_v1 import generate_signal as _legacy_signal
 
 
 def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return clock.utc_now_iso()
 
 
 def _to_obj(d: Dict[str, Any]) -> Any:
@@ -0,0 +1,122 @@
+"""
+SMOKE TEST — ADX V1
+Wilder ADX/DMI vs a textbook reference, batch == incremental (bit-exact),
+trend sanity, SeriesADX == last_adx() as a polled series grows / its forming
+bar moves / its window slides, and IndicatorPack.adx_14 filled without
+slowing the poll cycle.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from prototype.adx_v1 import ADX, SeriesADX, dmi, last_adx
+from prototype.contract_guard import ensure_candlepack
+from prototype.indicators_v2 import compute_indicators
+from prototype.synthetic_data_v1 import synthetic_tpseries_rows
+
+
+def _textbook(h, l, c, n):
+    """Wilder's running-sum form (s = s - s/n + x), straight from the definition."""
+    tr, pdm, mdm = [], [], []
+    for i in range(1, len(c)):
+        up, down = h[i] - h[i - 1], l[i - 1] - l[i]
+        pdm.append(up if up > down and up > 0 else 0.0)
+        mdm.append(down if down > up and down > 0 else 0.0)
+        tr.append(max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1])))
+    st, sp, sm = sum(tr[:n]), sum(pdm[:n]), sum(mdm[:n])
+    dx = []
+    pdi = mdi = 0.0
+    for j in range(n - 1, len(tr)):
+        if j >= n:
+            st, sp, sm = st - st / n + tr[j], sp - sp / n + pdm[j], sm - sm / n + mdm[j]
+        pdi, mdi = 100 * sp / st, 100 * sm / st
+        dx.append(100 * abs(pdi - mdi) / (pdi + mdi))
+    adx = sum(dx[:n]) / n
+    for x in dx[n:]:
+        adx = (adx * (n - 1) + x) / n
+    return adx, pdi, mdi
+
+
+def main():
+    print("=== SMOKE TEST: ADX V1 ===")
+
+    rng = np.random.default_rng(3)
+    c = 23000 + np.cumsum(rng.normal(0, 20, 600))
+    h = c + np.abs(rng.normal(0, 8, 600))
+    l = c - np.abs(rng.normal(0, 8, 600))
+    adx, pdi, mdi = dmi(h, l, c, 14)
+    ref = _textbook(h.tolist(), l.tolist(), c.tolist(), 14)
+    if max(abs(a - b) for a, b in zip((adx[-1], pdi[-1], mdi[-1]), ref)) > 1e-9:
+        raise SystemExit(f"FAIL: vs textbook {adx[-1], pdi[-1], mdi[-1]} {ref}")
+    if not (np.isnan(adx[:27]).all() and not np.isnan(adx[27]) and np.isnan(pdi[13]) and not np.isnan(pdi[14])):
+        raise SystemExit("FAIL: warm-up alignment (DI from bar 14, ADX from bar 27)")
+    print(f"✅ Matches Wilder textbook: ADX {adx[-1]:.4f} +DI {pdi[-1]:.4f} -DI {mdi[-1]:.4f}")
+
+    inc = ADX(14)
+    rows = [inc.update(*x) for x in zip(h.tolist(), l.tolist(), c.tolist())]
+    got = np.array(rows).T
+    for name, b, i in zip(("adx", "+di", "-di"), (adx, pdi, mdi), got):
+        if not np.array_equal(b, i, equal_nan=True):
+            raise SystemExit(f"FAIL: incremental {name} != batch")
+    if not inc.ready or ADX(14).warm(h, l, c).adx != adx[-1]:
+        raise SystemExit("FAIL: warm() / ready")
+    print("✅ Incremental update() == batch dmi() bit-for-bit over 600 bars")
+
+    up = np.arange(100, dtype=float)
+    a_up, p_up, m_up = dmi(up + 1, up - 1, up, 14)
+    a_dn, p_dn, m_dn = dmi(-up + 1, -up - 1, -up, 14)
+    if not (a_up[-1] > 90 and p_up[-1] > m_up[-1] and a_dn[-1] > 90 and m_dn[-1] > p_dn[-1]):
+        raise SystemExit("FAIL: trend sanity")
+    flat = dmi(np.ones(40), np.ones(40), np.ones(40), 14)
+    if flat[0][-1] != 0.0 or len(dmi([], [], [], 14)[0]):
+        raise SystemExit("FAIL: flat / empty series")
+    print("✅ Strong trends -> ADX > 90 with the right DI on top; flat -> 0")
+
+    rows = synthetic_tpseries_rows(400, seed=21)[::-1]              # oldest -> newest
+    series = SeriesADX(14)
+    polls = [(0, m) for m in range(1, 320, 7)] + [(s, s + 300) for s in range(1, 100, 9)]
+    for start, end in polls:
+        for forming in (None, 1.0015):                                # the newest candle keeps moving
+            window = [dict(r) for r in rows[start:end]]
+            if forming is not None:
+                window[-1]["inth"] = str(float(window[-1]["inth"]) * forming)
+                window[-1]["intc"] = str(float(window[-1]["intc"]) * forming)
+            b = ensure_candlepack(window[::-1], meta={}).columns()
+            got = series.last(b.ssboe, b.high, b.low, b.close)
+            ref = tuple(0.0 if math.isnan(v) else v for v in last_adx(b.high, b.low, b.close, 14))
+            if got != ref:
+                raise SystemExit(f"FAIL: SeriesADX {got} != last_adx {ref} on bars [{start}:{end}] forming={forming}")
+    if series.last([], [], [], []) != (0.0, 0.0, 0.0):
+        raise SystemExit("FAIL: SeriesADX empty series")
+    print(f"✅ SeriesADX == last_adx() over {len(polls) * 2} polls (growing, forming bar moving, window sliding)")
+
+    pack = ensure_candlepack(synthetic_tpseries_rows(72, seed=13), meta={})
+    ind = compute_indicators(pack)
+    if not (ind.adx_14 > 0 and ind.plus_di_14 > 0 and ind.minus_di_14 > 0) or "adx_14" not in ind.to_dict():
+        raise SystemExit(f"FAIL: IndicatorPack ADX not filled {ind}")
+    short = compute_indicators(ensure_candlepack(synthetic_tpseries_rows(20, seed=1), meta={}))
+    if short.adx_14 != 0.0 or short.plus_di_14 == 0.0:
+        raise SystemExit("FAIL: short series should have DI but ADX 0.0")
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        compute_indicators(pack)
+    per_poll = (time.perf_counter() - t0) / 1000
+    big = ensure_candlepack(synthetic_tpseries_rows(5000, seed=13), meta={})
+    t0 = time.perf_counter()
+    dmi(big.bars.high, big.bars.low, big.bars.close, 14)
+    batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(10000):
+        inc.update(23000.0, 22990.0, 22995.0)
+    per_bar = (time.perf_counter() - t0) / 10000
+    print(f"compute_indicators (72 x 1h bars, with ADX): {per_poll * 1e6:.0f} us | dmi[5000]: {batch * 1000:.2f} ms "
+          f"| update(): {per_bar * 1e6:.2f} us/bar | ADX {ind.adx_14:.2f}")
+    if per_poll > 0.002 or math.isnan(inc.adx):
+        raise SystemExit("FAIL: ADX slows the poll cycle")
+    print("✅ IndicatorPack.adx_14 / plus_di_14 / minus_di_14 live")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+SMOKE TEST — BAR CLOCK V1
+Offline, simulated clock. Session-aligned closes / opens (1h_915, 1h, 15m,
+weekend); a full day driven by BarClock.wait + MultiTimeframeEngine.sync_close
+steps once per 1H bar within a second of the close (also when the broker
+publishes the last minute late), with the same bars as ingesting the whole
+day at once and a few fetches per bar instead of a 60s poll; late minutes after a
+close never duplicate a bar.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+from prototype import clock
+from prototype.bar_clock_v1 import IST_OFFSET_SEC, BarClock, session_boundaries
+from prototype.clock import SimulatedClock, use_clock
+from prototype.market_types_v1 import Bar
+from prototype.mtf_engine_v1 import MultiTimeframeEngine
+
+IST = timezone(timedelta(seconds=IST_OFFSET_SEC))
+MONDAY = datetime(2026, 10, 19, tzinfo=IST)
+
+
+def _t(day, hh, mm, ss=0):
+    return (MONDAY + timedelta(days=day, hours=hh, minutes=mm, seconds=ss)).timestamp()
+
+
+def _hm(secs):
+    return [f"{s // 3600:02d}:{s % 3600 // 60:02d}" for s in secs]
+
+
+class _FakeApi:
+    """TPSeries 1m rows (newest first) for Monday's session; a minute is published publish_lag after it ends."""
+
+    def __init__(self, publish_lag=0.0):
+        self.publish_lag = publish_lag
+        self.calls = 0
+
+    @staticmethod
+    def row(m):
+        c = 23000 + 80 * math.sin(m / 1700.0) + 15 * math.sin(m / 97.0)
+        o = 23000 + 80 * math.sin((m - 60) / 1700.0) + 15 * math.sin((m - 60) / 97.0)
+        return {"stat": "Ok", "ssboe": str(m), "into": f"{o:.2f}", "inth": f"{max(o, c) + 3:.2f}",
+                "intl": f"{min(o, c) - 3:.2f}", "intc": f"{c:.2f}", "intv": "100"}
+
+    def rows(self, st, now):
+        m = max(int(st) - int(st) % 60, int(_t(0, 9, 15)))
+        out = []
+        while m + 60 + self.publish_lag <= now:
+            local = (m + IST_OFFSET_SEC) % 86400
+            if 9 * 3600 + 15 * 60 <= local < 15 * 3600 + 30 * 60:
+                out.append(self.row(m))
+            m += 60
+        return out[::-1]
+
+    def get_time_price_series(self, exchange, token, starttime, endtime=None, interval="1"):
+        self.calls += 1
+        return self.rows(float(starttime), clock.time()) or None
+
+
+def _bar(m):
+    return Bar.from_row(_FakeApi.row(m))
+
+
+def _day(api, settle=1.0):
+    eng = MultiTimeframeEngine(tz_offset_sec=IST_OFFSET_SEC)
+    steps = []
+    eng.subscribe("26000", "1h_915", lambda tok, tf, bar, ind: steps.append((clock.time(), bar.ssboe)))
+    bars = BarClock("1h_915", settle_sec=settle)
+    closes = []
+    with use_clock(SimulatedClock(_t(0, 9, 14))):
+        for _ in range(7):
+            t = bars.wait()
+            eng.sync_close(api, "NSE", "26000", t, bars.horizon(t))
+            closes.append(t)
+    return eng, steps, closes
+
+
+def main():
+    print("=== SMOKE TEST: BAR CLOCK V1 ===")
+
+    want = {
+        "1h_915": ["09:15", "10:15", "11:15", "12:15", "13:15", "14:15", "15:15", "15:30"],
+        "1h": ["09:15", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00", "15:30"],
+    }
+    for tf, w in want.items():
+        if _hm(session_boundaries(tf)) != w:
+            raise SystemExit(f"FAIL: {tf} boundaries {_hm(session_boundaries(tf))}")
+    if len(session_boundaries("15m")) != 26 or len(session_boundaries("1m")) != 376:
+        raise SystemExit("FAIL: 15m / 1m boundaries")
+    bc = BarClock("1h_915")
+    cases = [
+        (bc.next_close(_t(0, 9, 0)), _t(0, 10, 15)),
+        (bc.next_close(_t(0, 10, 15)), _t(0, 11, 15)),
+        (bc.next_close(_t(0, 15, 16)), _t(0, 15, 30)),
+        (bc.next_close(_t(4, 15, 30)), _t(7, 10, 15)),       # Friday close -> Monday
+        (bc.next_open(_t(0, 9, 20)), _t(0, 10, 15)),
+        (bc.next_open(_t(0, 15, 15)), _t(1, 9, 15)),
+        (bc.next_open(_t(5, 12, 0)), _t(7, 9, 15)),          # Saturday -> Monday
+        (bc.horizon(_t(0, 15, 30)), _t(1, 9, 15)),
+        (bc.horizon(_t(0, 11, 15)), _t(0, 11, 15)),
+    ]
+    for i, (got, exp) in enumerate(cases):
+        if got != exp:
+            raise SystemExit(f"FAIL: case {i}: {datetime.fromtimestamp(got, IST)} != {datetime.fromtimestamp(exp, IST)}")
+    with use_clock(SimulatedClock(_t(4, 15, 31))) as sim:
+        if bc.wait() != _t(7, 10, 15) or sim.sleeps != 1 or clock.time() != _t(7, 10, 15, 1):
+            raise SystemExit("FAIL: weekend wait is one sleep to Monday 10:15 + settle")
+    print("✅ Session-aligned closes / opens (1h_915, 1h, 15m, 1m), 15:30 cut, weekend skip, one sleep per wait")
+
+    ref = MultiTimeframeEngine(tz_offset_sec=IST_OFFSET_SEC)
+    ref.bars("26000", "1h_915")
+    ref.ingest_rows("26000", _FakeApi().rows(_t(0, 8, 0), _t(0, 15, 30)))
+    ref.close_due("26000", _t(1, 9, 15))
+    ref_bars = ref.bars("26000", "1h_915")
+
+    for lag in (0.0, 1.5):
+        api = _FakeApi(publish_lag=lag)
+        eng, steps, closes = _day(api)
+        got = eng.bars("26000", "1h_915")
+        delays = [t - c for (t, _), c in zip(steps, closes)]
+        if len(steps) != 7 or [b for _, b in steps] != ref_bars.ssboe.tolist():
+            raise SystemExit(f"FAIL: lag {lag}: one step per 1H bar ({len(steps)} steps)")
+        if got.close.tolist() != ref_bars.close.tolist() or got.high.tolist() != ref_bars.high.tolist():
+            raise SystemExit(f"FAIL: lag {lag}: bars differ from ingesting the whole day")
+        if max(delays) > max(1.0, lag + 0.25) + 1e-6:
+            raise SystemExit(f"FAIL: lag {lag}: close detected {max(delays):.2f}s late")
+        polls = (_t(0, 15, 30) - _t(0, 9, 14)) / 60
+        print(f"publish lag {lag:.1f}s: 7 bars, step {min(delays):.2f}-{max(delays):.2f}s after the close, "
+              f"{api.calls} fetches (60s poll: ~{polls:.0f})")
+        if api.calls > 4 * len(closes):
+            raise SystemExit("FAIL: fetching between closes")
+    print("✅ One step per 1H close within a second (broker publish lag absorbed by sync_close), idle otherwise")
+
+    eng = MultiTimeframeEngine(tz_offset_sec=IST_OFFSET_SEC)
+    for m in range(int(_t(0, 9, 15)), int(_t(0, 10, 14)), 60):
+        eng.ingest("26000", _bar(m), checkpoint=False)
+    eng.bars("26000", "1h_915")
+    eng.close_due("26000", _t(0, 10, 15))                    # the 10:14 minute is not in yet
+    for m in (_t(0, 10, 14), _t(0, 10, 15)):
+        eng.ingest("26000", _bar(int(m)), checkpoint=False)
+    b = eng.bars("26000", "1h_915", include_forming=True)
+    if b.ssboe.tolist() != [_t(0, 9, 15), _t(0, 10, 15)]:
+        raise SystemExit(f"FAIL: late minute duplicated a closed bar {b.ssboe.tolist()}")
+    print("✅ A minute arriving after its bar was closed does not reopen or duplicate it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+SMOKE TEST — BENCHMARK V1
+Every case runs on a tiny dataset; the regression gate trips on a slowdown.
+"""
+
+from prototype.benchmark_v1 import (
+    CASES,
+    BenchResult,
+    compare,
+    load_baseline,
+    result_key,
+    run_benchmarks,
+    to_baseline,
+)
+
+
+def main():
+    print("=== SMOKE TEST: BENCHMARK V1 ===")
+
+    tiny = {name: (sizes[0],) for name, (_, sizes) in CASES.items()}
+    results, unit = run_benchmarks(sizes=tiny, min_sec=0.005)
+    if len(results) != len(CASES) or any(r.sec_per_call <= 0 for r in results):
+        raise SystemExit(f"FAIL: cases did not run: {results}")
+    for r in results:
+        print(f"{result_key(r.case, r.size):28s} {r.sec_per_call * 1e3:9.3f} ms")
+    print("✅ All cases run")
+
+    base = to_baseline(results, unit)
+    regs, missing = compare(results, base)
+    if regs or missing:
+        raise SystemExit("FAIL: results regress against themselves")
+
+    slow = [BenchResult(r.case, r.size, r.sec_per_call * 3, r.norm * 3, r.calls) for r in results]
+    regs, _ = compare(slow, base, tolerance=0.5)
+    if len(regs) != len(results):
+        raise SystemExit("FAIL: 3x slowdown not flagged")
+    _, missing = compare(results, {"results": {}})
+    if len(missing) != len(results):
+        raise SystemExit("FAIL: missing baseline keys not reported")
+    print("✅ Regression gate")
+
+    committed = load_baseline()
+    keys = {result_key(c, s) for c, (_, sizes) in CASES.items() for s in sizes}
+    if set(committed.get("results", {})) != keys:
+        raise SystemExit("FAIL: committed baseline does not cover every case/size")
+    print("✅ Baseline covers", len(keys), "case/size pairs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+SMOKE TEST — CIRCUIT BREAKER V1
+State machine under a simulated clock, jittered exponential backoff, and a
+bypass() for protective exits, and a mock-server outage: bot stops hammering
+GetQuotes, recovers on the first half-open probe, and /get_status reports
+breaker state.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+from prototype import circuit_breaker_v1 as breakers
+from prototype.clock import SimulatedClock, use_clock
+from prototype.session_replay_v1 import REPLAY_ENV
+from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+
+def main():
+    print("=== SMOKE TEST: CIRCUIT BREAKER V1 ===")
+
+    ds = [breakers.backoff_delay(a, base=1.0, cap=8.0, jitter=0.5) for a in range(1, 7)]
+    if not (0.5 <= ds[0] <= 1.0 and 4.0 <= ds[3] <= 8.0 and 4.0 <= ds[5] <= 8.0):
+        raise SystemExit(f"FAIL: backoff_delay {ds}")
+    if breakers.backoff_delay(3, jitter=0.0) != 4.0:
+        raise SystemExit("FAIL: unjittered backoff")
+    print("✅ Jittered exponential backoff capped:", [round(d, 2) for d in ds])
+
+    sim = SimulatedClock(1_000_000.0)
+    with use_clock(sim):
+        b = breakers.CircuitBreaker("X", breakers.BreakerConfig(failure_threshold=3, jitter=0.0))
+        for _ in range(2):
+            b.record_failure("boom")
+        if b.state != breakers.CLOSED or not b.allow():
+            raise SystemExit("FAIL: tripped before threshold")
+        b.record_failure("boom")
+        if b.state != breakers.OPEN or b.allow() or b.retry_in() != 1.0:
+            raise SystemExit(f"FAIL: not open after threshold {b.snapshot()}")
+        sim.advance(1.0)
+        if not b.allow() or b.state != breakers.HALF_OPEN or b.allow():
+            raise SystemExit("FAIL: half-open should admit exactly one probe")
+        b.record_failure("still down")
+        if b.state != breakers.OPEN or b.retry_in() != 2.0:
+            raise SystemExit(f"FAIL: failed probe should double backoff {b.snapshot()}")
+        sim.advance(2.0)
+        b.allow()
+        b.record_success()
+        if b.state != breakers.CLOSED or b.opens or not b.allow():
+            raise SystemExit("FAIL: successful probe should close")
+    print("✅ closed -> open -> half-open -> open (2x) -> closed")
+
+    sent = []
+    http = breakers.BreakerHTTP(SimpleNamespace(post=lambda url, **kw: sent.append(url) or SimpleNamespace(status_code=200)))
+    exit_route = breakers.breaker("BypassProbe")
+    for _ in range(exit_route.cfg.failure_threshold):
+        exit_route.record_failure("outage")
+    try:
+        http.post("https://broker/NorenWClientTP/BypassProbe")
+        raise SystemExit("FAIL: open breaker should fail fast")
+    except breakers.BreakerOpen:
+        pass
+    with breakers.bypass():
+        http.post("https://broker/NorenWClientTP/BypassProbe")
+    if len(sent) != 1 or exit_route.state != breakers.CLOSED:
+        raise SystemExit(f"FAIL: bypass should send through an open breaker and close it {exit_route.snapshot()}")
+    breakers._BREAKERS.pop("BypassProbe")
+    print("✅ bypass(): sent through an open breaker (protective exits), success closes it")
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=1.0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        from starlette.testclient import TestClient
+
+        import api_server
+        import bot
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        tokens = {"SPOT": "26000"}
+        if not bot.get_shoonya_data(bot._susertoken, tokens):
+            raise SystemExit("FAIL: baseline GetQuotes")
+
+        srv.cfg.error_rate = 1.0  # outage: every call -> HTTP 502
+        before = srv.route_counts.get("GetQuotes", 0)
+        for _ in range(50):
+            bot.market_data.MARKET_DATA.invalidate()  # each poll is a fresh loop iteration
+            bot.get_shoonya_data(bot._susertoken, tokens)
+        hits = srv.route_counts.get("GetQuotes", 0) - before
+        gq = breakers.breaker("GetQuotes")
+        if gq.state != breakers.OPEN or hits > gq.cfg.failure_threshold:
+            raise SystemExit(f"FAIL: outage not contained: {hits} server hits, {gq.snapshot()}")
+        print(f"✅ Outage: 50 polls -> {hits} server hits, breaker {gq.state} (retry in {gq.retry_in():.2f}s)")
+
+        status = TestClient(api_server.app).get("/get_status").json()
+        if status.get("circuit_breakers", {}).get("GetQuotes", {}).get("state") != "open":
+            raise SystemExit(f"FAIL: status missing breaker state: {status.get('circuit_breakers')}")
+        print("✅ /get_status exposes circuit_breakers")
+
+        srv.cfg.error_rate = 0.0  # recovered
+        time.sleep(breakers.next_retry_in())
+        t0 = time.perf_counter()
+        data = bot.get_shoonya_data(bot._susertoken, tokens)
+        if not data or gq.state != breakers.CLOSED:
+            raise SystemExit(f"FAIL: no recovery on half-open probe {gq.snapshot()}")
+        for _ in range(10):
+            bot.market_data.MARKET_DATA.invalidate()
+            if not bot.get_shoonya_data(bot._susertoken, tokens):
+                raise SystemExit("FAIL: not back at full speed")
+        print(f"✅ Recovered on first probe; 11 polls in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
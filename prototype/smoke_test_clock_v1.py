@@ -0,0 +1,103 @@
+"""
+SMOKE TEST — CLOCK
+Formats match datetime, frozen/simulated clocks drive bot.py + engines.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from prototype import clock
+from prototype.clock import FrozenClock, SimulatedClock, use_clock
+from prototype.paper_broker import PaperBroker
+from prototype.risk_governor_v1 import evaluate_risk
+from prototype.vix_gear_v1 import select_gear
+
+
+def main():
+    print("=== SMOKE TEST: CLOCK ===")
+
+    # cached formatting == datetime formatting (incl. whole seconds)
+    for t in (1769139900.0, 1769139900.5, 1769139900.000001, 1769139959.999999, 0.25):
+        with use_clock(FrozenClock(t)):
+            exp = datetime.fromtimestamp(t, timezone.utc)
+            checks = {
+                "iso": clock.utc_now_iso() == exp.isoformat(),
+                "iso_z": clock.utc_now_iso_z() == exp.replace(tzinfo=None).isoformat() + "Z",
+                "hms": clock.local_hms() == datetime.fromtimestamp(t).strftime("%H:%M:%S"),
+                "now": clock.now() == datetime.fromtimestamp(t),
+            }
+            if not all(checks.values()):
+                raise SystemExit(f"FAIL: format mismatch at {t}: {checks} {clock.utc_now_iso()}")
+    print("✅ Formats match datetime")
+
+    class _NoSleep(clock.Clock):
+        def time(self):
+            return 0.0
+
+        def monotonic(self):
+            return 0.0
+    try:
+        _NoSleep()
+    except TypeError:
+        pass
+    else:
+        raise SystemExit("FAIL: clock without sleep() constructed")
+    print("✅ Incomplete Clock subclass rejected at construction")
+
+    # engines read the injected clock
+    friday = datetime(2026, 1, 23, 15, 20).timestamp()
+    with use_clock(FrozenClock(friday)):
+        d = evaluate_risk("OPTIONS", 0.0, 500000.0)
+        g = select_gear(15.0)
+        o = PaperBroker().place_market("NIFTY", "BUY", 50, 23000.0)
+    exp_z = datetime.fromtimestamp(friday, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    if d.ts != exp_z or g.ts != clock.utc_iso(friday) or o.ts_ms != int(friday * 1000):
+        raise SystemExit(f"FAIL: engines ignored injected clock: {d.ts} {g.ts} {o.ts_ms}")
+    print("✅ Engines use injected clock")
+
+    # simulated sleep is instant
+    sim = SimulatedClock(friday)
+    t0 = time.perf_counter()
+    with use_clock(sim):
+        for _ in range(7500):  # one 6h15m session of 3s loops
+            clock.sleep(3)
+    if sim.time() - friday != 22500 or time.perf_counter() - t0 > 1.0:
+        raise SystemExit("FAIL: simulated sleep")
+    print(f"✅ 22500s simulated in {time.perf_counter() - t0:.3f}s")
+
+    # bot.check_friday_exit follows the clock
+    import bot
+    calls = []
+    orig = bot.square_off_all, bot.telegram_send
+    bot.square_off_all = lambda: calls.append("sq")
+    bot.telegram_send = lambda msg: calls.append("tg")
+    active0 = bot.trade_data.get("active")
+    try:
+        bot.trade_data["active"] = True
+        with use_clock(FrozenClock(friday - 3600)):
+            bot.check_friday_exit()
+        with use_clock(FrozenClock(friday)):
+            bot.check_friday_exit()
+    finally:
+        bot.square_off_all, bot.telegram_send = orig
+        bot.trade_data["active"] = active0
+    if calls != ["sq", "tg"]:
+        raise SystemExit(f"FAIL: friday exit under frozen clock: {calls}")
+    print("✅ bot.check_friday_exit uses injected clock")
+
+    # cached formatting is cheaper than isoformat()
+    n = 100000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        datetime.now(timezone.utc).isoformat()
+    base = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(n):
+        clock.utc_now_iso()
+    fast = time.perf_counter() - t0
+    print(f"isoformat: {base / n * 1e9:.0f} ns | clock.utc_now_iso: {fast / n * 1e9:.0f} ns")
+    print("✅ Clock OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+SMOKE TEST — GREEKS V1
+Put-call parity, finite-difference greeks, IV round trip on a full chain,
+chain timing, unpriceable strikes excluded, and bot hedge strike selection at
+0.35 delta.
+"""
+
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from prototype import greeks_v1 as g
+
+
+def main():
+    print("=== SMOKE TEST: GREEKS V1 ===")
+
+    S, T, r = 23000.0, 14 / 365, g.RISK_FREE
+    K = g.strike_grid(S)
+    sig = 0.12 + 0.0000004 * (K - S) ** 2 / 100  # mild smile
+    c = g.bs_price(S, K, T, sig, True)
+    p = g.bs_price(S, K, T, sig, False)
+    parity = np.max(np.abs((c - p) - (S - K * np.exp(-r * T))))
+    if parity > 1e-4:
+        raise SystemExit(f"FAIL: put-call parity off by {parity}")
+    print("✅ Put-call parity")
+
+    gp = g.greeks(S, K, T, sig, False)
+    h, dv, dt = 0.5, 1e-4, 1e-5
+    fd_delta = (g.bs_price(S + h, K, T, sig, False) - g.bs_price(S - h, K, T, sig, False)) / (2 * h)
+    fd_gamma = (g.bs_price(S + h, K, T, sig, False) - 2 * p + g.bs_price(S - h, K, T, sig, False)) / h ** 2
+    fd_vega = (g.bs_price(S, K, T, sig + dv, False) - g.bs_price(S, K, T, sig - dv, False)) / (2 * dv) / 100
+    fd_theta = (g.bs_price(S, K, T - dt, sig, False) - g.bs_price(S, K, T + dt, sig, False)) / (2 * dt) / 365
+    for name, a, b, tol in (("delta", gp.delta, fd_delta, 1e-4), ("gamma", gp.gamma, fd_gamma, 1e-5),
+                            ("vega", gp.vega, fd_vega, 1e-3), ("theta", gp.theta, fd_theta, 1e-3)):
+        err = np.max(np.abs(a - b))
+        if err > tol:
+            raise SystemExit(f"FAIL: {name} vs finite difference: {err}")
+    print("✅ Greeks match finite differences")
+
+    calls = K >= S  # OTM side of the chain, as quoted
+    ltp = np.where(calls, c, p)
+    iv = g.implied_vol(ltp, S, K, T, calls)
+    ok = ltp > 0.05
+    err = np.max(np.abs(iv[ok] - sig[ok]))
+    if err > 1e-4 or not np.isnan(g.implied_vol(0.0, S, 23000, T, True)):
+        raise SystemExit(f"FAIL: IV round trip err={err}")
+    print(f"✅ IV round trip on {int(ok.sum())} strikes (max err {err:.2e})")
+
+    n = 200
+    t0 = time.perf_counter()
+    for _ in range(n):
+        g.chain_greeks(S, K, T, ltp, calls)
+    chain_us = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for _ in range(n):
+        g.select_put_by_delta(S, T, sigma=0.13)
+    sel_us = (time.perf_counter() - t0) / n * 1e6
+    print(f"chain IV+greeks ({len(K)} strikes): {chain_us:.0f} µs | 0.35-delta put select: {sel_us:.0f} µs")
+    if sel_us > 5000:
+        raise SystemExit("FAIL: strike selection too slow")
+
+    sel = g.select_put_by_delta(S, T, sigma=0.13)
+    if abs(sel["delta"] + 0.35) > 0.03 or sel["strike"] % 50 or sel["strike"] >= S:
+        raise SystemExit(f"FAIL: 0.35-delta put: {sel}")
+    from_ltp = g.select_put_by_delta(S, T, ltps=g.bs_price(S, K, T, 0.13, False))
+    if from_ltp["strike"] != sel["strike"]:
+        raise SystemExit(f"FAIL: LTP-implied selection {from_ltp} != flat {sel}")
+    print(f"✅ 0.35-delta put: {sel['strike']:.0f}PE delta={sel['delta']:.3f}")
+
+    fwd = S * np.exp((r - g.DIVIDEND_YIELD) * T)                 # delta ~ -0.5 if priced at IV_LO
+    bad = g.chain_greeks(S, [fwd, 22000.0], T, [0.0, g.bs_price(S, 22000.0, T, 0.13, False)], False)
+    pick = g.select_put_by_delta(S, T, strikes=[fwd, 22000.0], ltps=[0.0, g.bs_price(S, 22000.0, T, 0.13, False)])
+    if not np.isnan(bad.delta[0]) or not np.isfinite(bad.delta[1]) or pick["strike"] != 22000.0:
+        raise SystemExit(f"FAIL: strike without an IV selectable {bad.delta} {pick}")
+    print("✅ Strikes whose IV fails get NaN greeks and are skipped by the delta selection")
+
+    if g.monthly_expiry(date(2026, 1, 10)) != date(2026, 1, 29) or g.monthly_expiry(date(2026, 1, 30)) != date(2026, 2, 26):
+        raise SystemExit("FAIL: monthly expiry")
+    if abs(g.year_fraction(date(2026, 1, 29), datetime(2026, 1, 28, 15, 30)) - 1 / 365) > 1e-9:
+        raise SystemExit("FAIL: year fraction")
+    print("✅ Expiry / time to expiry")
+
+    import bot
+
+    bot.trade_data["current_vix"] = 13.0
+    strike, row = bot.select_hedge_put_strike(S, datetime(2026, 1, 15, 10, 0))
+    if row is None or abs(row["delta"] - bot.HEDGE_PUT_DELTA) > 0.03:
+        raise SystemExit(f"FAIL: bot hedge selection {strike} {row}")
+    bot.trade_data["current_vix"] = 0.0
+    bot.trade_data["vix_ltp"] = 0.0
+    if bot.select_hedge_put_strike(S) != (22800, None):
+        raise SystemExit("FAIL: bot fallback to ATM-200")
+    print(f"✅ bot hedge strike {strike}PE (delta {row['delta']:.3f}), fallback ATM-200")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+SMOKE TEST — INDICATOR CACHE V1
+60 polls of the same hourly candles -> one compute; forming-bar revision and
+a new bar recompute; params / instruments keyed apart; bounded LRU eviction;
+cached packs identical to compute_indicators.
+"""
+
+import time
+
+from prototype.contract_guard import ensure_candlepack
+from prototype.indicator_cache_v1 import IndicatorMemo, compute_indicators_cached
+from prototype.indicators_v2 import compute_indicators
+from prototype.synthetic_data_v1 import synthetic_tpseries_rows
+
+
+def main():
+    print("=== SMOKE TEST: INDICATOR CACHE V1 ===")
+
+    memo = IndicatorMemo(maxsize=4)
+    rows = synthetic_tpseries_rows(72, seed=21)
+    meta = {"token": "26000", "interval": "60"}
+
+    t0 = time.perf_counter()
+    for _ in range(60):
+        ind = compute_indicators_cached(ensure_candlepack(rows, meta=meta), memo=memo)
+    cached = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(60):
+        ref = compute_indicators(ensure_candlepack(rows, meta=meta))
+    plain = time.perf_counter() - t0
+    if memo.stats["miss"] != 1 or memo.stats["hit"] != 59 or ind.to_dict() != ref.to_dict():
+        raise SystemExit(f"FAIL: expected 1 compute for 60 polls {memo.stats}")
+    print(f"✅ 60 polls, same newest bar: 1 compute / 59 hits | {cached * 1000:.1f} ms vs {plain * 1000:.1f} ms uncached")
+    if cached >= plain:
+        raise SystemExit("FAIL: memoized polls not faster")
+
+    forming = [dict(rows[0], intc=f"{float(rows[0]['intc']) + 25:.2f}")] + rows[1:]
+    ind2 = compute_indicators_cached(ensure_candlepack(forming, meta=meta), memo=memo)
+    nxt = synthetic_tpseries_rows(73, seed=21, end="2026-01-26 09:15")
+    ind3 = compute_indicators_cached(ensure_candlepack(nxt, meta=meta), memo=memo)
+    if memo.stats["miss"] != 3 or ind2.close == ind.close or ind3 == ind2:
+        raise SystemExit(f"FAIL: revised / new bar must recompute {memo.stats}")
+    other = compute_indicators_cached(ensure_candlepack(rows, meta={"token": "26009", "interval": "60"}), memo=memo)
+    if memo.stats["miss"] != 4 or other.to_dict() != ind.to_dict():
+        raise SystemExit("FAIL: instruments must key apart")
+    print("✅ Revised forming bar / new bar / other instrument -> recompute")
+
+    for i in range(6):
+        memo.get(("26000", "60", ("p", i), (0,)), lambda: i, fn="t")
+    if len(memo) != 4 or memo.stats["evict"] < 4:
+        raise SystemExit(f"FAIL: LRU bound {len(memo)} {memo.stats}")
+    memo.get(("26000", "60", ("p", 2), (0,)), lambda: -1)
+    memo.get(("26000", "60", ("p", 9), (0,)), lambda: 9)
+    if memo.get(("26000", "60", ("p", 2), (0,)), lambda: -1) != 2:
+        raise SystemExit("FAIL: recently used entry evicted")
+    print(f"✅ Bounded LRU: {len(memo)} entries, {memo.stats['evict']} evictions, recently used kept")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+SMOKE TEST — INDICATOR PARITY V1
+indicator_lib_v1 against the golden values (prototype/indicator_golden_v1.json,
+captured from the pandas implementations), the frozen prototype.indicators,
+Model E (model_e_logic + backtest), indicators_v2 and main_v8; incremental ==
+batch bit-for-bit; compat shims in both call styles.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from prototype import indicator_lib_v1 as lib
+from prototype import indicators as legacy
+from prototype import indicators_v2
+
+GOLDEN_PATH = os.path.join("prototype", "indicator_golden_v1.json")
+
+
+def _arr(x):
+    return np.array([np.nan if v is None else v for v in x], dtype=float)
+
+
+def _same(name, got, want, tol=1e-9):
+    got, want = np.asarray(got, dtype=float), np.asarray(want, dtype=float)
+    if got.shape != want.shape or not np.allclose(got, want, rtol=0, atol=tol, equal_nan=True):
+        bad = np.flatnonzero(~np.isclose(got, want, rtol=0, atol=tol, equal_nan=True))[:3] if got.shape == want.shape else []
+        raise SystemExit(f"FAIL: {name} differs at {list(bad)}")
+
+
+def main():
+    print("=== SMOKE TEST: INDICATOR PARITY V1 ===")
+
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        gold = json.load(f)
+    o, h, l, c = (_arr(gold["bars"][k]) for k in ("open", "high", "low", "close"))
+    df = pd.DataFrame({"open": o, "high": h, "low": l, "close": c})
+
+    _same("ema_20", lib.ema(c, 20), _arr(gold["ema_20"]))
+    _same("ema_200", lib.ema(c, 200), _arr(gold["ema_200"]))
+    _same("rsi_14", lib.rsi(c, 14), _arr(gold["rsi_14"]))
+    _same("atr_14", lib.atr(h, l, c, 14), _arr(gold["atr_14"]))
+    st, d = lib.supertrend(h, l, c, 10, 3.0)
+    _same("supertrend value", st, _arr(gold["supertrend_10_3"]["value"]))
+    if d.tolist() != gold["supertrend_10_3"]["dir"]:
+        raise SystemExit("FAIL: supertrend direction")
+
+    from model_e_logic import calculate_model_e_indicators_1h
+    from prototype.model_e_backtest_v1 import HourlyBars, compute_hourly_indicators
+
+    me = calculate_model_e_indicators_1h(df.copy())
+    bt = compute_hourly_indicators(HourlyBars(open=o, high=h, low=l, close=c,
+                                              start_idx=np.arange(len(c)), end_idx=np.arange(len(c))))
+    for k, want in gold["model_e"].items():
+        _same(f"model_e {k}", me[k].values, _arr(want))
+        _same(f"backtest {k}", bt[k], _arr(want))
+    print(f"✅ Golden ({len(c)} bars): EMA/RSI/ATR/SuperTrend + Model E (model_e_logic, backtest) match")
+
+    rng = np.random.default_rng(45)
+    for n in (2, 15, 60, 700):
+        cc = 23000 + np.cumsum(rng.normal(0, 30, n))
+        hh, ll = cc + np.abs(rng.normal(0, 10, n)), cc - np.abs(rng.normal(0, 10, n))
+        dfn = pd.DataFrame({"high": hh, "low": ll, "close": cc})
+        _same(f"ema[{n}]", lib.ema(cc, 20), legacy.ema(dfn.close, 20))
+        _same(f"rsi[{n}]", lib.rsi(cc, 14), legacy.rsi(dfn.close, 14))
+        _same(f"atr[{n}]", lib.atr(hh, ll, cc, 14), legacy.atr(dfn.high, dfn.low, dfn.close, 14))
+        s_new, d_new = lib.supertrend(hh, ll, cc, 10, 3.0)
+        s_old, d_old = legacy.supertrend(dfn, 10, 3.0)
+        _same(f"supertrend[{n}]", s_new, s_old)
+        if d_new.tolist() != d_old.tolist():
+            raise SystemExit(f"FAIL: supertrend direction [{n}]")
+        if n > 15 and (indicators_v2.ema(cc.tolist(), 20) != lib.ema(cc, 20)[-1]
+                       or indicators_v2.rsi(cc.tolist(), 14) != lib.rsi(cc, 14)[-1]
+                       or indicators_v2.emas(cc.tolist(), (20, 50, 200))[2] != lib.ema(cc, 200)[-1]):
+            raise SystemExit(f"FAIL: indicators_v2 != lib [{n}]")
+    print("✅ Live parity with frozen prototype.indicators (pandas) and indicators_v2 over 2..700 bars")
+
+    e, r, a, s, x = lib.EMA(20), lib.RSI(14), lib.ATR(14), lib.SuperTrend(10, 3.0), lib.ADX(14)
+    inc = np.array([(e.update(ci), r.update(ci), a.update(hi, li, ci), *s.update(hi, li, ci), x.update(hi, li, ci)[0])
+                    for hi, li, ci in zip(h.tolist(), l.tolist(), c.tolist())]).T
+    adx, _, _ = lib.dmi(h, l, c, 14)
+    for name, got, want in zip(("EMA", "RSI", "ATR", "SuperTrend", "direction", "ADX"), inc,
+                               (lib.ema(c, 20), lib.rsi(c, 14), lib.atr(h, l, c, 14), st, d, adx)):
+        if not np.array_equal(got, want, equal_nan=True):
+            raise SystemExit(f"FAIL: incremental {name} != batch")
+    if (s.prev_direction, s.direction) != (int(d[-2]), int(d[-1])):
+        raise SystemExit("FAIL: SuperTrend prev_direction")
+    print("✅ Incremental EMA/RSI/ATR/SuperTrend/ADX == batch bit-for-bit")
+
+    hl, ll_, cl = h.tolist(), l.tolist(), c.tolist()
+    want_st = legacy.calc_supertrend(df, 10, 3.0)
+    if (lib.calc_supertrend(df, 10, 3.0) != want_st
+            or lib.calc_supertrend(highs=hl, lows=ll_, closes=cl, period=10, multiplier=3.0) != want_st
+            or lib.calc_rsi14(cl) != legacy.calc_rsi14(df.close)
+            or lib.calc_ema(cl, length=20) != legacy.calc_ema(df.close, 20)
+            or lib.calc_atr14(hl, ll_, cl) != legacy.calc_atr14(df) or lib.calc_atr14(df) != legacy.calc_atr14(df)):
+        raise SystemExit("FAIL: compat shims")
+    from prototype.main_v8 import compute_signal_from_spot_df
+
+    snap = compute_signal_from_spot_df(df)
+    if snap["st_dir"] != want_st[1] or snap["rsi"] != legacy.calc_rsi14(df.close):
+        raise SystemExit(f"FAIL: main_v8 snapshot {snap}")
+    print("✅ calc_ema / calc_rsi14 / calc_atr14 / calc_supertrend: DataFrame and highs=/lows=/closes= styles; "
+          "main_v8 snapshot computes")
+
+    big = pd.DataFrame({"high": np.tile(h, 10), "low": np.tile(l, 10), "close": np.tile(c, 10)})
+    t0 = time.perf_counter()
+    legacy.supertrend(big, 10, 3.0)
+    t_pd = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    lib.supertrend(big.high.values, big.low.values, big.close.values, 10, 3.0)
+    t_np = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(10000):
+        s.update(23000.0, 22990.0, 22995.0)
+    per_bar = (time.perf_counter() - t0) / 10000
+    print(f"SuperTrend[{len(big)}]: pandas {t_pd * 1000:.1f} ms | lib {t_np * 1000:.2f} ms | "
+          f"incremental {per_bar * 1e6:.2f} us/bar")
+    if t_np >= t_pd:
+        raise SystemExit("FAIL: lib SuperTrend not faster than pandas")
+    print("✅ Single-source library is the fast path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+SMOKE TEST — MAIN V2.1
+Offline: fake broker on a SimulatedClock. A signal at 10:15:02 is placed by
+EntryScheduler at 11:15:01 (Candle N+1 open + exec_delay_sec) with VIX
+pre-warmed 5s before; the intrabar SL loop then exits and writes the trade.
+"""
+
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+
+from prototype import clock
+from prototype import main_v2_1
+from prototype.clock import IST_OFFSET_SEC, SimulatedClock, use_clock
+
+IST = timezone(timedelta(seconds=IST_OFFSET_SEC))
+MONDAY = datetime(2026, 10, 19, tzinfo=IST)
+
+
+def _t(hh, mm, ss=0.0):
+    return (MONDAY + timedelta(hours=hh, minutes=mm, seconds=ss)).timestamp()
+
+
+class _Broker:
+    def __init__(self):
+        closes = [23000.0 + (10.0 if i % 2 else -10.0) for i in range(59)] + [23015.0]
+        self.spot = pd.DataFrame({"high": [c + 5 for c in closes], "low": [c - 5 for c in closes], "close": closes})
+        self.fut = [23100.0, 23100.0, 22000.0]
+        self.calls = []
+
+    def login(self):
+        pass
+
+    def get_spot_candles_1h(self):
+        return self.spot
+
+    def get_india_vix(self):
+        self.calls.append(("vix", clock.time()))
+        return 13.2
+
+    def get_future_ltp(self):
+        self.calls.append(("fut", clock.time()))
+        return "NIFTY26OCTFUT", self.fut.pop(0)
+
+
+def main():
+    print("=== SMOKE TEST: MAIN V2.1 ===")
+
+    cfg = SimpleNamespace(poll_sec=60, exec_delay_sec=1.0)
+    broker = _Broker()
+    supertrend = main_v2_1.supertrend
+    main_v2_1.supertrend = lambda df, n, m: (22990.0, 1, -1)             # flip on the last closed bar
+    try:
+        with tempfile.TemporaryDirectory() as d, use_clock(SimulatedClock(_t(10, 15, 2.0))):
+            events_path = os.path.join(d, "events.jsonl")
+            trades_path = os.path.join(d, "paper_trades.csv")
+            main_v2_1.run(cfg, broker=broker, cycles=2, events_path=events_path, trades_path=trades_path)
+
+            with open(events_path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+            with open(trades_path, encoding="utf-8") as f:
+                trades = list(csv.DictReader(f))
+    finally:
+        main_v2_1.supertrend = supertrend
+
+    kinds = [e["event"] for e in events]
+    for k in ("PENDING_ENTRY", "ENTRY_DECISION", "ENTRY_FILLED", "SL_HIT"):
+        if k not in kinds:
+            raise SystemExit(f"FAIL: {k} not logged {kinds}")
+    dec = next(e["data"] for e in events if e["event"] == "ENTRY_DECISION")
+    intended = _t(11, 15, 1.0)
+    if dec["intended_at"] != intended or dec["fired_at"] != intended or dec["fire_drift_ms"] != 0.0:
+        raise SystemExit(f"FAIL: entry not at Candle N+1 open + delay {dec}")
+    if dec["vix"] != 13.2 or dec["regime"] != "RATIO_SPREAD" or dec["fut_entry"] != 23100.0:
+        raise SystemExit(f"FAIL: entry decision {dec}")
+    if broker.calls[:2] != [("vix", intended - 5.0), ("fut", intended)]:
+        raise SystemExit(f"FAIL: VIX pre-warmed before the open, FUT LTP at it {broker.calls}")
+    print(f"✅ Signal 10:15:02 -> entry 11:15:01, drift {dec['fire_drift_ms']} ms, VIX pre-warmed at 11:14:56")
+
+    if len(trades) != 1 or trades[0]["reason_exit"] != "SL_INTRABAR" or float(trades[0]["fut_exit"]) != 22000.0:
+        raise SystemExit(f"FAIL: SL exit trade row {trades}")
+    print(f"✅ SL_HIT on the next poll, trade row written (pnl {trades[0]['pnl_value']})")
+
+
+if __name__ == "__main__":
+    main()
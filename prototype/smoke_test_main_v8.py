@@ -0,0 +1,105 @@
+"""
+SMOKE TEST — MAIN V8
+Offline, simulated clock, ShoonyaAdapterV5 on a fake 60m TPSeries api
+(ring-buffered frames == adapter_v3 row-dict frames): a CANDLE_CLOSE_SIGNAL for
+the boot candle and one per new 1H candle, fetched right after each close
+(re-polled while the broker publishes the candle late), no fetches in
+between; 15:30 (no new candle) gives up after bar_wait_sec.
+"""
+
+import json
+import math
+import os
+import tempfile
+
+from prototype import clock, events
+from prototype import main_v8
+from prototype import market_data_v1 as market_data
+from prototype.clock import IST_OFFSET_SEC, SimulatedClock, use_clock
+from prototype.shoonya_adapter_v3 import build_df_from_shoonya_series as build_df_v3
+from prototype.shoonya_adapter_v5 import ShoonyaAdapterV5
+from prototype.smoke_test_bar_clock_v1 import _t
+
+
+class _Api:
+    """09:15-anchored 60m TPSeries rows (newest first); a candle is published publish_lag after it opens."""
+
+    def __init__(self, publish_lag):
+        self.publish_lag = publish_lag
+        self.starts = [_t(d, h, 15) for d in range(-21, 1) for h in range(9, 16)
+                       if (int(_t(d, 0, 0) + IST_OFFSET_SEC) // 86400 + 3) % 7 < 5]
+        self.at = []
+
+    @staticmethod
+    def row(i, t):
+        c = 23000 + 120 * math.sin(i / 9.0)
+        return {"stat": "Ok", "time": "", "ssboe": str(int(t)), "into": f"{c - 5:.2f}", "inth": f"{c + 20:.2f}",
+                "intl": f"{c - 20:.2f}", "intc": f"{c:.2f}", "intv": "0"}
+
+    def rows(self, starttime):
+        return [self.row(i, t) for i, t in enumerate(self.starts)
+                if float(starttime) <= t and t + self.publish_lag <= clock.time()][::-1]
+
+    def get_time_price_series(self, exchange, token, starttime, endtime=None, interval="60"):
+        self.at.append(clock.time())
+        return self.rows(starttime) or None
+
+
+def _run(publish_lag):
+    api = _Api(publish_lag)
+    broker = ShoonyaAdapterV5(token="26000")
+    broker.api = api
+    broker.login = lambda: True
+    fetch, diffs = broker.get_spot_candles_1h_pack, []
+
+    def checked():
+        pack = fetch()
+        old, _ = build_df_v3(api.rows(clock.time() - broker.lookback_hours * 3600))
+        diffs.append(not pack["df"].equals(old))
+        return pack
+    broker.get_spot_candles_1h_pack = checked
+    saved = main_v8.OUTPUT_DIR, events.EVENTS_FILE
+    market_data.MARKET_DATA.invalidate()
+    try:
+        with tempfile.TemporaryDirectory() as d, use_clock(SimulatedClock(_t(0, 9, 20))):
+            main_v8.OUTPUT_DIR, events.EVENTS_FILE = d, os.path.join(d, "events.jsonl")
+            main_v8.run({"nifty_spot_token": "26000", "bar_settle_sec": 1.0}, broker=broker, cycles=8)
+            with open(events.EVENTS_FILE, encoding="utf-8") as f:
+                evs = [json.loads(line) for line in f]
+    finally:
+        main_v8.OUTPUT_DIR, events.EVENTS_FILE = saved
+    return api, diffs, evs
+
+
+def main():
+    print("=== SMOKE TEST: MAIN V8 ===")
+
+    want = [_t(0, h, 15) for h in range(9, 16)]
+    for lag in (0.0, 2.5):
+        api, diffs, evs = _run(lag)
+        sig = [e["data"] for e in evs if e["event"] == "CANDLE_CLOSE_SIGNAL"]
+        if [s["ssboe"] for s in sig] != want or any(len(s["conds"]) != 4 for s in sig):
+            raise SystemExit(f"FAIL: lag {lag}: one signal per 1H candle {[s['ssboe'] for s in sig]}")
+        if "RUNTIME_EXCEPTION" in [e["event"] for e in evs]:
+            raise SystemExit("FAIL: runtime exception in the loop")
+        closes = [_t(0, h, 15) for h in range(10, 16)]
+        first = [min(t for t in api.at if t > c) - c for c in closes]
+        seen = [min(t for t in api.at if t >= c + lag) - c for c in closes]
+        if max(first) != 1.0 or max(seen) > lag + 1.0 + main_v8.BAR_RETRY_SEC:
+            raise SystemExit(f"FAIL: lag {lag}: fetch {first} / candle seen {seen}s after the close")
+        gave_up = [t for t in api.at if t > _t(0, 15, 30)]
+        if max(gave_up) - _t(0, 15, 30) > 1.0 + 5.0 + main_v8.BAR_RETRY_SEC:
+            raise SystemExit(f"FAIL: 15:30 re-polled past bar_wait_sec {gave_up}")
+        windows = closes + [_t(0, 15, 30)]
+        between = [t for t in api.at if t > _t(0, 9, 20) and not any(0 < t - c <= 7.0 for c in windows)]
+        if between:
+            raise SystemExit(f"FAIL: fetched between closes {between}")
+        if not diffs or any(diffs):
+            raise SystemExit(f"FAIL: lag {lag}: ring-buffered frame != adapter_v3 row-dict frame")
+        print(f"publish lag {lag:.1f}s: 7 signals, candle seen {min(seen):.1f}-{max(seen):.1f}s after the close, "
+              f"{len(api.at)} fetches (60s poll: ~370)")
+    print("✅ One signal per 1H candle right after the close (late candle re-polled, 15:30 gives up), idle otherwise")
+
+
+if __name__ == "__main__":
+    main()
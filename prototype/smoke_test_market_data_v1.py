@@ -0,0 +1,131 @@
+"""
+SMOKE TEST — MARKET DATA V1
+Single-flight coalescing, freshness TTL, shared-but-uncached failures,
+series window coverage, and the bot / network_guard / adapter call sites
+sharing round trips against the offline Shoonya mock.
+"""
+
+import os
+import threading
+import time
+
+from prototype.clock import SimulatedClock, use_clock
+from prototype.market_data_v1 import MarketData
+
+
+def main():
+    print("=== SMOKE TEST: MARKET DATA V1 ===")
+
+    md = MarketData()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"stat": "Ok", "lp": "23000.00"}
+
+    out = []
+    workers = [threading.Thread(target=lambda: out.append(md.get(("NSE", "26000", "quote"), slow, 1.0)))
+               for _ in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    if len(calls) != 1 or len(out) != 8 or md.stats["joins"] != 7:
+        raise SystemExit(f"FAIL: 8 concurrent callers -> {len(calls)} fetches {md.stats}")
+    print(f"✅ 8 concurrent callers share one in-flight call {md.stats}")
+
+    sim = SimulatedClock(1_000_000.0)
+    with use_clock(sim):
+        md = MarketData()
+        n = [0]
+
+        def fetch():
+            n[0] += 1
+            return {"lp": str(n[0])}
+
+        md.get(("NSE", "26017", "quote"), fetch, 5.0)
+        sim.advance(4.0)
+        if md.get(("NSE", "26017", "quote"), fetch, 5.0)["lp"] != "1" or n[0] != 1:
+            raise SystemExit("FAIL: fresh value not reused")
+        if md.get(("NSE", "26017", "quote"), fetch, 1.0)["lp"] != "2":
+            raise SystemExit("FAIL: max_age not honoured")
+
+        def boom():
+            n[0] += 1
+            raise OSError("down")
+
+        for _ in range(2):
+            try:
+                md.get(("NFO", "1", "quote"), boom, 5.0)
+                raise SystemExit("FAIL: error swallowed")
+            except OSError:
+                pass
+        if n[0] != 4 or md.get(("NFO", "1", "quote"), lambda: None, 5.0) is not None:
+            raise SystemExit("FAIL: failures must not be cached")
+
+        key = ("NSE", "26000", "tpseries:60")
+        md.get(key, lambda: ["wide"], 30.0, window=(100.0, None))
+        if md.get(key, lambda: ["narrow"], 30.0, window=(200.0, None)) != ["wide"]:
+            raise SystemExit("FAIL: wider cached window should cover")
+        if md.get(key, lambda: ["wider"], 30.0, window=(50.0, None)) != ["wider"]:
+            raise SystemExit("FAIL: narrower cached window must not cover")
+    print("✅ TTL reuse / expiry, failures shared but never cached, series window coverage")
+
+    from prototype.session_replay_v1 import REPLAY_ENV
+    from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=50.0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        os.environ["NIFTY_SPOT_TOKEN"] = "26000"
+        import bot
+        from prototype import market_data_v1 as market_data
+        from prototype.network_guard import fetch_spot_1h_with_timeout
+        from prototype.shoonya_adapter_v4 import ShoonyaAdapterV4
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        market_data.MARKET_DATA.invalidate()
+        q0 = srv.route_counts.get("GetQuotes", 0)
+        data = bot.get_shoonya_data(bot._susertoken, {"VIX": bot.TOKENS["VIX"], "SPOT": bot.TOKENS["NIFTY_SPOT"]})
+        vix = market_data.quote(bot.api, "NSE", bot.TOKENS["VIX"], max_age=bot.QUOTE_REUSE_SEC)
+        spot = market_data.quote(bot.api, "NSE", bot.TOKENS["NIFTY_SPOT"], max_age=bot.QUOTE_REUSE_SEC)
+        hits = srv.route_counts.get("GetQuotes", 0) - q0
+        if hits != 2 or vix is not data["VIX"] or spot is not data["SPOT"]:
+            raise SystemExit(f"FAIL: scan/execution re-fetched loop quotes ({hits} GetQuotes)")
+        print(f"✅ Loop quotes reused by scan VIX + execution spot: {hits} GetQuotes for 4 reads")
+
+        adapter = ShoonyaAdapterV4()
+        adapter.api = bot.api
+        t0 = srv.route_counts.get("TPSeries", 0)
+        results = {}
+        threads = [
+            threading.Thread(target=lambda: results.update(pack=adapter.get_spot_candles_1h_pack())),
+            threading.Thread(target=lambda: results.update(guard=fetch_spot_1h_with_timeout(bot.api, "26000", 30))),
+        ]
+        for th in threads:
+            th.start()
+            time.sleep(0.01)
+        for th in threads:
+            th.join()
+        guard = fetch_spot_1h_with_timeout(bot.api, "26000", 30)
+        tp = srv.route_counts.get("TPSeries", 0) - t0
+        if tp != 1 or not guard.ok or results["pack"].close <= 0 or not results["guard"].ok:
+            raise SystemExit(f"FAIL: 1h candles not shared ({tp} TPSeries) {guard.error}")
+        if guard.meta["ssboe"] != results["pack"].last_ssboe:
+            raise SystemExit("FAIL: guard and adapter disagree on the last candle")
+        print(f"✅ Adapter + network_guard 1h candles: {tp} TPSeries for 3 reads")
+
+        bot.trade_data["fut_token"] = bot.trade_data.get("fut_token") or "1"
+        bot.scan_for_model_e()
+        if srv.route_counts.get("TPSeries", 0) - t0 != 2 or not bot.trade_data.get("model_e_rsi"):
+            raise SystemExit(f"FAIL: scan_for_model_e 1-min history fetch: {bot.trade_data.get('last_error')}")
+        print(f"✅ scan_for_model_e fetches 1-min history (RSI {bot.trade_data['model_e_rsi']:.1f})")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+SMOKE TEST — MARKET TYPES V1
+Quote / Bar parsing, slotted footprint vs dict-of-dicts, BarBatch columns
+(chronological, local-time frame), and /get_status served from Quote records.
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from prototype.market_types_v1 import NO_QUOTE, Bar, BarBatch, Quote
+
+
+def _rows(n, t0=1_769_140_800):
+    return [{"stat": "Ok", "time": datetime.fromtimestamp(t0 - i * 60).strftime("%d-%m-%Y %H:%M:%S"),
+             "ssboe": str(t0 - i * 60), "into": f"{23000 + i:.2f}", "inth": f"{23005 + i:.2f}",
+             "intl": f"{22995 + i:.2f}", "intc": f"{23001 + i:.2f}", "intv": "100"} for i in range(n)]
+
+
+def main():
+    print("=== SMOKE TEST: MARKET TYPES V1 ===")
+
+    q = Quote.from_reply({"stat": "Ok", "lp": "23010.50", "c": "22950.00", "bp1": "23010.45", "sp1": "23010.55"},
+                         "NSE", "26000")
+    if (q.ltp, q.close, q.bid, q.ask) != (23010.5, 22950.0, 23010.45, 23010.55):
+        raise SystemExit(f"FAIL: quote parse {q}")
+    if Quote.from_reply({"stat": "Not_Ok"}) is not None or Quote.from_reply({"stat": "Ok", "lp": "x"}).ltp != 0.0:
+        raise SystemExit("FAIL: bad replies")
+    if hasattr(q, "__dict__") or NO_QUOTE.ltp != 0.0:
+        raise SystemExit("FAIL: Quote must be slotted")
+    print("✅ Quote parsed once (ltp/close/bid/ask floats), slotted, Not_Ok -> None")
+
+    n = 10000
+    tracemalloc.start()
+    as_dicts = [{"ltp": 23010.5 + i, "close": 22950.0} for i in range(n)]
+    d_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    as_quotes = [Quote("NSE", "26000", 23010.5 + i, 22950.0) for i in range(n)]
+    q_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{n} snapshots: dict {d_bytes / n:.0f} B/each vs Quote {q_bytes / n:.0f} B/each "
+          f"(sizeof {sys.getsizeof(as_dicts[0])} vs {sys.getsizeof(as_quotes[0])})")
+    if q_bytes >= d_bytes:
+        raise SystemExit("FAIL: Quote not smaller than dict")
+
+    rows = _rows(1440)
+    t0 = time.perf_counter()
+    b = BarBatch.from_rows(rows)
+    dt = time.perf_counter() - t0
+    if len(b) != 1440 or not (b.ssboe[1:] > b.ssboe[:-1]).all() or b.close[-1] != 23001.0:
+        raise SystemExit("FAIL: BarBatch not chronological")
+    if b[-1] != Bar.from_row(rows[0]) or b.last().high != 23005.0:
+        raise SystemExit("FAIL: Bar / BarBatch disagree")
+    df = b.to_frame()
+    if df["time"].iloc[-1] != datetime.strptime(rows[0]["time"], "%d-%m-%Y %H:%M:%S"):
+        raise SystemExit(f"FAIL: frame time not local wall clock {df['time'].iloc[-1]}")
+    print(f"✅ BarBatch: 1440 rows -> columns in {dt * 1000:.2f} ms, chronological, local-time frame")
+
+    from fastapi import Response
+
+    import api_server
+
+    td = api_server.bot.trade_data
+    td.update({"status": "Running", "vix_ltp": 99.0, "quotes": {
+        "VIX": Quote("NSE", "26017", 14.2, 14.0), "SPOT": Quote("NSE", "26000", 23010.0, 22950.0),
+        "CURR": Quote("NFO", "53001", 23080.0, 23010.0), "NEXT": Quote("NFO", "53002", 23190.0, 23120.0)}})
+    st = api_server.get_status_strict(Response())
+    if (st.vix_ltp, st.spot_close, st.fut_curr_ltp, st.fut_next_close) != (14.2, 22950.0, 23080.0, 23120.0):
+        raise SystemExit(f"FAIL: /get_status not from Quote records {st}")
+    print("✅ /get_status Trinity View served from Quote records")
+
+
+if __name__ == "__main__":
+    main()
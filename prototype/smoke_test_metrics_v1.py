@@ -0,0 +1,82 @@
+"""
+SMOKE TEST — METRICS V1
+Histograms/counters, overhead, and api_server /metrics fed by bot.py broker
+calls against the offline Shoonya mock.
+"""
+
+import os
+import time
+
+from prototype import metrics
+from prototype.session_replay_v1 import REPLAY_ENV
+from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+
+def main():
+    print("=== SMOKE TEST: METRICS V1 ===")
+
+    h = metrics.Histogram("t_seconds", buckets=(0.01, 0.1, 1.0))
+    for v in (0.005, 0.05, 0.05, 0.5, 5.0):
+        h.observe(v, route="X")
+    text = "\n".join(h.render())
+    snap = h.snapshot(route="X")
+    if ('t_seconds_bucket{route="X",le="0.1"} 3' not in text
+            or 't_seconds_bucket{route="X",le="+Inf"} 5' not in text
+            or snap["count"] != 5 or snap["p50"] != 0.1):
+        raise SystemExit(f"FAIL: histogram render/snapshot\n{text}\n{snap}")
+    print("✅ Histogram buckets / exposition")
+
+    n = 100000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        metrics.observe("overhead_seconds", 0.002, route="GetQuotes")
+    per = (time.perf_counter() - t0) / n * 1e6
+    print(f"observe(): {per:.2f} µs/op")
+    if per > 20:
+        raise SystemExit("FAIL: observe() too slow for hot path")
+    metrics.REGISTRY.reset()
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=3.0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        from starlette.testclient import TestClient
+
+        import api_server
+        import bot
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        tokens = bot.resolve_futures_tokens()
+        for _ in range(5):
+            bot.market_data.MARKET_DATA.invalidate()  # each poll is a fresh loop iteration
+            bot.get_shoonya_data(bot._susertoken, tokens)
+        bot.api.get_quotes(exchange="NSE", token="26000")  # NorenApi path
+
+        client = TestClient(api_server.app)  # no lifespan -> bot loop not started
+        for _ in range(3):
+            if client.get("/get_status").status_code != 200:
+                raise SystemExit("FAIL: /get_status")
+        r = client.get("/metrics")
+    finally:
+        srv.stop()
+
+    body = r.text
+    need = [
+        'broker_request_seconds_bucket{route="GetQuotes",le="0.005"}',
+        'broker_request_seconds_count{route="QuickAuth"} 1',
+        'broker_requests_total{outcome="ok",route="SearchScrip"} 1.0',
+        'broker_request_seconds_count{route="GetQuotes"} 21',
+        'http_request_seconds_count{method="GET",path="/get_status"} 3',
+        "# TYPE broker_request_seconds histogram",
+    ]
+    missing = [x for x in need if x not in body]
+    if r.status_code != 200 or not r.headers["content-type"].startswith("text/plain") or missing:
+        raise SystemExit(f"FAIL: /metrics missing {missing}\n{body[:2000]}")
+    gq = metrics.REGISTRY.histogram("broker_request_seconds").snapshot(route="GetQuotes")
+    print(f"GetQuotes via mock: n={gq['count']} p50<={gq['p50'] * 1000:.1f}ms p99<={gq['p99'] * 1000:.1f}ms")
+    print("✅ /metrics exposes broker + handler latency")
+
+
+if __name__ == "__main__":
+    main()
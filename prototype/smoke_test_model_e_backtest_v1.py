@@ -0,0 +1,70 @@
+"""
+SMOKE TEST — MODEL E BACKTEST V1
+Offline: synthetic NIFTY 1m session data, no broker login.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_e_logic import calculate_model_e_indicators
+from prototype.clock import IST_OFFSET_SEC
+from prototype.model_e_backtest_v1 import (
+    compute_hourly_indicators,
+    resample_hourly,
+    run_backtest,
+)
+from prototype.synthetic_data_v1 import synthetic_1m_session
+
+
+def main():
+    print("=== SMOKE TEST: MODEL E BACKTEST V1 ===")
+
+    data = synthetic_1m_session(days=40)
+    times, o, h, l, c = data["times"], data["open"], data["high"], data["low"], data["close"]
+
+    # parity vs model_e_logic (pandas reference)
+    df = pd.DataFrame({"time": times, "open": o, "high": h, "low": l, "close": c})
+    ref = calculate_model_e_indicators(df)
+    bars = resample_hourly(times, o, h, l, c)
+    ind = compute_hourly_indicators(bars)
+
+    if len(ref) != len(bars.close):
+        raise SystemExit(f"FAIL: hourly bar count {len(bars.close)} != {len(ref)}")
+    for col in ("rsi", "ema20", "atr", "st_line"):
+        if not np.allclose(ref[col].to_numpy(), ind[col], rtol=1e-9, atol=1e-6, equal_nan=True):
+            raise SystemExit(f"FAIL: {col} mismatch vs model_e_logic")
+    if not np.array_equal(ref["st_direction"].to_numpy(), ind["st_direction"]):
+        raise SystemExit("FAIL: st_direction mismatch vs model_e_logic")
+    print("✅ Indicator parity OK")
+
+    res = run_backtest(data)
+    print("SUMMARY:", res.summary)
+    for t in res.trades[:3]:
+        print(t)
+    if len(res.equity) != len(times):
+        raise SystemExit("FAIL: equity curve length")
+    print("✅ Backtest OK")
+
+    # UTC epoch seconds: same IST hour buckets, Friday 15:15 exits and trades as IST wall-clock datetime64
+    epoch = times.astype("datetime64[s]").astype(np.int64) - IST_OFFSET_SEC
+    eb = resample_hourly(epoch, o, h, l, c)
+    if not (np.array_equal(eb.start_idx, bars.start_idx) and np.array_equal(eb.close, bars.close)):
+        raise SystemExit("FAIL: epoch input bucketed off IST clock hours")
+    res_e = run_backtest(dict(data, times=epoch))
+    if [(t.entry_time, t.exit_time, t.reason_exit) for t in res_e.trades] != \
+            [(t.entry_time, t.exit_time, t.reason_exit) for t in res.trades]:
+        raise SystemExit("FAIL: epoch input trades differ from IST datetime64 input")
+    print("✅ Epoch-second input: identical IST buckets / exits")
+
+    # ~2 years of 1m bars
+    data = synthetic_1m_session(days=500, seed=11)
+    t0 = time.perf_counter()
+    res = run_backtest(data)
+    dt = time.perf_counter() - t0
+    print(f"✅ {len(data['times'])} bars, {res.summary['trades']} trades in {dt:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+SMOKE TEST — MTF CHECKPOINT V1
+Restart halfway through a session from the on-disk checkpoint: bars and
+indicators (EMA/RSI/ADX/SuperTrend) continue bit-for-bit vs an engine that
+never stopped; parameter / stale / corrupt checkpoints are refused; after a
+restart sync() fetches only the gap (offline mock).
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from prototype.indicator_lib_v1 import EMA, SuperTrend, get_state, set_state
+from prototype.mtf_engine_v1 import MultiTimeframeEngine
+from prototype.smoke_test_mtf_engine_v1 import _rows
+
+TFS = ("5m", "15m", "1h", "1h_915", "1d")
+
+
+def _same(a, b, label):
+    for tf in TFS:
+        x, y = a.bars("26000", tf, include_forming=True), b.bars("26000", tf, include_forming=True)
+        n = min(len(x), len(y))
+        if not n or any(not np.array_equal(getattr(x, f)[-n:], getattr(y, f)[-n:])
+                        for f in ("ssboe", "open", "high", "low", "close", "volume")):
+            raise SystemExit(f"FAIL: {label} {tf} bars differ")
+        if a.indicators("26000", tf) != b.indicators("26000", tf):
+            raise SystemExit(f"FAIL: {label} {tf} indicators {a.indicators('26000', tf)} != {b.indicators('26000', tf)}")
+
+
+def main():
+    print("=== SMOKE TEST: MTF CHECKPOINT V1 ===")
+
+    rows = _rows(20)
+    half = len(rows) // 2
+    ref = MultiTimeframeEngine(tz_offset_sec=0)
+    for tf in TFS:
+        ref.bars("26000", tf)
+    ref.ingest_rows("26000", rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mtf_checkpoint.json")
+
+        first = MultiTimeframeEngine(tz_offset_sec=0)
+        if first.restore(path):
+            raise SystemExit("FAIL: restored a missing checkpoint")
+        for tf in TFS:
+            first.bars("26000", tf)
+        first.ingest_rows("26000", rows[half:])          # oldest half (rows are newest first)
+        for i in range(half - 1, half - 61, -1):          # one more hour bar by bar
+            first.ingest_rows("26000", [rows[i]])
+        if first.stats["checkpoints"] < 12:
+            raise SystemExit(f"FAIL: checkpoint on every bar close {first.stats}")
+        size = os.path.getsize(path)
+
+        t0 = time.perf_counter()
+        second = MultiTimeframeEngine(tz_offset_sec=0)
+        if not second.restore(path):
+            raise SystemExit("FAIL: restore")
+        t_restore = time.perf_counter() - t0
+        lag = first.bars("26000", "1m").ssboe[-1] - second.bars("26000", "1m").ssboe[-1]
+        if not 0 <= lag < 300:                            # saved at the last 5m close
+            raise SystemExit(f"FAIL: last 1m bar id not restored (lag {lag}s)")
+        second.ingest_rows("26000", rows[:half])          # the gap since the checkpoint, overlap deduped
+        _same(ref, second, "resumed")
+        st = second.indicators("26000", "1h")
+        print(f"✅ Restart mid-session: {len(TFS)} timeframes resume bit-for-bit (EMA200 {st['ema_200']:.2f}, "
+              f"ST dir {st['st_dir']}) | checkpoint {size / 1024:.0f} KB, restore {t_restore * 1000:.1f} ms")
+
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        state["saved_at"] -= 10 * 24 * 3600
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        if MultiTimeframeEngine(tz_offset_sec=0).restore(path):
+            raise SystemExit("FAIL: stale checkpoint restored")
+        if MultiTimeframeEngine(tz_offset_sec=19800).restore(path, max_age_sec=1e12):
+            raise SystemExit("FAIL: checkpoint from another timezone restored")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{truncated")
+        if MultiTimeframeEngine(tz_offset_sec=0).restore(path):
+            raise SystemExit("FAIL: corrupt checkpoint restored")
+        for fresh_ind, saved in ((SuperTrend(10, 2.0), SuperTrend(10, 3.0)), (EMA(50), EMA(20))):
+            try:
+                set_state(fresh_ind, get_state(saved))
+            except ValueError:
+                continue
+            raise SystemExit(f"FAIL: checkpoint with other {type(saved).__name__} parameters accepted")
+        print("✅ Stale / other-timezone / corrupt checkpoints and changed indicator parameters refused")
+
+    from prototype.session_replay_v1 import REPLAY_ENV
+    from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=5.0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        import bot
+        from prototype import clock
+        from prototype import market_data_v1 as market_data
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mtf_checkpoint.json")
+            now = clock.time()
+            before = MultiTimeframeEngine()
+            before.restore(path)
+            before.bars("26000", "1h")
+            rows = market_data.series(bot.api, "NSE", "26000", "1", starttime=now - 24 * 3600)
+            before.ingest_rows("26000", rows, until=now - 3600)   # went down an hour ago
+
+            market_data.MARKET_DATA.invalidate()
+            t0 = srv.route_counts.get("TPSeries", 0)
+            t_boot = time.perf_counter()
+            after = MultiTimeframeEngine()
+            after.restore(path)
+            gap = after.sync(bot.api, "NSE", "26000")
+            t_boot = time.perf_counter() - t_boot
+            tp = srv.route_counts.get("TPSeries", 0) - t0
+
+            market_data.MARKET_DATA.invalidate()
+            fresh = MultiTimeframeEngine()
+            t_seed = time.perf_counter()
+            seeded = fresh.sync(bot.api, "NSE", "26000")
+            t_seed = time.perf_counter() - t_seed
+        if tp != 1 or not 55 <= gap <= 62 or after.bars("26000", "1m").ssboe[-1] != fresh.bars("26000", "1m").ssboe[-1]:
+            raise SystemExit(f"FAIL: gap fetch ({tp} TPSeries, {gap} bars)")
+        if not after.indicators("26000", "1h")["ema_20"]:
+            raise SystemExit("FAIL: no indicators after restore + gap")
+        print(f"✅ Boot from checkpoint: 1 TPSeries, {gap} gap bars in {t_boot * 1000:.0f} ms "
+              f"(fresh seed: {seeded} bars in {t_seed * 1000:.0f} ms)")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
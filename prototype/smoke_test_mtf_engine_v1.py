@@ -0,0 +1,144 @@
+"""
+SMOKE TEST — MTF ENGINE V1
+One 1m buffer -> 5m/15m/1h/1d bars: parity with pandas resample (Model E),
+incremental indicators == batch indicators_v2 / adx_v1, subscriber callbacks,
+late-timeframe back-fill, IST buckets whatever the host time zone, and
+delta-only downloads against the offline mock.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from model_e_logic import calculate_model_e_indicators, calculate_model_e_indicators_1h, resample_1h
+from prototype.adx_v1 import last_adx
+from prototype.clock import IST_OFFSET_SEC
+from prototype.indicators_v2 import ema, rsi
+from prototype.market_types_v1 import BarBatch
+from prototype.mtf_engine_v1 import MultiTimeframeEngine
+from prototype.synthetic_data_v1 import synthetic_1m_session
+
+
+def _rows(days):
+    s = synthetic_1m_session(days, seed=11)
+    t = s["times"].astype("datetime64[s]").astype(np.int64)
+    return [{"stat": "Ok", "ssboe": str(t[i]), "into": f"{s['open'][i]:.2f}", "inth": f"{s['high'][i]:.2f}",
+             "intl": f"{s['low'][i]:.2f}", "intc": f"{s['close'][i]:.2f}", "intv": "100"}
+            for i in range(len(t) - 1, -1, -1)]
+
+
+def main():
+    print("=== SMOKE TEST: MTF ENGINE V1 ===")
+
+    rows = _rows(20)
+    eng = MultiTimeframeEngine(tz_offset_sec=0)
+    fired = {"5m": 0, "1h": 0}
+    eng.subscribe("26000", "5m", lambda tok, tf, bar, ind: fired.__setitem__("5m", fired["5m"] + 1))
+    eng.subscribe("26000", "1h", lambda tok, tf, bar, ind: fired.__setitem__("1h", fired["1h"] + 1))
+    t0 = time.perf_counter()
+    new = eng.ingest_rows("26000", rows)
+    per_bar = (time.perf_counter() - t0) / new
+    if new != len(rows) or eng.ingest_rows("26000", rows[:500]) != 0:
+        raise SystemExit("FAIL: 1m dedupe by ssboe")
+
+    df_1min = BarBatch.from_rows(rows).to_frame(0)
+    ref = resample_1h(df_1min.copy())
+    got = eng.frame("26000", "1h", include_forming=True).set_index("time")
+    if len(got) != len(ref) or not np.allclose(got[["open", "high", "low", "close"]].values, ref.values):
+        raise SystemExit(f"FAIL: 1h bars != resample('1H') ({len(got)} vs {len(ref)})")
+    a = calculate_model_e_indicators(df_1min.copy())
+    b = calculate_model_e_indicators_1h(eng.frame("26000", "1h", include_forming=True))
+    cols = ["rsi", "ema20", "atr", "st_direction", "st_line"]
+    if not np.allclose(a[cols].values, b[cols].values, equal_nan=True):
+        raise SystemExit("FAIL: Model E indicators differ on engine bars")
+    if fired["1h"] != len(ref) - 1 or fired["5m"] != len(eng.bars("26000", "5m")):
+        raise SystemExit(f"FAIL: subscriber callbacks {fired}")
+    print(f"✅ 1h bars == resample('1H') over {len(ref)} hours; Model E indicators identical; "
+          f"callbacks {fired} | ingest {per_bar * 1e6:.1f} us/1m bar")
+
+    b15 = eng.bars("26000", "15m")
+    ind = eng.indicators("26000", "15m")
+    c = b15.close.tolist()
+    want = {"ema_20": ema(c, 20), "ema_50": ema(c, 50), "ema_200": ema(c, 200), "rsi_14": rsi(c, 14)}
+    want.update(zip(("adx_14", "plus_di_14", "minus_di_14"), last_adx(b15.high, b15.low, b15.close, 14)))
+    bad = {k: (ind[k], v) for k, v in want.items() if abs(ind[k] - v) > 1e-9}
+    if bad:
+        raise SystemExit(f"FAIL: incremental indicators != batch {bad}")
+    late = eng.bars("26000", "15m")                      # live-built; a fresh engine back-fills it lazily
+    eng2 = MultiTimeframeEngine(tz_offset_sec=0)
+    eng2.ingest_rows("26000", rows)
+    if not np.array_equal(eng2.bars("26000", "15m").close, late.close) or eng2.indicators("26000", "15m") != ind:
+        raise SystemExit("FAIL: late timeframe back-fill differs")
+    h915 = eng.bars("26000", "1h_915")
+    d1 = eng.bars("26000", "1d")
+    if not ((h915.ssboe % 3600) == 900).all() or len(d1) != 19:
+        raise SystemExit("FAIL: 09:15-anchored hours / daily bars")
+    print(f"✅ 15m EMA/RSI/ADX incremental == batch; back-filled timeframes identical; "
+          f"1h_915 anchored at :15, {len(d1)} closed daily bars")
+
+    if eng.close_due("26000", now=float(eng.bars("26000", "1m").ssboe[-1]) + 86400) != 5:
+        raise SystemExit("FAIL: close_due should close the forming 5m/15m/1h/1h_915/1d bars")
+    print("✅ close_due() closes forming bars once their bucket has ended")
+
+    host_tz = os.environ.get("TZ")
+    os.environ["TZ"] = "UTC"                             # Render: TZ unset -> UTC host
+    time.tzset()
+    try:
+        utc_host = MultiTimeframeEngine()
+    finally:
+        if host_tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = host_tz
+        time.tzset()
+    day = 1_760_918_400 - IST_OFFSET_SEC                 # 2025-10-20 00:00 IST
+    mins = [day + 9 * 3600 + 15 * 60 + 60 * i for i in range(76)] + [day + 11 * 3600]   # 09:15-10:30, 11:00
+    utc_host.ingest_rows("26000", [{"stat": "Ok", "ssboe": str(t), "into": "1", "inth": "1", "intl": "1",
+                                    "intc": "1", "intv": "1"} for t in reversed(mins)])
+    starts = [(t - day) // 60 for t in utc_host.bars("26000", "1h").ssboe.tolist()]
+    if utc_host.tz != IST_OFFSET_SEC or starts != [9 * 60, 10 * 60]:
+        raise SystemExit(f"FAIL: UTC host 1h buckets {[f'{m // 60:02d}:{m % 60:02d}' for m in starts]} IST")
+    print("✅ UTC host: default engine buckets 09:15-10:30 IST into 09:00 / 10:00 IST hours")
+
+    from prototype.session_replay_v1 import REPLAY_ENV
+    from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=5.0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        os.environ["NIFTY_SPOT_TOKEN"] = "26000"
+        import bot
+        from prototype import market_data_v1 as market_data
+        from prototype.shoonya_adapter_v4 import ShoonyaAdapterV4
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        market_data.MARKET_DATA.invalidate()
+        t0 = srv.route_counts.get("TPSeries", 0)
+        bot.trade_data["fut_token"] = bot.trade_data.get("fut_token") or "1"
+        bot.scan_for_model_e()
+        seeded = len(bot.MTF.bars("26000", "1m"))
+        if not seeded or not bot.trade_data.get("model_e_rsi"):
+            raise SystemExit(f"FAIL: scan_for_model_e via engine: {bot.trade_data.get('last_error')}")
+
+        adapter = ShoonyaAdapterV4(mtf=bot.MTF)
+        adapter.api = bot.api
+        pack = adapter.get_spot_candles_1h_pack(lookback_hours=24)
+        market_data.MARKET_DATA.invalidate()
+        bot.scan_for_model_e()
+        tp = srv.route_counts.get("TPSeries", 0) - t0
+        if len(bot.MTF.bars("26000", "1m")) > seeded + 2 or tp != 2:
+            raise SystemExit(f"FAIL: re-downloaded history ({tp} TPSeries)")
+        if pack.meta.get("timeframe") != "1h_915" or pack.close != bot.MTF.bars("26000", "1m").close[-1] \
+                or (pack.last_ssboe + bot.MTF.tz) % 3600 != 900 or not pack.rows:
+            raise SystemExit(f"FAIL: adapter CandlePack from engine {pack.meta} {pack.last_ssboe}")
+        print(f"✅ Scan + adapter + rescan share one 1m buffer: {seeded} bars seeded, "
+              f"{tp} TPSeries for 3 reads (adapter served from the seed, rescan delta-only)")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
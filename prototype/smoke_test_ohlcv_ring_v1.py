@@ -0,0 +1,110 @@
+"""
+SMOKE TEST — OHLCV RING V1
+O(1) append / wrap-around, contiguous zero-copy windows and pandas export,
+forming-bar revision, TPSeries dedupe, flat memory across polls, and the
+network_guard / adapter_v5 frames matching the old row-dict builders (and
+not changing when their ring takes the next poll).
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from prototype.market_types_v1 import BarBatch
+from prototype.network_guard import _build_df_from_series
+from prototype.ohlcv_ring_v1 import OHLCVRing
+from prototype.shoonya_adapter_v3 import build_df_from_shoonya_series as build_df_v3
+from prototype.shoonya_adapter_v5 import build_df_from_shoonya_series
+from prototype.synthetic_data_v1 import synthetic_tpseries_rows
+
+
+def _old_df(out):
+    """The pre-ring builder: row dicts -> DataFrame."""
+    return pd.DataFrame([{"open": float(r["into"]), "high": float(r["inth"]), "low": float(r["intl"]),
+                          "close": float(r["intc"])} for r in reversed(out)])
+
+
+def main():
+    print("=== SMOKE TEST: OHLCV RING V1 ===")
+
+    ring = OHLCVRing(100)
+    for i in range(250):
+        ring.append(i * 60, i, i + 1, i - 1, i + 0.5, 10)
+    w = ring.window()
+    if len(ring) != 100 or w.ssboe[0] != 150 * 60 or w.close[-1] != 249.5 or not (np.diff(w.ssboe) == 60).all():
+        raise SystemExit("FAIL: wrap-around window not oldest -> newest")
+    if not (w.close.flags.c_contiguous and np.shares_memory(w.close, ring._f)) or w.close.flags.writeable:
+        raise SystemExit("FAIL: window must be a read-only contiguous view")
+    ring.set_last(300.0, 1.0, 299.0, 11.0)
+    if w.close[-1] != 299.0 or ring.last().high != 300.0 or ring.window(5, drop_last=True).close[-1] != 248.5:
+        raise SystemExit("FAIL: forming-bar revision / drop_last")
+    df = ring.to_frame(20)
+    if not np.shares_memory(df["close"].to_numpy(), ring._f) or list(df.columns) != [
+            "time", "open", "high", "low", "close", "volume"] or df["close"].iloc[-1] != 299.0:
+        raise SystemExit("FAIL: to_frame OHLCV block must be zero-copy")
+    print("✅ Wrap-around keeps newest 100; windows + frames are contiguous views; forming bar revised in place")
+
+    rows = synthetic_tpseries_rows(500, seed=5)
+    r2 = OHLCVRing(1000)
+    if r2.extend_rows(rows[100:]) != 400 or r2.extend_rows(rows) != 100 or r2.extend_rows(rows) != 0:
+        raise SystemExit("FAIL: TPSeries dedupe by ssboe")
+    ref = BarBatch.from_rows(rows)
+    got = r2.window()
+    if not all(np.array_equal(getattr(got, c), getattr(ref, c)) for c in ("ssboe", "open", "high", "low", "close")):
+        raise SystemExit("FAIL: ring != BarBatch.from_rows")
+    revised = [dict(rows[0], intc="1.00")] + rows[1:3]
+    if r2.extend_rows(revised) != 0 or r2.last().close != 1.0:
+        raise SystemExit("FAIL: same-ssboe row should revise the newest bar")
+    print("✅ extend_rows: older bars skipped, newest revised, new appended (== BarBatch.from_rows)")
+
+    out = synthetic_tpseries_rows(72, seed=9)
+    res = _build_df_from_series(out, OHLCVRing(2048))
+    df5, meta5 = build_df_from_shoonya_series(out, OHLCVRing(2048))
+    old = _old_df(out)
+    df3, meta3 = build_df_v3(out)
+    if not (res.ok and res.df.equals(old) and df5.equals(old) and df3.equals(old) and meta5 == meta3 == res.meta):
+        raise SystemExit("FAIL: network_guard / adapter_v5 frames differ from the row-dict builder")
+    print("✅ network_guard._build_df_from_series / adapter_v5 build_df_from_shoonya_series == old row-dict frames")
+
+    held_ring, adapter_ring = OHLCVRing(80), OHLCVRing(80)
+    held = _build_df_from_series(out, held_ring).df
+    held5, _ = build_df_from_shoonya_series(out, adapter_ring)
+    later = synthetic_tpseries_rows(72, seed=4, end="2026-02-27 15:15")
+    for _ in range(3):
+        _build_df_from_series(later, held_ring)
+        build_df_from_shoonya_series(later, adapter_ring)
+    if not (held.equals(old) and held5.equals(old)):
+        raise SystemExit("FAIL: a frame the caller kept changed when the ring took the next poll")
+    print("✅ Returned frames are the caller's: later polls into the same ring leave them unchanged")
+
+    guard_ring = OHLCVRing(2048)
+    polls = [synthetic_tpseries_rows(72, seed=9, end=f"2026-01-{d:02d} 15:15") for d in range(5, 24)]
+    _build_df_from_series(polls[0], guard_ring)
+    tracemalloc.start()
+    for p in polls * 3:
+        _build_df_from_series(p, guard_ring)
+    base = tracemalloc.get_traced_memory()[0]
+    for p in polls * 3:
+        _build_df_from_series(p, guard_ring)
+    grown = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for _ in range(200):
+        _old_df(out)
+    t_old = (time.perf_counter() - t0) / 200
+    t0 = time.perf_counter()
+    for _ in range(200):
+        _build_df_from_series(out, guard_ring)
+    t_new = (time.perf_counter() - t0) / 200
+    print(f"72-row poll: row dicts -> DataFrame {t_old * 1000:.2f} ms | ring {t_new * 1000:.2f} ms | "
+          f"memory growth over 57 polls: {grown} B")
+    if grown > 64 * 1024 or t_new >= t_old:
+        raise SystemExit("FAIL: steady-state polls should be flat and faster")
+    print("✅ Steady-state polls: flat memory, faster than row-dict DataFrames")
+
+
+if __name__ == "__main__":
+    main()
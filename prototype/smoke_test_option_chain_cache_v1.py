@@ -0,0 +1,107 @@
+"""
+SMOKE TEST — OPTION CHAIN CACHE V1
+Against the offline Shoonya mock: one GetOptionChain fetch, live premiums
+over the websocket, baskets and the bot hedge leg built from memory, TTL
+and ATM-drift refetch; a re-login closes the old feed.
+"""
+
+import os
+import time
+
+from prototype.option_chain_cache_v1 import OptionChainCache, parse_expiry
+from prototype.order_basket_v1 import build_order_basket
+from prototype.session_replay_v1 import REPLAY_ENV
+from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+
+def main():
+    print("=== SMOKE TEST: OPTION CHAIN CACHE V1 ===")
+
+    if str(parse_expiry("NIFTY29JAN26P23000")) != "2026-01-29" or parse_expiry("NIFTY") is not None:
+        raise SystemExit("FAIL: parse_expiry")
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=2.0, tick_interval_sec=0.05)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        import bot
+
+        if not bot.shoonya_login() or not bot.resolve_futures_tokens():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        fut = bot.trade_data["symbol"]
+        spot = float(bot.api.get_quotes(exchange="NSE", token="26000")["lp"])
+
+        cache = OptionChainCache(bot.api, ttl_sec=0.5, count=10)
+        if not cache.start_feed():
+            raise SystemExit("FAIL: websocket feed did not open")
+        snap = cache.get(fut, spot)
+        if snap is None or len(snap.legs) != 42 or snap.expiry != parse_expiry(fut):
+            raise SystemExit(f"FAIL: chain snapshot {snap and len(snap.legs)}")
+        if cache.get(fut, spot) is not snap or cache.stats["fetches"] != 1:
+            raise SystemExit("FAIL: second get() did not hit the cache")
+        print(f"✅ Chain fetched once: {len(snap.legs)} legs, expiry {snap.expiry}")
+
+        deadline = time.time() + 3
+        while time.time() < deadline:
+            _, pe = snap.ltps("PE", max_age=cache.ltp_ttl_sec)
+            if (pe == pe).all():
+                break
+            time.sleep(0.05)
+        else:
+            raise SystemExit(f"FAIL: premiums not live over websocket: {pe}")
+        print(f"✅ Live premiums from {cache.stats['ticks']} websocket ticks")
+
+        atm = int(snap.atm)
+        quotes_before = srv.route_counts.get("GetQuotes", 0)
+        t0 = time.perf_counter()
+        for gear in ("SAFE_FUTURE", "RATIO_SPREAD", "BULL_CALL_SPREAD"):
+            b = build_order_basket(gear, atm, chain=snap)
+            opt = [leg for leg in b.legs if leg.instrument != "FUT"]
+            if not opt or any(not leg.tsym or not leg.token or not leg.premium for leg in opt):
+                raise SystemExit(f"FAIL: basket legs not filled from chain: {b.legs}")
+        per_us = (time.perf_counter() - t0) / 3 * 1e6
+        if srv.route_counts.get("GetQuotes", 0) != quotes_before:
+            raise SystemExit("FAIL: basket build made quote calls")
+        if build_order_basket("SAFE_FUTURE", atm).legs[1].tsym is not None:
+            raise SystemExit("FAIL: basket without chain changed")
+        print(f"✅ Baskets from memory ({per_us:.0f} µs each, 0 quote calls)")
+
+        bot.option_chain = cache
+        strike, row = bot.select_hedge_put_strike(spot, chain=snap)
+        if row is None or abs(row["delta"] - bot.HEDGE_PUT_DELTA) > 0.1 or not snap.leg(strike, "PE"):
+            raise SystemExit(f"FAIL: hedge strike from chain premiums: {strike} {row}")
+        print(f"✅ Hedge put from chain IVs: {snap.leg(strike, 'PE').tsym} delta={row['delta']:.3f} iv={row['iv']:.3f}")
+
+        time.sleep(0.6)
+        if cache.get(fut, spot) is snap or cache.stats["fetches"] != 2:
+            raise SystemExit("FAIL: TTL expiry did not refetch")
+        snap = cache.get(fut, spot)
+        if cache.get(fut, spot + 9 * 50) is snap or cache.stats["fetches"] != 3:
+            raise SystemExit("FAIL: ATM drift did not refetch")
+        print("✅ TTL + ATM drift refetch", cache.stats)
+
+        if not bot.execute_model_e_trade(1, spot - 100, spot):
+            raise SystemExit("FAIL: execute_model_e_trade against mock")
+        hedge = [o for o in srv.broker.orders if o["remarks"] == "ModelE_Hedge"]
+        if not hedge or hedge[-1]["tsym"] not in {lg.tsym for lg in cache.get(fut, spot).legs.values()}:
+            raise SystemExit(f"FAIL: hedge order tsym not from chain: {hedge}")
+        print(f"✅ execute_model_e_trade hedge leg {hedge[-1]['tsym']}")
+
+        if not bot.shoonya_login():                                     # re-login: new api, new feed
+            raise SystemExit(f"FAIL: re-login: {bot.trade_data.get('last_error')}")
+        bot.get_option_chain(spot)
+        fresh = bot.option_chain
+        deadline = time.time() + 5
+        while not fresh.feed_active and time.time() < deadline:
+            time.sleep(0.02)
+        ticks = cache.stats["ticks"]
+        time.sleep(0.3)
+        if fresh is cache or not fresh.feed_active or cache.feed_active or cache.stats["ticks"] != ticks:
+            raise SystemExit(f"FAIL: old feed still running after re-login ({cache.stats['ticks'] - ticks} ticks)")
+        print(f"✅ Re-login: old feed closed, one feed on the new session ({fresh.stats['ticks']} ticks)")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
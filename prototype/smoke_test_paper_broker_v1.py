@@ -0,0 +1,99 @@
+"""
+SMOKE TEST — PAPER BROKER FILL MODELS
+Legacy instant fills, spread/slippage/latency/partial/reject behaviour of
+RealisticFill, collision-free IDs under bursts, and throughput.
+"""
+
+import time
+
+import numpy as np
+
+from prototype.paper_broker import PaperBroker, RealisticFill
+
+
+def main():
+    print("=== SMOKE TEST: PAPER BROKER FILL MODELS ===")
+
+    pb = PaperBroker()
+    o = pb.place_market("NIFTYFUT", "BUY", 65, ltp=23000.0)
+    pb.place_market("NIFTYFUT", "SELL", 65, ltp=23010.0)
+    if o.price != 23000.0 or o.status != "FILLED" or pb.get_positions() or pb.friction_total:
+        raise SystemExit(f"FAIL: legacy instant fill changed: {o}")
+    print("✅ Default model = legacy instant fill at LTP")
+
+    m = RealisticFill(spread_bps=2.0, slippage_bps=0.0, latency_ms=40.0, jitter_ms=0.0, seed=1)
+    pb = PaperBroker(m)
+    buy = pb.place_market("NIFTYFUT", "BUY", 50, ltp=23000.0)
+    sell = pb.place_market("NIFTYFUT", "SELL", 50, ltp=23000.0, bid=22998.0, ask=23001.0)
+    if not (buy.price > 23000.0 and sell.price == 22998.0 and buy.fill_ts_ms - buy.ts_ms == 40):
+        raise SystemExit(f"FAIL: spread/latency: {buy} {sell}")
+    if pb.friction_total != 8.0 * 50:
+        raise SystemExit(f"FAIL: round-trip friction {pb.friction_total}")
+    print(f"✅ Spread crossing, latency stamp, 8-pt round-trip friction (buy {buy.price}, sell {sell.price})")
+
+    part = pb.place_market("NIFTYFUT", "BUY", 500, ltp=23000.0, ask=23001.0, depth_qty=150)
+    walk = PaperBroker(RealisticFill(walk_book=True, slippage_bps=0.0, seed=1)).place_market(
+        "NIFTYFUT", "BUY", 500, ltp=23000.0, ask=23001.0, depth_qty=150)
+    frz = pb.place_market("NIFTYFUT", "BUY", 5000, ltp=23000.0)
+    if part.status != "PARTIAL" or part.filled_qty != 150 or pb.positions["NIFTYFUT"].qty != 150:
+        raise SystemExit(f"FAIL: partial fill {part}")
+    if walk.status != "FILLED" or walk.price <= 23001.0 or frz.status != "REJECTED":
+        raise SystemExit(f"FAIL: book walk / freeze reject {walk} {frz}")
+    rej = PaperBroker(RealisticFill(reject_rate=0.3, seed=3))
+    n_rej = sum(rej.place_market("X", "BUY", 1, 100.0).status == "REJECTED" for _ in range(2000))
+    if not 450 < n_rej < 750:
+        raise SystemExit(f"FAIL: reject rate {n_rej}/2000")
+    print(f"✅ Partial fill at depth, book walk, freeze-qty and random rejects ({n_rej}/2000)")
+
+    sb = PaperBroker()
+    for side in ("buy", "Bogus", ""):
+        sb.place_market("X", side, 10, 100.0)
+    if sb.positions["X"].qty != -10:
+        raise SystemExit(f"FAIL: only side == BUY (any case) buys {sb.positions['X']}")
+    bo = PaperBroker(RealisticFill(reject_rate=1e-9, seed=6))
+    bo.place_market_batch(["X", "X"], ["BUY", "SELL"], [5000, 10], [100.0, 100.0])
+    reasons = [o.reason for o in bo.orders.values()]
+    if reasons != ["qty 5000 above freeze limit 1800", ""]:
+        raise SystemExit(f"FAIL: batch reject reason {reasons}")
+    print("✅ Side is BUY / anything else (empty side sells), batch rejects keep their reason")
+
+    # 5 pts/sqrt(s) over 50ms: E|N| * 5 * sqrt(0.05) ~ 0.89 pts
+    noisy = PaperBroker(RealisticFill(vol_pts=5.0, slippage_bps=0.0, spread_bps=0.0, seed=2))
+    px = np.array([noisy.place_market("X", "BUY", 1, 23000.0).price for _ in range(2000)])
+    if px.min() < 23000.0 or not 0.6 < px.mean() - 23000.0 < 1.2:
+        raise SystemExit(f"FAIL: volatility slippage mean {px.mean() - 23000.0}")
+    print(f"✅ Volatility slippage is adverse (mean {px.mean() - 23000.0:.2f} pts)")
+
+    burst = PaperBroker(RealisticFill(seed=4))
+    other = PaperBroker(RealisticFill(seed=4))
+    n = 100000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        burst.place_market("NIFTYFUT", "BUY", 50, 23000.0)
+    single_rate = n / (time.perf_counter() - t0)
+    other.place_market("NIFTYFUT", "BUY", 50, 23000.0)
+    if len(burst.orders) != n or set(other.orders) & set(burst.orders):
+        raise SystemExit("FAIL: order id collision")
+    print(f"✅ {n} ids in one burst, no collisions across brokers | place_market: {single_rate:,.0f} orders/s")
+
+    bb = PaperBroker(RealisticFill(seed=5))
+    nb = 200000
+    rng = np.random.default_rng(0)
+    sides = np.where(rng.random(nb) < 0.5, "BUY", "SELL").tolist()
+    syms = ["NIFTYFUT"] * nb
+    ltps = 23000.0 + rng.normal(0, 20, nb)
+    t0 = time.perf_counter()
+    out = bb.place_market_batch(syms, sides, np.full(nb, 50), ltps, keep_orders=False)
+    batch_rate = nb / (time.perf_counter() - t0)
+    net = sum(50 if s == "BUY" else -50 for s in sides)
+    pos = bb.positions.get("NIFTYFUT")
+    if (pos.qty if pos else 0) != net or len(set(out["order_id"].tolist())) != nb:
+        raise SystemExit("FAIL: batch positions / ids")
+    print(f"place_market_batch: {batch_rate:,.0f} orders/s")
+    if max(single_rate, batch_rate) < 100000:
+        raise SystemExit("FAIL: below 100k simulated orders/s")
+    print("✅ 100k+ simulated orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+SMOKE TEST — PAPERTRADE RUNNER V3
+Offline, simulated clock, ShoonyaAdapterV4 on a fake 1m TPSeries api: boot
+step, then one paper step per 1H close (within a second of the boundary, a
+few fetches per bar, none in between); a holiday logs BAR_CLOSE_NO_DATA per
+close and does not step; a restart restores the MTF checkpoint and fetches
+only the gap.
+"""
+
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+from prototype import clock
+from prototype import papertrade_runner_v3 as runner
+from prototype.clock import IST_OFFSET_SEC, SimulatedClock, use_clock
+from prototype.mtf_engine_v1 import MultiTimeframeEngine
+from prototype.session_replay_v1 import REPLAY_ENV
+from prototype.smoke_test_bar_clock_v1 import _FakeApi, _t
+
+HOLIDAY = int(_t(3, 0, 0))                              # Thursday
+
+
+class _HolidayApi(_FakeApi):
+    def __init__(self):
+        super().__init__()
+        self.at = []
+
+    def get_time_price_series(self, exchange, token, starttime, endtime=None, interval="1"):
+        self.at.append(clock.time())
+        return super().get_time_price_series(exchange, token, starttime, endtime, interval)
+
+    def rows(self, st, now):
+        return [r for r in super().rows(st, now) if not HOLIDAY <= int(r["ssboe"]) < HOLIDAY + 86400]
+
+
+def _broker(api, eng):
+    from prototype.shoonya_adapter_v4 import ShoonyaAdapterV4
+
+    broker = ShoonyaAdapterV4(mtf=eng)
+    broker.api = api
+    broker.login = lambda: True
+    return broker
+
+
+def main():
+    print("=== SMOKE TEST: PAPERTRADE RUNNER V3 ===")
+
+    os.environ.update(REPLAY_ENV)
+    os.environ["NIFTY_SPOT_TOKEN"] = "26000"
+    api = _HolidayApi()
+    eng = MultiTimeframeEngine(tz_offset_sec=IST_OFFSET_SEC)
+
+    paths = ("OUT_DIR", "STATE_PATH", "JOURNAL_PATH", "EVENTS_PATH", "MTF_CHECKPOINT_PATH")
+    saved = {p: getattr(runner, p) for p in paths}
+    os.environ["PAPERTRADE_CYCLES"] = "16"              # boot + 7 Wednesday closes + 7 holiday closes + Friday 10:15
+    try:
+        with tempfile.TemporaryDirectory() as d, use_clock(SimulatedClock(_t(2, 9, 20))) as sim:
+            for p in paths:
+                setattr(runner, p, os.path.join(d, os.path.basename(saved[p])) if p != "OUT_DIR" else d)
+            runner.main(cfg=SimpleNamespace(bar_settle_sec=1.0), broker=_broker(api, eng), mtf=eng)
+            with open(runner.EVENTS_PATH, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+            with open(runner.JOURNAL_PATH, encoding="utf-8") as f:
+                journal = [json.loads(line) for line in f]
+            end = clock.time()
+            sleeps, fetched = sim.sleeps, list(api.at)
+
+            # restart at 11:20: the MTF checkpoint is restored, the boot fetch covers only the gap
+            sim.advance(_t(4, 11, 20) - end)
+            os.environ["PAPERTRADE_CYCLES"] = "1"
+            fresh = MultiTimeframeEngine(tz_offset_sec=IST_OFFSET_SEC)
+            calls = api.calls
+            runner.main(cfg=SimpleNamespace(bar_settle_sec=1.0), broker=_broker(api, fresh), mtf=fresh)
+            restart_calls = api.calls - calls
+            with open(runner.EVENTS_PATH, encoding="utf-8") as f:
+                restart = [json.loads(line) for line in f][len(events):]
+    finally:
+        for p, v in saved.items():
+            setattr(runner, p, v)
+        os.environ.pop("PAPERTRADE_CYCLES", None)
+
+    steps = [e for e in events if e["event"] == "PAPERTRADE_STEP"]
+    no_data = [e["data"]["close_at"] for e in events if e["event"] == "BAR_CLOSE_NO_DATA"]
+    if len(steps) != 9 or len(journal) != 9:
+        raise SystemExit(f"FAIL: boot + one step per 1H close ({len(steps)} steps, {len(journal)} journal rows)")
+    if no_data != [_t(3, h, 15) for h in range(10, 16)] + [_t(3, 15, 30)]:
+        raise SystemExit(f"FAIL: holiday closes {no_data}")
+    if end > _t(4, 10, 15, 2.0):
+        raise SystemExit(f"FAIL: Friday 10:15 step {end - _t(4, 10, 15)}s after the close")
+    last = eng.bars("26000", "1h_915")
+    if last.ssboe[-1] != _t(4, 9, 15) or [e["data"]["close"] for e in steps][-1] != last.close[-1]:
+        raise SystemExit(f"FAIL: Friday step not on the 09:15 bar {last.ssboe[-1]}")
+    trading = sum(1 for t in fetched if not HOLIDAY <= t < HOLIDAY + 86400)
+    if trading > 3 * len(steps):
+        raise SystemExit(f"FAIL: fetching between closes ({trading} TPSeries for {len(steps)} steps)")
+    print(f"✅ Boot + 7 Wednesday closes + Friday 10:15 stepped, 7 holiday closes BAR_CLOSE_NO_DATA: "
+          f"{trading} TPSeries on trading days + {len(fetched) - trading} on the holiday (sync_close retries), "
+          f"{sleeps} sleeps over 3 days (60s poll: ~1100 fetches)")
+
+    ck = next(e["data"] for e in restart if e["event"] == "MTF_CHECKPOINT")
+    if not ck["restored"] or restart_calls != 1 or fresh.bars("26000", "1m").ssboe[-1] < _t(4, 11, 18):
+        raise SystemExit(f"FAIL: restart from the checkpoint {ck} ({restart_calls} TPSeries)")
+    stepped = any(e["event"] == "PAPERTRADE_STEP" for e in restart)
+    if fresh.bars("26000", "1h_915").ssboe[-1] != _t(4, 10, 15) or not stepped:
+        raise SystemExit("FAIL: restarted runner did not step on the resumed bars")
+    print(f"✅ Restart: MTF checkpoint restored, boot fetched only the gap ({restart_calls} TPSeries) and stepped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+SMOKE TEST — PARAM SWEEP V1
+Offline: synthetic data, small grid on 1 process vs all cores.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_e_logic import get_vaps_lots
+from prototype.indicators import atr, ema, rsi, supertrend
+from prototype.indicator_lib_v1 import atr as atr_np
+from prototype.indicator_lib_v1 import ema as ema_np
+from prototype.indicator_lib_v1 import rsi as rsi_np
+from prototype.indicator_lib_v1 import supertrend as supertrend_np
+from prototype.param_sweep_v1 import MODEL_E_SPACE, TYPEF_SPACE, grid, random_search, run_sweep
+from prototype.synthetic_data_v1 import synthetic_1m_session
+
+
+def main():
+    print("=== SMOKE TEST: PARAM SWEEP V1 ===")
+
+    # NumPy kernels == prototype.indicators (pandas)
+    d = synthetic_1m_session(days=5)
+    df = pd.DataFrame({"high": d["high"][:600], "low": d["low"][:600], "close": d["close"][:600]})
+    st, sd = supertrend(df, 10, 3.0)
+    st2, sd2 = supertrend_np(df["high"], df["low"], df["close"], 10, 3.0)
+    checks = {
+        "ema": np.allclose(ema(df["close"], 20), ema_np(df["close"], 20)),
+        "rsi": np.allclose(rsi(df["close"], 14), rsi_np(df["close"], 14), equal_nan=True),
+        "atr": np.allclose(atr(df["high"], df["low"], df["close"], 14), atr_np(df["high"], df["low"], df["close"], 14)),
+        "supertrend": np.allclose(st, st2) and np.array_equal(sd.to_numpy(), sd2),
+    }
+    if not all(checks.values()):
+        raise SystemExit(f"FAIL: numpy kernels differ: {checks}")
+    print("✅ NumPy kernels match prototype.indicators")
+
+    for v in (12.0, 14.0, 15.9, 16.0, 18.0, 18.5):
+        if get_vaps_lots(v, 500000) != get_vaps_lots(v, 500000, bounds=(14, 16, 18)):
+            raise SystemExit("FAIL: default VIX bounds changed sizing")
+    print("✅ VAPS defaults unchanged")
+
+    data = synthetic_1m_session(days=250, seed=3)
+    sets = random_search(MODEL_E_SPACE, 48, seed=1)
+
+    one = run_sweep(data, "model_e", sets, processes=1)
+    print(f"1 proc : {one.evals_per_sec:.1f} evals/s")
+
+    procs = os.cpu_count() or 1
+    many = run_sweep(data, "model_e", sets, processes=procs, top=5)
+    print(f"{procs} procs: {many.evals_per_sec:.1f} evals/s")
+    if many.errors:
+        raise SystemExit(f"FAIL: errors in sweep: {many.results[-1]}")
+    if [r["net_pnl"] for r in many.results] != [r["net_pnl"] for r in one.results[:5]]:
+        raise SystemExit("FAIL: ranking differs between 1 proc and pool")
+    for r in many.results:
+        print(r["net_pnl"], r["trades"], r["params"])
+    print("✅ Model E sweep OK")
+
+    tf = run_sweep(data, "type_f", grid(TYPEF_SPACE), processes=procs, top=3)
+    print(f"type_f: {tf.evaluated} evals, {tf.evals_per_sec:.1f} evals/s, best={tf.results[0]['net_pnl']:.2f}")
+    print("✅ Type F sweep OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,27 @@
 """
 SMOKE TEST — PENDING ENTRY ENGINE V1
+Poll-driven READY check; EntryScheduler fires at the exact Candle N+1 open
+(+ delay) with a pre-warmed payload, re-arm replaces, cancel, fire errors
+and early fires recorded; real-clock drift on the wheel thread.
 """
 
-from prototype.pending_entry_engine_v1 import PendingEntryState, update_pending_entry
+import time
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
+from prototype import clock, metrics
+from prototype.bar_clock_v1 import IST_OFFSET_SEC
+from prototype.clock import SimulatedClock, use_clock
+from prototype.pending_entry_engine_v1 import EntryScheduler, PendingEntryState, update_pending_entry
+
+IST = timezone(timedelta(seconds=IST_OFFSET_SEC))
+MONDAY = datetime(2026, 10, 19, tzinfo=IST)
+
+
+def _t(day, hh, mm, ss=0.0):
+    return (MONDAY + timedelta(days=day, hours=hh, minutes=mm, seconds=ss)).timestamp()
+
+
 def main():
     print("=== SMOKE TEST: PENDING ENTRY V1 ===")
 
@@ -19,5 +36,65 @@ def main():
     state, out2 = update_pending_entry(state, sig, t2)
     print(out2, state)
 
+    with use_clock(SimulatedClock(_t(0, 10, 15, 2.5))):
+        sched = EntryScheduler(delay_sec=1.0)
+        calls = []
+
+        def prewarm():
+            calls.append(("prewarm", clock.time()))
+            return {"vix": 13.2}
+
+        def fire(payload):
+            calls.append(("fire", clock.time()))
+            return payload
+        e = sched.arm("model_e", fire=fire, prewarm=prewarm)
+        sched.wait(e)
+        if e.intended != _t(0, 11, 15, 1.0) or abs(e.drift) > 1e-6 or e.result != {"vix": 13.2}:
+            raise SystemExit(f"FAIL: fire at N+1 open + delay {e}")
+        if [c for c, _ in calls] != ["prewarm", "fire"] or calls[0][1] != e.intended - 5.0:
+            raise SystemExit(f"FAIL: pre-warm before the open {calls}")
+
+        clock.get_clock().advance(_t(0, 15, 20) - clock.time())          # last bar: next open is tomorrow
+        e = sched.arm("model_e", fire=fire)
+        if e.intended != _t(1, 9, 15, 1.0):
+            raise SystemExit(f"FAIL: after 15:15 the next open is 09:15 next session {e.intended}")
+        e2 = sched.arm("model_e", fire=lambda p: "second", at=_t(1, 9, 15, 2.0))
+        if not e.cancelled or not e.done.is_set() or len(sched.wheel) != 1:
+            raise SystemExit("FAIL: re-arm replaces the pending entry")
+        sched.wait(e2)
+        if e2.result != "second" or e.fired_at is not None:
+            raise SystemExit("FAIL: only the re-armed entry fires")
+
+        e = sched.arm("x", fire=lambda p: 1 / 0, prewarm=lambda: 1 / 0)
+        sched.wait(e)
+        if not isinstance(e.error, ZeroDivisionError) or e.payload is not None:
+            raise SystemExit("FAIL: fire / pre-warm errors")
+        if sched.cancel("y") or sched.get("x") is not None:
+            raise SystemExit("FAIL: cancel / get")
+
+        e = sched.arm("early", at=clock.time() + 2.0)
+        sched.wheel.run_due(clock.time() + 2.0)                             # wheel ahead of the clock
+        h = metrics.REGISTRY.histogram("entry_fire_early_seconds").snapshot(key="early")
+        if e.drift != -2.0 or h["count"] != 1 or h["sum"] != 2.0:
+            raise SystemExit(f"FAIL: early fire not recorded {e.drift} {h}")
+    print("✅ Fires at Candle N+1 open + delay exactly (10:15:02 -> 11:15:01; 15:20 -> next 09:15:01), "
+          "payload pre-warmed 5s before, re-arm replaces, errors and early fires recorded")
+
+    sched = EntryScheduler().start()
+    try:
+        drift = []
+        for _ in range(3):
+            e = sched.arm("rt", fire=lambda p: p, prewarm=lambda: "payload", at=time.time() + 0.15)
+            if not sched.wait(e, timeout=2) or e.result != "payload":
+                raise SystemExit("FAIL: wheel thread did not fire")
+            drift.append(e.drift)
+    finally:
+        sched.wheel.stop()
+    if max(drift) > 0.05:
+        raise SystemExit(f"FAIL: real-clock drift {drift}")
+    print(f"✅ Wheel thread: actual - intended {', '.join(f'{d * 1000:.1f}' for d in drift)} ms "
+          f"(previous sleep_until 200ms poll + exec sleep: up to 200 ms late)")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+"""
+SMOKE TEST — RATE LIMITER V1
+Token buckets, priority under contention (orders never starve), route
+waits don't block other classes, bounded waits, and bot/NorenApi calls
+paced against the offline Shoonya mock.
+"""
+
+import os
+import threading
+import time
+
+from prototype import metrics
+from prototype.rate_limiter_v1 import RateLimited, RateLimiter, TokenBucket, class_of
+
+
+def main():
+    print("=== SMOKE TEST: RATE LIMITER V1 ===")
+
+    b = TokenBucket(rate=2.0, capacity=4.0, now=0.0)
+    b.tokens = 0.0
+    b.refill(1.0)
+    if b.tokens != 2.0 or b.wait_for() != 0.0 or b.wait_for(floor=1.5) != 0.25:
+        raise SystemExit(f"FAIL: token bucket {b.tokens}")
+    b.refill(10.0)
+    if b.tokens != 4.0:
+        raise SystemExit("FAIL: bucket exceeded capacity")
+    if class_of("PlaceOrder").priority >= class_of("GetQuotes").priority >= class_of("TPSeries").priority \
+            or class_of("TPSeries").priority >= class_of("SearchScrip").priority:
+        raise SystemExit("FAIL: priority order orders > quotes > history > search")
+    print("✅ Token bucket refill / floor / class priorities")
+
+    # background history + search polling saturates the gateway; orders keep getting through
+    lim = RateLimiter(gateway=(20.0, 10.0), routes={})
+    stop = threading.Event()
+    bg_calls = {"TPSeries": 0, "SearchScrip": 0}
+
+    def poll(route):
+        while not stop.is_set():
+            try:
+                lim.acquire(route, max_wait=0.5)
+                bg_calls[route] += 1
+            except RateLimited:
+                pass
+
+    workers = [threading.Thread(target=poll, args=(r,), daemon=True) for r in ("TPSeries", "SearchScrip") * 4]
+    for w in workers:
+        w.start()
+    time.sleep(0.3)
+    order_waits = []
+    for _ in range(10):
+        order_waits.append(lim.acquire("PlaceOrder"))
+        time.sleep(0.05)
+    stop.set()
+    for w in workers:
+        w.join()
+    worst = max(order_waits)
+    print(f"orders under load: worst wait {worst * 1000:.1f} ms | background calls {bg_calls}")
+    if worst > 0.06 or bg_calls["TPSeries"] <= bg_calls["SearchScrip"]:
+        raise SystemExit("FAIL: orders starved or history not ahead of search")
+    print("✅ Orders keep capacity while history/search back off")
+
+    lim = RateLimiter(gateway=(100.0, 100.0), routes={"QuickAuth": (2.0, 1.0)})
+    lim.acquire("QuickAuth")
+    th = threading.Thread(target=lim.acquire, args=("QuickAuth",))
+    th.start()
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    for _ in range(20):
+        lim.acquire("GetQuotes")
+    quotes_dt = time.perf_counter() - t0
+    th.join()
+    if quotes_dt > 0.05:
+        raise SystemExit(f"FAIL: login retry wait blocked quotes ({quotes_dt:.3f}s)")
+    lim = RateLimiter(gateway=(0.5, 1.0), routes={})
+    try:
+        lim.acquire("PlaceOrder", max_wait=0.1)
+        lim.acquire("PlaceOrder", max_wait=0.1)
+        raise SystemExit("FAIL: RateLimited not raised")
+    except RateLimited:
+        pass
+    print("✅ Route waits isolated; bounded waits raise RateLimited")
+
+    from prototype.session_replay_v1 import REPLAY_ENV
+    from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+    srv = MockShoonyaServer(MockConfig(port=0)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        import bot
+
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        n = 40
+        t0 = time.perf_counter()
+        for _ in range(n):
+            bot.api.get_quotes(exchange="NSE", token="26000")
+        dt = time.perf_counter() - t0
+    finally:
+        srv.stop()
+    rate, burst = bot.rate_limiter.ROUTE_LIMITS["GetQuotes"]
+    floor = (n - burst) / rate * 0.8
+    waited = metrics.REGISTRY.histogram("rate_limit_wait_seconds").snapshot(cls="quotes")["count"]
+    print(f"{n} NorenApi GetQuotes against mock: {dt:.2f}s ({n / dt:.1f}/s), {waited} waited")
+    if dt < floor or not waited:
+        raise SystemExit("FAIL: NorenApi calls not paced by the limiter")
+    print("✅ bot/NorenApi broker calls paced by route budget")
+
+
+if __name__ == "__main__":
+    main()
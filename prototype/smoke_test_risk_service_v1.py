@@ -0,0 +1,208 @@
+"""
+SMOKE TEST — RISK SERVICE V1
+Offline. STOP / TRAIL / MTM_LOSS (4.5% of capital) fire once per breach on
+the exit worker; a failed exit re-arms and retries; per-tick cost. Against
+the Shoonya mock: a Model E entry is watched on the websocket and the stop
+exits both legs through bot.close_model_e_position, tick-to-exit measured; a
+restart re-registers the open position from its persisted state (reconciled
+with the broker position book) and opens the feed for its legs; its exit goes
+out while PlaceOrder's breaker is open.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from prototype import circuit_breaker_v1 as breakers
+from prototype import clock, metrics
+from prototype.risk_governor_v1 import MTM_LOSS_PCT
+from prototype.risk_service_v1 import Leg, RiskPosition, RiskService
+
+SPOT, FUT, PUT = "NSE|26000", "NFO|53001", "NFO|61234"
+
+
+def _service(results=None):
+    exits = []
+
+    def exit_fn(pos, d):
+        exits.append((pos.pid, d.reason))
+        return results.pop(0) if results else True
+    return RiskService(exit_fn), exits
+
+
+def main():
+    print("=== SMOKE TEST: RISK SERVICE V1 ===")
+
+    svc, exits = _service()
+    svc.add(RiskPosition("sl", [Leg(FUT, 50, 23010.0)], stop_key=SPOT, stop=22880.0))
+    for ltp in (22950.0, 22900.0, 0.0, float("inf"), 22881.0):
+        svc.on_price(SPOT, ltp)
+    svc.on_tick({"t": "tf", "e": "NSE", "tk": "26000", "lp": "22879.50"})
+    svc.on_price(SPOT, 22870.0)
+    svc.wait_idle()
+    if len(exits) != 1 or not exits[0][1].startswith("STOP: NSE|26000 22879.50") or svc.active():
+        raise SystemExit(f"FAIL: stop fires once on the breaching tick: {exits}")
+    if svc.get("sl") is not None or svc.keys():
+        raise SystemExit("FAIL: exited position still watched")
+    print(f"✅ STOP: ignored 0 / inf prints, fired once on the breaching tick ({exits[0][1]})")
+
+    capital = 500000.0
+    limit = MTM_LOSS_PCT * capital
+    svc, exits = _service()
+    svc.add(RiskPosition("mtm", [Leg(FUT, 100, 23000.0), Leg(PUT, 100)], stop_key=SPOT, stop=20000.0,
+                         mtm_limit=limit))
+    svc.on_price(PUT, 90.0)                               # baseline
+    svc.on_price(FUT, 22800.0)                            # -20000
+    svc.on_price(PUT, 120.0)                              # hedge +3000 -> -17000
+    svc.on_price(FUT, 22780.0)                            # -22000 + 3000 = -19000
+    svc.wait_idle()
+    if exits:
+        raise SystemExit(f"FAIL: MTM exit inside the limit: {exits}")
+    svc.on_price(FUT, 22740.0)                            # -26000 + 3000 = -23000 > 22500
+    svc.wait_idle()
+    if len(exits) != 1 or not exits[0][1].startswith("MTM_LOSS"):
+        raise SystemExit(f"FAIL: MTM loss over {limit:.0f}: {exits}")
+    print(f"✅ MTM_LOSS: hedged MTM tracked per tick, exit beyond {MTM_LOSS_PCT:.1%} x capital = ₹{limit:,.0f}")
+
+    svc, exits = _service()
+    svc.add(RiskPosition("trail", [Leg(FUT, 50, 23000.0)], stop_key=SPOT, stop=22800.0, trail_dist=100.0))
+    for ltp in (22950.0, 23050.0, 23120.0, 23040.0, 23060.0):
+        svc.on_price(SPOT, ltp)
+    pos = svc.get("trail")
+    if pos.level() != 23020.0 or exits:
+        raise SystemExit(f"FAIL: trail ratchet {pos.level()} {exits}")
+    svc.on_price(SPOT, 23019.0)
+    svc.wait_idle()
+    if len(exits) != 1 or not exits[0][1].startswith("TRAIL"):
+        raise SystemExit(f"FAIL: trailing stop: {exits}")
+    print("✅ TRAIL: stop ratchets up with the peak (never down), fires at peak - trail_dist")
+
+    svc, exits = _service(results=[False, True])
+    svc.add(RiskPosition("retry", [Leg(FUT, 50, 23000.0)], stop_key=SPOT, stop=22900.0))
+    svc.on_price(SPOT, 22890.0)
+    svc.wait_idle()
+    if len(exits) != 1 or not svc.active() or svc.stats["exit_failures"] != 1:
+        raise SystemExit(f"FAIL: failed exit must keep the position {svc.stats}")
+    svc.on_price(SPOT, 22885.0)
+    svc.wait_idle()
+    if len(exits) != 2 or svc.active():
+        raise SystemExit(f"FAIL: re-armed position retried on the next tick {svc.stats}")
+    print("✅ Failed exit re-arms: retried on the next breaching tick")
+
+    svc, _ = _service()
+    for i in range(20):
+        svc.add(RiskPosition(f"p{i}", [Leg(FUT, 50, 23000.0), Leg(PUT, 50, 90.0)], stop_key=SPOT,
+                             stop=1000.0, mtm_limit=1e9))
+    n = 20000
+    t0 = time.perf_counter()
+    for i in range(n):
+        svc.on_tick({"e": "NSE", "tk": "26000", "lp": 23000.0 + (i % 50)})
+    per_tick = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    for i in range(n):
+        svc.on_tick({"e": "NFO", "tk": "99999", "lp": 100.0})
+    unwatched = (time.perf_counter() - t0) / n
+    print(f"20 positions: {per_tick * 1e6:.1f} µs/watched tick | {unwatched * 1e6:.2f} µs/unwatched tick")
+
+    from prototype.session_replay_v1 import REPLAY_ENV
+    from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=2.0, tick_interval_sec=0.05)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        import bot
+
+        bot.MODEL_E_POSITION_PATH = os.path.join(tempfile.mkdtemp(), "model_e_position.json")
+        if not bot.shoonya_login() or not bot.resolve_futures_tokens():
+            raise SystemExit(f"FAIL: login: {bot.trade_data.get('last_error')}")
+        spot = float(bot.api.get_quotes(exchange="NSE", token="26000")["lp"])
+        h0 = metrics.REGISTRY.histogram("tick_to_exit_seconds").snapshot(rule="STOP")
+        bot.get_option_chain(spot)
+        deadline = time.time() + 5
+        while not bot.option_chain.feed_active and time.time() < deadline:
+            time.sleep(0.02)
+
+        exited = threading.Event()
+        close = bot.close_model_e_position
+
+        def _close(reason):
+            ok = close(reason)
+            exited.set()
+            return ok
+        bot.close_model_e_position = _close
+        try:
+            if not bot.execute_model_e_trade(1, spot + 500, spot):          # stop above spot: first tick breaches
+                raise SystemExit("FAIL: execute_model_e_trade against mock")
+            if not exited.wait(5):
+                raise SystemExit(f"FAIL: no exit from websocket ticks {bot.RISK.stats}")
+            bot.RISK.wait_idle()
+        finally:
+            bot.close_model_e_position = close
+        pos = bot.RISK.get("model_e")
+        exits = [o for o in srv.broker.orders if o["remarks"] == "ModelE_Exit"]
+        if pos is not None or len(exits) != 2 or {o["trantype"] for o in exits} != {"S"}:
+            raise SystemExit(f"FAIL: both legs sold once: {exits}")
+        if bot.trade_data["active"] or not bot.trade_data["exit_reason"].startswith("STOP: NSE|26000"):
+            raise SystemExit(f"FAIL: trade_data after exit {bot.trade_data.get('exit_reason')}")
+        if bot.square_off_all():
+            raise SystemExit("FAIL: square off with no open legs")
+        h = metrics.REGISTRY.histogram("tick_to_exit_seconds").snapshot(rule="STOP")
+        lat = (h["sum"] - h0["sum"]) / max(1, h["count"] - h0["count"])
+        print(f"✅ Mock: stop on a websocket spot tick -> FUT + PUT sold via close_model_e_position "
+              f"({', '.join(o['tsym'] for o in exits)}), tick-to-exit {lat * 1000:.1f} ms")
+        if os.path.exists(bot.MODEL_E_POSITION_PATH):
+            raise SystemExit("FAIL: persisted position kept after the exit")
+
+        if not bot.execute_model_e_trade(1, spot - 5000, spot):                # far stop: stays open
+            raise SystemExit("FAIL: second entry against mock")
+        with open(bot.MODEL_E_POSITION_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+        legs = (bot.trade_data["fut_symbol"], bot.trade_data["put_symbol"])
+        bot.RISK.remove("model_e")                                              # restart: fresh process state
+        bot.option_chain.stop_feed()
+        bot.option_chain = None
+        for k in bot.MODEL_E_POSITION_KEYS:
+            bot.trade_data.pop(k, None)
+        bot.trade_data["active"] = False
+        if not bot.restore_model_e_position():
+            raise SystemExit("FAIL: open position not restored")
+        pos = bot.RISK.get("model_e")
+        if pos is None or pos.stop != spot - 5000 or pos.to_state() != saved["risk"] or not bot.trade_data["active"] \
+                or (bot.trade_data["fut_symbol"], bot.trade_data["put_symbol"]) != legs:
+            raise SystemExit(f"FAIL: restored position / trade_data {pos} {saved}")
+        deadline = time.time() + 5
+        while any(leg.ltp is None for leg in pos.legs) and time.time() < deadline:
+            time.sleep(0.02)
+        if bot.option_chain is None or any(leg.ltp is None for leg in pos.legs):
+            raise SystemExit(f"FAIL: restored legs not ticking on the websocket {pos.legs}")
+        print(f"✅ Restart: Model E position re-registered with RISK from its saved state ({', '.join(legs)}), "
+              f"feed started for its legs (put LTP {pos.legs[-1].ltp})")
+
+        place = breakers.breaker("PlaceOrder")
+        for _ in range(place.cfg.failure_threshold):
+            place.record_failure("outage")
+        sells = len([o for o in srv.broker.orders if o["remarks"] == "ModelE_Exit"])
+        if not bot.close_model_e_position("restart exit") or bot.RISK.get("model_e") is not None:
+            raise SystemExit(f"FAIL: protective exit refused by the open breaker {place.snapshot()}")
+        if len([o for o in srv.broker.orders if o["remarks"] == "ModelE_Exit"]) != sells + 2:
+            raise SystemExit("FAIL: both legs sold through the open breaker")
+        print("✅ Exit orders bypass an open PlaceOrder breaker (outage): both legs sold")
+
+        with open(bot.MODEL_E_POSITION_PATH, "w", encoding="utf-8") as f:
+            json.dump(saved, f)                                                 # crashed before clearing
+        if bot.restore_model_e_position() or bot.RISK.active() or os.path.exists(bot.MODEL_E_POSITION_PATH):
+            raise SystemExit("FAIL: legs the broker shows flat were re-armed")
+        with open(bot.MODEL_E_POSITION_PATH, "w", encoding="utf-8") as f:
+            json.dump(dict(saved, saved_at=clock.time() - 86400), f)
+        if bot.restore_model_e_position() or os.path.exists(bot.MODEL_E_POSITION_PATH):
+            raise SystemExit("FAIL: state from an earlier session was re-armed")
+        print("✅ Saved state ignored when the broker shows the legs flat or it is from an earlier session")
+    finally:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+SMOKE TEST — RULES V1
+Offline. The rule language (lookbacks, crossovers, arithmetic, params, NaN,
+strings, errors); vector == scalar evaluation on every bar; Model E rules ==
+the previous hand-coded conditions in the backtest and the live scanner;
+main_v8 conds / signals_v1 / spot engine rule unchanged; array speed.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_e_logic import calculate_model_e_indicators_1h, model_e_entry_rules
+from prototype.model_e_backtest_v1 import ModelEParams, compute_hourly_indicators, entry_signals, resample_hourly
+from prototype.rules_v1 import Rule, RuleSet
+from prototype.synthetic_data_v1 import synthetic_1m_session
+
+
+def _vector_eq_scalar(rs, cols, label):
+    vec = rs.vector(cols)
+    n = len(next(iter(vec.values())))
+    for i in range(n):
+        at = rs.at(cols, i)
+        for name, m in vec.items():
+            if bool(m[i]) != at[name]:
+                raise SystemExit(f"FAIL: {label} {name} vector != scalar at bar {i}")
+    return vec
+
+
+def main():
+    print("=== SMOKE TEST: RULES V1 ===")
+
+    x = np.array([1.0, 3.0, 2.0, np.nan, 5.0, 4.0, 6.0])
+    y = np.array([2.0, 2.0, 2.0, 2.0, 2.0, 5.0, 5.0])
+    cols = {"x": x, "y": y, "tag": np.array(["A", "B", "A", "A", "B", "B", "A"], dtype=object)}
+    rs = RuleSet({
+        "up": "crosses_above(x, y)",
+        "down": "crosses_below(x, y)",
+        "rising2": "x > x[2]",
+        "ratio": "x / (y - 2) > 1 or abs(x - y) * 2 >= lim",
+        "tag": "tag == 'A' and not x[1] > 2",
+    }, params={"lim": 3})
+    vec = _vector_eq_scalar(rs, cols, "language")
+    want = {
+        "up": [False, True, False, False, False, False, True],
+        "down": [False, False, False, False, False, True, False],
+        "rising2": [False, False, True, False, True, False, True],
+        "ratio": [True, True, True, False, True, True, True],
+        "tag": [True, False, False, True, False, False, False],
+    }
+    for name, w in want.items():
+        if vec[name].tolist() != w:
+            raise SystemExit(f"FAIL: {name} {vec[name].tolist()} != {w}")
+    if rs.columns != {"x", "y", "tag"} or "lim" in rs.columns:
+        raise SystemExit(f"FAIL: columns {rs.columns}")
+    for bad in ("x.real > 1", "x[-1] > 0", "open(x)", "x[y] > 1", "x >", "__import__('os')", "x ** 2 > 1"):
+        try:
+            Rule(bad)
+        except ValueError:
+            continue
+        raise SystemExit(f"FAIL: accepted {bad!r}")
+    print("✅ Language: lookbacks, crossovers, chained comparisons, arithmetic, params, strings, NaN; unsafe syntax rejected")
+
+    data = synthetic_1m_session(days=120, seed=46)
+    bars = resample_hourly(data["times"], data["open"], data["high"], data["low"], data["close"])
+    ind = compute_hourly_indicators(bars)
+    close, st_dir = bars.close, ind["st_direction"]
+    prev_dir = np.r_[0, st_dir[:-1]]
+    with np.errstate(invalid="ignore"):
+        hand = ((st_dir == 1) & (prev_dir == -1) & (ind["rsi"] < 65)
+                & (close > ind["st_line"]) & (close > ind["ema20"]))
+    rules = model_e_entry_rules()
+    cols = dict(ind, close=close)
+    _vector_eq_scalar(rules, cols, "model_e")
+    if not np.array_equal(entry_signals(bars, ind), hand) or not hand.any():
+        raise SystemExit("FAIL: backtest entry_signals != hand-coded conditions")
+
+    df = calculate_model_e_indicators_1h(pd.DataFrame({"open": bars.open, "high": bars.high, "low": bars.low, "close": close}))
+    hits = 0
+    for end in range(2, len(df) + 1):
+        view = df.iloc[:end]
+        bar_i, bar_prev = view.iloc[-1], view.iloc[-2]
+        old = {
+            "trend_flip": bar_i["st_direction"] == 1 and bar_prev["st_direction"] == -1,
+            "rsi_filter": bar_i["rsi"] < 65,
+            "price_action": (bar_i["close"] > bar_i["st_line"]) and (bar_i["close"] > bar_i["ema20"]),
+        }
+        new = rules.last(view)
+        if new != {k: bool(v) for k, v in old.items()}:
+            raise SystemExit(f"FAIL: scan_for_model_e conditions differ at bar {end - 1}: {new} vs {old}")
+        hits += all(new.values())
+    if hits != int(hand.sum()) or not np.array_equal(entry_signals(bars, ind, ModelEParams(rsi_max=60.0)),
+                                                     hand & (ind["rsi"] < 60)):
+        raise SystemExit("FAIL: live / backtest signal counts or rsi_max param")
+    print(f"✅ Model E: {len(close)} 1H bars, {hits} entries — live scan (.last) == backtest (.mask) == hand-coded")
+
+    from prototype.main_v8 import SPOT_SIGNAL_RULES
+    from prototype.signals_v1 import SIGNAL_RULES
+    from prototype.spot_signal_engine_v1 import READY_RULE
+
+    rng = np.random.default_rng(46)
+    for _ in range(500):
+        c, e, r, a, d = rng.normal(100, 2), rng.normal(100, 2), rng.uniform(30, 70), rng.normal(1, 1), int(rng.choice([-1, 1]))
+        snap = {"close": c, "ema20": e, "rsi": r, "atr14": a, "st_dir": d}
+        if list(SPOT_SIGNAL_RULES.last(snap).values()) != [c > e, d == 1, r >= 55.0, a > 0]:
+            raise SystemExit("FAIL: main_v8 conds")
+        sig = SIGNAL_RULES.last({"close": c, "ema20": e, "rsi14": r})
+        if sig != {"CALL": c > e and r > 55, "PUT": c < e and r < 45}:
+            raise SystemExit("FAIL: signals_v1 rules")
+        st, red = rng.choice(["GREEN", "RED"]), bool(rng.integers(2))
+        ready = READY_RULE.ok({"close": c, "ema20": e, "rsi19": r, "supertrend": st, "supertrend_prev_red": red})
+        if ready != (st == "GREEN" and not red and r < 65 and c > e):
+            raise SystemExit("FAIL: spot signal READY rule")
+    print("✅ main_v8 conds / signals_v1 CALL-PUT / spot engine READY == previous conditions (500 snapshots)")
+
+    big = {k: np.tile(v, 20) for k, v in cols.items()}
+    n = len(big["close"])
+    t0 = time.perf_counter()
+    mask = rules.mask(big)
+    t_vec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    per_bar = sum(rules.ok(big, i) for i in range(0, n, 10))
+    t_loop = (time.perf_counter() - t0) * 10
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        rules.last(df)
+    t_live = (time.perf_counter() - t0) / 1000
+    print(f"{n} bars: vector {t_vec * 1000:.2f} ms | per-bar closures ~{t_loop * 1000:.0f} ms | "
+          f"live .last(df_1h) {t_live * 1e6:.0f} us")
+    if per_bar != int(mask[::10].sum()) or t_vec >= t_loop:
+        raise SystemExit("FAIL: vector path must agree and run at array speed")
+    print("✅ Whole-history evaluation at array speed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+SMOKE TEST — SESSION REPLAY V1
+Offline: synthetic recorded session -> live bot.bot_loop under virtual time,
+through the bot's breaker / rate-limit / metrics wrappers; the recorder is
+installed beneath those wrappers without removing any of them.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from prototype import metrics
+from prototype.circuit_breaker_v1 import BreakerHTTP
+from prototype.rate_limiter_v1 import RateLimitedHTTP
+from prototype.session_replay_v1 import (
+    SESSION_SECONDS,
+    RecordingTransport,
+    ReplayResponse,
+    _noren_module,
+    install_recorder,
+    load_records,
+    replay_session,
+)
+
+WRAPPERS = (BreakerHTTP, RateLimitedHTTP, metrics.InstrumentedHTTP)
+
+
+class _FakeHTTP:
+    def post(self, url, data=None, **kwargs):
+        return ReplayResponse(json.dumps({"stat": "Ok", "lp": "23000.00"}))
+
+
+def _synthetic_records(start: float, seconds: int, step: int = 30):
+    rng = np.random.default_rng(5)
+    recs = [
+        {"t": start - 5, "route": "QuickAuth", "req": {"uid": "REPLAY"}, "status": 200,
+         "body": json.dumps({"stat": "Ok", "susertoken": "replay-token", "actid": "REPLAY"})},
+        {"t": start - 4, "route": "SearchScrip", "req": {"uid": "REPLAY", "stext": "NIFTY", "exch": "NFO"}, "status": 200,
+         "body": json.dumps({"stat": "Ok", "values": [
+             {"instname": "FUTIDX", "token": "53002", "tsym": "NIFTY24FEB26F", "expd": "26-FEB-2026"},
+             {"instname": "FUTIDX", "token": "53001", "tsym": "NIFTY29JAN26F", "expd": "29-JAN-2026"},
+         ]})},
+    ]
+    # Model E scan history: last 24h of 1-min spot bars (newest first, as Noren)
+    close, bars = 23000.0, []
+    for i in range(1, 1441):
+        t = int(start) - i * 60
+        o = close * (1.0 - rng.normal(0.0, 0.0003))
+        bars.append({"stat": "Ok", "time": datetime.fromtimestamp(t).strftime("%d-%m-%Y %H:%M:%S"),
+                     "ssboe": str(t), "into": f"{o:.2f}", "inth": f"{max(o, close) + 1:.2f}",
+                     "intl": f"{min(o, close) - 1:.2f}", "intc": f"{close:.2f}", "intv": "1000"})
+        close = o
+    recs.append({"t": start - 3, "route": "TPSeries", "req": {"uid": "REPLAY", "exch": "NSE", "token": "26000", "intrv": "1"},
+                 "status": 200, "body": json.dumps(bars)})
+    px = {"26000": 23000.0, "26017": 14.5, "53001": 23080.0, "53002": 23190.0}
+    for t in range(0, seconds + step, step):
+        for tok in px:
+            px[tok] *= 1.0 + rng.normal(0.0, 0.0004)
+            exch = "NSE" if "26" in tok else "NFO"
+            recs.append({
+                "t": start + t, "route": "GetQuotes", "req": {"uid": "REPLAY", "exch": exch, "token": tok},
+                "status": 200, "body": json.dumps({"stat": "Ok", "lp": f"{px[tok]:.2f}", "c": "22950.00"}),
+            })
+    return recs
+
+
+def main():
+    print("=== SMOKE TEST: SESSION REPLAY V1 ===")
+
+    start = datetime(2026, 1, 23, 9, 15).timestamp()
+    records = _synthetic_records(start, SESSION_SECONDS)
+
+    quotes = metrics.REGISTRY.histogram("broker_request_seconds").snapshot(route="GetQuotes")["count"]
+    rep = replay_session(records, start=start)
+    td = rep.trade_data
+    print(f"virtual={rep.virtual_sec:.0f}s wall={rep.wall_sec:.2f}s speedup={rep.speedup:.0f}x "
+          f"sleeps={rep.loop_sleeps} calls={rep.calls} misses={rep.misses}")
+    print("served:", rep.served, "| status:", td.get("status"), "| last_error:", td.get("last_error"))
+
+    if rep.virtual_sec < SESSION_SECONDS:
+        raise SystemExit("FAIL: session not fully replayed")
+    if td.get("status") != "Stopped" or not td.get("fut_curr_ltp") or rep.misses:
+        raise SystemExit(f"FAIL: unexpected final state {td.get('status')} {td.get('fut_curr_ltp')}")
+    if rep.wall_sec > 60:
+        raise SystemExit("FAIL: replay too slow")
+    print("✅ Full session replayed")
+    seen = metrics.REGISTRY.histogram("broker_request_seconds").snapshot(route="GetQuotes")["count"] - quotes
+    if seen != rep.served["GetQuotes"]:
+        raise SystemExit(f"FAIL: replay bypassed the bot's HTTP wrappers ({seen} instrumented calls)")
+    print("✅ Replay ran beneath the live BreakerHTTP / RateLimitedHTTP / InstrumentedHTTP chain")
+
+    again = replay_session(records, start=start)
+    if json.dumps(again.trade_data, sort_keys=True, default=str) != json.dumps(td, sort_keys=True, default=str):
+        raise SystemExit("FAIL: replay not deterministic")
+    print("✅ Deterministic")
+
+    import bot
+
+    path = os.path.join(tempfile.mkdtemp(), "session.jsonl")
+    top = (type(bot.requests), type(_noren_module().requests))
+    rec = install_recorder(path)
+    if install_recorder(path) is not None:
+        raise SystemExit("FAIL: recorder installed twice")
+    for owner in (bot, _noren_module()):
+        if not all(metrics.is_wrapped(owner.requests, w) for w in WRAPPERS + (RecordingTransport,)):
+            raise SystemExit(f"FAIL: recorder dropped a wrapper on {owner.__name__}")
+    if (type(bot.requests), type(_noren_module().requests)) != top:
+        raise SystemExit("FAIL: recorder replaced the top of the chain")
+    real, rec._real = rec._real, _FakeHTTP()
+    try:
+        bot.requests.post("https://api.shoonya.com/NorenWClientTP/GetQuotes",
+                          data='jData={"uid":"U","exch":"NSE","token":"26000"}&jKey=k')
+    finally:
+        rec._real = real
+    got = load_records(path)
+    if [(r["route"], r["req"].get("token")) for r in got] != [("GetQuotes", "26000")]:
+        raise SystemExit(f"FAIL: round trip not recorded {got}")
+    print("✅ Recorder sits beneath breaker / rate limit / metrics wrappers (bot + NorenApi), idempotent")
+
+
+if __name__ == "__main__":
+    main()
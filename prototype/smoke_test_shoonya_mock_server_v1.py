@@ -0,0 +1,123 @@
+"""
+SMOKE TEST — SHOONYA MOCK SERVER V1
+Offline: bot.py direct HTTP + NorenApi (REST + websocket) against the mock.
+"""
+
+import os
+import statistics
+import threading
+import time
+
+import requests
+
+from prototype.session_replay_v1 import REPLAY_ENV
+from prototype.shoonya_mock_server_v1 import MockConfig, MockShoonyaServer, parse_form
+
+
+def _percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(p / 100.0 * len(xs)))]
+
+
+def main():
+    print("=== SMOKE TEST: SHOONYA MOCK SERVER V1 ===")
+
+    req, key = parse_form('jData={"uid":"A","tsym":"NIFTY%2B1"}&jKey=abc')
+    if req.get("uid") != "A" or key != "abc":
+        raise SystemExit("FAIL: parse_form")
+
+    srv = MockShoonyaServer(MockConfig(port=0, latency_ms=4.0, jitter_ms=2.0, tick_interval_sec=0.05)).start()
+    try:
+        os.environ.update(REPLAY_ENV)
+        os.environ.update(srv.env())
+        import bot  # endpoints are read at import
+
+        if bot.SHOONYA_REST_URL != srv.rest_url:
+            raise SystemExit("FAIL: bot did not pick up SHOONYA_REST_URL")
+
+        # ---- bot.py direct HTTP path ----
+        if not bot.shoonya_login():
+            raise SystemExit(f"FAIL: bot login: {bot.trade_data.get('last_error')}")
+        tokens = bot.resolve_futures_tokens()
+        if not tokens or not tokens["CURR"] or not tokens["NEXT"]:
+            raise SystemExit("FAIL: futures tokens not resolved")
+        data = bot.get_shoonya_data(bot._susertoken, tokens)
+        if set(data) != {"SPOT", "VIX", "CURR", "NEXT"} or data["SPOT"].ltp <= 0:
+            raise SystemExit(f"FAIL: GetQuotes via bot: {data}")
+        print("✅ bot.py login / SearchScrip / GetQuotes:", {k: v.ltp for k, v in data.items()})
+
+        # ---- NorenApi REST ----
+        api = bot.api
+        bars = api.get_time_price_series(exchange="NSE", token="26000",
+                                         starttime=time.time() - 6 * 3600, endtime=time.time(), interval=5)
+        if not bars or int(bars[0]["ssboe"]) <= int(bars[-1]["ssboe"]):
+            raise SystemExit("FAIL: TPSeries")
+        print(f"✅ TPSeries: {len(bars)} bars, newest first")
+
+        # ---- websocket: touchline + order updates ----
+        ticks, orders, opened = [], [], threading.Event()
+        api.start_websocket(
+            subscribe_callback=ticks.append,
+            order_update_callback=orders.append,
+            socket_open_callback=opened.set,
+        )
+        if not opened.wait(5):
+            raise SystemExit("FAIL: websocket did not open")
+        api.subscribe(["NSE|26000", f"NFO|{tokens['CURR']}"])
+        api.subscribe_orders()
+        time.sleep(0.3)
+
+        ret = api.place_order(buy_or_sell="B", product_type="M", exchange="NFO",
+                              tradingsymbol=bot.trade_data["symbol"], quantity=50, discloseqty=0,
+                              price_type="MKT", price=0.0, trigger_price=None, retention="DAY",
+                              remarks="smoke")
+        put = api.place_order(buy_or_sell="B", product_type="M", exchange="NFO",
+                              tradingsymbol="NIFTY26JAN22800PE", quantity=50, discloseqty=0,
+                              price_type="MKT", price=0.0, trigger_price=None, retention="DAY",
+                              remarks="smoke")
+        if not ret or ret.get("stat") != "Ok" or not put or put.get("stat") != "Ok":
+            raise SystemExit(f"FAIL: PlaceOrder {ret} {put}")
+        deadline = time.time() + 3
+        while len(orders) < 2 and time.time() < deadline:
+            time.sleep(0.02)
+        kinds = {t["t"] for t in ticks}
+        if len(orders) < 2 or not {"tk", "tf"} <= kinds:
+            raise SystemExit(f"FAIL: websocket feed orders={len(orders)} kinds={kinds}")
+        pos = api.get_positions()
+        if not pos or sum(int(p["netqty"]) for p in pos) != 100:
+            raise SystemExit(f"FAIL: PositionBook {pos}")
+        api.close_websocket()
+        print(f"✅ Websocket: {len(ticks)} touchline msgs, {len(orders)} order updates; positions={len(pos)}")
+
+        # ---- latency profile ----
+        url = srv.rest_url + "GetQuotes"
+        body = 'jData={"uid":"REPLAY","exch":"NSE","token":"26000"}&jKey=' + bot._susertoken
+        lat = []
+        with requests.Session() as s:
+            for _ in range(100):
+                t0 = time.perf_counter()
+                r = s.post(url, data=body)
+                lat.append((time.perf_counter() - t0) * 1000)
+                if r.json().get("stat") != "Ok":
+                    raise SystemExit("FAIL: GetQuotes under load")
+        p50, p99 = statistics.median(lat), _percentile(lat, 99)
+        print(f"GetQuotes latency p50={p50:.1f}ms p99={p99:.1f}ms (configured 4±2ms)")
+        if p50 < 2.0:
+            raise SystemExit("FAIL: latency injection not applied")
+        print("✅ Latency injection")
+    finally:
+        srv.stop()
+
+    # ---- error injection ----
+    bad = MockShoonyaServer(MockConfig(port=0, error_rate=0.5, seed=3)).start()
+    try:
+        codes = [requests.post(bad.rest_url + "QuickAuth", data='jData={"uid":"X"}').status_code for _ in range(40)]
+    finally:
+        bad.stop()
+    if not (5 <= codes.count(502) <= 35):
+        raise SystemExit(f"FAIL: error injection {codes.count(502)}/40")
+    print(f"✅ Error injection: {codes.count(502)}/40 HTTP 502")
+
+
+if __name__ == "__main__":
+    main()
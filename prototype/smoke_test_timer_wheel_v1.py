@@ -0,0 +1,87 @@
+"""
+SMOKE TEST — TIMER WHEEL V1
+Offline. Timers fire in due order at their exact due time (simulated clock,
+one sleep per deadline), cancel, timers beyond one revolution, a long gap
+between run_due calls, early fires recorded apart from the drift; the
+background thread fires on the real clock within a few ms of the deadline.
+"""
+
+import time
+
+from prototype import clock, metrics
+from prototype.clock import SimulatedClock, use_clock
+from prototype.timer_wheel_v1 import TimerWheel
+
+T0 = 1_760_000_000.0
+
+
+def main():
+    print("=== SMOKE TEST: TIMER WHEEL V1 ===")
+
+    with use_clock(SimulatedClock(T0)) as sim:
+        wheel = TimerWheel()
+        fired = []
+        for dt in (0.5, 0.013, 3600.0, 12.0, 0.5, 7.25):
+            wheel.schedule(T0 + dt, lambda dt=dt: fired.append((dt, clock.time() - T0)))
+        gone = wheel.schedule(T0 + 1.0, lambda: fired.append(("cancelled", 0.0)))
+        if not wheel.cancel(gone) or wheel.cancel(gone) or len(wheel) != 6:
+            raise SystemExit("FAIL: cancel")
+        if wheel.next_due() != T0 + 0.013:
+            raise SystemExit(f"FAIL: next_due {wheel.next_due() - T0}")
+        while wheel.next_due() is not None:
+            wheel.run_next()
+        if [d for d, _ in fired] != [0.013, 0.5, 0.5, 7.25, 12.0, 3600.0]:
+            raise SystemExit(f"FAIL: fire order {fired}")
+        if any(abs(at - d) > 1e-6 for d, at in fired):
+            raise SystemExit(f"FAIL: fired off the deadline {fired}")
+        if sim.sleeps != 5 or wheel.stats["fired"] != 6 or len(wheel):
+            raise SystemExit(f"FAIL: one sleep per deadline ({sim.sleeps}) {wheel.stats}")
+    print("✅ Due order, exact due time (not the tick edge), cancel, 12s / 1h timers past one revolution, "
+          "one sleep per deadline")
+
+    with use_clock(SimulatedClock(T0)) as sim:
+        wheel = TimerWheel()
+        fired = []
+        for dt in (5.0, 30.0, 95.0, 200.0):
+            wheel.schedule(T0 + dt, fired.append, dt)
+        sim.advance(100.0)
+        wheel.run_due()
+        if fired != [5.0, 30.0, 95.0] or len(wheel) != 1:
+            raise SystemExit(f"FAIL: long gap {fired}")
+        late = wheel.schedule(T0 + 50.0, fired.append, "late")             # already past: next run_due
+        wheel.run_due()
+        if fired[-1] != "late" or late.drift != 50.0:
+            raise SystemExit("FAIL: past-due timer")
+        boom = wheel.schedule(T0 + 101.0, lambda: 1 / 0)
+        sim.advance(1.0)
+        wheel.run_due()
+        if not isinstance(boom.error, ZeroDivisionError):
+            raise SystemExit("FAIL: callback error not recorded")
+        early = wheel.schedule(T0 + 110.0, fired.append, "early", name="early")
+        wheel.run_due(T0 + 110.0)                                           # ahead of the clock (T0 + 101)
+        h = metrics.REGISTRY.histogram("timer_fire_early_seconds").snapshot(timer="early")
+        if early.drift != -9.0 or h["count"] != 1 or h["sum"] != 9.0:
+            raise SystemExit(f"FAIL: early fire not recorded {early.drift} {h}")
+    print("✅ A gap of several revolutions fires everything due once; past-due, early and failing timers handled")
+
+    wheel = TimerWheel().start()
+    if not wheel.running:
+        raise SystemExit("FAIL: background runner not running")
+    try:
+        timers = [wheel.schedule(time.time() + dt, lambda: None, name="rt") for dt in (0.05, 0.2, 0.35)]
+        t0 = time.time()
+        while any(t.fired_at is None for t in timers) and time.time() - t0 < 2:
+            time.sleep(0.01)
+        drift = [t.drift for t in timers]
+    finally:
+        wheel.stop()
+    if wheel.running:
+        raise SystemExit("FAIL: runner alive after stop()")
+    if None in drift or max(drift) > 0.05:
+        raise SystemExit(f"FAIL: real-clock drift {drift}")
+    print(f"✅ Background thread: fire drift {', '.join(f'{d * 1000:.1f}' for d in drift)} ms "
+          f"(200ms poll: up to 200 ms)")
+
+
+if __name__ == "__main__":
+    main()
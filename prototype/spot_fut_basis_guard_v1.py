@@ -3,7 +3,7 @@ SPOT vs FUT BASIS GUARD V1
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 MAX_BASIS = 40.0
 
@@ -16,7 +16,7 @@ class BasisDecision:
 
 def check_spot_fut_basis(spot: float, future: float):
     basis = abs(future - spot)
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     if basis <= MAX_BASIS:
         return BasisDecision(True, basis, "Basis within limit", ts)
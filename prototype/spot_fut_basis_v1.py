@@ -1,7 +1,7 @@
 ﻿# prototype/spot_fut_basis_v1.py
 
 from dataclasses import dataclass
-from datetime import datetime
+from prototype import clock
 
 MAX_BASIS_POINTS = 50  # configurable safety threshold
 
@@ -20,12 +20,12 @@ def check_basis(spot: float, future: float) -> BasisDecision:
             allowed=False,
             basis=basis,
             reason="Basis exceeds limit",
-            ts=datetime.utcnow().isoformat() + "Z"
+            ts=clock.utc_now_iso_z()
         )
 
     return BasisDecision(
         allowed=True,
         basis=basis,
         reason="Basis within limit",
-        ts=datetime.utcnow().isoformat() + "Z"
+        ts=clock.utc_now_iso_z()
     )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Literal
-from datetime import datetime
+from prototype import clock
 
 SignalType = Literal["ENTRY_ARMED", "WAIT"]
 
@@ -15,4 +15,4 @@ class SpotSignal:
     ts: str
 
 def now_ts() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    return clock.utc_now_iso_z()
@@ -1,6 +1,11 @@
+from prototype import clock
 from prototype.spot_signal_contracts import SpotSignal
+from prototype.rules_v1 import RuleSet
 from prototype.spot_signal_state_recorder_v1 import record_spot_signal
-from datetime import datetime
+
+READY_RULE = RuleSet({
+    'ready': "supertrend == 'GREEN' and not supertrend_prev_red and rsi19 < 65 and close > ema20",
+})
 
 def generate_spot_signal(
     close,
@@ -9,12 +14,13 @@ def generate_spot_signal(
     supertrend,
     supertrend_prev_red
 ):
-    if (
-        supertrend == 'GREEN'
-        and not supertrend_prev_red
-        and rsi19 < 65
-        and close > ema20
-    ):
+    if READY_RULE.ok({
+        'close': close,
+        'ema20': ema20,
+        'rsi19': rsi19,
+        'supertrend': supertrend,
+        'supertrend_prev_red': supertrend_prev_red,
+    }):
         signal = SpotSignal(
             signal='READY',
             reason='Trend aligned',
@@ -22,7 +28,7 @@ def generate_spot_signal(
             ema20=ema20,
             rsi19=rsi19,
             supertrend=supertrend,
-            ts=datetime.utcnow().isoformat() + 'Z'
+            ts=clock.utc_now_iso_z()
         )
     else:
         signal = SpotSignal(
@@ -32,7 +38,7 @@ def generate_spot_signal(
             ema20=ema20,
             rsi19=rsi19,
             supertrend=supertrend,
-            ts=datetime.utcnow().isoformat() + 'Z'
+            ts=clock.utc_now_iso_z()
         )
 
     record_spot_signal(signal)
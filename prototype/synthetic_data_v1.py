@@ -0,0 +1,74 @@
+"""
+SYNTHETIC DATA V1
+Deterministic NIFTY-like 1m session data for offline smoke tests,
+backtests and sweeps (no broker needed).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+SESSION_MINUTES = 375  # 09:15 -> 15:29 inclusive
+
+
+def synthetic_1m_session(days: int, seed: int = 7, start: str = "2022-01-03",
+                         spot: float = 18000.0, step_sd: float = 6.0) -> Dict[str, np.ndarray]:
+    """
+    NSE session minutes on weekdays, random-walk prices, one VIX level per day.
+    Returns the same dict layout as model_e_backtest_v1.load_1m_csv.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days)
+    offsets = np.arange(SESSION_MINUTES, dtype="timedelta64[m]") + np.timedelta64(9 * 60 + 15, "m")
+    times = (dates.values.astype("datetime64[m]")[:, None] + offsets[None, :]).ravel()
+
+    close = spot + np.cumsum(rng.normal(0.0, step_sd, len(times)))
+    open_ = np.r_[close[0], close[:-1]]
+    wick = np.abs(rng.normal(0.0, step_sd / 2.0, len(times)))
+    high = np.maximum(open_, close) + wick
+    low = np.minimum(open_, close) - wick
+    vix = np.repeat(rng.uniform(11.0, 22.0, days), SESSION_MINUTES)
+
+    return {
+        "times": times,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "vix": vix,
+    }
+
+
+def synthetic_tpseries_rows(bars: int, interval_min: int = 60, seed: int = 7,
+                            end: str = "2026-01-23 15:15", spot: float = 23000.0,
+                            step_sd: float = 40.0) -> List[Dict[str, Any]]:
+    """
+    Noren TPSeries-shaped rows (string fields, newest first), as returned by
+    get_time_price_series and wrapped by contract_guard.ensure_candlepack.
+    """
+    rng = np.random.default_rng(seed)
+    close = spot + np.cumsum(rng.normal(0.0, step_sd, bars))
+    open_ = np.r_[close[0], close[:-1]]
+    wick = np.abs(rng.normal(0.0, step_sd / 3.0, bars))
+    high = np.maximum(open_, close) + wick
+    low = np.minimum(open_, close) - wick
+    vol = rng.integers(1000, 50000, bars)
+
+    t_end = int(pd.Timestamp(end).timestamp())
+    rows: List[Dict[str, Any]] = []
+    for i in range(bars - 1, -1, -1):
+        t = t_end - (bars - 1 - i) * interval_min * 60
+        rows.append({
+            "stat": "Ok",
+            "time": pd.Timestamp(t, unit="s").strftime("%d-%m-%Y %H:%M:%S"),
+            "ssboe": str(t),
+            "into": f"{open_[i]:.2f}",
+            "inth": f"{high[i]:.2f}",
+            "intl": f"{low[i]:.2f}",
+            "intc": f"{close[i]:.2f}",
+            "intv": str(int(vol[i])),
+        })
+    return rows
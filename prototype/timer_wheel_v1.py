@@ -0,0 +1,173 @@
+"""
+TIMER WHEEL V1
+Hashed timer wheel: O(1) schedule / cancel, expiry in tick order, and a
+runner that sleeps straight to the earliest deadline (no fixed-interval
+polling). Timers fire at their exact due time, not at the tick edge.
+
+    wheel = TimerWheel()
+    t = wheel.schedule(due_epoch, fn, *args, name="entry")
+    wheel.cancel(t)
+    wheel.start()          # background thread (RealClock): wait to the next deadline, fire
+    wheel.run_next()       # or in the caller's thread: one clock.sleep to the next deadline, fire
+    wheel.run_due(now)     # fire everything due by now (simulated clocks / tests)
+
+Each fire records t.fired_at and timer_fire_drift_seconds{timer} (actual -
+intended); a timer fired before its due time (run_due(now) ahead of the
+clock) goes to timer_fire_early_seconds{timer} instead.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from prototype import clock, metrics
+
+TICK_SEC = 0.01
+SLOTS = 1024                  # one revolution = 10.24s; later timers wait out their rounds in the slot
+
+
+@dataclass(eq=False)
+class Timer:
+    due: float
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    name: str = ""
+    tick: int = 0
+    fired_at: Optional[float] = None
+    cancelled: bool = False
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def drift(self) -> Optional[float]:
+        return None if self.fired_at is None else self.fired_at - self.due
+
+
+class TimerWheel:
+    def __init__(self, tick_sec: float = TICK_SEC, slots: int = SLOTS):
+        self.tick_sec = float(tick_sec)
+        self.slots = int(slots)
+        self._wheel: List[List[Timer]] = [[] for _ in range(self.slots)]
+        self._cursor = math.floor(clock.time() / self.tick_sec)
+        self._n = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self.stats = {"scheduled": 0, "fired": 0, "cancelled": 0}
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def running(self) -> bool:
+        """The background runner (start()) is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # ---- timers ----
+    def schedule(self, due: float, fn: Callable[..., Any], *args: Any, name: str = "") -> Timer:
+        t = Timer(float(due), fn, args, name)
+        with self._cond:
+            t.tick = max(math.ceil(t.due / self.tick_sec), self._cursor)
+            self._wheel[t.tick % self.slots].append(t)
+            self._n += 1
+            self.stats["scheduled"] += 1
+            self._cond.notify()
+        return t
+
+    def cancel(self, t: Timer) -> bool:
+        with self._cond:
+            bucket = self._wheel[t.tick % self.slots]
+            if t.cancelled or t.fired_at is not None or t not in bucket:
+                return False
+            bucket.remove(t)
+            t.cancelled = True
+            self._n -= 1
+            self.stats["cancelled"] += 1
+            self._cond.notify()
+        return True
+
+    def next_due(self) -> Optional[float]:
+        with self._cond:
+            return self._next_due()
+
+    def _next_due(self) -> Optional[float]:
+        if not self._n:
+            return None
+        for k in range(self._cursor, self._cursor + self.slots):
+            due = [t.due for t in self._wheel[k % self.slots] if t.tick == k]
+            if due:
+                return min(due)
+        return min(t.due for bucket in self._wheel for t in bucket)   # all beyond one revolution
+
+    # ---- expiry ----
+    def run_due(self, now: Optional[float] = None) -> List[Timer]:
+        """Fire every timer due by now, in due order; returns them."""
+        now = clock.time() if now is None else now
+        end = math.floor(now / self.tick_sec)
+        with self._cond:
+            full = end - self._cursor >= self.slots              # long gap: every slot once
+            due: List[Timer] = []
+            for k in (range(self.slots) if full else range(self._cursor, end + 2)):   # + the partial tick
+                bucket = self._wheel[k % self.slots]
+                hit = [t for t in bucket if t.due <= now]           # later rounds are not due yet
+                if hit:
+                    due.extend(hit)
+                    bucket[:] = [t for t in bucket if t.due > now]
+            self._cursor = max(self._cursor, end)
+            self._n -= len(due)
+        due.sort(key=lambda t: t.due)
+        for t in due:
+            self._fire(t)
+        return due
+
+    def _fire(self, t: Timer) -> None:
+        t.fired_at = clock.time()
+        if t.drift < 0:
+            metrics.observe("timer_fire_early_seconds", -t.drift, timer=t.name)
+        else:
+            metrics.observe("timer_fire_drift_seconds", t.drift, timer=t.name)
+        self.stats["fired"] += 1
+        try:
+            t.fn(*t.args)
+        except Exception as e:
+            t.error = e
+            print(f"❌ Timer {t.name or t.fn} failed: {e}")
+
+    def run_next(self) -> List[Timer]:
+        """Caller's thread: one sleep to the earliest deadline, then fire what is due."""
+        due = self.next_due()
+        if due is None:
+            return []
+        clock.sleep(due - clock.time())
+        return self.run_due()
+
+    # ---- background runner ----
+    def start(self) -> "TimerWheel":
+        with self._cond:
+            if not self.running:
+                self._stop = False
+                self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop:
+                    due = self._next_due()
+                    wait = None if due is None else due - clock.time()
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)                      # re-evaluated on schedule / cancel
+                if self._stop:
+                    return
+            self.run_due()
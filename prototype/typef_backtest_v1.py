@@ -0,0 +1,126 @@
+"""
+TYPE F BACKTEST V1
+main_v7 Type F conditions replayed over 1H bars:
+- ENTRY (flat): close > EMA(ema_len) AND ST(st_len, st_mult) bullish AND RSI14 >= rsi_min AND ATR14 > 0
+- EXIT: close - atr_mult x ATR stop (on bar lows) OR SuperTrend turns bearish (at close)
+Indicators come from prototype.indicator_lib_v1 (same numbers as prototype.indicators).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from prototype.indicator_lib_v1 import atr as atr_np
+from prototype.indicator_lib_v1 import ema as ema_np
+from prototype.indicator_lib_v1 import rsi as rsi_np
+from prototype.indicator_lib_v1 import supertrend as supertrend_np
+from prototype.model_e_backtest_v1 import (
+    CAPITAL,
+    FRICTION_PTS,
+    LOT_SIZE,
+    BacktestResult,
+    BacktestTrade,
+    HourlyBars,
+    summarize,
+)
+
+
+@dataclass(frozen=True)
+class TypeFParams:
+    """
+    Mirrors main_v7.RuntimeCfg defaults.
+    """
+    rsi_min: float = 55.0
+    ema_len: int = 20
+    st_len: int = 10
+    st_mult: float = 3.0
+    atr_len: int = 14
+    atr_mult: float = 2.0
+    lots: int = 1
+    friction_pts: float = FRICTION_PTS
+    lot_size: int = LOT_SIZE
+
+
+def run_typef_backtest(bars: HourlyBars, times_1m: np.ndarray,
+                       params: TypeFParams = TypeFParams(), capital: float = CAPITAL) -> BacktestResult:
+    """
+    bars: 1H bars (model_e_backtest_v1.resample_hourly)
+    times_1m: int64 minutes / datetime64 of the source 1m bars (for ledger timestamps)
+    Equity curve is per 1H bar (realized + open MTM at bar close).
+    """
+    o, h, l, c = bars.open, bars.high, bars.low, bars.close
+    n = len(c)
+    mins = np.asarray(times_1m)
+    if np.issubdtype(mins.dtype, np.datetime64):
+        mins = mins.astype("datetime64[m]", copy=False).view(np.int64)
+    bar_mins = mins[bars.end_idx] if n else np.empty(0, dtype=np.int64)
+
+    ema_v = ema_np(c, params.ema_len)
+    rsi_v = rsi_np(c, 14)
+    atr_v = atr_np(h, l, c, params.atr_len)
+    _, st_dir = supertrend_np(h, l, c, params.st_len, params.st_mult)
+
+    with np.errstate(invalid="ignore"):
+        entry_ok = (c > ema_v) & (st_dir == 1) & (rsi_v >= params.rsi_min) & (atr_v > 0)
+    entries = np.flatnonzero(entry_ok)
+    bear = np.flatnonzero(st_dir == -1)
+
+    qty = params.lots * params.lot_size
+    trades: List[BacktestTrade] = []
+    realized = np.zeros(n)
+    open_qty = np.zeros(n)
+    open_cost = np.zeros(n)
+    busy_until = -1
+
+    for i in entries.tolist():
+        if i <= busy_until:
+            continue
+        entry = float(c[i])
+        sl = entry - params.atr_mult * float(atr_v[i])
+
+        hit = np.flatnonzero(l[i + 1:] <= sl)
+        j_stop = i + 1 + int(hit[0]) if len(hit) else -1
+        k = int(np.searchsorted(bear, i + 1))
+        j_sig = int(bear[k]) if k < len(bear) else -1
+
+        cands = [j for j in (j_stop, j_sig) if j >= 0]
+        if cands:
+            j = min(cands)
+            if j == j_stop:
+                reason, exit_px = "STOP_LOSS", min(float(o[j]), sl)
+            else:
+                reason, exit_px = "SIGNAL_EXIT", float(c[j])
+        else:
+            j, reason, exit_px = n - 1, "END_OF_DATA", float(c[n - 1])
+
+        pnl_points = exit_px - entry - params.friction_pts
+        trades.append(BacktestTrade(
+            entry_time=str(np.datetime64(int(bar_mins[i]), "m")),
+            exit_time=str(np.datetime64(int(bar_mins[j]), "m")),
+            entry_price=entry,
+            exit_price=exit_px,
+            stop_loss=sl,
+            lots=params.lots,
+            qty=qty,
+            vix=0.0,
+            gear=0,
+            rsi=float(rsi_v[i]),
+            atr=float(atr_v[i]),
+            pnl_points=pnl_points,
+            pnl_value=pnl_points * qty,
+            reason_exit=reason,
+        ))
+        realized[j] += pnl_points * qty
+        open_qty[i] += qty
+        open_qty[j] -= qty
+        open_cost[i] += qty * entry
+        open_cost[j] -= qty * entry
+        busy_until = j
+
+    curve = capital + np.cumsum(realized) + (np.cumsum(open_qty) * c - np.cumsum(open_cost))
+    summary = summarize(trades, curve, capital)
+    summary["bars_1h"] = int(n)
+    return BacktestResult(trades=trades, times=bar_mins, equity=curve, summary=summary)
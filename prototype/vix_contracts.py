@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 def now_ts():
-    return datetime.now(timezone.utc).isoformat()
+    return clock.utc_now_iso()
 
 @dataclass(frozen=True)
 class VixContext:
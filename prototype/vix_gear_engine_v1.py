@@ -1,6 +1,6 @@
+from prototype import clock
 from prototype.vix_contracts import VixContext
 from prototype.vix_state_recorder_v1 import record_vix_context
-from datetime import datetime
 
 def select_gear_from_vix(vix):
     if vix < 13:
@@ -8,21 +8,21 @@ def select_gear_from_vix(vix):
             vix=vix,
             gear='RATIO_SPREAD',
             reason='Low VIX < 13 → Gamma expansion',
-            ts=datetime.utcnow().isoformat() + 'Z'
+            ts=clock.utc_now_iso_z()
         )
     elif vix <= 18:
         ctx = VixContext(
             vix=vix,
             gear='SAFE_FUTURE',
             reason='Mid VIX 13–18 → Trend with hedge',
-            ts=datetime.utcnow().isoformat() + 'Z'
+            ts=clock.utc_now_iso_z()
         )
     else:
         ctx = VixContext(
             vix=vix,
             gear='BULL_CALL_SPREAD',
             reason='High VIX > 18 → Sell IV',
-            ts=datetime.utcnow().isoformat() + 'Z'
+            ts=clock.utc_now_iso_z()
         )
 
     record_vix_context(ctx)
@@ -4,7 +4,7 @@ Pure decision logic — no side effects
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from prototype import clock
 
 
 @dataclass(frozen=True)
@@ -16,7 +16,7 @@ class VixContext:
 
 
 def select_gear(vix: float) -> VixContext:
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utc_now_iso()
 
     if vix < 13:
         return VixContext(